@@ -5,6 +5,7 @@ Provides request log query endpoints.
 """
 
 import json
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from urllib.parse import urlsplit
@@ -27,9 +28,11 @@ from app.common.provider_protocols import (
     resolve_implementation_protocol,
 )
 from app.common.errors import AppError, NotFoundError, ValidationError
+from app.common.token_count_cache import token_count_cache
 from app.common.utils import try_parse_json_object
 from app.config import get_settings
 from app.services.active_requests import active_requests
+from app.services.log_writer import log_writer
 from app.domain.log import (
     RequestLogQuery,
     RequestLogResponse,
@@ -476,6 +479,24 @@ async def get_log_cost_stats(
         return JSONResponse(content=e.to_dict(), status_code=e.status_code)
 
 
+@router.get("/writer-stats")
+async def get_log_writer_stats():
+    """
+    Background log writer counters of the worker serving this request:
+    queue depth, written/failed/dropped logs and flush latency.
+    """
+    return asdict(log_writer.stats())
+
+
+@router.get("/token-cache-stats")
+async def get_token_count_cache_stats():
+    """
+    Token count cache counters of the worker serving this request:
+    entries, memory use, hits/misses and evictions.
+    """
+    return asdict(token_count_cache.stats())
+
+
 @router.get("", response_model=PaginatedLogResponse)
 async def list_logs(
     service: LogServiceDep,
@@ -332,7 +332,7 @@ async def _collect_stream_text(
     usage_acc = StreamUsageAccumulator(protocol=implementation, model=requested_model)
     async for chunk in stream:
         usage_acc.feed(chunk)
-    return usage_acc.finalize().output_text
+    return (await usage_acc.finalize_async()).output_text
 
 
 # ============ Model Mapping Endpoints ============
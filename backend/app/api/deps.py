@@ -24,21 +24,30 @@ from app.repositories.sqlalchemy import (
 from app.services import (
     ApiKeyService,
     CostFirstStrategy,
+    LeastOutstandingStrategy,
     LogService,
+    LowestLatencyStrategy,
     ModelService,
     PriorityStrategy,
     ProviderService,
-    ProviderHealthTracker,
     ProxyService,
     RoundRobinStrategy,
 )
+from app.services.api_key_auth import api_key_auth_cache, api_key_last_used
 from app.services.protocol_hooks import ProtocolConversionHooks
+from app.services.inflight import inflight_tracker
+from app.services.log_writer import log_writer
+from app.services.provider_health import create_provider_health_tracker
+from app.services.routing_cache import routing_cache
+from app.services.token_rate_limit import token_rate_limiter
 
 # Singleton strategies
 _round_robin_strategy = RoundRobinStrategy()
 _cost_first_strategy = CostFirstStrategy()
 _priority_strategy = PriorityStrategy()
-_provider_health_tracker = ProviderHealthTracker.from_settings(get_settings())
+_lowest_latency_strategy = LowestLatencyStrategy()
+_least_outstanding_strategy = LeastOutstandingStrategy(inflight_tracker)
+_provider_health_tracker = create_provider_health_tracker(get_settings())
 
 
 async def get_db():
@@ -92,13 +101,19 @@ def get_model_service(db: DbSession) -> ModelService:
     """Get Model Service"""
     model_repo = SQLAlchemyModelRepository(db)
     provider_repo = SQLAlchemyProviderRepository(db)
-    return ModelService(model_repo, provider_repo, _provider_health_tracker)
+    return ModelService(
+        model_repo,
+        provider_repo,
+        _provider_health_tracker,
+        lowest_latency_strategy=_lowest_latency_strategy,
+        inflight_tracker=inflight_tracker,
+    )
 
 
 def get_api_key_service(db: DbSession) -> ApiKeyService:
     """Get API Key Service"""
     repo = SQLAlchemyApiKeyRepository(db)
-    return ApiKeyService(repo)
+    return ApiKeyService(repo, api_key_auth_cache, api_key_last_used)
 
 
 def get_log_service(db: DbSession) -> LogService:
@@ -133,6 +148,7 @@ def get_proxy_service() -> ProxyService:
     uses a short-lived session. This prevents streaming responses from holding
     a pooled connection for the entire upstream stream (see pool-exhaustion fix).
     """
+    settings = get_settings()
     return ProxyService(
         session_factory=AsyncSessionLocal,
         model_repo_factory=lambda s: SQLAlchemyModelRepository(s),
@@ -141,8 +157,20 @@ def get_proxy_service() -> ProxyService:
         round_robin_strategy=_round_robin_strategy,
         cost_first_strategy=_cost_first_strategy,
         priority_strategy=_priority_strategy,
+        lowest_latency_strategy=_lowest_latency_strategy,
+        least_outstanding_strategy=_least_outstanding_strategy,
         protocol_hooks=_build_protocol_hooks(),
         health_tracker=_provider_health_tracker,
+        inflight_tracker=inflight_tracker,
+        routing_cache=routing_cache,
+        token_rate_limiter=token_rate_limiter,
+        log_writer=log_writer,
+        log_write_mode=settings.REQUEST_LOG_WRITE_MODE,
+        stream_log_persist_after_seconds=settings.REQUEST_LOG_STREAM_PERSIST_AFTER_SECONDS,
+        stream_capture_max_bytes=settings.STREAM_CAPTURE_MAX_BYTES,
+        stream_capture_spill_to_disk=settings.STREAM_CAPTURE_SPILL_TO_DISK,
+        stream_capture_spill_max_bytes=settings.STREAM_CAPTURE_SPILL_MAX_BYTES,
+        stream_passthrough=settings.STREAM_PASSTHROUGH_ENABLED,
     )
 
 
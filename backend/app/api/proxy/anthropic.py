@@ -12,6 +12,7 @@ from fastapi.responses import JSONResponse, Response, StreamingResponse
 from app.api.deps import CurrentApiKey, ProxyServiceDep
 from app.common.errors import AppError
 from app.common.proxy_headers import sanitize_upstream_response_headers
+from app.common.token_count_executor import token_count_executor
 from app.common.token_counter import AnthropicTokenCounter
 
 router = APIRouter(tags=["Proxy - Anthropic"])
@@ -124,7 +125,9 @@ async def create_message(
             )
             
     except AppError as e:
-        return JSONResponse(content=e.to_dict(), status_code=e.status_code)
+        return JSONResponse(
+            content=e.to_dict(), status_code=e.status_code, headers=e.headers
+        )
     except Exception as e:
         # Unexpected errors return 500
         import logging
@@ -156,10 +159,14 @@ async def count_message_tokens(
     try:
         body = await request.json()
         model = body.get("model", "") if isinstance(body, dict) else ""
-        input_tokens = token_counter.count_request(body, model)
+        input_tokens = await token_count_executor.count_request(
+            token_counter, body, model
+        )
         return JSONResponse(content={"input_tokens": input_tokens})
     except AppError as e:
-        return JSONResponse(content=e.to_dict(), status_code=e.status_code)
+        return JSONResponse(
+            content=e.to_dict(), status_code=e.status_code, headers=e.headers
+        )
     except Exception as e:
         import logging
 
@@ -54,7 +54,9 @@ async def list_models(
             ],
         }
     except AppError as e:
-        return JSONResponse(content=e.to_dict(), status_code=e.status_code)
+        return JSONResponse(
+            content=e.to_dict(), status_code=e.status_code, headers=e.headers
+        )
 
 
 async def _handle_proxy_request_with_body(
@@ -157,7 +159,9 @@ async def _handle_proxy_request_with_body(
         )
 
     except AppError as e:
-        return JSONResponse(content=e.to_dict(), status_code=e.status_code)
+        return JSONResponse(
+            content=e.to_dict(), status_code=e.status_code, headers=e.headers
+        )
     except Exception as e:
         # Unexpected errors return 500
         import logging
@@ -477,7 +481,9 @@ async def _handle_proxy_request_openai_responses(
         )
 
     except AppError as e:
-        return JSONResponse(content=e.to_dict(), status_code=e.status_code)
+        return JSONResponse(
+            content=e.to_dict(), status_code=e.status_code, headers=e.headers
+        )
     except Exception as e:
         import logging
 
@@ -10,6 +10,7 @@ from app.common.errors import (
     ValidationError,
     UpstreamError,
     ServiceError,
+    RateLimitError,
 )
 from app.common.sanitizer import sanitize_authorization, sanitize_headers
 from app.common.token_counter import TokenCounter, OpenAITokenCounter, AnthropicTokenCounter
@@ -25,6 +26,7 @@ __all__ = [
     "ValidationError",
     "UpstreamError",
     "ServiceError",
+    "RateLimitError",
     # 工具函数
     "sanitize_authorization",
     "sanitize_headers",
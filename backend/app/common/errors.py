@@ -42,6 +42,8 @@ class AppError(Exception):
         self.code = code
         self.details = details or {}
         self.status_code = status_code
+        # Extra HTTP response headers (e.g. Retry-After)
+        self.headers: dict[str, str] = {}
     
     def to_dict(self, include_details: bool = True) -> dict[str, Any]:
         """
@@ -224,4 +226,30 @@ class ServiceError(AppError):
             code=code,
             details=details,
             status_code=503,
-        )
\ No newline at end of file
+        )
+
+
+class RateLimitError(AppError):
+    """
+    Rate Limit Error
+
+    Raised when a request exceeds a rate or token budget. ``retry_after``
+    (seconds) is sent as the Retry-After response header.
+    """
+
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded. Please try again later.",
+        code: str = "rate_limit_exceeded",
+        details: Optional[dict[str, Any]] = None,
+        retry_after: Optional[int] = None,
+    ):
+        super().__init__(
+            message=message,
+            error_type="rate_limit_error",
+            code=code,
+            details=details,
+            status_code=429,
+        )
+        if retry_after is not None:
+            self.headers["Retry-After"] = str(retry_after)
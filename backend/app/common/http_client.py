@@ -4,12 +4,19 @@ HTTP Client Wrapper Module
 Provides a unified asynchronous HTTP client for communicating with upstream providers.
 """
 
-from typing import Any, AsyncGenerator, Optional
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
+from urllib.parse import urlsplit
 
 import httpx
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class HttpClient:
     """
@@ -164,4 +171,162 @@ async def create_client(
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
     
-    return HttpClient(base_url=base_url, timeout=timeout, headers=headers)
\ No newline at end of file
+    return HttpClient(base_url=base_url, timeout=timeout, headers=headers)
+
+
+# (origin, proxy_url, timeout seconds)
+UpstreamClientKey = tuple[str, Optional[str], int]
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar that never stores anything.
+
+    Pooled clients are shared by every API key calling the same upstream, so
+    a Set-Cookie from one response must not be replayed on other requests.
+    """
+
+    def extract_cookies(self, response: Any, request: Any) -> None:
+        return None
+
+    def set_cookie(self, cookie: Any) -> None:
+        return None
+
+
+class UpstreamClientPool:
+    """
+    Long-lived upstream HTTP clients shared across requests
+
+    One httpx.AsyncClient is kept per (base URL origin, proxy URL, timeout), so
+    consecutive requests to the same provider reuse keep-alive connections
+    instead of paying a TCP+TLS handshake each time. HTTP/2 is opt-in: it is
+    negotiated via ALPN when enabled and the optional ``h2`` package (the
+    ``http2`` extra) is installed; upstreams without HTTP/2 keep using
+    HTTP/1.1.
+
+    When disabled, every request gets a throwaway client (the old behavior).
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        pool_timeout_seconds: float = 5.0,
+        http2: bool = False,
+    ) -> None:
+        self.enabled = enabled
+        # None means no limit: SSE streams hold a connection for their whole
+        # duration, so a cap would queue new streams behind running ones.
+        self.max_connections = max_connections
+        self.pool_timeout_seconds = pool_timeout_seconds
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry_seconds = keepalive_expiry_seconds
+        self.http2 = http2 and self._http2_available()
+        # key -> (client as constructed, client as entered)
+        self._clients: dict[UpstreamClientKey, tuple[Any, httpx.AsyncClient]] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "UpstreamClientPool":
+        return cls(
+            enabled=settings.UPSTREAM_CLIENT_POOL_ENABLED,
+            max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry_seconds=settings.UPSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+            pool_timeout_seconds=settings.UPSTREAM_POOL_TIMEOUT_SECONDS,
+            http2=settings.UPSTREAM_HTTP2_ENABLED,
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        if importlib.util.find_spec("h2") is not None:
+            return True
+        logger.warning(
+            "UPSTREAM_HTTP2_ENABLED is set but the 'h2' package is missing; "
+            "using HTTP/1.1 (install it with: pip install 'httpx[http2]')"
+        )
+        return False
+
+    @staticmethod
+    def _origin(base_url: str) -> str:
+        parts = urlsplit(base_url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def _build_client(self, proxy_url: Optional[str], timeout: int) -> Any:
+        client_timeout: Any = timeout
+        if self.max_connections is not None:
+            # Waiting for a free pooled connection fails fast (PoolTimeout)
+            # so the request can fail over instead of queueing for the
+            # whole response timeout.
+            client_timeout = httpx.Timeout(
+                timeout, pool=min(timeout, self.pool_timeout_seconds)
+            )
+        return httpx.AsyncClient(
+            timeout=client_timeout,
+            proxy=proxy_url,
+            cookies=_NoCookieJar(),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry_seconds,
+            ),
+            http2=self.http2,
+        )
+
+    @asynccontextmanager
+    async def client(
+        self,
+        base_url: str,
+        proxy_url: Optional[str],
+        timeout: int,
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Get the client for an upstream
+
+        Args:
+            base_url: Provider base URL (only the origin is used as key)
+            proxy_url: Proxy URL, or None for a direct connection
+            timeout: Timeout (seconds) applied to connect/read/write; the
+                pool wait is capped at pool_timeout_seconds
+
+        Yields:
+            httpx.AsyncClient: Shared client; do not close it
+        """
+        if not self.enabled:
+            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+                yield client
+            return
+
+        key = (self._origin(base_url), proxy_url, timeout)
+        entry = self._clients.get(key)
+        if entry is None:
+            raw = self._build_client(proxy_url, timeout)
+            entered = await raw.__aenter__()
+            entry = self._clients.setdefault(key, (raw, entered))
+            if entry[0] is not raw:
+                # Another request created the client for this key meanwhile.
+                await raw.__aexit__(None, None, None)
+            else:
+                logger.debug(
+                    "Upstream client created: origin=%s proxy=%s timeout=%s http2=%s",
+                    key[0],
+                    bool(proxy_url),
+                    timeout,
+                    self.http2,
+                )
+        yield entry[1]
+
+    async def aclose(self) -> None:
+        """Close every pooled client (called on application shutdown)"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for raw, _ in clients:
+            try:
+                await raw.__aexit__(None, None, None)
+            except Exception:
+                logger.exception("Failed to close upstream client")
+
+
+# Global singleton used by the provider clients; closed in the app lifespan.
+upstream_client_pool = UpstreamClientPool.from_settings(get_settings())
@@ -0,0 +1,170 @@
+"""
+JSON Codec Module
+
+One place for JSON encoding/decoding on the proxy hot path (SSE payloads,
+upstream response and log bodies). Uses ``orjson`` or ``msgspec`` when
+installed (the ``orjson`` / ``msgspec`` extras) and falls back to the
+standard library.
+
+All backends keep the stdlib semantics callers rely on:
+
+- ``dumps`` output is UTF-8 with non-ASCII characters unescaped
+  (``ensure_ascii=False``); non-string dict keys are stringified
+- documents a fast backend rejects but the stdlib accepts (NaN/Infinity,
+  lone surrogates) are decoded by the stdlib; real decode errors raise
+  ``json.JSONDecodeError`` (re-exported as ``JSONDecodeError``)
+- values a fast backend cannot encode (e.g. integers beyond 64 bits) are
+  encoded by the stdlib instead of failing
+
+orjson decodes integers beyond 64 bits as floats, so client request bodies
+are parsed with the stdlib rather than through this module.
+
+The fast backends emit compact separators (``{"a":1}``) where the stdlib
+emits ``{"a": 1}``; both are the same JSON.
+
+Call through the module (``json_codec.loads(...)``) so ``set_backend`` takes
+effect everywhere.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def _build_orjson() -> tuple[Callable[[Any], Any], Callable[[Any], bytes]]:
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # The stdlib accepts a few documents orjson rejects, and raises
+            # its own JSONDecodeError for the rest
+            return _stdlib_loads(data)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # orjson.JSONEncodeError: big ints, unsupported types, lone
+            # surrogates; let the stdlib produce its usual result or error
+            return _stdlib_dumps_bytes(obj)
+
+    return loads, dumps_bytes
+
+
+def _build_msgspec() -> tuple[Callable[[Any], Any], Callable[[Any], bytes]]:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: Any) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return _stdlib_loads(data)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        try:
+            return encoder.encode(obj)
+        except (TypeError, ValueError, OverflowError, msgspec.EncodeError):
+            return _stdlib_dumps_bytes(obj)
+
+    return loads, dumps_bytes
+
+
+_loads: Callable[[Any], Any] = _stdlib_loads
+_dumps_bytes: Callable[[Any], bytes] = _stdlib_dumps_bytes
+_backend = "stdlib"
+
+
+def set_backend(name: str = "auto") -> str:
+    """
+    Select the codec backend and return the name of the one in use.
+
+    Args:
+        name: "auto" (first installed of orjson, msgspec), "orjson",
+            "msgspec" or "stdlib". A named backend that is not installed
+            falls back to the stdlib with a warning.
+    """
+    global _loads, _dumps_bytes, _backend
+
+    if name != "auto" and name not in BACKENDS:
+        raise ValueError(f"Unknown JSON codec backend: {name}")
+
+    builders = {"orjson": _build_orjson, "msgspec": _build_msgspec}
+    candidates = ("orjson", "msgspec") if name == "auto" else (name,)
+    for candidate in candidates:
+        if candidate == "stdlib":
+            break
+        try:
+            _loads, _dumps_bytes = builders[candidate]()
+        except ImportError:
+            if name != "auto":
+                logger.warning(
+                    "JSON codec '%s' is not installed, using the standard library",
+                    name,
+                )
+            continue
+        _backend = candidate
+        return _backend
+
+    _loads, _dumps_bytes = _stdlib_loads, _stdlib_dumps_bytes
+    _backend = "stdlib"
+    return _backend
+
+
+def backend_name() -> str:
+    """Name of the backend in use."""
+    return _backend
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode a JSON document from text or UTF-8 bytes."""
+    return _loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode a value as UTF-8 JSON bytes."""
+    return _dumps_bytes(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Encode a value as a JSON string."""
+    if _backend == "stdlib":
+        return _stdlib_dumps(obj)
+    return _dumps_bytes(obj).decode("utf-8")
+
+
+def _configure_from_settings() -> None:
+    from app.config import get_settings
+
+    set_backend(get_settings().JSON_CODEC)
+
+
+_configure_from_settings()
@@ -26,6 +26,7 @@ from app.common.errors import AppError
 from app.db.session import AsyncSessionLocal
 from app.repositories.sqlalchemy import SQLAlchemyApiKeyRepository
 from app.services import ApiKeyService
+from app.services.api_key_auth import api_key_auth_cache, api_key_last_used
 
 logger = logging.getLogger(__name__)
 
@@ -109,7 +110,9 @@ async def authenticate_token(token: str) -> MCPPrincipal:
         raise PermissionError("Missing API key")
 
     async with AsyncSessionLocal() as session:
-        service = ApiKeyService(SQLAlchemyApiKeyRepository(session))
+        service = ApiKeyService(
+            SQLAlchemyApiKeyRepository(session), api_key_auth_cache, api_key_last_used
+        )
         try:
             api_key = await service.authenticate(token)
         except AppError as exc:
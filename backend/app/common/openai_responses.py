@@ -8,13 +8,15 @@ OpenAI Responses API (`/v1/responses`) and Chat Completions so clients can use t
 
 from __future__ import annotations
 
-import json
 import time
 import uuid
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 
+from app.common import json_codec
 from app.common.reasoning import normalize_reasoning_for_openai
+from app.common.sse import SSE_DONE, SSE_INVALID, decode_json_events, encode_json_events
 from app.common.stream_usage import SSEDecoder
+from app.common.token_count_executor import token_count_executor
 from app.common.token_counter import get_token_counter
 
 
@@ -469,8 +471,29 @@ async def chat_completions_sse_to_responses_sse(
 
     """
 
-    decoder = SSEDecoder()
+    events = decode_json_events(upstream, SSEDecoder().feed)
+    async for chunk in chat_completions_events_to_responses_sse(
+        events=events,
+        model=model,
+        response_id=response_id,
+        input_tokens=input_tokens,
+    ):
+        yield chunk
 
+
+async def chat_completions_events_to_responses_sse(
+    *,
+    events: AsyncIterator[Any],
+    model: str,
+    response_id: Optional[str] = None,
+    input_tokens: Optional[int] = None,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Convert decoded Chat Completions chunks to a Responses SSE stream.
+
+    ``events`` yields JSON values as produced by ``decode_json_events``, so
+    converters that already hold Chat chunks can skip an SSE round trip.
+    """
     resp_id = response_id or _new_id("resp")
 
     msg_id = _new_id("msg")
@@ -494,69 +517,53 @@ async def chat_completions_sse_to_responses_sse(
         },
     }
 
-    yield f"event: response.created\ndata: {json.dumps(created, ensure_ascii=False)}\n\n".encode(
-        "utf-8"
-    )
+    yield b"event: response.created\ndata: " + json_codec.dumps_bytes(created) + b"\n\n"
 
     text_parts: list[str] = []
 
-    saw_done = False
-
     final_usage = None
 
-    async for chunk in upstream:
-        for payload in decoder.feed(chunk):
-            if not payload:
-                continue
-
-            if payload.strip() == "[DONE]":
-                saw_done = True
-
-                break
+    async for data in events:
+        if data is SSE_DONE:
+            break
 
-            try:
-                data = json.loads(payload)
+        if data is SSE_INVALID or not isinstance(data, dict):
+            continue
 
-            except Exception:
-                continue
+        # Try to extract usage from upstream if available (e.g. stream_options: {include_usage: true})
 
-            # Try to extract usage from upstream if available (e.g. stream_options: {include_usage: true})
+        if "usage" in data and data["usage"]:
+            final_usage = data["usage"]
 
-            if "usage" in data and data["usage"]:
-                final_usage = data["usage"]
+        choices = data.get("choices")
 
-            choices = data.get("choices")
+        if not isinstance(choices, list):
+            continue
 
-            if not isinstance(choices, list):
+        for choice in choices:
+            if not isinstance(choice, dict):
                 continue
 
-            for choice in choices:
-                if not isinstance(choice, dict):
-                    continue
-
-                delta = (
-                    choice.get("delta") if isinstance(choice.get("delta"), dict) else {}
-                )
+            delta = choice.get("delta") if isinstance(choice.get("delta"), dict) else {}
 
-                content = delta.get("content")
+            content = delta.get("content")
 
-                if isinstance(content, str) and content:
-                    text_parts.append(content)
+            if isinstance(content, str) and content:
+                text_parts.append(content)
 
-                    evt = {
-                        "type": "response.output_text.delta",
-                        "delta": content,
-                        "output_index": 0,
-                        "content_index": 0,
-                        "item_id": msg_id,
-                    }
-
-                    yield f"event: response.output_text.delta\ndata: {json.dumps(evt, ensure_ascii=False)}\n\n".encode(
-                        "utf-8"
-                    )
+                evt = {
+                    "type": "response.output_text.delta",
+                    "delta": content,
+                    "output_index": 0,
+                    "content_index": 0,
+                    "item_id": msg_id,
+                }
 
-        if saw_done:
-            break
+                yield (
+                    b"event: response.output_text.delta\ndata: "
+                    + json_codec.dumps_bytes(evt)
+                    + b"\n\n"
+                )
 
     final_text = "".join(text_parts)
 
@@ -565,7 +572,9 @@ async def chat_completions_sse_to_responses_sse(
     if not final_usage:
         token_counter = get_token_counter("openai")
 
-        output_tokens = token_counter.count_tokens(final_text, model)
+        output_tokens = await token_count_executor.run(
+            len(final_text), token_counter.count_tokens, final_text, model
+        )
 
         total_input = input_tokens or 0
 
@@ -605,9 +614,7 @@ async def chat_completions_sse_to_responses_sse(
         },
     }
 
-    yield f"event: response.completed\ndata: {json.dumps(completed, ensure_ascii=False)}\n\n".encode(
-        "utf-8"
-    )
+    yield b"event: response.completed\ndata: " + json_codec.dumps_bytes(completed) + b"\n\n"
 
 
 async def responses_sse_to_chat_completions_sse(
@@ -619,6 +626,25 @@ async def responses_sse_to_chat_completions_sse(
     """
     Convert OpenAI Responses SSE stream to Chat Completions SSE stream.
     """
+    async for chunk in encode_json_events(
+        responses_sse_to_chat_completions_events(
+            upstream=upstream, model=model, response_id=response_id
+        )
+    ):
+        yield chunk
+
+
+async def responses_sse_to_chat_completions_events(
+    *,
+    upstream: AsyncGenerator[bytes, None],
+    model: str,
+    response_id: Optional[str] = None,
+) -> AsyncGenerator[Any, None]:
+    """
+    Convert OpenAI Responses SSE stream to Chat Completions chunks.
+
+    Yields JSON values (and ``SSE_DONE``) rather than encoded SSE bytes.
+    """
     decoder = SSEDecoder()
     resp_id = response_id or _new_id("chatcmpl")
     sent_role = False
@@ -635,12 +661,12 @@ async def responses_sse_to_chat_completions_sse(
                 continue
             if payload.strip() == "[DONE]":
                 if not done:
-                    yield b"data: [DONE]\n\n"
+                    yield SSE_DONE
                     done = True
                 continue
 
             try:
-                data = json.loads(payload)
+                data = json_codec.loads(payload)
             except Exception:
                 continue
 
@@ -690,9 +716,7 @@ async def responses_sse_to_chat_completions_sse(
                             {"index": 0, "delta": delta, "finish_reason": None}
                         ],
                     }
-                    yield f"data: {json.dumps(payload_obj, ensure_ascii=False)}\n\n".encode(
-                        "utf-8"
-                    )
+                    yield payload_obj
                 continue
 
             if event_type == "response.function_call_arguments.delta":
@@ -718,9 +742,7 @@ async def responses_sse_to_chat_completions_sse(
                             {"index": 0, "delta": delta, "finish_reason": None}
                         ],
                     }
-                    yield f"data: {json.dumps(payload_obj, ensure_ascii=False)}\n\n".encode(
-                        "utf-8"
-                    )
+                    yield payload_obj
                 continue
 
             if event_type == "response.output_text.delta":
@@ -739,9 +761,7 @@ async def responses_sse_to_chat_completions_sse(
                             {"index": 0, "delta": delta, "finish_reason": None}
                         ],
                     }
-                    yield f"data: {json.dumps(payload_obj, ensure_ascii=False)}\n\n".encode(
-                        "utf-8"
-                    )
+                    yield payload_obj
                 continue
 
             if event_type == "response.output_item.done":
@@ -771,13 +791,11 @@ async def responses_sse_to_chat_completions_sse(
                         {"index": 0, "delta": {}, "finish_reason": finish_reason}
                     ],
                 }
-                yield f"data: {json.dumps(payload_obj, ensure_ascii=False)}\n\n".encode(
-                    "utf-8"
-                )
+                yield payload_obj
                 if not done:
-                    yield b"data: [DONE]\n\n"
+                    yield SSE_DONE
                     done = True
                 continue
 
     if not done:
-        yield b"data: [DONE]\n\n"
+        yield SSE_DONE
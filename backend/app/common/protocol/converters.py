@@ -12,12 +12,20 @@ import json
 import logging
 import time
 import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Union
 
+from app.common import json_codec
 from app.common.reasoning import (
     normalize_reasoning_for_anthropic,
     normalize_reasoning_for_openai,
 )
+from app.common.sse import (
+    SSE_DONE,
+    SSE_INVALID,
+    SSEFramer,
+    decode_json_events,
+    encode_json_events,
+)
 from app.common.usage_extractor import extract_usage_details
 
 from .base import (
@@ -322,7 +330,7 @@ def _safe_json_loads(text: Any) -> Any:
     if not isinstance(text, str):
         return text
     try:
-        return json.loads(text)
+        return json_codec.loads(text)
     except Exception:
         return text
 
@@ -1776,20 +1784,21 @@ class SDKStreamConverter(IStreamConverter):
             self._source == Protocol.ANTHROPIC
             and self._target == Protocol.OPENAI_RESPONSES
         ):
-            # Chain: Anthropic -> OpenAI Chat -> OpenAI Responses
-            openai_stream = self._convert_anthropic_to_openai(upstream, model)
+            # Anthropic -> OpenAI Chat chunks -> OpenAI Responses, without
+            # re-encoding the intermediate chunks as SSE
+            events = self._anthropic_to_openai_events(upstream, model)
             input_tokens = options.get("input_tokens") if options else None
-            async for chunk in self._convert_openai_to_openai_responses(
-                openai_stream, model, input_tokens=input_tokens
+            async for chunk in self._openai_events_to_openai_responses(
+                events, model, input_tokens=input_tokens
             ):
                 yield chunk
         elif (
             self._source == Protocol.OPENAI_RESPONSES
             and self._target == Protocol.ANTHROPIC
         ):
-            # Chain: OpenAI Responses -> OpenAI Chat -> Anthropic
-            openai_stream = self._convert_openai_responses_to_openai(upstream, model)
-            async for chunk in self._convert_openai_to_anthropic(openai_stream, model):
+            # OpenAI Responses -> OpenAI Chat chunks -> Anthropic
+            events = self._openai_responses_to_openai_events(upstream, model)
+            async for chunk in self._openai_events_to_anthropic(events, model):
                 yield chunk
         elif self._source == Protocol.GEMINI and self._target == Protocol.OPENAI:
             async for chunk in self._convert_gemini_to_openai(upstream, model):
@@ -1801,26 +1810,26 @@ class SDKStreamConverter(IStreamConverter):
             self._source == Protocol.GEMINI
             and self._target == Protocol.OPENAI_RESPONSES
         ):
-            openai_stream = self._convert_gemini_to_openai(upstream, model)
+            events = self._gemini_to_openai_events(upstream, model)
             input_tokens = options.get("input_tokens") if options else None
-            async for chunk in self._convert_openai_to_openai_responses(
-                openai_stream, model, input_tokens=input_tokens
+            async for chunk in self._openai_events_to_openai_responses(
+                events, model, input_tokens=input_tokens
             ):
                 yield chunk
         elif (
             self._source == Protocol.OPENAI_RESPONSES
             and self._target == Protocol.GEMINI
         ):
-            openai_stream = self._convert_openai_responses_to_openai(upstream, model)
-            async for chunk in self._convert_openai_to_gemini(openai_stream, model):
+            events = self._openai_responses_to_openai_events(upstream, model)
+            async for chunk in self._openai_events_to_gemini(events, model):
                 yield chunk
         elif self._source == Protocol.GEMINI and self._target == Protocol.ANTHROPIC:
-            openai_stream = self._convert_gemini_to_openai(upstream, model)
-            async for chunk in self._convert_openai_to_anthropic(openai_stream, model):
+            events = self._gemini_to_openai_events(upstream, model)
+            async for chunk in self._openai_events_to_anthropic(events, model):
                 yield chunk
         elif self._source == Protocol.ANTHROPIC and self._target == Protocol.GEMINI:
-            openai_stream = self._convert_anthropic_to_openai(upstream, model)
-            async for chunk in self._convert_openai_to_gemini(openai_stream, model):
+            events = self._anthropic_to_openai_events(upstream, model)
+            async for chunk in self._openai_events_to_gemini(events, model):
                 yield chunk
         else:
             # Generic fallback using SDK
@@ -1833,6 +1842,17 @@ class SDKStreamConverter(IStreamConverter):
         model: str,
     ) -> AsyncGenerator[bytes, None]:
         """Convert Anthropic stream to OpenAI format."""
+        async for chunk in encode_json_events(
+            self._anthropic_to_openai_events(upstream, model)
+        ):
+            yield chunk
+
+    async def _anthropic_to_openai_events(
+        self,
+        upstream: AsyncGenerator[bytes, None],
+        model: str,
+    ) -> AsyncGenerator[Any, None]:
+        """Convert Anthropic stream events to OpenAI Chat chunks (JSON values)."""
         decoder = _SSEDecoder()
         response_id: Optional[str] = None
         sent_role = False
@@ -1850,7 +1870,7 @@ class SDKStreamConverter(IStreamConverter):
                     continue
 
                 try:
-                    data = json.loads(payload)
+                    data = json_codec.loads(payload)
                 except Exception:
                     continue
 
@@ -1883,10 +1903,8 @@ class SDKStreamConverter(IStreamConverter):
                                 if not sent_role:
                                     delta["role"] = "assistant"
                                     sent_role = True
-                                yield _encode_sse_json(
-                                    self._create_openai_chunk(
-                                        response_id, model, delta, None
-                                    )
+                                yield self._create_openai_chunk(
+                                    response_id, model, delta, None
                                 )
                         elif block_type == "tool_use":
                             current_tool_id = content_block.get("id")
@@ -1895,7 +1913,7 @@ class SDKStreamConverter(IStreamConverter):
                                 current_tool_index = data["index"]
                             tool_args = content_block.get("input")
                             if isinstance(tool_args, dict):
-                                arguments = json.dumps(tool_args, ensure_ascii=False)
+                                arguments = json_codec.dumps(tool_args)
                             elif isinstance(tool_args, str):
                                 arguments = tool_args
                             else:
@@ -1916,10 +1934,8 @@ class SDKStreamConverter(IStreamConverter):
                             if not sent_role:
                                 delta["role"] = "assistant"
                                 sent_role = True
-                            yield _encode_sse_json(
-                                self._create_openai_chunk(
-                                    response_id, model, delta, None
-                                )
+                            yield self._create_openai_chunk(
+                                response_id, model, delta, None
                             )
                     continue
 
@@ -1934,10 +1950,8 @@ class SDKStreamConverter(IStreamConverter):
                                 if not sent_role:
                                     delta["role"] = "assistant"
                                     sent_role = True
-                                yield _encode_sse_json(
-                                    self._create_openai_chunk(
-                                        response_id, model, delta, None
-                                    )
+                                yield self._create_openai_chunk(
+                                    response_id, model, delta, None
                                 )
                         elif delta_type == "input_json_delta":
                             partial_json = delta_obj.get("partial_json") or ""
@@ -1958,10 +1972,8 @@ class SDKStreamConverter(IStreamConverter):
                                 if not sent_role:
                                     delta["role"] = "assistant"
                                     sent_role = True
-                                yield _encode_sse_json(
-                                    self._create_openai_chunk(
-                                        response_id, model, delta, None
-                                    )
+                                yield self._create_openai_chunk(
+                                    response_id, model, delta, None
                                 )
                     continue
 
@@ -1990,9 +2002,7 @@ class SDKStreamConverter(IStreamConverter):
                                 "cached_tokens": cache_read,
                             }
 
-                    yield _encode_sse_json(
-                        self._create_openai_chunk(response_id, model, {}, finish_reason)
-                    )
+                    yield self._create_openai_chunk(response_id, model, {}, finish_reason)
 
                     # Emit usage chunk before [DONE] (OpenAI format with empty choices)
                     if final_usage:
@@ -2004,20 +2014,20 @@ class SDKStreamConverter(IStreamConverter):
                             "choices": [],
                             "usage": final_usage,
                         }
-                        yield _encode_sse_json(usage_chunk)
+                        yield usage_chunk
 
-                    yield _encode_sse_data("[DONE]")
+                    yield SSE_DONE
                     done = True
                     continue
 
                 if event_type == "message_stop":
                     if not done:
-                        yield _encode_sse_data("[DONE]")
+                        yield SSE_DONE
                         done = True
                     continue
 
         if not done:
-            yield _encode_sse_data("[DONE]")
+            yield SSE_DONE
 
     async def _convert_openai_to_anthropic(
         self,
@@ -2025,7 +2035,16 @@ class SDKStreamConverter(IStreamConverter):
         model: str,
     ) -> AsyncGenerator[bytes, None]:
         """Convert OpenAI stream to Anthropic format."""
-        decoder = _SSEDecoder()
+        events = decode_json_events(upstream, _SSEDecoder().feed)
+        async for chunk in self._openai_events_to_anthropic(events, model):
+            yield chunk
+
+    async def _openai_events_to_anthropic(
+        self,
+        events: AsyncIterator[Any],
+        model: str,
+    ) -> AsyncGenerator[bytes, None]:
+        """Convert OpenAI Chat chunks (JSON values) to Anthropic SSE events."""
         sent_message_start = False
         sent_message_stop = False
 
@@ -2041,169 +2060,164 @@ class SDKStreamConverter(IStreamConverter):
         last_usage = None
         pending_stop_reason: Optional[str] = None
 
-        async for chunk in upstream:
-            for payload in decoder.feed(chunk):
-                if not payload:
-                    continue
-                if payload.strip() == "[DONE]":
-                    continue
+        async for data in events:
+            if data is SSE_DONE:
+                continue
 
-                if not sent_message_start:
-                    sent_message_start = True
-                    yield _encode_sse_json(
-                        {
-                            "type": "message_start",
-                            "message": {
-                                "id": f"msg_{uuid.uuid4().hex}",
-                                "type": "message",
-                                "role": "assistant",
-                                "content": [],
-                                "model": model,
-                                "stop_reason": None,
-                                "stop_sequence": None,
-                                "usage": {"input_tokens": 0, "output_tokens": 0},
-                            },
+            if not sent_message_start:
+                sent_message_start = True
+                yield _encode_sse_json(
+                    {
+                        "type": "message_start",
+                        "message": {
+                            "id": f"msg_{uuid.uuid4().hex}",
+                            "type": "message",
+                            "role": "assistant",
+                            "content": [],
+                            "model": model,
+                            "stop_reason": None,
+                            "stop_sequence": None,
+                            "usage": {"input_tokens": 0, "output_tokens": 0},
                         },
-                        event="message_start",
-                    )
-
-                try:
-                    data = json.loads(payload)
-                except Exception:
-                    continue
+                    },
+                    event="message_start",
+                )
 
-                # Capture usage from every chunk BEFORE the empty-choices guard:
-                # the final usage chunk has `choices: []`, so reading it after the
-                # guard would drop it entirely.
-                chunk_usage = extract_usage_details(data)
-                if chunk_usage is not None:
-                    last_usage = chunk_usage
+            if data is SSE_INVALID:
+                continue
 
-                choices = data.get("choices", [])
-                if not choices:
-                    continue
+            # Capture usage from every chunk BEFORE the empty-choices guard:
+            # the final usage chunk has `choices: []`, so reading it after the
+            # guard would drop it entirely.
+            chunk_usage = extract_usage_details(data)
+            if chunk_usage is not None:
+                last_usage = chunk_usage
 
-                choice = choices[0]
-                delta = choice.get("delta", {})
-                finish_reason = choice.get("finish_reason")
+            choices = data.get("choices", [])
+            if not choices:
+                continue
 
-                # Handle Text Content
-                content = delta.get("content")
-                if content is not None:
-                    # If we were in a tool block or this is the first block, start text block
-                    if current_block_type != "text":
-                        if current_block_type is not None:
-                            # Close previous block
-                            yield _encode_sse_json(
-                                {
-                                    "type": "content_block_stop",
-                                    "index": current_block_index,
-                                },
-                                event="content_block_stop",
-                            )
-                            current_block_index += 1
+            choice = choices[0]
+            delta = choice.get("delta", {})
+            finish_reason = choice.get("finish_reason")
 
-                        # Start new text block
+            # Handle Text Content
+            content = delta.get("content")
+            if content is not None:
+                # If we were in a tool block or this is the first block, start text block
+                if current_block_type != "text":
+                    if current_block_type is not None:
+                        # Close previous block
                         yield _encode_sse_json(
                             {
-                                "type": "content_block_start",
+                                "type": "content_block_stop",
                                 "index": current_block_index,
-                                "content_block": {"type": "text", "text": ""},
                             },
-                            event="content_block_start",
+                            event="content_block_stop",
                         )
-                        current_block_type = "text"
-                        current_tool_call_id = None
+                        current_block_index += 1
 
+                    # Start new text block
                     yield _encode_sse_json(
                         {
-                            "type": "content_block_delta",
+                            "type": "content_block_start",
                             "index": current_block_index,
-                            "delta": {"type": "text_delta", "text": content},
+                            "content_block": {"type": "text", "text": ""},
                         },
-                        event="content_block_delta",
+                        event="content_block_start",
                     )
+                    current_block_type = "text"
+                    current_tool_call_id = None
 
-                # Handle Tool Calls
-                tool_calls = delta.get("tool_calls")
-                if tool_calls:
-                    for tool_call in tool_calls:
-                        t_id = tool_call.get("id")
-                        t_name = tool_call.get("function", {}).get("name", "")
-
-                        # Detect if this is a new tool call:
-                        # 1. If we're not currently in a tool_use block, it's new
-                        # 2. If the tool_call has an id and it differs from current, it's new
-                        # Note: Some providers (like Gemini) don't provide index field
-                        is_new_tool_call = False
-                        if current_block_type != "tool_use":
-                            is_new_tool_call = True
-                        elif t_id is not None and t_id != current_tool_call_id:
-                            is_new_tool_call = True
-
-                        if is_new_tool_call:
-                            if current_block_type is not None:
-                                # Close previous block
-                                yield _encode_sse_json(
-                                    {
-                                        "type": "content_block_stop",
-                                        "index": current_block_index,
-                                    },
-                                    event="content_block_stop",
-                                )
-                                current_block_index += 1
+                yield _encode_sse_json(
+                    {
+                        "type": "content_block_delta",
+                        "index": current_block_index,
+                        "delta": {"type": "text_delta", "text": content},
+                    },
+                    event="content_block_delta",
+                )
 
-                            # Start new tool block
+            # Handle Tool Calls
+            tool_calls = delta.get("tool_calls")
+            if tool_calls:
+                for tool_call in tool_calls:
+                    t_id = tool_call.get("id")
+                    t_name = tool_call.get("function", {}).get("name", "")
+
+                    # Detect if this is a new tool call:
+                    # 1. If we're not currently in a tool_use block, it's new
+                    # 2. If the tool_call has an id and it differs from current, it's new
+                    # Note: Some providers (like Gemini) don't provide index field
+                    is_new_tool_call = False
+                    if current_block_type != "tool_use":
+                        is_new_tool_call = True
+                    elif t_id is not None and t_id != current_tool_call_id:
+                        is_new_tool_call = True
+
+                    if is_new_tool_call:
+                        if current_block_type is not None:
+                            # Close previous block
                             yield _encode_sse_json(
                                 {
-                                    "type": "content_block_start",
+                                    "type": "content_block_stop",
                                     "index": current_block_index,
-                                    "content_block": {
-                                        "type": "tool_use",
-                                        "id": t_id or "",
-                                        "name": t_name,
-                                        "input": {},  # Empty input for now
-                                    },
                                 },
-                                event="content_block_start",
+                                event="content_block_stop",
                             )
-                            current_block_type = "tool_use"
-                            current_tool_call_id = t_id
+                            current_block_index += 1
 
-                        # Handle arguments
-                        args = tool_call.get("function", {}).get("arguments")
-                        if args:
-                            yield _encode_sse_json(
-                                {
-                                    "type": "content_block_delta",
-                                    "index": current_block_index,
-                                    "delta": {
-                                        "type": "input_json_delta",
-                                        "partial_json": args,
-                                    },
+                        # Start new tool block
+                        yield _encode_sse_json(
+                            {
+                                "type": "content_block_start",
+                                "index": current_block_index,
+                                "content_block": {
+                                    "type": "tool_use",
+                                    "id": t_id or "",
+                                    "name": t_name,
+                                    "input": {},  # Empty input for now
                                 },
-                                event="content_block_delta",
-                            )
+                            },
+                            event="content_block_start",
+                        )
+                        current_block_type = "tool_use"
+                        current_tool_call_id = t_id
 
-                # Handle Finish Reason
-                if finish_reason:
-                    # Close any open block now, but defer the terminal
-                    # message_delta/message_stop to the trailing flush so the
-                    # final usage chunk (which arrives after finish_reason with
-                    # empty choices) is included in the usage we emit.
-                    if current_block_type is not None:
+                    # Handle arguments
+                    args = tool_call.get("function", {}).get("arguments")
+                    if args:
                         yield _encode_sse_json(
                             {
-                                "type": "content_block_stop",
+                                "type": "content_block_delta",
                                 "index": current_block_index,
+                                "delta": {
+                                    "type": "input_json_delta",
+                                    "partial_json": args,
+                                },
                             },
-                            event="content_block_stop",
+                            event="content_block_delta",
                         )
-                        current_block_type = None
 
-                    pending_stop_reason = _map_openai_to_anthropic_finish_reason(
-                        finish_reason
+            # Handle Finish Reason
+            if finish_reason:
+                # Close any open block now, but defer the terminal
+                # message_delta/message_stop to the trailing flush so the
+                # final usage chunk (which arrives after finish_reason with
+                # empty choices) is included in the usage we emit.
+                if current_block_type is not None:
+                    yield _encode_sse_json(
+                        {
+                            "type": "content_block_stop",
+                            "index": current_block_index,
+                        },
+                        event="content_block_stop",
                     )
+                    current_block_type = None
+
+                pending_stop_reason = _map_openai_to_anthropic_finish_reason(
+                    finish_reason
+                )
 
         # Trailing flush: emit the terminal message_delta (carrying real usage)
         # and message_stop once the upstream stream is fully drained.
@@ -2268,13 +2282,26 @@ class SDKStreamConverter(IStreamConverter):
         model: str,
     ) -> AsyncGenerator[bytes, None]:
         """Convert OpenAI Responses stream to OpenAI Chat format."""
+        async for chunk in encode_json_events(
+            self._openai_responses_to_openai_events(upstream, model)
+        ):
+            yield chunk
+
+    async def _openai_responses_to_openai_events(
+        self,
+        upstream: AsyncGenerator[bytes, None],
+        model: str,
+    ) -> AsyncGenerator[Any, None]:
+        """Convert OpenAI Responses stream to OpenAI Chat chunks (JSON values)."""
         # Import from openai_responses module
-        from app.common.openai_responses import responses_sse_to_chat_completions_sse
+        from app.common.openai_responses import (
+            responses_sse_to_chat_completions_events,
+        )
 
-        async for chunk in responses_sse_to_chat_completions_sse(
+        async for event in responses_sse_to_chat_completions_events(
             upstream=upstream, model=model
         ):
-            yield chunk
+            yield event
 
     async def _convert_openai_to_openai_responses(
         self,
@@ -2290,11 +2317,37 @@ class SDKStreamConverter(IStreamConverter):
         ):
             yield chunk
 
+    async def _openai_events_to_openai_responses(
+        self,
+        events: AsyncIterator[Any],
+        model: str,
+        input_tokens: Optional[int] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Convert OpenAI Chat chunks (JSON values) to OpenAI Responses SSE events."""
+        from app.common.openai_responses import chat_completions_events_to_responses_sse
+
+        async for chunk in chat_completions_events_to_responses_sse(
+            events=events, model=model, input_tokens=input_tokens
+        ):
+            yield chunk
+
     async def _convert_gemini_to_openai(
         self,
         upstream: AsyncGenerator[bytes, None],
         model: str,
     ) -> AsyncGenerator[bytes, None]:
+        """Convert Gemini stream to OpenAI format."""
+        async for chunk in encode_json_events(
+            self._gemini_to_openai_events(upstream, model)
+        ):
+            yield chunk
+
+    async def _gemini_to_openai_events(
+        self,
+        upstream: AsyncGenerator[bytes, None],
+        model: str,
+    ) -> AsyncGenerator[Any, None]:
+        """Convert Gemini stream events to OpenAI Chat chunks (JSON values)."""
         decoder = _SSEDecoder()
         sent_role = False
         response_id = f"chatcmpl-{uuid.uuid4().hex}"
@@ -2306,7 +2359,7 @@ class SDKStreamConverter(IStreamConverter):
                 if not payload or payload.strip() == "[DONE]":
                     continue
                 try:
-                    data = json.loads(payload)
+                    data = json_codec.loads(payload)
                 except Exception:
                     continue
 
@@ -2324,14 +2377,12 @@ class SDKStreamConverter(IStreamConverter):
                                 if not sent_role:
                                     delta["role"] = "assistant"
                                     sent_role = True
-                                yield _encode_sse_json(
-                                    self._create_openai_chunk(response_id, model, delta, None)
-                                )
+                                yield self._create_openai_chunk(response_id, model, delta, None)
                             fc = part.get("functionCall")
                             if isinstance(fc, dict) and isinstance(fc.get("name"), str):
                                 args = fc.get("args")
                                 if not isinstance(args, str):
-                                    args = json.dumps(args or {}, ensure_ascii=False)
+                                    args = json_codec.dumps(args or {})
                                 
                                 tool_call: Dict[str, Any] = {
                                     "index": tool_call_index,
@@ -2353,18 +2404,14 @@ class SDKStreamConverter(IStreamConverter):
                                 if not sent_role:
                                     delta["role"] = "assistant"
                                     sent_role = True
-                                yield _encode_sse_json(
-                                    self._create_openai_chunk(response_id, model, delta, None)
-                                )
+                                yield self._create_openai_chunk(response_id, model, delta, None)
 
                     finish_reason = _map_gemini_finish_reason_to_openai(
                         cand.get("finishReason")
                     )
                     if finish_reason:
-                        yield _encode_sse_json(
-                            self._create_openai_chunk(
-                                response_id, model, {}, finish_reason
-                            )
+                        yield self._create_openai_chunk(
+                            response_id, model, {}, finish_reason
                         )
 
                 usage = data.get("usageMetadata")
@@ -2377,92 +2424,94 @@ class SDKStreamConverter(IStreamConverter):
                         "choices": [],
                         "usage": _gemini_usage_to_openai(usage),
                     }
-                    yield _encode_sse_json(usage_chunk)
+                    yield usage_chunk
 
         if not done:
             done = True
-            yield _encode_sse_data("[DONE]")
+            yield SSE_DONE
 
     async def _convert_openai_to_gemini(
         self,
         upstream: AsyncGenerator[bytes, None],
         model: str,
     ) -> AsyncGenerator[bytes, None]:
-        decoder = _SSEDecoder()
+        """Convert OpenAI stream to Gemini format."""
+        events = decode_json_events(upstream, _SSEDecoder().feed)
+        async for chunk in self._openai_events_to_gemini(events, model):
+            yield chunk
 
-        async for chunk in upstream:
-            for payload in decoder.feed(chunk):
-                if not payload:
-                    continue
-                if payload.strip() == "[DONE]":
-                    continue
-                try:
-                    data = json.loads(payload)
-                except Exception:
-                    continue
+    async def _openai_events_to_gemini(
+        self,
+        events: AsyncIterator[Any],
+        model: str,
+    ) -> AsyncGenerator[bytes, None]:
+        """Convert OpenAI Chat chunks (JSON values) to Gemini SSE events."""
+        async for data in events:
+            if data is SSE_DONE or data is SSE_INVALID:
+                continue
 
-                choices = data.get("choices")
-                if not isinstance(choices, list) or not choices:
-                    continue
-                choice = choices[0] if isinstance(choices[0], dict) else {}
-                delta = choice.get("delta", {})
-                finish_reason = choice.get("finish_reason")
-
-                parts: list[Dict[str, Any]] = []
-                if isinstance(delta, dict):
-                    text = delta.get("content")
-                    if isinstance(text, str) and text:
-                        parts.append({"text": text})
-                    tool_calls = delta.get("tool_calls")
-                    if isinstance(tool_calls, list):
-                        for tool_call in tool_calls:
-                            if not isinstance(tool_call, dict):
-                                continue
-                            fn = tool_call.get("function")
-                            if not isinstance(fn, dict) or not isinstance(
-                                fn.get("name"), str
-                            ):
-                                continue
-                            args = _safe_json_loads(fn.get("arguments"))
-                            if not isinstance(args, dict):
-                                args = {"value": args}
-                            parts.append(
-                                {
-                                    "functionCall": {
-                                        "name": fn["name"],
-                                        "args": args,
-                                    }
+            choices = data.get("choices")
+            if not isinstance(choices, list) or not choices:
+                continue
+            choice = choices[0] if isinstance(choices[0], dict) else {}
+            delta = choice.get("delta", {})
+            finish_reason = choice.get("finish_reason")
+
+            parts: list[Dict[str, Any]] = []
+            if isinstance(delta, dict):
+                text = delta.get("content")
+                if isinstance(text, str) and text:
+                    parts.append({"text": text})
+                tool_calls = delta.get("tool_calls")
+                if isinstance(tool_calls, list):
+                    for tool_call in tool_calls:
+                        if not isinstance(tool_call, dict):
+                            continue
+                        fn = tool_call.get("function")
+                        if not isinstance(fn, dict) or not isinstance(
+                            fn.get("name"), str
+                        ):
+                            continue
+                        args = _safe_json_loads(fn.get("arguments"))
+                        if not isinstance(args, dict):
+                            args = {"value": args}
+                        parts.append(
+                            {
+                                "functionCall": {
+                                    "name": fn["name"],
+                                    "args": args,
                                 }
-                            )
-
-                gemini_chunk: Dict[str, Any] = {
-                    "candidates": [
-                        {
-                            "content": {
-                                "role": "model",
-                                "parts": parts or [{"text": ""}],
-                            },
-                            "index": 0,
-                        }
-                    ]
-                }
-                mapped_finish_reason = _map_openai_finish_reason_to_gemini(finish_reason)
-                if mapped_finish_reason:
-                    gemini_chunk["candidates"][0]["finishReason"] = mapped_finish_reason
+                            }
+                        )
 
-                usage = data.get("usage")
-                if isinstance(usage, dict):
-                    gemini_chunk["usageMetadata"] = {
-                        "promptTokenCount": usage.get("prompt_tokens", 0),
-                        "candidatesTokenCount": usage.get("completion_tokens", 0),
-                        "totalTokenCount": usage.get(
-                            "total_tokens",
-                            (usage.get("prompt_tokens", 0) or 0)
-                            + (usage.get("completion_tokens", 0) or 0),
-                        ),
+            gemini_chunk: Dict[str, Any] = {
+                "candidates": [
+                    {
+                        "content": {
+                            "role": "model",
+                            "parts": parts or [{"text": ""}],
+                        },
+                        "index": 0,
                     }
+                ]
+            }
+            mapped_finish_reason = _map_openai_finish_reason_to_gemini(finish_reason)
+            if mapped_finish_reason:
+                gemini_chunk["candidates"][0]["finishReason"] = mapped_finish_reason
+
+            usage = data.get("usage")
+            if isinstance(usage, dict):
+                gemini_chunk["usageMetadata"] = {
+                    "promptTokenCount": usage.get("prompt_tokens", 0),
+                    "candidatesTokenCount": usage.get("completion_tokens", 0),
+                    "totalTokenCount": usage.get(
+                        "total_tokens",
+                        (usage.get("prompt_tokens", 0) or 0)
+                        + (usage.get("completion_tokens", 0) or 0),
+                    ),
+                }
 
-                yield _encode_sse_json(gemini_chunk)
+            yield _encode_sse_json(gemini_chunk)
 
     async def _generic_stream_conversion(
         self,
@@ -2501,21 +2550,16 @@ class _SSEDecoder:
     """SSE decoder for streaming responses."""
 
     def __init__(self):
-        self._buffer = ""
+        self._framer = SSEFramer()
 
     def feed(self, chunk: bytes) -> List[str]:
         """Feed bytes and return complete SSE data payloads."""
-        try:
-            text = chunk.decode("utf-8")
-        except UnicodeDecodeError:
-            return []
-
-        self._buffer += text
         payloads = []
-
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            line = line.strip()
+        for raw_line in self._framer.feed_lines(chunk):
+            try:
+                line = raw_line.decode("utf-8").strip()
+            except UnicodeDecodeError:
+                continue
 
             if line.startswith("data:"):
                 data = line[5:].strip()
@@ -2532,11 +2576,10 @@ def _encode_sse_data(payload: str) -> bytes:
 
 def _encode_sse_json(obj: Dict[str, Any], event: Optional[str] = None) -> bytes:
     """Encode dict as SSE JSON data line."""
+    data = b"data: " + json_codec.dumps_bytes(obj) + b"\n\n"
     if event:
-        return f"event: {event}\n".encode("utf-8") + _encode_sse_data(
-            json.dumps(obj, ensure_ascii=False)
-        )
-    return _encode_sse_data(json.dumps(obj, ensure_ascii=False))
+        return f"event: {event}\n".encode("utf-8") + data
+    return data
 
 
 def _map_anthropic_to_openai_finish_reason(stop_reason: Optional[str]) -> str:
@@ -0,0 +1,223 @@
+"""
+Rate Limiter Module
+
+GCRA (generic cell rate algorithm) limiters shared by the request rate limit
+middleware and the token budgets of the proxy.
+
+A limit of ``limit`` units per ``window_seconds`` admits bursts of up to
+``limit`` units and refills at ``limit / window_seconds`` units per second.
+Each key stores a single "theoretical arrival time" (TAT), so a check is O(1)
+in time and memory, and a cost other than 1 (e.g. a token count) is a
+multiplication rather than ``cost`` entries.
+
+- ``InMemoryRateLimiter``: per-process; for single-node deployments
+- ``RedisRateLimiter``: one atomic Lua script per check, timed by the Redis
+  server clock, so every worker and node shares the same budget
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Absorbs float rounding when converting the remaining budget to units
+_EPSILON = 1e-6
+
+
+class RateLimiter(ABC):
+    """
+    Rate Limiter Interface
+
+    ``acquire`` returns (is_allowed, remaining, retry_after_seconds).
+    """
+
+    @abstractmethod
+    async def acquire(
+        self, key: str, limit: int, window_seconds: int, cost: int = 1
+    ) -> tuple[bool, int, int]:
+        """
+        Take ``cost`` units from the key's budget if they are available
+
+        Args:
+            key: Unique identifier (IP, API key, model, ...)
+            limit: Units allowed per window
+            window_seconds: Time window in seconds
+            cost: Units this call consumes
+
+        Returns:
+            Tuple of (is_allowed, remaining, retry_after_seconds)
+        """
+
+    @abstractmethod
+    async def adjust(
+        self, key: str, limit: int, window_seconds: int, delta: int
+    ) -> None:
+        """
+        Debit (``delta`` > 0) or refund (``delta`` < 0) units unconditionally
+
+        Used to true up a cost that was estimated at ``acquire`` time.
+        """
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    In-memory GCRA rate limiter (O(1) per check).
+
+    State is per process: with N workers the effective limit is N times the
+    configured one. Use RedisRateLimiter for multi-worker deployments.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        # Structure: {key: theoretical arrival time}
+        self._tat: dict[str, float] = {}
+
+    def is_allowed(
+        self, key: str, max_requests: int, window_seconds: int, cost: int = 1
+    ) -> tuple[bool, int, int]:
+        """
+        Check if request is allowed under rate limit.
+
+        Args:
+            key: Unique identifier (IP or API key)
+            max_requests: Maximum requests allowed in window
+            window_seconds: Time window in seconds
+            cost: Units this request consumes
+
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        now = self._clock()
+        interval = window_seconds / max_requests
+        tat = max(self._tat.get(key, now), now)
+        new_tat = tat + cost * interval
+        allow_at = new_tat - window_seconds
+        if allow_at > now + _EPSILON:
+            return False, 0, max(1, math.ceil(allow_at - now))
+
+        self._tat[key] = new_tat
+        remaining = int((window_seconds - (new_tat - now)) / interval + _EPSILON)
+        return True, max(0, remaining), 0
+
+    async def acquire(
+        self, key: str, limit: int, window_seconds: int, cost: int = 1
+    ) -> tuple[bool, int, int]:
+        return self.is_allowed(key, limit, window_seconds, cost)
+
+    async def adjust(
+        self, key: str, limit: int, window_seconds: int, delta: int
+    ) -> None:
+        now = self._clock()
+        tat = max(self._tat.get(key, now), now) + delta * (window_seconds / limit)
+        # A refund only cancels outstanding debt; it never banks extra budget
+        self._tat[key] = max(tat, now)
+
+    def cleanup_expired(self, max_age_seconds: int = 3600) -> None:
+        """Remove keys whose budget has been fully refilled for max_age_seconds."""
+        cutoff = self._clock() - max_age_seconds
+        self._tat = {k: tat for k, tat in self._tat.items() if tat > cutoff}
+
+
+# KEYS[1]: budget key
+# ARGV: emission interval (ms per unit), window (ms), cost, force (1 = adjust)
+# Returns {is_allowed, remaining, retry_after_ms}
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+  tat = now
+end
+local new_tat = tat + cost * interval
+local allow_at = new_tat - window
+if ARGV[4] ~= '1' and allow_at > now then
+  return {0, 0, math.ceil(allow_at - now)}
+end
+if new_tat < now then
+  new_tat = now
+end
+local ttl = math.ceil(new_tat - now)
+if ttl > 0 then
+  redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', ttl)
+else
+  redis.call('DEL', KEYS[1])
+end
+return {1, math.floor((window - (new_tat - now)) / interval + 0.000001), 0}
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Redis-backed GCRA rate limiter shared by all workers.
+
+    Keys expire once their budget is refilled. Redis errors fail open (the
+    request is allowed and a warning is logged) so a Redis outage does not
+    take the gateway down with it.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], Any]] = None,
+        key_prefix: str = "lgw:ratelimit:",
+    ) -> None:
+        if client_factory is None:
+            from app.db.redis import get_redis
+
+            client_factory = get_redis
+        self._client_factory = client_factory
+        self._key_prefix = key_prefix
+        self._client: Any = None
+        self._script: Any = None
+
+    def _get_script(self) -> Any:
+        # The client is created in the app lifespan, after middleware setup
+        client = self._client_factory()
+        if self._script is None or client is not self._client:
+            self._client = client
+            self._script = client.register_script(_GCRA_SCRIPT)
+        return self._script
+
+    async def _run(
+        self, key: str, limit: int, window_seconds: int, cost: int, force: bool
+    ) -> tuple[bool, int, int]:
+        window_ms = window_seconds * 1000
+        result = await self._get_script()(
+            keys=[f"{self._key_prefix}{key}"],
+            args=[window_ms / limit, window_ms, cost, 1 if force else 0],
+        )
+        allowed, remaining, retry_after_ms = (int(value) for value in result)
+        if not allowed:
+            return False, 0, max(1, math.ceil(retry_after_ms / 1000))
+        return True, max(0, remaining), 0
+
+    async def acquire(
+        self, key: str, limit: int, window_seconds: int, cost: int = 1
+    ) -> tuple[bool, int, int]:
+        try:
+            return await self._run(key, limit, window_seconds, cost, force=False)
+        except Exception as exc:
+            logger.warning("Rate limiter unavailable, allowing request: %s", exc)
+            return True, limit, 0
+
+    async def adjust(
+        self, key: str, limit: int, window_seconds: int, delta: int
+    ) -> None:
+        try:
+            await self._run(key, limit, window_seconds, delta, force=True)
+        except Exception as exc:
+            logger.warning("Rate limiter unavailable, skipping adjustment: %s", exc)
+
+
+def create_rate_limiter(settings) -> RateLimiter:
+    """Rate limiter for the configured RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter()
+    return InMemoryRateLimiter()
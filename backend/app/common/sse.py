@@ -0,0 +1,183 @@
+"""
+Incremental SSE Framing
+
+Splits a server-sent events byte stream into events (or lines) in linear time.
+Bytes are appended to one buffer and scanning resumes where the previous
+``feed`` stopped, so a large event that arrives in many chunks is never
+rescanned or re-copied. Lines may end with CRLF, LF or a lone CR, as allowed
+by the SSE spec.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.common import json_codec
+
+_LINE_END = re.compile(rb"[\r\n]")
+_LINE_SPLIT = re.compile(rb"\r\n|\r|\n")
+
+
+class SSEFramer:
+    """
+    Incremental SSE framer.
+
+    - ``feed`` returns complete events: the raw bytes of each event including
+      its terminating blank line, untouched so they can be passed through
+    - ``feed_lines`` returns complete lines without their terminators
+
+    An instance must use only one of the two methods.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        # Where the next line-terminator scan starts
+        self._pos = 0
+        # Start of the event being assembled (always 0 after compaction)
+        self._event_start = 0
+        # The buffer ended with CR: a LF starting the next chunk completes a
+        # CRLF that was already treated as a line end
+        self._skip_lf = False
+
+    def _next_line_end(self) -> Optional[tuple[int, int]]:
+        """Return (line_end, next_line_start) of the next complete line."""
+        match = _LINE_END.search(self._buf, self._pos)
+        if match is None:
+            return None
+        end = match.start()
+        if self._buf[end] == 0x0D:  # \r
+            if end + 1 == len(self._buf):
+                # May be the first half of a CRLF split across chunks
+                self._skip_lf = True
+            elif self._buf[end + 1] == 0x0A:
+                return end, end + 2
+        return end, end + 1
+
+    def _append(self, chunk: bytes) -> None:
+        if self._skip_lf:
+            self._skip_lf = False
+            if chunk[:1] == b"\n":
+                chunk = chunk[1:]
+        self._buf += chunk
+
+    def _compact(self, keep_from: int) -> None:
+        if keep_from:
+            # Deleting a bytearray prefix is O(1) amortized in CPython
+            del self._buf[:keep_from]
+            self._pos -= keep_from
+            self._event_start -= keep_from
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Append bytes and return the complete events they finish."""
+        if not chunk:
+            return []
+        self._append(chunk)
+        events: list[bytes] = []
+        while (line := self._next_line_end()) is not None:
+            end, next_start = line
+            blank = end == self._pos
+            self._pos = next_start
+            if not blank:
+                continue
+            if end > self._event_start:
+                events.append(bytes(self._buf[self._event_start : next_start]))
+            # Blank lines outside an event are dropped
+            self._event_start = next_start
+        self._compact(self._event_start)
+        return events
+
+    def feed_lines(self, chunk: bytes) -> list[bytes]:
+        """Append bytes and return the complete lines they finish."""
+        if not chunk:
+            return []
+        self._append(chunk)
+        lines: list[bytes] = []
+        while (line := self._next_line_end()) is not None:
+            end, next_start = line
+            lines.append(bytes(self._buf[self._pos : end]))
+            self._pos = next_start
+        self._event_start = self._pos
+        self._compact(self._pos)
+        return lines
+
+    def flush(self) -> bytes:
+        """Return and clear whatever is left (an unterminated event or line)."""
+        remaining = bytes(self._buf[self._event_start :])
+        self._buf = bytearray()
+        self._pos = 0
+        self._event_start = 0
+        self._skip_lf = False
+        return remaining
+
+
+def iter_event_lines(event: bytes) -> list[bytes]:
+    """Split an event into its lines, dropping empty ones."""
+    return [line for line in _LINE_SPLIT.split(event) if line]
+
+
+def event_data(event: bytes) -> Optional[str]:
+    """
+    Return the data payload of an event, or None if it has no data field.
+
+    Multiple data lines are joined with "\\n"; one leading space is removed.
+    """
+    data_lines: list[bytes] = []
+    for line in iter_event_lines(event):
+        if line.startswith(b"data:"):
+            value = line[5:]
+            if value.startswith(b" "):
+                value = value[1:]
+            data_lines.append(value)
+    if not data_lines:
+        return None
+    return b"\n".join(data_lines).decode("utf-8", errors="ignore")
+
+
+class _Marker:
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return self._name
+
+
+# Yielded by decode_json_events in place of a JSON value
+SSE_DONE: Any = _Marker("SSE_DONE")
+SSE_INVALID: Any = _Marker("SSE_INVALID")
+
+
+async def decode_json_events(
+    upstream: AsyncIterator[bytes],
+    feed: Callable[[bytes], list[str]],
+) -> AsyncIterator[Any]:
+    """
+    Decode the data payloads of an SSE byte stream as JSON values.
+
+    ``feed`` maps a chunk to the complete data payloads it finishes. Empty
+    payloads are skipped, "[DONE]" yields ``SSE_DONE`` and payloads that are
+    not JSON yield ``SSE_INVALID``.
+    """
+    async for chunk in upstream:
+        for payload in feed(chunk):
+            if not payload:
+                continue
+            if payload.strip() == "[DONE]":
+                yield SSE_DONE
+                continue
+            try:
+                yield json_codec.loads(payload)
+            except Exception:
+                yield SSE_INVALID
+
+
+async def encode_json_events(events: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode JSON values (and ``SSE_DONE``) as data-only SSE events."""
+    async for event in events:
+        if event is SSE_DONE:
+            yield b"data: [DONE]\n\n"
+        else:
+            yield b"data: " + json_codec.dumps_bytes(event) + b"\n\n"
+
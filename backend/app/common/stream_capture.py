@@ -0,0 +1,131 @@
+"""
+Bounded Stream Capture
+
+Captures streamed response bytes for request logging without holding the whole
+stream in memory. Only the first and last part of the stream are kept (the
+byte budget is split between a head and a tail window); the bytes in between
+are replaced by a truncation marker. Optionally a much larger head is spooled
+to a temporary file instead, still capped by a hard byte limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from typing import Optional
+
+# Spooled head bytes are buffered and written to the temp file in a worker
+# thread once this much is pending.
+_SPILL_FLUSH_BYTES = 64 * 1024
+
+
+class StreamCapture:
+    """
+    Byte-budgeted capture sink for one stream.
+
+    - ``max_bytes`` = 0 keeps everything in memory (no limit)
+    - ``enabled`` = False ignores every write (detail logging disabled)
+    - ``spill_to_disk`` raises the total budget to ``spill_max_bytes``: the
+      head goes to a temp file, the tail window stays in memory; longer
+      streams are still truncated
+
+    In spill mode use ``awrite``/``atext`` so file I/O runs off the event loop.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        *,
+        enabled: bool = True,
+        spill_to_disk: bool = False,
+        spill_max_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        if spill_max_bytes < 0:
+            raise ValueError("spill_max_bytes must be >= 0")
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._head_len = 0
+        self._tail = bytearray()
+        self._head_budget = max_bytes - max_bytes // 2
+        self._tail_budget = max_bytes // 2
+        self._spool: Optional[tempfile.SpooledTemporaryFile] = None
+        if enabled and spill_to_disk and max_bytes:
+            self._head_budget = max(spill_max_bytes, max_bytes) - self._tail_budget
+            self._spool = tempfile.SpooledTemporaryFile(max_size=max_bytes)
+
+    @property
+    def truncated(self) -> bool:
+        return self.max_bytes > 0 and self.total_bytes > self._head_len + len(self._tail)
+
+    def write(self, chunk: bytes | bytearray | str) -> None:
+        if not self.enabled or not chunk:
+            return
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        self.total_bytes += len(chunk)
+        if not self.max_bytes:
+            self._head += chunk
+            self._head_len += len(chunk)
+            return
+
+        room = self._head_budget - self._head_len
+        if room > 0:
+            # In spill mode _head only buffers bytes not yet in the temp file
+            self._head += chunk[:room]
+            self._head_len += min(room, len(chunk))
+            chunk = chunk[room:]
+            if not chunk:
+                return
+        self._tail += chunk
+        # Trim lazily so the amortized cost stays linear in the stream size
+        if len(self._tail) > 2 * self._tail_budget:
+            del self._tail[: len(self._tail) - self._tail_budget]
+
+    async def awrite(self, chunk: bytes | bytearray | str) -> None:
+        """``write``, moving spooled head bytes to disk in a worker thread."""
+        self.write(chunk)
+        if self._spool is not None and len(self._head) >= _SPILL_FLUSH_BYTES:
+            pending = bytes(self._head)
+            self._head.clear()
+            await asyncio.to_thread(self._spool.write, pending)
+
+    def _read_head(self) -> bytes:
+        if self._spool is None:
+            return bytes(self._head)
+        self._spool.seek(0)
+        # Reading leaves the position at the end, where later writes append
+        return self._spool.read() + bytes(self._head)
+
+    def _assemble(self, head: bytes) -> bytes:
+        if self._tail_budget and len(self._tail) > self._tail_budget:
+            del self._tail[: len(self._tail) - self._tail_budget]
+        omitted = self.total_bytes - len(head) - len(self._tail)
+        if omitted <= 0:
+            return head + bytes(self._tail)
+        marker = f"\n...[truncated {omitted} bytes]...\n".encode("utf-8")
+        return head + marker + bytes(self._tail)
+
+    def getvalue(self) -> bytes:
+        """Return the captured bytes (with a truncation marker if needed)."""
+        return self._assemble(self._read_head())
+
+    async def agetvalue(self) -> bytes:
+        """``getvalue`` reading the spooled head in a worker thread."""
+        if self._spool is None:
+            return self.getvalue()
+        return self._assemble(await asyncio.to_thread(self._read_head))
+
+    def text(self) -> str:
+        return self.getvalue().decode("utf-8", errors="replace")
+
+    async def atext(self) -> str:
+        return (await self.agetvalue()).decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
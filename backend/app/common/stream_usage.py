@@ -6,10 +6,12 @@ Used when upstream returns SSE (text/event-stream) to extract incremental text f
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, fields
 from typing import Any, Optional
 
+from app.common import json_codec
+from app.common.sse import SSEFramer, event_data
+from app.common.token_count_executor import token_count_executor
 from app.common.token_counter import get_token_counter
 from app.common.usage_extractor import UsageDetails, extract_usage_details
 
@@ -18,50 +20,25 @@ class SSEDecoder:
     """
     Simple SSE Decoder: Splits bytes stream into event blocks and extracts data fields.
 
-    - Uses empty line (\n\n) as event boundary
-    - Supports CRLF (\r\n)
+    - Uses empty line as event boundary
+    - Supports CRLF (\r\n) and CR line endings
     - Only parses data: lines, ignores other fields
     """
 
     def __init__(self) -> None:
-        self._buf = b""
+        self._framer = SSEFramer()
 
     def feed(self, chunk: bytes) -> list[str]:
         """
         Append bytes and return list of parsed data payloads (one string per event).
         """
-        if not chunk:
-            return []
-
-        data = (self._buf + chunk).replace(b"\r\n", b"\n")
-        parts = data.split(b"\n\n")
-        self._buf = parts.pop()  # Keep last incomplete event
-
         payloads: list[str] = []
-        for event in parts:
-            payload = self._extract_data_payload(event)
+        for event in self._framer.feed(chunk):
+            payload = event_data(event)
             if payload is not None:
                 payloads.append(payload)
         return payloads
 
-    @staticmethod
-    def _extract_data_payload(event: bytes) -> Optional[str]:
-        data_lines: list[bytes] = []
-        for line in event.split(b"\n"):
-            if not line:
-                continue
-            if line.startswith(b"data:"):
-                value = line[5:]
-                if value.startswith(b" "):
-                    value = value[1:]
-                data_lines.append(value)
-        if not data_lines:
-            return None
-        try:
-            return b"\n".join(data_lines).decode("utf-8", errors="ignore")
-        except Exception:
-            return None
-
 
 @dataclass
 class StreamUsageResult:
@@ -134,6 +111,17 @@ class StreamUsageAccumulator:
         for payload in self._decoder.feed(chunk):
             self._handle_payload(payload)
 
+    async def finalize_async(self) -> StreamUsageResult:
+        """
+        finalize() on the token-count executor when a lot of output text is
+        left for the local tokenizer (upstream reported no output tokens).
+        """
+        size = 0 if self._upstream_output_tokens else self._pending_chars()
+        return await token_count_executor.run(size, self.finalize)
+
+    def _pending_chars(self) -> int:
+        return sum(len(part) for part in self._text_parts)
+
     def finalize(self) -> StreamUsageResult:
         if self._tool_calls_buffer:
             try:
@@ -143,7 +131,7 @@ class StreamUsageAccumulator:
                     self._tool_calls_buffer.items(), key=lambda x: x[0]
                 )
                 tool_calls_list = [call for _, call in sorted_calls]
-                self._text_parts.append(json.dumps(tool_calls_list, ensure_ascii=False))
+                self._text_parts.append(json_codec.dumps(tool_calls_list))
             except Exception:
                 pass
 
@@ -180,10 +168,15 @@ class StreamUsageAccumulator:
             return
 
         try:
-            data = json.loads(payload)
+            data = json_codec.loads(payload)
         except Exception:
             return
 
+        self._handle_data(data)
+
+    def _handle_data(self, data: Any) -> None:
+        if not isinstance(data, dict):
+            return
         if self.protocol == "anthropic":
             self._handle_anthropic_event(data)
         elif self.protocol == "gemini":
@@ -328,7 +321,7 @@ class StreamUsageAccumulator:
                 if isinstance(fc, dict) and isinstance(fc.get("name"), str):
                     index = len(self._tool_calls_buffer)
                     args = fc.get("args")
-                    args_str = json.dumps(args or {}, ensure_ascii=False) if not isinstance(args, str) else args
+                    args_str = json_codec.dumps(args or {}) if not isinstance(args, str) else args
                     self._tool_calls_buffer[index] = {
                         "index": index,
                         "type": "function",
@@ -353,3 +346,87 @@ class StreamUsageAccumulator:
         completion = data.get("completion")
         if isinstance(completion, str) and completion:
             self._text_parts.append(completion)
+
+
+class StreamUsageTap(StreamUsageAccumulator):
+    """
+    Usage side tap for streams that are passed through untouched.
+
+    Only events that mention usage are parsed as they arrive. The other events
+    matter only when upstream never reports output tokens (the local tokenizer
+    then counts their text), so their data payloads are set aside and parsed
+    in ``finalize``, and dropped as soon as upstream reports output tokens.
+    Once more than ``max_deferred_bytes`` are set aside they are parsed and the
+    tap parses every later event eagerly, like ``StreamUsageAccumulator``.
+    """
+
+    def __init__(
+        self,
+        protocol: str,
+        model: str,
+        preview_chars: int = 4096,
+        *,
+        max_deferred_bytes: int = 1024 * 1024,
+    ) -> None:
+        super().__init__(protocol, model, preview_chars)
+        self.max_deferred_bytes = max_deferred_bytes
+        self._framer = SSEFramer()
+        self._deferred: list[str] = []
+        self._deferred_bytes = 0
+        self._eager = False
+
+    def feed(self, chunk: bytes) -> None:
+        for event in self._framer.feed(chunk):
+            self._handle_event(event)
+
+    def _pending_chars(self) -> int:
+        return super()._pending_chars() + self._deferred_bytes
+
+    def finalize(self) -> StreamUsageResult:
+        remaining = self._framer.flush()
+        if remaining:
+            self._handle_event(remaining)
+        if not self._upstream_output_tokens:
+            self._replay_deferred()
+        return super().finalize()
+
+    def _handle_event(self, event: bytes) -> None:
+        # "usage" also matches Gemini's usageMetadata
+        has_usage = b"usage" in event
+        if not self._eager and not has_usage and self._upstream_output_tokens:
+            return
+        payload = event_data(event)
+        if payload is None:
+            return
+        if self._eager:
+            self._handle_payload(payload)
+            return
+        if not has_usage:
+            self._defer(payload)
+            return
+
+        try:
+            data = json_codec.loads(payload)
+        except Exception:
+            return
+        details = extract_usage_details(data) if isinstance(data, dict) else None
+        if details is not None and details.output_tokens:
+            # The deferred text will never be counted
+            self._deferred.clear()
+            self._deferred_bytes = 0
+        else:
+            self._replay_deferred()
+        self._handle_data(data)
+
+    def _defer(self, payload: str) -> None:
+        self._deferred.append(payload)
+        self._deferred_bytes += len(payload)
+        if self._deferred_bytes > self.max_deferred_bytes:
+            self._replay_deferred()
+            self._eager = True
+
+    def _replay_deferred(self) -> None:
+        deferred, self._deferred = self._deferred, []
+        self._deferred_bytes = 0
+        for payload in deferred:
+            self._handle_payload(payload)
@@ -0,0 +1,153 @@
+"""
+Token Count Cache Module
+
+Memoizes token counts of request fragments (messages, content blocks, tool
+lists) by content hash.
+
+Agent clients resend the same system prompt, tool list and conversation
+prefix on every turn. With the cache only the fragments that changed since
+the previous turn are tokenized, so counting costs O(new content) instead of
+O(conversation). Keys are (counter, encoding, fragment kind, BLAKE2b digest of
+the fragment's JSON); only counts are stored, never content. Entries are
+evicted least-recently-used once the cache exceeds its byte budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.common import json_codec
+from app.config import get_settings
+
+CacheKey = tuple[str, str, str, bytes]
+
+# Per-entry bookkeeping not visible to sys.getsizeof of the key parts
+# (OrderedDict node, tuple slots, count int)
+_ENTRY_OVERHEAD_BYTES = 120
+
+
+@dataclass(frozen=True)
+class TokenCountCacheStats:
+    """Point-in-time counters of the token count cache."""
+
+    enabled: bool
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: Optional[float]
+
+
+class TokenCountCache:
+    """
+    LRU cache of token counts keyed by content hash
+
+    - ``max_bytes``: memory budget for entries
+    - ``min_chars``: fragments whose JSON is shorter are counted directly;
+      hashing them would cost about as much as tokenizing
+
+    Thread-safe: counts of large payloads run on the token-count executor.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        max_bytes: int = 16 * 1024 * 1024,
+        min_chars: int = 256,
+    ) -> None:
+        self.enabled = enabled and max_bytes > 0
+        self.max_bytes = max_bytes
+        self.min_chars = min_chars
+        self._entries: OrderedDict[CacheKey, tuple[int, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "TokenCountCache":
+        return cls(
+            enabled=settings.TOKEN_COUNT_CACHE_ENABLED,
+            max_bytes=settings.TOKEN_COUNT_CACHE_MAX_BYTES,
+            min_chars=settings.TOKEN_COUNT_CACHE_MIN_CHARS,
+        )
+
+    def key(
+        self, counter: str, encoding: str, kind: str, value: Any
+    ) -> Optional[CacheKey]:
+        """
+        Cache key of a fragment, or None when it should not be cached
+
+        ``value`` is hashed as is when it is already a string (e.g. a
+        serialized tool list) and as its JSON otherwise.
+        """
+        if not self.enabled:
+            return None
+        if isinstance(value, str):
+            if len(value) < self.min_chars:
+                return None
+            data = value.encode("utf-8", errors="surrogatepass")
+        else:
+            try:
+                data = json_codec.dumps_bytes(value)
+            except (TypeError, ValueError):
+                return None
+            if len(data) < self.min_chars:
+                return None
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        return (counter, encoding, kind, digest)
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, count: int) -> None:
+        size = _ENTRY_OVERHEAD_BYTES + sum(sys.getsizeof(part) for part in key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            self._entries[key] = (count, size)
+            self._size_bytes += size
+            while self._size_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> TokenCountCacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return TokenCountCacheStats(
+                enabled=self.enabled,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                hit_rate=self._hits / lookups if lookups else None,
+            )
+
+
+# Global singleton shared by every token counter of the process.
+token_count_cache = TokenCountCache.from_settings(get_settings())
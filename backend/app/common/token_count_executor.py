@@ -0,0 +1,129 @@
+"""
+Token Count Executor Module
+
+Runs local token counting (tiktoken) off the event loop for large payloads.
+
+Counting a 100k-token prompt takes long enough to stall every other stream
+served by the worker, so payloads above a size threshold are counted on a
+dedicated thread pool. tiktoken releases the GIL while encoding, and the
+texts of one payload are encoded as a batch (encode_ordinary_batch). Small
+payloads are counted inline, where a thread hop would cost more than it saves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from app.common.token_counter import TokenCounter
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+def payload_chars(value: Any, limit: int) -> int:
+    """
+    Total length of the strings in a JSON-like value
+
+    Stops walking once ``limit`` is reached, so deciding whether to offload
+    costs little even for huge payloads.
+    """
+    total = 0
+    stack = [value]
+    while stack and total < limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item)
+        elif isinstance(item, (bytes, bytearray)):
+            total += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return total
+
+
+class TokenCountExecutor:
+    """
+    Thread pool for token counting
+
+    - ``max_workers``: pool size; 0 counts everything on the event loop
+    - ``offload_min_chars``: payloads with fewer characters are counted inline
+    - ``batch_threads``: threads tiktoken uses to encode the texts of one
+      offloaded payload
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        offload_min_chars: int = 20000,
+        batch_threads: int = 4,
+    ) -> None:
+        self.max_workers = max_workers
+        self.offload_min_chars = offload_min_chars
+        self.batch_threads = max(1, batch_threads)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "TokenCountExecutor":
+        return cls(
+            max_workers=settings.TOKEN_COUNT_EXECUTOR_WORKERS,
+            offload_min_chars=settings.TOKEN_COUNT_OFFLOAD_MIN_CHARS,
+            batch_threads=settings.TOKEN_COUNT_BATCH_THREADS,
+        )
+
+    def should_offload(self, size: int) -> bool:
+        return self.max_workers > 0 and size >= self.offload_min_chars
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="token-count"
+            )
+        return self._pool
+
+    async def run(self, size: int, fn: Callable[..., T], *args: Any) -> T:
+        """Call fn(*args) on the pool when size warrants it, else inline."""
+        if not self.should_offload(size):
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), partial(fn, *args))
+
+    def _batched(
+        self, counter: TokenCounter, method: str, size: int
+    ) -> Callable[..., int]:
+        if not isinstance(counter, TokenCounter):
+            return getattr(counter, method)
+        threads = self.batch_threads if self.should_offload(size) else 1
+        return partial(getattr(counter, f"{method}_batched"), num_threads=threads)
+
+    async def count_request(
+        self, counter: TokenCounter, body: dict[str, Any], model: str = ""
+    ) -> int:
+        """TokenCounter.count_request, off the event loop for large bodies."""
+        size = payload_chars(body, self.offload_min_chars)
+        return await self.run(
+            size, self._batched(counter, "count_request", size), body, model
+        )
+
+    async def count_output_body(
+        self, counter: TokenCounter, body: Any, model: str = ""
+    ) -> int:
+        """TokenCounter.count_output_body, off the event loop for large bodies."""
+        size = payload_chars(body, self.offload_min_chars)
+        return await self.run(
+            size, self._batched(counter, "count_output_body", size), body, model
+        )
+
+    def shutdown(self) -> None:
+        """Stop the pool (called on application shutdown)"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global singleton; shut down in the app lifespan.
+token_count_executor = TokenCountExecutor.from_settings(get_settings())
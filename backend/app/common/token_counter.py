@@ -8,7 +8,11 @@ import base64
 import json
 import math
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from app.common.token_count_cache import CacheKey, token_count_cache
 
 try:
     import tiktoken
@@ -22,6 +26,29 @@ def _encode_plain_text(encoding: Any, text: str) -> list[int]:
     return encoding.encode(text, disallowed_special=())
 
 
+@dataclass
+class _TextBatch:
+    texts: list[str] = field(default_factory=list)
+    # Cache entries completed once texts are encoded:
+    # (key, count without texts, first text index, end text index)
+    pending: list[tuple[CacheKey, int, int, int]] = field(default_factory=list)
+
+
+# Set while TokenCounter._count_batched runs: count_tokens appends its text
+# here (and counts 0) so all texts are encoded together afterwards.
+_batched_texts: ContextVar[Optional[_TextBatch]] = ContextVar(
+    "token_counter_batched_texts", default=None
+)
+
+
+def _defer_to_batch(text: str) -> bool:
+    batch = _batched_texts.get()
+    if batch is None:
+        return False
+    batch.texts.append(text)
+    return True
+
+
 class TokenCounter(ABC):
     """
     Token Counter Abstract Base Class
@@ -96,6 +123,105 @@ class TokenCounter(ABC):
 
         return 0
 
+    def _get_encoding(self, model: str) -> Any:
+        """tiktoken encoding for the model, or None to estimate."""
+        return None
+
+    def _encoding_name(self, model: str) -> str:
+        """Name of the tokenizer counts come from (part of cache keys)."""
+        return "estimate"
+
+    def _text_token_counts(
+        self, texts: list[str], model: str, num_threads: int
+    ) -> list[int]:
+        if not texts:
+            return []
+        encoding = self._get_encoding(model)
+        if not encoding:
+            # Fallback estimation: average 4 chars per token
+            return [len(text) // 4 for text in texts]
+        if num_threads > 1 and len(texts) > 1:
+            return [
+                len(tokens)
+                for tokens in encoding.encode_ordinary_batch(
+                    texts, num_threads=num_threads
+                )
+            ]
+        return [len(encoding.encode_ordinary(text)) for text in texts]
+
+    def count_texts(self, texts: list[str], model: str = "", num_threads: int = 1) -> int:
+        """
+        Count tokens of several texts
+
+        Equivalent to summing count_tokens over texts. With num_threads > 1
+        and several texts, they are encoded with tiktoken's
+        encode_ordinary_batch, which runs them on that many threads (tiktoken
+        releases the GIL while encoding).
+        """
+        return sum(self._text_token_counts(texts, model, num_threads))
+
+    def _count_batched(
+        self, count: Callable[[], int], model: str, num_threads: int
+    ) -> int:
+        batch = _TextBatch()
+        token = _batched_texts.set(batch)
+        try:
+            total = count()
+        finally:
+            _batched_texts.reset(token)
+        counts = self._text_token_counts(batch.texts, model, num_threads)
+        for key, base, start, end in batch.pending:
+            token_count_cache.put(key, base + sum(counts[start:end]))
+        return total + sum(counts)
+
+    def _count_tools(self, tools: list[Any], model: str) -> int:
+        text = json.dumps(tools, ensure_ascii=False)
+        return self._memoized(
+            "tools", text, model, lambda: self.count_tokens(text, model)
+        )
+
+    def _memoized(
+        self, kind: str, value: Any, model: str, count: Callable[[], int]
+    ) -> int:
+        """
+        count(), memoized in the token count cache by the content of value
+
+        Inside a batched count the texts are not encoded yet, so the entry is
+        stored by _count_batched once they are.
+        """
+        key = token_count_cache.key(
+            type(self).__name__, self._encoding_name(model), kind, value
+        )
+        if key is None:
+            return count()
+        cached = token_count_cache.get(key)
+        if cached is not None:
+            return cached
+        batch = _batched_texts.get()
+        start = len(batch.texts) if batch is not None else 0
+        total = count()
+        if batch is None:
+            token_count_cache.put(key, total)
+        else:
+            batch.pending.append((key, total, start, len(batch.texts)))
+        return total
+
+    def count_request_batched(
+        self, body: dict[str, Any], model: str = "", num_threads: int = 1
+    ) -> int:
+        """count_request, with all texts of the request encoded in one batch."""
+        return self._count_batched(
+            lambda: self.count_request(body, model), model, num_threads
+        )
+
+    def count_output_body_batched(
+        self, body: Any, model: str = "", num_threads: int = 1
+    ) -> int:
+        """count_output_body, with all texts of the body encoded in one batch."""
+        return self._count_batched(
+            lambda: self.count_output_body(body, model), model, num_threads
+        )
+
     def count_request(self, body: dict[str, Any], model: str = "") -> int:
         """
         Count tokens in a request body (messages/input).
@@ -203,6 +329,15 @@ class OpenAITokenCounter(TokenCounter):
         """Initialize Counter"""
         self._encodings: dict[str, Any] = {}
 
+    def _encoding_name(self, model: str) -> str:
+        if not TIKTOKEN_AVAILABLE:
+            return "estimate"
+        # Find encoding for model
+        for model_prefix, enc_name in self.MODEL_ENCODING_MAP.items():
+            if model.startswith(model_prefix):
+                return enc_name
+        return self.DEFAULT_ENCODING
+
     def _get_encoding(self, model: str) -> Any:
         """
         Get encoder for model
@@ -216,12 +351,7 @@ class OpenAITokenCounter(TokenCounter):
         if not TIKTOKEN_AVAILABLE:
             return None
 
-        # Find encoding for model
-        encoding_name = self.DEFAULT_ENCODING
-        for model_prefix, enc_name in self.MODEL_ENCODING_MAP.items():
-            if model.startswith(model_prefix):
-                encoding_name = enc_name
-                break
+        encoding_name = self._encoding_name(model)
 
         # Cache encoder
         if encoding_name not in self._encodings:
@@ -245,6 +375,8 @@ class OpenAITokenCounter(TokenCounter):
         """
         if not text:
             return 0
+        if _defer_to_batch(text):
+            return 0
 
         encoding = self._get_encoding(model)
         if encoding:
@@ -269,40 +401,49 @@ class OpenAITokenCounter(TokenCounter):
         if not messages:
             return 0
 
-        # Overhead per message
-        tokens_per_message = 4  # <|start|>role<|separator|>content<|end|>
-        tokens_per_name = -1  # If there's a name field
-
         total_tokens = 0
         for message in messages:
-            total_tokens += tokens_per_message
-            for key, value in message.items():
-                if key == "content":
-                    total_tokens += _count_openai_content(value, model, self)
-                    continue
-                if key in ("tool_calls", "function_call") and value is not None:
-                    try:
-                        total_tokens += self.count_tokens(
-                            json.dumps(value, ensure_ascii=False), model
-                        )
-                    except Exception:
-                        pass
-                    continue
-                if isinstance(value, str):
-                    total_tokens += self.count_tokens(value, model)
-                elif isinstance(value, list):
-                    total_tokens += _count_openai_list(value, model, self)
-                if key == "name":
-                    total_tokens += tokens_per_name
+            total_tokens += self._memoized(
+                "message",
+                message,
+                model,
+                lambda message=message: self._count_message(message, model),
+            )
 
         total_tokens += 3  # Every reply is primed with <|start|>assistant<|message|>
         return total_tokens
 
+    def _count_message(self, message: dict[str, Any], model: str) -> int:
+        # Overhead per message
+        tokens_per_message = 4  # <|start|>role<|separator|>content<|end|>
+        tokens_per_name = -1  # If there's a name field
+
+        total_tokens = tokens_per_message
+        for key, value in message.items():
+            if key == "content":
+                total_tokens += _count_openai_content(value, model, self)
+                continue
+            if key in ("tool_calls", "function_call") and value is not None:
+                try:
+                    total_tokens += self.count_tokens(
+                        json.dumps(value, ensure_ascii=False), model
+                    )
+                except Exception:
+                    pass
+                continue
+            if isinstance(value, str):
+                total_tokens += self.count_tokens(value, model)
+            elif isinstance(value, list):
+                total_tokens += _count_openai_list(value, model, self)
+            if key == "name":
+                total_tokens += tokens_per_name
+        return total_tokens
+
     def count_request(self, body: dict[str, Any], model: str = "") -> int:
         total = super().count_request(body, model)
         tools = body.get("tools")
         if isinstance(tools, list) and tools:
-            total += self.count_tokens(json.dumps(tools, ensure_ascii=False), model)
+            total += self._count_tools(tools, model)
         tool_choice = body.get("tool_choice")
         if tool_choice is not None:
             try:
@@ -327,6 +468,9 @@ class AnthropicTokenCounter(TokenCounter):
     def __init__(self):
         self._encodings: dict[str, Any] = {}
 
+    def _encoding_name(self, model: str) -> str:
+        return self.DEFAULT_ENCODING if TIKTOKEN_AVAILABLE else "estimate"
+
     def _get_encoding(self, model: str) -> Any:
         if not TIKTOKEN_AVAILABLE:
             return None
@@ -352,6 +496,8 @@ class AnthropicTokenCounter(TokenCounter):
         """
         if not text:
             return 0
+        if _defer_to_batch(text):
+            return 0
 
         encoding = self._get_encoding(model)
         if encoding:
@@ -376,15 +522,24 @@ class AnthropicTokenCounter(TokenCounter):
 
         total_tokens = 0
         for message in messages:
-            role = message.get("role", "")
-            content = message.get("content", "")
+            total_tokens += self._memoized(
+                "message",
+                message,
+                model,
+                lambda message=message: self._count_message(message, model),
+            )
+
+        return total_tokens
 
-            total_tokens += self.count_tokens(role, model)
-            total_tokens += _count_anthropic_content(content, model, self)
+    def _count_message(self, message: dict[str, Any], model: str) -> int:
+        role = message.get("role", "")
+        content = message.get("content", "")
 
-            # Message overhead
-            total_tokens += 4
+        total_tokens = self.count_tokens(role, model)
+        total_tokens += _count_anthropic_content(content, model, self)
 
+        # Message overhead
+        total_tokens += 4
         return total_tokens
 
     def count_request(self, body: dict[str, Any], model: str = "") -> int:
@@ -400,11 +555,16 @@ class AnthropicTokenCounter(TokenCounter):
         if isinstance(system, str):
             total += self.count_tokens(system, model)
         elif isinstance(system, list):
-            total += _count_anthropic_content(system, model, self)
+            total += self._memoized(
+                "system",
+                system,
+                model,
+                lambda: _count_anthropic_content(system, model, self),
+            )
 
         tools = body.get("tools")
         if isinstance(tools, list) and tools:
-            total += self.count_tokens(json.dumps(tools, ensure_ascii=False), model)
+            total += self._count_tools(tools, model)
 
         return total
 
@@ -623,9 +783,9 @@ def _count_anthropic_document(
         elif source_type == "content":
             total += _count_anthropic_content(source.get("content"), model, counter)
         elif source_type == "base64" and isinstance(source.get("data"), str):
-            raw = _decode_base64_data(source["data"])
-            if raw is not None:
-                total += max(1, math.ceil(len(raw) / 4000))
+            length = _base64_decoded_length(source["data"])
+            if length is not None:
+                total += max(1, math.ceil(length / 4000))
         elif source_type == "url" and isinstance(source.get("url"), str):
             total += counter.count_tokens(source["url"], model)
 
@@ -709,9 +869,9 @@ def _estimate_audio_tokens(item: dict[str, Any]) -> int:
     duration = _extract_duration_seconds(item)
     if duration is not None:
         return max(1, math.ceil(duration * 50))
-    data = _extract_base64_bytes(item)
-    if data is not None:
-        return max(1, math.ceil(len(data) / 1000))
+    length = _extract_base64_length(item)
+    if length is not None:
+        return max(1, math.ceil(length / 1000))
     return 0
 
 
@@ -719,9 +879,9 @@ def _estimate_video_tokens(item: dict[str, Any]) -> int:
     duration = _extract_duration_seconds(item)
     if duration is not None:
         return max(1, math.ceil(duration * 200))
-    data = _extract_base64_bytes(item)
-    if data is not None:
-        return max(1, math.ceil(len(data) / 2000))
+    length = _extract_base64_length(item)
+    if length is not None:
+        return max(1, math.ceil(length / 2000))
     return 0
 
 
@@ -736,7 +896,7 @@ def _extract_duration_seconds(item: dict[str, Any]) -> Optional[float]:
     return None
 
 
-def _extract_base64_bytes(item: dict[str, Any]) -> Optional[bytes]:
+def _extract_base64_length(item: dict[str, Any]) -> Optional[int]:
     data = item.get("data")
     if isinstance(item.get("audio"), dict):
         data = item.get("audio", {}).get("data") or data
@@ -747,26 +907,92 @@ def _extract_base64_bytes(item: dict[str, Any]) -> Optional[bytes]:
     if isinstance(item.get("input_video"), dict):
         data = item.get("input_video", {}).get("data") or data
     if isinstance(data, str):
-        return _decode_base64_data(data)
+        return _base64_decoded_length(data)
     return None
 
 
-def _decode_base64_data(data: str) -> Optional[bytes]:
+# Whitespace some encoders insert into base64 (e.g. MIME line breaks); the
+# decoder skips it
+_BASE64_WHITESPACE = "\r\n\t "
+_STRIP_BASE64_WHITESPACE = str.maketrans("", "", _BASE64_WHITESPACE)
+# Leading bytes holding the dimensions of PNG, GIF and WebP images
+_IMAGE_HEADER_BYTES = 32
+# JPEG dimensions sit in the SOF segment, after EXIF/ICC segments of any
+# size: decode this many leading bytes, then 4x more until it is reached
+_JPEG_PROBE_BYTES = 4096
+
+
+def _base64_payload_start(data: str) -> int:
     if data.startswith("data:"):
         comma = data.find(",")
         if comma != -1:
-            data = data[comma + 1 :]
+            return comma + 1
+    return 0
+
+
+def _base64_decoded_length(data: str) -> Optional[int]:
+    """
+    Byte length of a base64 payload or data URL, computed without decoding
+
+    None when the payload is not a whole number of base64 quanta (decoding
+    it would fail).
+    """
+    start = _base64_payload_start(data)
+    chars = len(data) - start
+    for char in _BASE64_WHITESPACE:
+        # find() is a memchr scan; count() only when there is something to count
+        if data.find(char, start) != -1:
+            chars -= data.count(char, start)
+    if chars % 4:
+        return None
+    tail = data[max(start, len(data) - 8) :].rstrip(_BASE64_WHITESPACE)
+    padding = min(2, len(tail) - len(tail.rstrip("=")))
+    return chars // 4 * 3 - padding
+
+
+def _decode_base64_prefix(data: str, size: int) -> Optional[bytes]:
+    """
+    Decode the first ``size`` bytes (or more) of a base64 payload or data URL
+
+    Returns fewer bytes only when the whole payload is shorter.
+    """
+    start = _base64_payload_start(data)
+    chars = -(-size // 3) * 4
+    window = chars
+    while True:
+        compact = data[start : start + window].translate(_STRIP_BASE64_WHITESPACE)
+        if len(compact) >= chars or start + window >= len(data):
+            break
+        window += chars - len(compact)
+    compact = compact[: len(compact) - len(compact) % 4]
     try:
-        return base64.b64decode(data, validate=False)
+        return base64.b64decode(compact, validate=False)
     except Exception:
         return None
 
 
 def _extract_image_size_from_data(data: str) -> Optional[tuple[int, int]]:
-    raw = _decode_base64_data(data)
+    """
+    Dimensions of a base64 image, decoding only its header
+
+    Multi-megabyte screenshots are common in vision requests; only the
+    leading bytes holding the dimensions are decoded.
+    """
+    raw = _decode_base64_prefix(data, _IMAGE_HEADER_BYTES)
     if not raw:
         return None
-    return _extract_image_size_from_bytes(raw)
+    if not raw.startswith(b"\xff\xd8"):
+        return _extract_image_size_from_bytes(raw)
+
+    size = _JPEG_PROBE_BYTES
+    while True:
+        raw = _decode_base64_prefix(data, size)
+        if raw is None:
+            return None
+        dimensions, truncated = _scan_jpeg_size(raw)
+        if dimensions or not truncated or len(raw) < size:
+            return dimensions
+        size *= 4
 
 
 def _extract_image_size_from_bytes(data: bytes) -> Optional[tuple[int, int]]:
@@ -775,11 +1001,34 @@ def _extract_image_size_from_bytes(data: bytes) -> Optional[tuple[int, int]]:
         height = int.from_bytes(data[20:24], "big")
         return width, height
     if data.startswith(b"\xff\xd8"):
-        return _extract_jpeg_size(data)
+        return _scan_jpeg_size(data)[0]
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width = int.from_bytes(data[6:8], "little")
+        height = int.from_bytes(data[8:10], "little")
+        return width, height
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _extract_webp_size(data)
+    return None
+
+
+def _extract_webp_size(data: bytes) -> Optional[tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width = int.from_bytes(data[26:28], "little") & 0x3FFF
+        height = int.from_bytes(data[28:30], "little") & 0x3FFF
+        return width, height
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
     return None
 
 
-def _extract_jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
+def _scan_jpeg_size(data: bytes) -> tuple[Optional[tuple[int, int]], bool]:
+    """JPEG dimensions, and whether data ended before the SOF segment"""
     idx = 2
     size = len(data)
     while idx < size:
@@ -806,15 +1055,15 @@ def _extract_jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
             if idx + 7 <= size:
                 height = int.from_bytes(data[idx + 3 : idx + 5], "big")
                 width = int.from_bytes(data[idx + 5 : idx + 7], "big")
-                return width, height
-            return None
+                return (width, height), False
+            return None, True
         if idx + 1 >= size:
             break
         segment_length = int.from_bytes(data[idx : idx + 2], "big")
         if segment_length < 2:
-            break
+            return None, False
         idx += segment_length
-    return None
+    return None, True
 
 
 def _safe_int(value: Any) -> Optional[int]:
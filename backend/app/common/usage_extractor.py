@@ -9,9 +9,12 @@ pass through raw bytes without parsing the JSON body.
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from app.common import json_codec
+
 
 def _coerce_json_obj(body: Any) -> Any | None:
     if body is None:
@@ -34,7 +37,7 @@ def _coerce_json_obj(body: Any) -> Any | None:
         return None
 
     try:
-        return json.loads(stripped)
+        return json_codec.loads(stripped)
     except Exception:
         return None
 
@@ -268,7 +271,49 @@ def _normalize_usage(usage: dict[str, Any], usage_kind: str) -> UsageDetails:
     )
 
 
+# A usage object key; inside JSON strings quotes are escaped, so only real
+# keys match
+_USAGE_KEY_RE = re.compile(rb'"(usage|usageMetadata|usage_metadata)"\s*:\s*\{')
+_USAGE_DECODER = json.JSONDecoder()
+
+
+def _scan_usage_dict(raw: bytes | bytearray) -> tuple[dict[str, Any], str] | None | bool:
+    """
+    Find the usage object of a raw JSON body without parsing the whole body.
+
+    Returns the usage dict and its kind, None when the body has no usage object
+    at all, or False when the scan is inconclusive (several candidates or an
+    undecodable object) and the body must be parsed.
+    """
+    matches = list(_USAGE_KEY_RE.finditer(raw))
+    if not matches:
+        return None
+    if len(matches) > 1:
+        return False
+    match = matches[0]
+    start = match.end() - 1
+    try:
+        usage, _ = _USAGE_DECODER.raw_decode(
+            raw[start:].decode("utf-8", errors="ignore")
+        )
+    except ValueError:
+        return False
+    if not isinstance(usage, dict):
+        return False
+    kind = "usage" if match.group(1) == b"usage" else "usage_metadata"
+    return usage, kind
+
+
 def extract_usage_details(body: Any) -> Optional[UsageDetails]:
+    if isinstance(body, (bytes, bytearray)):
+        # Raw passthrough bodies (e.g. large embeddings or b64 images) usually
+        # carry a single usage object: decode just that object.
+        scanned = _scan_usage_dict(body)
+        if scanned is None:
+            return None
+        if scanned is not False:
+            usage, usage_kind = scanned
+            return _normalize_usage(usage, usage_kind)
     obj = _coerce_json_obj(body)
     usage_extracted = _extract_usage_dict(obj)
     if not usage_extracted:
@@ -4,11 +4,11 @@ Utility Functions Module
 Provides common utility functions, such as API Key generation, Trace ID generation, etc.
 """
 
-import json
 import secrets
 import uuid
 from typing import Any, Optional
 
+from app.common import json_codec
 from app.config import get_settings
 
 
@@ -132,6 +132,6 @@ def try_parse_json_object(text: str) -> Any:
     ):
         return text
     try:
-        return json.loads(stripped)
+        return json_codec.loads(stripped)
     except Exception:
         return text
\ No newline at end of file
@@ -44,18 +44,88 @@ class Settings(BaseSettings):
     PROVIDER_HEALTH_MIN_SAMPLES: int = 6
     # Failure rate at or above which a provider/model mapping is degraded
     PROVIDER_HEALTH_FAILURE_RATE_THRESHOLD: float = 0.5
+    # Where health windows live: "memory" (per process) or "redis" (shared by
+    # all workers and nodes; uses REDIS_URL)
+    PROVIDER_HEALTH_BACKEND: Literal["memory", "redis"] = "memory"
+    # redis backend: how long a worker reuses health read from Redis (ms)
+    PROVIDER_HEALTH_CACHE_MS: int = 250
+    # Hard circuit breaker: consecutive failures that open a provider/model
+    # mapping's circuit, taking it out of rotation (0 disables; per process)
+    PROVIDER_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    # Seconds an open circuit waits before letting a single probe through
+    PROVIDER_CIRCUIT_OPEN_SECONDS: int = 30
+
+    # Hedged Requests Config (opt-in per model mapping)
+    # Delay before the next candidate is dispatched when a mapping has no
+    # fixed hedge_delay_ms and too few latency samples for an adaptive delay
+    HEDGE_DEFAULT_DELAY_MS: int = 2000
+    # Adaptive delay: this percentile of the first candidate's recent latency
+    # to first byte (streams) or full response (non-streams)
+    HEDGE_DELAY_PERCENTILE: float = 0.9
+
+    # Routing Cache Config
+    # Cache model/provider routing config in memory so proxied requests resolve
+    # candidates without DB queries. Admin/MCP writes invalidate it immediately.
+    ROUTING_CACHE_ENABLED: bool = True
+    # Maximum snapshot age in seconds (bounds staleness for out-of-process writes)
+    ROUTING_CACHE_TTL_SECONDS: int = 30
+    # How often workers poll the config_version row for writes made by other
+    # workers (seconds). Only used when Redis is not configured; with
+    # KV_STORE_TYPE=redis changes are pushed over pub/sub instead.
+    CONFIG_VERSION_POLL_INTERVAL_SECONDS: float = 2.0
 
     # HTTP Client Config
     # Request timeout (seconds)
     HTTP_TIMEOUT: int = 1800
+    # Reuse upstream connections through long-lived clients keyed by provider
+    # origin, proxy and timeout (disable to open a new client per request)
+    UPSTREAM_CLIENT_POOL_ENABLED: bool = True
+    # Max concurrent connections per pooled upstream client (unset: no limit).
+    # Long-lived SSE streams each hold a connection for their whole duration.
+    UPSTREAM_MAX_CONNECTIONS: int | None = None
+    # With a connection limit, how long a request waits for a free pooled
+    # connection before failing over (seconds)
+    UPSTREAM_POOL_TIMEOUT_SECONDS: float = 5.0
+    # Max idle keep-alive connections per pooled upstream client
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    # Idle keep-alive connections are closed after this many seconds
+    UPSTREAM_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Negotiate HTTP/2 with upstreams that support it (requires the optional
+    # "h2" package: pip install 'backend[http2]')
+    UPSTREAM_HTTP2_ENABLED: bool = False
     # Whether provider base URLs may use private/internal IP addresses
     ALLOW_PRIVATE_IP_PROVIDER: bool = False
 
+    # Token Count Config
+    # Threads that count tokens of large requests/responses off the event loop
+    # (0 counts on the event loop)
+    TOKEN_COUNT_EXECUTOR_WORKERS: int = 4
+    # Payloads with fewer characters of text are counted inline
+    TOKEN_COUNT_OFFLOAD_MIN_CHARS: int = 20000
+    # Threads tiktoken uses to encode the texts of one offloaded payload
+    TOKEN_COUNT_BATCH_THREADS: int = 4
+    # Memoize token counts of repeated messages/tool lists by content hash
+    TOKEN_COUNT_CACHE_ENABLED: bool = True
+    # Memory budget of the token count cache (least recently used evicted)
+    TOKEN_COUNT_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Fragments whose JSON is shorter are counted without the cache
+    TOKEN_COUNT_CACHE_MIN_CHARS: int = 256
+
     # API Key Config
     # Generated API Key prefix
     API_KEY_PREFIX: str = "lgw-"
     # API Key length (excluding prefix)
     API_KEY_LENGTH: int = 32
+    # Cache API key lookups in memory for proxied requests (keyed by a token
+    # hash). API key edits/deletes invalidate it immediately on every worker.
+    API_KEY_AUTH_CACHE_ENABLED: bool = True
+    # How long a valid key lookup is reused (seconds)
+    API_KEY_AUTH_CACHE_TTL_SECONDS: int = 30
+    # How long an unknown key is remembered as invalid (seconds, 0 disables)
+    API_KEY_AUTH_CACHE_NEGATIVE_TTL_SECONDS: int = 5
+    # API key last_used_at is kept in memory and written in one bulk UPDATE at
+    # this interval (seconds) instead of on every request
+    API_KEY_LAST_USED_FLUSH_INTERVAL_SECONDS: float = 10.0
 
     # Admin Login Authentication
     # Enables login authentication when both ADMIN_USERNAME and ADMIN_PASSWORD are set; otherwise, login is not required.
@@ -67,9 +137,50 @@ class Settings(BaseSettings):
     # KV Store Config
     # KV store backend: "database" uses the SQL database, "redis" uses Redis
     KV_STORE_TYPE: Literal["database", "redis"] = "database"
-    # Redis connection URL (only used when KV_STORE_TYPE is "redis")
+    # Redis connection URL (used when KV_STORE_TYPE, RATE_LIMIT_BACKEND or
+    # PROVIDER_HEALTH_BACKEND is "redis")
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Request Log Write Config
+    # "initial_row": insert a log row when a request arrives and update it on
+    # completion (in-progress requests are visible to every worker).
+    # "single_write": keep in-flight requests in memory and insert the row once
+    # on completion; the admin log list/cancel only see in-flight requests of
+    # the worker that serves the admin request.
+    REQUEST_LOG_WRITE_MODE: Literal["initial_row", "single_write"] = "initial_row"
+    # single_write only: streams still running after this many seconds get
+    # their in-progress row inserted early (0 disables)
+    REQUEST_LOG_STREAM_PERSIST_AFTER_SECONDS: int = 0
+    # Byte budget per captured stream body in request logs (client and
+    # upstream); longer streams keep their head and tail around a truncation
+    # marker (0 keeps whole streams)
+    STREAM_CAPTURE_MAX_BYTES: int = 1048576
+    # Spool the head of stream bodies to a temp file while streaming, so up to
+    # STREAM_CAPTURE_SPILL_MAX_BYTES are logged while memory stays bounded by
+    # STREAM_CAPTURE_MAX_BYTES; longer streams are still truncated
+    STREAM_CAPTURE_SPILL_TO_DISK: bool = False
+    # Hard byte cap per logged stream body when spilling to disk
+    STREAM_CAPTURE_SPILL_MAX_BYTES: int = 16777216
+    # Send same-protocol upstream stream bytes straight to the client instead
+    # of re-framing them through the stream chunk hooks
+    STREAM_PASSTHROUGH_ENABLED: bool = True
+    # JSON codec for request bodies, SSE payloads and log bodies: "auto" uses
+    # orjson or msgspec when installed and the standard library otherwise
+    JSON_CODEC: Literal["auto", "orjson", "msgspec", "stdlib"] = "auto"
+    # Write request logs from a background task in multi-row batches instead
+    # of inline in the request (queued logs are flushed on shutdown)
+    LOG_WRITER_ENABLED: bool = True
+    # Maximum number of logs waiting to be written
+    LOG_WRITER_MAX_QUEUE_SIZE: int = 10000
+    # Flush once this many logs are queued...
+    LOG_WRITER_BATCH_SIZE: int = 200
+    # ...or this long after the first queued log
+    LOG_WRITER_FLUSH_INTERVAL_SECONDS: float = 0.5
+    # When the queue fills up: "drop_details" strips request/response payloads
+    # once it is 80% full and then blocks, "block" always blocks the request,
+    # "drop" discards new logs
+    LOG_WRITER_OVERFLOW_POLICY: Literal["drop_details", "block", "drop"] = "drop_details"
+
     # Log Cleanup Config
     # Log retention days (default 90 days)
     LOG_RETENTION_DAYS: int = 90
@@ -101,6 +212,13 @@ class Settings(BaseSettings):
     RATE_LIMIT_ADMIN: str = "20/minute"
     # Rate limit for proxy endpoints (/v1/*)
     RATE_LIMIT_PROXY: str = "200/minute"
+    # Where rate limit state lives: "memory" (per process) or "redis" (shared
+    # by all workers and nodes; uses REDIS_URL)
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    # Tokens per minute (input + output) allowed per API key (0 = unlimited)
+    RATE_LIMIT_TPM_PER_KEY: int = 0
+    # Tokens per minute (input + output) allowed per requested model (0 = unlimited)
+    RATE_LIMIT_TPM_PER_MODEL: int = 0
 
     # MCP (Model Context Protocol) Config
     # Enable the MCP management interface mounted at /mcp. Requests must
@@ -140,10 +258,50 @@ class Settings(BaseSettings):
             raise ValueError("PROVIDER_HEALTH_WINDOW_SECONDS must be >= 1")
         if self.PROVIDER_HEALTH_MIN_SAMPLES < 1:
             raise ValueError("PROVIDER_HEALTH_MIN_SAMPLES must be >= 1")
+        if self.PROVIDER_HEALTH_CACHE_MS < 0:
+            raise ValueError("PROVIDER_HEALTH_CACHE_MS must be >= 0")
+        if self.PROVIDER_CIRCUIT_FAILURE_THRESHOLD < 0:
+            raise ValueError("PROVIDER_CIRCUIT_FAILURE_THRESHOLD must be >= 0")
+        if self.PROVIDER_CIRCUIT_OPEN_SECONDS < 1:
+            raise ValueError("PROVIDER_CIRCUIT_OPEN_SECONDS must be >= 1")
         if not 0 < self.PROVIDER_HEALTH_FAILURE_RATE_THRESHOLD <= 1:
             raise ValueError(
                 "PROVIDER_HEALTH_FAILURE_RATE_THRESHOLD must be in (0, 1]"
             )
+        if self.HEDGE_DEFAULT_DELAY_MS < 1:
+            raise ValueError("HEDGE_DEFAULT_DELAY_MS must be >= 1")
+        if not 0 < self.HEDGE_DELAY_PERCENTILE < 1:
+            raise ValueError("HEDGE_DELAY_PERCENTILE must be in (0, 1)")
+        if self.ROUTING_CACHE_TTL_SECONDS < 1:
+            raise ValueError("ROUTING_CACHE_TTL_SECONDS must be >= 1")
+        if self.CONFIG_VERSION_POLL_INTERVAL_SECONDS <= 0:
+            raise ValueError("CONFIG_VERSION_POLL_INTERVAL_SECONDS must be > 0")
+        if self.REQUEST_LOG_STREAM_PERSIST_AFTER_SECONDS < 0:
+            raise ValueError("REQUEST_LOG_STREAM_PERSIST_AFTER_SECONDS must be >= 0")
+        if self.STREAM_CAPTURE_MAX_BYTES < 0:
+            raise ValueError("STREAM_CAPTURE_MAX_BYTES must be >= 0")
+        if self.STREAM_CAPTURE_SPILL_MAX_BYTES < 0:
+            raise ValueError("STREAM_CAPTURE_SPILL_MAX_BYTES must be >= 0")
+        if self.LOG_WRITER_MAX_QUEUE_SIZE < 1:
+            raise ValueError("LOG_WRITER_MAX_QUEUE_SIZE must be >= 1")
+        if self.LOG_WRITER_BATCH_SIZE < 1:
+            raise ValueError("LOG_WRITER_BATCH_SIZE must be >= 1")
+        if self.LOG_WRITER_FLUSH_INTERVAL_SECONDS <= 0:
+            raise ValueError("LOG_WRITER_FLUSH_INTERVAL_SECONDS must be > 0")
+        if self.API_KEY_AUTH_CACHE_TTL_SECONDS < 1:
+            raise ValueError("API_KEY_AUTH_CACHE_TTL_SECONDS must be >= 1")
+        if self.API_KEY_AUTH_CACHE_NEGATIVE_TTL_SECONDS < 0:
+            raise ValueError("API_KEY_AUTH_CACHE_NEGATIVE_TTL_SECONDS must be >= 0")
+        if self.API_KEY_LAST_USED_FLUSH_INTERVAL_SECONDS <= 0:
+            raise ValueError("API_KEY_LAST_USED_FLUSH_INTERVAL_SECONDS must be > 0")
+        if self.UPSTREAM_MAX_CONNECTIONS is not None and self.UPSTREAM_MAX_CONNECTIONS < 1:
+            raise ValueError("UPSTREAM_MAX_CONNECTIONS must be >= 1")
+        if self.UPSTREAM_POOL_TIMEOUT_SECONDS <= 0:
+            raise ValueError("UPSTREAM_POOL_TIMEOUT_SECONDS must be > 0")
+        if self.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS < 0:
+            raise ValueError("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS must be >= 0")
+        if self.UPSTREAM_KEEPALIVE_EXPIRY_SECONDS < 0:
+            raise ValueError("UPSTREAM_KEEPALIVE_EXPIRY_SECONDS must be >= 0")
         return self
 
 
@@ -7,6 +7,7 @@ Defines all database table structures for the system, including:
 - model_mapping_providers: Model-Provider Mappings Table
 - api_keys: API Keys Table
 - request_logs: Request Logs Table
+- config_version: Config Version Counter Table
 """
 
 import logging
@@ -141,7 +142,8 @@ class ModelMapping(Base):
     requested_model: Mapped[str] = mapped_column(
         String(100), primary_key=True, nullable=False
     )
-    # Selection strategy: round_robin / cost_first / priority
+    # Selection strategy: round_robin / cost_first / priority / lowest_latency /
+    # least_outstanding
     strategy: Mapped[str] = mapped_column(String(50), default="round_robin")
     # Model type: chat / speech / transcription / embedding / images
     model_type: Mapped[str] = mapped_column(String(50), default="chat")
@@ -165,6 +167,10 @@ class ModelMapping(Base):
     cache_creation_input_price: Mapped[Optional[float]] = mapped_column(
         Numeric(12, 4), nullable=True
     )
+    # Hedged requests: dispatch the next candidate when the first is slow
+    hedge_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Hedge delay in ms (NULL = adaptive, from the first candidate's latency)
+    hedge_delay_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     # Is Active
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     # Creation Time
@@ -471,3 +477,22 @@ class KeyValueStore(Base):
     __table_args__ = (
         Index("idx_kv_expires_at", "expires_at"),
     )
+
+
+class ConfigVersion(Base):
+    """
+    Config Version Table
+
+    Single-row counter bumped on every routing/auth config write. Workers poll
+    it to drop their in-process caches when Redis pub/sub is not available.
+    """
+    __tablename__ = "config_version"
+
+    # Always 1 (single row)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Monotonic version counter
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Update Time
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now_naive, onupdate=utc_now_naive, nullable=False
+    )
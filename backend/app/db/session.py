@@ -147,6 +147,8 @@ def _run_migrations(sync_conn) -> None:
             "cached_input_price": "cached_input_price NUMERIC(12,4)",
             "cached_output_price": "cached_output_price NUMERIC(12,4)",
             "cache_creation_input_price": "cache_creation_input_price NUMERIC(12,4)",
+            "hedge_enabled": "hedge_enabled BOOLEAN DEFAULT FALSE",
+            "hedge_delay_ms": "hedge_delay_ms INTEGER",
         },
     )
     ensure_columns(
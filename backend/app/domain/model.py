@@ -12,7 +12,9 @@ from typing_extensions import Literal
 
 
 BillingMode = Literal["token_flat", "token_tiered", "per_request", "per_image", "inherit_model_default"]
-SelectionStrategyType = Literal["round_robin", "cost_first", "priority"]
+SelectionStrategyType = Literal[
+    "round_robin", "cost_first", "priority", "lowest_latency", "least_outstanding"
+]
 ModelType = Literal["chat", "speech", "transcription", "embedding", "images"]
 
 
@@ -40,7 +42,7 @@ class ModelMappingBase(BaseModel):
     requested_model: str = Field(
         ..., min_length=1, max_length=100, description="Requested Model Name"
     )
-    # Selection Strategy: round_robin / cost_first / priority
+    # Selection Strategy: round_robin / cost_first / priority / lowest_latency / least_outstanding
     strategy: SelectionStrategyType = Field("round_robin", description="Selection Strategy")
     # Model Type: chat / speech / transcription / embedding / images
     model_type: ModelType = Field("chat", description="Model Type")
@@ -73,6 +75,13 @@ class ModelMappingCreate(ModelMappingBase):
     cache_creation_input_price: Optional[float] = Field(
         None, ge=0, description="Cache creation (cache WRITE) price ($/1M tokens)"
     )
+    # Hedged requests: dispatch the next candidate when the first is slow
+    hedge_enabled: bool = Field(False, description="Enable hedged requests")
+    hedge_delay_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Hedge delay (ms); None adapts to the first candidate's p90 latency",
+    )
 
     @model_validator(mode="after")
     def _validate_billing(self) -> "ModelMappingCreate":
@@ -112,6 +121,8 @@ class ModelMappingUpdate(BaseModel):
     cached_input_price: Optional[float] = Field(None, ge=0)
     cached_output_price: Optional[float] = Field(None, ge=0)
     cache_creation_input_price: Optional[float] = Field(None, ge=0)
+    hedge_enabled: Optional[bool] = None
+    hedge_delay_ms: Optional[int] = Field(None, ge=1)
 
 
 class ModelMapping(ModelMappingBase):
@@ -129,6 +140,8 @@ class ModelMapping(ModelMappingBase):
     cached_input_price: Optional[float] = None
     cached_output_price: Optional[float] = None
     cache_creation_input_price: Optional[float] = None
+    hedge_enabled: bool = False
+    hedge_delay_ms: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -362,6 +375,11 @@ class ModelMappingProviderResponse(ModelMappingProvider):
     health_sample_count: int = Field(0, description="Health-window sample count")
     health_failure_count: int = Field(0, description="Health-window failure count")
     health_failure_rate: float = Field(0.0, description="Health-window failure rate")
+    health_circuit_state: str = Field(
+        "closed", description="Hard circuit breaker state: closed, open or half_open"
+    )
+    # Upstream requests currently outstanding on this mapping (this process)
+    in_flight: int = Field(0, description="In-flight upstream requests")
     # Resolved billing config for history copy/apply scenarios
     resolved_billing_mode: Optional[BillingMode] = Field(
         None, description="Resolved billing mode after applying model fallback"
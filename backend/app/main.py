@@ -20,6 +20,8 @@ from app.api.admin import api_keys_router, logs_router, models_router, providers
 from app.api.auth import router as auth_router
 from app.api.proxy import anthropic_router, openai_router
 from app.common.errors import AppError
+from app.common.http_client import upstream_client_pool
+from app.common.token_count_executor import token_count_executor
 from app.common.mcp_auth import MCPAuthMiddleware
 from app.config import get_settings
 from app.db.redis import close_redis, init_redis
@@ -27,6 +29,9 @@ from app.db.session import init_db
 from app.logging_config import setup_logging
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.scheduler import shutdown_scheduler, start_scheduler
+from app.services.api_key_auth import api_key_last_used
+from app.services.config_bus import config_bus
+from app.services.log_writer import log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +50,81 @@ if _settings_boot.MCP_ENABLED:
     logger.info("MCP interface enabled at /mcp")
 
 
+def _uses_redis(settings) -> bool:
+    """Whether the KV store, rate limiter or provider health needs Redis."""
+    return (
+        settings.KV_STORE_TYPE == "redis"
+        or (settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "redis")
+        or (
+            settings.PROVIDER_HEALTH_ENABLED
+            and settings.PROVIDER_HEALTH_BACKEND == "redis"
+        )
+    )
+
+
+async def _start_config_bus(settings) -> None:
+    """Subscribe this worker to config writes made by other workers."""
+    if settings.KV_STORE_TYPE == "redis":
+        from app.db.redis import get_redis
+        from app.repositories.redis import RedisConfigVersionRepository
+        from app.repositories.redis.config_version_repo import CONFIG_VERSION_CHANNEL
+
+        @asynccontextmanager
+        async def redis_repo():
+            yield RedisConfigVersionRepository(get_redis())
+
+        await config_bus.start(
+            redis_repo,
+            redis_client=get_redis(),
+            channel=CONFIG_VERSION_CHANNEL,
+        )
+        return
+
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.sqlalchemy import SQLAlchemyConfigVersionRepository
+
+    @asynccontextmanager
+    async def db_repo():
+        async with AsyncSessionLocal() as session:
+            yield SQLAlchemyConfigVersionRepository(session)
+
+    await config_bus.start(
+        db_repo,
+        poll_interval_seconds=settings.CONFIG_VERSION_POLL_INTERVAL_SECONDS,
+    )
+
+
+async def _start_api_key_last_used(settings) -> None:
+    """Batch API key last_used_at writes instead of one UPDATE per request."""
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.sqlalchemy import SQLAlchemyApiKeyRepository
+
+    @asynccontextmanager
+    async def db_repo():
+        async with AsyncSessionLocal() as session:
+            yield SQLAlchemyApiKeyRepository(session)
+
+    await api_key_last_used.start(
+        db_repo,
+        flush_interval_seconds=settings.API_KEY_LAST_USED_FLUSH_INTERVAL_SECONDS,
+    )
+
+
+async def _start_log_writer(settings) -> None:
+    """Write request logs in background batches instead of inline."""
+    if not settings.LOG_WRITER_ENABLED:
+        return
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.sqlalchemy import SQLAlchemyLogRepository
+
+    @asynccontextmanager
+    async def db_repo():
+        async with AsyncSessionLocal() as session:
+            yield SQLAlchemyLogRepository(session)
+
+    await log_writer.start(db_repo)
+
+
 # Application Lifecycle Management
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -56,8 +136,11 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     settings = get_settings()
-    if settings.KV_STORE_TYPE == "redis":
+    if _uses_redis(settings):
         await init_redis()
+    await _start_config_bus(settings)
+    await _start_api_key_last_used(settings)
+    await _start_log_writer(settings)
     start_scheduler()
 
     # Run the MCP session manager for the lifetime of the app when enabled.
@@ -66,14 +149,24 @@ async def lifespan(app: FastAPI):
             yield
             # Shutdown (inside MCP lifespan so it is torn down last)
             shutdown_scheduler()
-            if settings.KV_STORE_TYPE == "redis":
+            await config_bus.stop()
+            await upstream_client_pool.aclose()
+            await api_key_last_used.stop()
+            await log_writer.stop()
+            token_count_executor.shutdown()
+            if _uses_redis(settings):
                 await close_redis()
         return
 
     yield
     # Shutdown
     shutdown_scheduler()
-    if settings.KV_STORE_TYPE == "redis":
+    await config_bus.stop()
+    await upstream_client_pool.aclose()
+    await api_key_last_used.stop()
+    await log_writer.stop()
+    token_count_executor.shutdown()
+    if _uses_redis(settings):
         await close_redis()
 
 
@@ -134,6 +227,7 @@ async def app_error_handler(request: Request, exc: AppError):
     return JSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict(include_details=include_details),
+        headers=exc.headers,
     )
 
 
@@ -2,19 +2,23 @@
 Rate Limit Middleware Module
 
 Implements API rate limiting based on IP address or API key.
-Supports configurable rate limits for different endpoint types.
+Supports configurable rate limits for different endpoint types, enforced
+per process or, with RATE_LIMIT_BACKEND=redis, across all workers.
 """
 
 import logging
 import hashlib
-import time
-from typing import Callable
 
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.rate_limiter import (
+    InMemoryRateLimiter,
+    RateLimiter,
+    create_rate_limiter,
+)
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -65,69 +69,9 @@ def parse_rate_limit(limit: str) -> tuple[int, int]:
     return count, unit_multipliers[unit]
 
 
-class InMemoryRateLimiter:
-    """
-    In-memory rate limiter using sliding window algorithm.
-
-    For production with multiple workers, consider using Redis-backed limiter.
+class RateLimitMiddleware:
     """
-
-    def __init__(self) -> None:
-        # Structure: {key: [(timestamp, count), ...]}
-        self._requests: dict[str, list[tuple[float, int]]] = {}
-
-    def is_allowed(self, key: str, max_requests: int, window_seconds: int) -> tuple[bool, int, int]:
-        """
-        Check if request is allowed under rate limit.
-
-        Args:
-            key: Unique identifier (IP or API key)
-            max_requests: Maximum requests allowed in window
-            window_seconds: Time window in seconds
-
-        Returns:
-            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
-        """
-        current_time = time.time()
-        window_start = current_time - window_seconds
-
-        # Get existing requests for this key
-        if key not in self._requests:
-            self._requests[key] = []
-
-        # Clean up old entries outside the window
-        self._requests[key] = [
-            (ts, count) for ts, count in self._requests[key]
-            if ts > window_start
-        ]
-
-        # Calculate total requests in current window
-        total_requests = sum(count for _, count in self._requests[key])
-
-        if total_requests >= max_requests:
-            # Calculate retry after
-            oldest = min(ts for ts, _ in self._requests[key]) if self._requests[key] else current_time
-            retry_after = int(oldest + window_seconds - current_time) + 1
-            return False, 0, max(1, retry_after)
-
-        # Record this request
-        self._requests[key].append((current_time, 1))
-        remaining = max_requests - total_requests - 1
-
-        return True, remaining, 0
-
-    def cleanup_expired(self, max_age_seconds: int = 3600) -> None:
-        """Remove entries older than max_age_seconds."""
-        cutoff = time.time() - max_age_seconds
-        self._requests = {
-            k: v for k, v in self._requests.items()
-            if v and max(ts for ts, _ in v) > cutoff
-        }
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """
-    Rate Limit Middleware
+    Rate Limit Middleware (pure ASGI)
 
     Enforces rate limits based on:
     1. API Key (if authenticated) - higher priority
@@ -137,17 +81,21 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     - Proxy endpoints (/v1/*): PROXY_RATE_LIMIT
     - Admin endpoints (/api/*): ADMIN_RATE_LIMIT
     - Other endpoints: DEFAULT_RATE_LIMIT
+
+    Only the request line and headers are inspected; the request body is never
+    read and response messages after ``http.response.start`` (e.g. streamed
+    chunks) are forwarded untouched.
     """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
         settings = get_settings()
         self.enabled = settings.RATE_LIMIT_ENABLED
         self.default_limit = settings.RATE_LIMIT_DEFAULT
         self.admin_limit = settings.RATE_LIMIT_ADMIN
         self.proxy_limit = settings.RATE_LIMIT_PROXY
 
-        self._limiter = InMemoryRateLimiter()
+        self._limiter: RateLimiter = create_rate_limiter(settings)
 
         # Parse rate limits
         self._default_max, self._default_window = parse_rate_limit(self.default_limit)
@@ -156,6 +104,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         logger.info(
             f"Rate limit middleware initialized: enabled={self.enabled}, "
+            f"backend={type(self._limiter).__name__}, "
             f"default={self.default_limit}, admin={self.admin_limit}, proxy={self.proxy_limit}"
         )
 
@@ -239,32 +188,35 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         ]
         return any(path == prefix or path.startswith(f"{prefix}/") for prefix in excluded_prefixes)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through rate limiter."""
-        # Skip if rate limiting is disabled
-        if not self.enabled:
-            return await call_next(request)
+        # Skip if rate limiting is disabled or not an HTTP request
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        path = request.url.path
+        path = scope["path"]
 
         # Skip excluded paths
         if self._is_excluded_path(path):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Skip static files
         if path.startswith("/_next/") or any(
             path.endswith(ext) for ext in [".js", ".css", ".png", ".jpg", ".ico", ".svg", ".woff", ".woff2"]
         ):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        # Get rate limit key
-        key, key_type = self._get_rate_limit_key(request)
+        # Get rate limit key (headers only; the body is left unread)
+        key, key_type = self._get_rate_limit_key(Request(scope))
 
         # Get endpoint-specific limits
         max_requests, window_seconds = self._get_endpoint_limits(path)
 
         # Check rate limit
-        is_allowed, remaining, retry_after = self._limiter.is_allowed(
+        is_allowed, remaining, retry_after = await self._limiter.acquire(
             key, max_requests, window_seconds
         )
 
@@ -273,7 +225,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 f"Rate limit exceeded: key={key}, type={key_type}, path={path}, "
                 f"limit={max_requests}/{window_seconds}s"
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": {
@@ -289,18 +241,27 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "Retry-After": str(retry_after),
                 },
             )
+            await response(scope, receive, send)
+            return
 
-        # Process request
-        response = await call_next(request)
+        rate_limit_headers = (
+            ("X-RateLimit-Limit", str(max_requests)),
+            ("X-RateLimit-Remaining", str(remaining)),
+            ("X-RateLimit-Reset", str(window_seconds)),
+        )
 
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit"] = str(max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(window_seconds)
+        async def send_with_headers(message: Message) -> None:
+            # Add rate limit headers to response
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers:
+                    headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
 
     def cleanup(self) -> None:
-        """Clean up expired rate limit entries."""
-        self._limiter.cleanup_expired()
+        """Clean up expired rate limit entries (Redis keys expire on their own)."""
+        if isinstance(self._limiter, InMemoryRateLimiter):
+            self._limiter.cleanup_expired()
         logger.debug("Rate limit cleanup completed")
@@ -11,6 +11,8 @@ from typing import Any, AsyncGenerator, Optional
 
 import httpx
 
+from app.common import json_codec
+from app.common.http_client import upstream_client_pool
 from app.common.upstream_url import build_upstream_url
 from app.common.timer import Timer
 from app.config import get_settings
@@ -174,20 +176,23 @@ class AnthropicClient(ProviderClient):
             prepared_headers = self._sanitize_minimax_headers(prepared_headers)
         prepared_headers["Content-Type"] = "application/json"
         
-        logger.debug(
-            "Anthropic Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(prepared_body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Anthropic Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(prepared_body),
+            )
         
         timer = Timer().start()
         
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 response = await client.request(
                     method=method,
                     url=url,
@@ -266,7 +271,9 @@ class AnthropicClient(ProviderClient):
 
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
-            async with httpx.AsyncClient(timeout=self.timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, self.timeout
+            ) as client:
                 response = await client.request(
                     method="GET",
                     url=url,
@@ -355,13 +362,14 @@ class AnthropicClient(ProviderClient):
             prepared_headers = self._sanitize_minimax_headers(prepared_headers)
         prepared_headers["Content-Type"] = "application/json"
         
-        logger.debug(
-            "Anthropic Stream Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(prepared_body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Anthropic Stream Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(prepared_body),
+            )
         
         timer = Timer().start()
         first_chunk = True
@@ -369,7 +377,9 @@ class AnthropicClient(ProviderClient):
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 async with client.stream(
                     method=method,
                     url=url,
@@ -10,6 +10,8 @@ from typing import Any, AsyncGenerator, Optional
 
 import httpx
 
+from app.common import json_codec
+from app.common.http_client import upstream_client_pool
 from app.common.protocol import sanitize_gemini_request_body
 from app.common.timer import Timer
 from app.config import get_settings
@@ -100,20 +102,23 @@ class GeminiClient(ProviderClient):
         prepared_headers["Content-Type"] = "application/json"
         body = sanitize_gemini_request_body(body)
 
-        logger.debug(
-            "Gemini Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Gemini Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(body),
+            )
 
         timer = Timer().start()
 
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 response = await client.request(
                     method=method,
                     url=url,
@@ -189,7 +194,9 @@ class GeminiClient(ProviderClient):
 
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
-            async with httpx.AsyncClient(timeout=self.timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, self.timeout
+            ) as client:
                 response = await client.request(
                     method="GET",
                     url=url,
@@ -262,13 +269,14 @@ class GeminiClient(ProviderClient):
         prepared_headers["Content-Type"] = "application/json"
         body = sanitize_gemini_request_body(body)
 
-        logger.debug(
-            "Gemini Stream Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Gemini Stream Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(body),
+            )
 
         timer = Timer().start()
         first_chunk = True
@@ -276,7 +284,9 @@ class GeminiClient(ProviderClient):
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 async with client.stream(
                     method=method,
                     url=url,
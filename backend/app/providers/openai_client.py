@@ -10,6 +10,8 @@ from typing import Any, AsyncGenerator, Optional
 
 import httpx
 
+from app.common import json_codec
+from app.common.http_client import upstream_client_pool
 from app.common.protocol import sanitize_anthropic_tools
 from app.common.upstream_url import build_upstream_url
 from app.common.timer import Timer
@@ -119,20 +121,23 @@ class OpenAIClient(ProviderClient):
                 )
             log_body = {**prepared_body, "_files": safe_files}
 
-        logger.debug(
-            "OpenAI Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(log_body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "OpenAI Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(log_body),
+            )
         
         timer = Timer().start()
         
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 request_kwargs: dict[str, Any] = {
                     "method": method,
                     "url": url,
@@ -217,7 +222,9 @@ class OpenAIClient(ProviderClient):
 
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
-            async with httpx.AsyncClient(timeout=self.timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, self.timeout
+            ) as client:
                 response = await client.request(
                     method="GET",
                     url=url,
@@ -331,13 +338,14 @@ class OpenAIClient(ProviderClient):
                 )
             log_body = {**prepared_body, "_files": safe_files}
 
-        logger.debug(
-            "OpenAI Stream Request: method=%s url=%s headers=%s body=%s",
-            method,
-            url,
-            prepared_headers,
-            json.dumps(log_body, ensure_ascii=False),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "OpenAI Stream Request: method=%s url=%s headers=%s body=%s",
+                method,
+                url,
+                prepared_headers,
+                json_codec.dumps(log_body),
+            )
         
         timer = Timer().start()
         first_chunk = True
@@ -345,7 +353,9 @@ class OpenAIClient(ProviderClient):
         try:
             proxy_url = proxy_config.get("all://") if proxy_config else None
             timeout = self._resolve_timeout(response_timeout_seconds)
-            async with httpx.AsyncClient(timeout=timeout, proxy=proxy_url) as client:
+            async with upstream_client_pool.client(
+                base_url, proxy_url, timeout
+            ) as client:
                 stream_kwargs: dict[str, Any] = {
                     "method": method,
                     "url": url,
@@ -8,6 +8,7 @@ from app.repositories.model_repo import ModelRepository
 from app.repositories.api_key_repo import ApiKeyRepository
 from app.repositories.log_repo import LogRepository
 from app.repositories.kv_store_repo import KVStoreRepository
+from app.repositories.config_version_repo import ConfigVersionRepository
 
 __all__ = [
     "BaseRepository",
@@ -16,4 +17,5 @@ __all__ = [
     "ApiKeyRepository",
     "LogRepository",
     "KVStoreRepository",
+    "ConfigVersionRepository",
 ]
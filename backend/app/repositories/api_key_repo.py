@@ -5,7 +5,7 @@ Defines the data access interface for API Keys.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
 from app.domain.api_key import ApiKeyModel, ApiKeyCreate, ApiKeyUpdate
@@ -68,6 +68,11 @@ class ApiKeyRepository(ABC):
         """Update Last Used Time"""
         pass
     
+    @abstractmethod
+    async def bulk_update_last_used(self, last_used: Dict[int, datetime]) -> None:
+        """Update Last Used Time for several keys in one transaction (never moves it backwards)"""
+        pass
+    
     @abstractmethod
     async def delete(self, id: int) -> bool:
         """Delete API Key"""
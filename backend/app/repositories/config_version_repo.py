@@ -0,0 +1,31 @@
+"""
+Config Version Repository Interface
+
+Defines the data access interface for the shared config version counter.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class ConfigVersionRepository(ABC):
+    """Config Version Repository Interface"""
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """
+        Get the current config version
+
+        Returns:
+            Current version (0 when no write has been recorded yet)
+        """
+        pass
+
+    @abstractmethod
+    async def bump(self) -> int:
+        """
+        Atomically increment the config version and announce the change
+
+        Returns:
+            The new version
+        """
+        pass
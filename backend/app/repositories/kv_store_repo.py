@@ -45,6 +45,19 @@ class KVStoreRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    async def set_many(self, items: dict[str, str], ttl_seconds: Optional[int] = None) -> None:
+        """
+        Set several key-value pairs at once (same TTL for all)
+        
+        Existing keys are updated.
+        
+        Args:
+            items: Mapping of key to value
+            ttl_seconds: Time to live in seconds (None means never expires)
+        """
+        pass
+    
     @abstractmethod
     async def delete(self, key: str) -> bool:
         """
@@ -64,6 +64,35 @@ class LogRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def bulk_create(self, items: List[RequestLogCreate]) -> List[int]:
+        """
+        Create several complete log entries (with detail rows) in one transaction.
+
+        Args:
+            items: Log creation data
+
+        Returns:
+            List[int]: IDs of the created entries, in input order
+        """
+        pass
+
+    @abstractmethod
+    async def bulk_update(self, items: List[Tuple[int, RequestLogCreate]]) -> int:
+        """
+        Complete several in-progress log entries in one transaction.
+
+        Entries that are no longer in progress (cancelled or already completed)
+        are skipped, as with ``update``.
+
+        Args:
+            items: (log_id, completion data) pairs
+
+        Returns:
+            int: Number of entries completed
+        """
+        pass
+
     @abstractmethod
     async def cancel(self, log_id: int, error_info: str = "Request cancelled by admin") -> None:
         """
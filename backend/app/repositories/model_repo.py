@@ -5,7 +5,7 @@ Defines the data access interface for Model Mappings and Model-Provider Mappings
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 
 from app.domain.model import (
     ModelMapping,
@@ -106,6 +106,13 @@ class ModelRepository(ABC):
     async def get_active_provider_count(self, requested_model: str) -> int:
         """Get the count of active providers associated with the model"""
         pass
+
+    @abstractmethod
+    async def get_provider_counts(
+        self, requested_models: Iterable[str]
+    ) -> Dict[str, Tuple[int, int]]:
+        """Get (provider count, active provider count) for several models in one query"""
+        pass
     
     @abstractmethod
     async def update_provider_mapping(self, id: int, data: ModelMappingProviderUpdate) -> Optional[ModelMappingProvider]:
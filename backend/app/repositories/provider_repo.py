@@ -5,7 +5,7 @@ Defines the data access interface for Providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 
 from app.domain.provider import Provider, ProviderCreate, ProviderUpdate
 
@@ -23,6 +23,11 @@ class ProviderRepository(ABC):
         """Get Provider by ID"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, ids: Iterable[int]) -> Dict[int, Provider]:
+        """Get Providers by IDs in one query, keyed by ID (missing IDs omitted)"""
+        pass
+    
     @abstractmethod
     async def get_by_name(self, name: str) -> Optional[Provider]:
         """Get Provider by Name"""
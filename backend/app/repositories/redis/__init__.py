@@ -3,7 +3,9 @@ Redis Repository Implementation Module Initialization
 """
 
 from app.repositories.redis.kv_store_repo import RedisKVStoreRepository
+from app.repositories.redis.config_version_repo import RedisConfigVersionRepository
 
 __all__ = [
     "RedisKVStoreRepository",
+    "RedisConfigVersionRepository",
 ]
@@ -0,0 +1,42 @@
+"""
+Config Version Repository Redis Implementation
+
+Keeps the config version in a Redis counter and announces every bump on a
+pub/sub channel so subscribed workers can drop their caches immediately.
+"""
+
+from redis.asyncio import Redis
+
+from app.repositories.config_version_repo import ConfigVersionRepository
+
+CONFIG_VERSION_KEY = "llm_gateway:config_version"
+CONFIG_VERSION_CHANNEL = "llm_gateway:config_version"
+
+
+class RedisConfigVersionRepository(ConfigVersionRepository):
+    """
+    Config Version Repository Redis Implementation
+
+    INCR keeps the counter atomic across workers and replicas; PUBLISH pushes
+    the new version to every subscriber.
+    """
+
+    def __init__(self, client: Redis):
+        """
+        Initialize Repository
+
+        Args:
+            client: Async Redis client instance
+        """
+        self.client = client
+
+    async def get_version(self) -> int:
+        """Get the current config version"""
+        raw = await self.client.get(CONFIG_VERSION_KEY)
+        return int(raw) if raw is not None else 0
+
+    async def bump(self) -> int:
+        """Increment the config version and publish it"""
+        version = int(await self.client.incr(CONFIG_VERSION_KEY))
+        await self.client.publish(CONFIG_VERSION_CHANNEL, str(version))
+        return version
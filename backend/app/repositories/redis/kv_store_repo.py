@@ -91,6 +91,28 @@ class RedisKVStoreRepository(KVStoreRepository):
             updated_at=now_iso,
         )
 
+    async def set_many(
+        self, items: dict[str, str], ttl_seconds: Optional[int] = None
+    ) -> None:
+        """Set several key-value pairs with one round trip per phase"""
+        if not items:
+            return
+        keys = list(items)
+        now_iso = utc_now().isoformat()
+        # Preserve original created_at of keys that already exist
+        existing = await self.client.mget(keys)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, raw in zip(keys, existing):
+                created_at = (
+                    json.loads(raw)["created_at"] if raw is not None else now_iso
+                )
+                data = self._serialize(items[key], created_at, now_iso)
+                if ttl_seconds is not None and ttl_seconds > 0:
+                    pipe.set(key, data, ex=ttl_seconds)
+                else:
+                    pipe.set(key, data)
+            await pipe.execute()
+
     async def delete(self, key: str) -> bool:
         """Delete a key"""
         deleted_count = await self.client.delete(key)
@@ -7,6 +7,7 @@ from app.repositories.sqlalchemy.model_repo import SQLAlchemyModelRepository
 from app.repositories.sqlalchemy.api_key_repo import SQLAlchemyApiKeyRepository
 from app.repositories.sqlalchemy.log_repo import SQLAlchemyLogRepository
 from app.repositories.sqlalchemy.kv_store_repo import SQLAlchemyKVStoreRepository
+from app.repositories.sqlalchemy.config_version_repo import SQLAlchemyConfigVersionRepository
 
 __all__ = [
     "SQLAlchemyProviderRepository",
@@ -14,4 +15,5 @@ __all__ = [
     "SQLAlchemyApiKeyRepository",
     "SQLAlchemyLogRepository",
     "SQLAlchemyKVStoreRepository",
-]
\ No newline at end of file
+    "SQLAlchemyConfigVersionRepository",
+]
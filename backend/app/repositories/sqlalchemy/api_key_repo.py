@@ -7,7 +7,7 @@ Provides concrete database operation implementation for API Keys.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.time import ensure_utc, to_utc_naive
@@ -137,6 +137,35 @@ class SQLAlchemyApiKeyRepository(ApiKeyRepository):
         if entity:
             entity.last_used_at = to_utc_naive(last_used_at)
             await self.session.commit()
+
+    async def bulk_update_last_used(self, last_used: dict[int, datetime]) -> None:
+        """Update last used time for several keys in one transaction.
+
+        Rows that already hold a newer value (e.g. written by another worker)
+        are left untouched.
+        """
+        if not last_used:
+            return
+        table = ApiKeyORM.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .where(
+                or_(
+                    table.c.last_used_at.is_(None),
+                    table.c.last_used_at < bindparam("b_last_used_at"),
+                )
+            )
+            .values(last_used_at=bindparam("b_last_used_at"))
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {"b_id": api_key_id, "b_last_used_at": to_utc_naive(used_at)}
+                for api_key_id, used_at in last_used.items()
+            ],
+        )
+        await self.session.commit()
     
     async def delete(self, id: int) -> bool:
         """Delete API Key"""
@@ -0,0 +1,64 @@
+"""
+Config Version Repository SQLAlchemy Implementation
+
+Stores the config version in a single-row table that workers poll.
+"""
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.time import utc_now_naive
+from app.db.models import ConfigVersion as ConfigVersionORM
+from app.repositories.config_version_repo import ConfigVersionRepository
+
+CONFIG_VERSION_ROW_ID = 1
+
+
+class SQLAlchemyConfigVersionRepository(ConfigVersionRepository):
+    """
+    Config Version Repository SQLAlchemy Implementation
+
+    Uses an in-place ``version = version + 1`` UPDATE so concurrent bumps from
+    several workers never lose an increment.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize Repository
+
+        Args:
+            session: Async database session
+        """
+        self.session = session
+
+    async def get_version(self) -> int:
+        """Get the current config version"""
+        result = await self.session.execute(
+            select(ConfigVersionORM.version).where(
+                ConfigVersionORM.id == CONFIG_VERSION_ROW_ID
+            )
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self) -> int:
+        """Increment the config version, creating the row on first use"""
+        result = await self.session.execute(
+            update(ConfigVersionORM)
+            .where(ConfigVersionORM.id == CONFIG_VERSION_ROW_ID)
+            .values(
+                version=ConfigVersionORM.version + 1,
+                updated_at=utc_now_naive(),
+            )
+        )
+        if result.rowcount == 0:
+            self.session.add(ConfigVersionORM(id=CONFIG_VERSION_ROW_ID, version=1))
+            try:
+                await self.session.commit()
+                return 1
+            except IntegrityError:
+                # Another worker created the row first; bump it instead.
+                await self.session.rollback()
+                return await self.bump()
+        await self.session.commit()
+        return await self.get_version()
@@ -93,6 +93,29 @@ class SQLAlchemyKVStoreRepository(KVStoreRepository):
         await self.session.refresh(entity)
         return self._to_domain(entity)
     
+    async def set_many(self, items: dict[str, str], ttl_seconds: Optional[int] = None) -> None:
+        """Set several key-value pairs in one transaction"""
+        if not items:
+            return
+        expires_at = None
+        if ttl_seconds is not None and ttl_seconds > 0:
+            expires_at = utc_now_naive() + timedelta(seconds=ttl_seconds)
+
+        result = await self.session.execute(
+            select(KeyValueStoreORM).where(KeyValueStoreORM.key.in_(list(items)))
+        )
+        existing = {entity.key: entity for entity in result.scalars().all()}
+        for key, value in items.items():
+            entity = existing.get(key)
+            if entity:
+                entity.value = value
+                entity.expires_at = expires_at
+            else:
+                self.session.add(
+                    KeyValueStoreORM(key=key, value=value, expires_at=expires_at)
+                )
+        await self.session.commit()
+    
     async def delete(self, key: str) -> bool:
         """Delete a key"""
         result = await self.session.execute(
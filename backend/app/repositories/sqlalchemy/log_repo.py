@@ -7,7 +7,20 @@ Provides concrete database operation implementation for request logs.
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import Integer, and_, case, cast, delete, func, not_, or_, select
+from sqlalchemy import (
+    Integer,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    not_,
+    or_,
+    select,
+)
+from sqlalchemy import update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, joinedload
 
@@ -59,6 +72,66 @@ _SUMMARY_COLUMNS = [
 ]
 
 
+# Summary fields written when a log entry is completed (update/bulk_update)
+_COMPLETION_FIELDS = (
+    "provider_id",
+    "provider_name",
+    "retry_count",
+    "matched_provider_count",
+    "first_byte_delay_ms",
+    "total_time_ms",
+    "input_tokens",
+    "output_tokens",
+    "total_cost",
+    "input_cost",
+    "output_cost",
+    "cached_input_cost",
+    "cached_output_cost",
+    "price_source",
+    "response_status",
+    "target_model",
+    "supplier_protocol",
+    "upstream_url",
+)
+
+# Summary fields written when a complete log entry is inserted (bulk_create)
+_SUMMARY_INSERT_FIELDS = _COMPLETION_FIELDS + (
+    "api_key_id",
+    "api_key_name",
+    "user_id",
+    "requested_model",
+    "trace_id",
+    "is_stream",
+    "is_completed",
+    "request_protocol",
+    "request_path",
+    "request_url",
+    "request_method",
+)
+
+# Large fields stored in the detail table
+_DETAIL_FIELDS = (
+    "request_body",
+    "response_body",
+    "request_headers",
+    "response_headers",
+    "converted_request_body",
+    "upstream_response_body",
+    "usage_details",
+    "error_info",
+)
+
+
+def _completion_values(data: RequestLogCreate) -> dict:
+    return {field: getattr(data, field) for field in _COMPLETION_FIELDS}
+
+
+def _detail_values(log_id: int, data: RequestLogCreate) -> dict:
+    values = {field: getattr(data, field) for field in _DETAIL_FIELDS}
+    values["log_id"] = log_id
+    return values
+
+
 def _pg_make_interval_minutes(minutes):
     # Use 6-arg signature (without seconds) and cast minutes to integer for PostgreSQL.
     return func.make_interval(0, 0, 0, 0, 0, cast(minutes, Integer))
@@ -304,8 +377,6 @@ class SQLAlchemyLogRepository(LogRepository):
 
     async def update(self, log_id: int, data: RequestLogCreate) -> RequestLogModel:
         """Complete an in-progress log without overwriting a concurrent cancel."""
-        from sqlalchemy import update as sa_update
-
         from app.common.errors import NotFoundError
 
         stmt = (
@@ -314,27 +385,7 @@ class SQLAlchemyLogRepository(LogRepository):
                 RequestLogORM.id == log_id,
                 RequestLogORM.is_completed.is_(False),
             )
-            .values(
-                provider_id=data.provider_id,
-                provider_name=data.provider_name,
-                retry_count=data.retry_count,
-                matched_provider_count=data.matched_provider_count,
-                first_byte_delay_ms=data.first_byte_delay_ms,
-                total_time_ms=data.total_time_ms,
-                input_tokens=data.input_tokens,
-                output_tokens=data.output_tokens,
-                total_cost=data.total_cost,
-                input_cost=data.input_cost,
-                output_cost=data.output_cost,
-                cached_input_cost=data.cached_input_cost,
-                cached_output_cost=data.cached_output_cost,
-                price_source=data.price_source,
-                response_status=data.response_status,
-                is_completed=True,
-                target_model=data.target_model,
-                supplier_protocol=data.supplier_protocol,
-                upstream_url=data.upstream_url,
-            )
+            .values(is_completed=True, **_completion_values(data))
         )
         update_result = await self.session.execute(stmt)
 
@@ -351,18 +402,7 @@ class SQLAlchemyLogRepository(LogRepository):
             return existing
 
         # Upsert detail row
-        detail = RequestLogDetailORM(
-            log_id=log_id,
-            request_body=data.request_body,
-            response_body=data.response_body,
-            request_headers=data.request_headers,
-            response_headers=data.response_headers,
-            converted_request_body=data.converted_request_body,
-            upstream_response_body=data.upstream_response_body,
-            usage_details=data.usage_details,
-            error_info=data.error_info,
-        )
-        await self.session.merge(detail)
+        await self.session.merge(RequestLogDetailORM(**_detail_values(log_id, data)))
         await self.session.commit()
 
         # Re-fetch with joined detail
@@ -374,10 +414,91 @@ class SQLAlchemyLogRepository(LogRepository):
         entity = result.unique().scalar_one()
         return self._to_domain(entity)
 
+    async def bulk_create(self, items: list[RequestLogCreate]) -> list[int]:
+        """Insert complete log entries with multi-row INSERTs (summary + detail)."""
+        if not items:
+            return []
+        summary_rows = []
+        for data in items:
+            row = {field: getattr(data, field) for field in _SUMMARY_INSERT_FIELDS}
+            row["request_time"] = to_utc_naive(data.request_time)
+            summary_rows.append(row)
+        result = await self.session.execute(
+            insert(RequestLogORM).returning(
+                RequestLogORM.id, sort_by_parameter_order=True
+            ),
+            summary_rows,
+        )
+        log_ids = list(result.scalars().all())
+        await self.session.execute(
+            insert(RequestLogDetailORM),
+            [_detail_values(log_id, data) for log_id, data in zip(log_ids, items)],
+        )
+        await self.session.commit()
+        return log_ids
+
+    async def bulk_update(self, items: list[tuple[int, RequestLogCreate]]) -> int:
+        """Complete in-progress log entries with one executemany UPDATE.
+
+        Rows are locked first (PostgreSQL) so only entries still in progress,
+        i.e. not cancelled concurrently, get their summary and detail written.
+        """
+        if not items:
+            return 0
+        result = await self.session.execute(
+            select(RequestLogORM.id)
+            .where(
+                RequestLogORM.id.in_([log_id for log_id, _ in items]),
+                RequestLogORM.is_completed.is_(False),
+            )
+            .with_for_update()
+        )
+        in_progress = set(result.scalars().all())
+        # Last completion wins if the same entry was queued twice.
+        pending = {
+            log_id: data for log_id, data in items if log_id in in_progress
+        }
+        if not pending:
+            await self.session.rollback()
+            return 0
+
+        table = RequestLogORM.__table__
+        stmt = (
+            sa_update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .where(table.c.is_completed.is_(False))
+            .values(
+                is_completed=True,
+                **{field: bindparam(f"b_{field}") for field in _COMPLETION_FIELDS},
+            )
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {
+                    "b_id": log_id,
+                    **{
+                        f"b_{field}": value
+                        for field, value in _completion_values(data).items()
+                    },
+                }
+                for log_id, data in pending.items()
+            ],
+        )
+        await self.session.execute(
+            delete(RequestLogDetailORM).where(
+                RequestLogDetailORM.log_id.in_(list(pending))
+            )
+        )
+        await self.session.execute(
+            insert(RequestLogDetailORM),
+            [_detail_values(log_id, data) for log_id, data in pending.items()],
+        )
+        await self.session.commit()
+        return len(pending)
+
     async def cancel(self, log_id: int, error_info: str = "Request cancelled by admin") -> None:
         """Atomically mark an in-progress log as cancelled."""
-        from sqlalchemy import update as sa_update
-
         from app.common.errors import NotFoundError
 
         stmt = (
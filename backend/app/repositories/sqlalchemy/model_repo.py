@@ -4,9 +4,9 @@ Model Repository SQLAlchemy Implementation
 Provides concrete database operation implementation for Model Mappings and Model-Provider Mappings.
 """
 
-from typing import Optional
+from typing import Iterable, Optional
 
-from sqlalchemy import func, select, delete, or_
+from sqlalchemy import and_, case, func, select, delete, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -63,6 +63,8 @@ class SQLAlchemyModelRepository(ModelRepository):
             cached_input_price=float(entity.cached_input_price) if entity.cached_input_price is not None else None,
             cached_output_price=float(entity.cached_output_price) if entity.cached_output_price is not None else None,
             cache_creation_input_price=float(entity.cache_creation_input_price) if entity.cache_creation_input_price is not None else None,
+            hedge_enabled=bool(entity.hedge_enabled),
+            hedge_delay_ms=entity.hedge_delay_ms,
             created_at=ensure_utc(entity.created_at),
             updated_at=ensure_utc(entity.updated_at),
         )
@@ -133,6 +135,8 @@ class SQLAlchemyModelRepository(ModelRepository):
             cached_input_price=data.cached_input_price,
             cached_output_price=data.cached_output_price,
             cache_creation_input_price=data.cache_creation_input_price,
+            hedge_enabled=data.hedge_enabled,
+            hedge_delay_ms=data.hedge_delay_ms,
         )
         self.session.add(entity)
         await self.session.commit()
@@ -487,3 +491,37 @@ class SQLAlchemyModelRepository(ModelRepository):
             .where(ServiceProvider.is_active.is_(True))
         )
         return result.scalar() or 0
+
+    async def get_provider_counts(
+        self, requested_models: Iterable[str]
+    ) -> dict[str, tuple[int, int]]:
+        """Get (provider count, active provider count) for several models.
+
+        Counts match get_provider_count / get_active_provider_count; models
+        without provider mappings are reported as (0, 0).
+        """
+        models = list(dict.fromkeys(requested_models))
+        if not models:
+            return {}
+        active = and_(
+            ModelMappingProviderORM.is_active.is_(True),
+            ServiceProvider.is_active.is_(True),
+        )
+        result = await self.session.execute(
+            select(
+                ModelMappingProviderORM.requested_model,
+                func.count(),
+                func.sum(case((active, 1), else_=0)),
+            )
+            .select_from(ModelMappingProviderORM)
+            .outerjoin(
+                ServiceProvider,
+                ModelMappingProviderORM.provider_id == ServiceProvider.id
+            )
+            .where(ModelMappingProviderORM.requested_model.in_(models))
+            .group_by(ModelMappingProviderORM.requested_model)
+        )
+        counts = {model: (0, 0) for model in models}
+        for requested_model, total, active_total in result.all():
+            counts[requested_model] = (total or 0, int(active_total or 0))
+        return counts
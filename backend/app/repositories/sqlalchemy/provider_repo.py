@@ -4,7 +4,7 @@ Provider Repository SQLAlchemy Implementation
 Provides concrete database operation implementation for Provider data.
 """
 
-from typing import Optional
+from typing import Iterable, Optional
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -96,6 +96,16 @@ class SQLAlchemyProviderRepository(ProviderRepository):
         entity = result.scalar_one_or_none()
         return self._to_domain(entity) if entity else None
     
+    async def get_by_ids(self, ids: Iterable[int]) -> dict[int, Provider]:
+        """Get Providers by IDs in one query, keyed by ID"""
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+        result = await self.session.execute(
+            select(ServiceProvider).where(ServiceProvider.id.in_(unique_ids))
+        )
+        return {e.id: self._to_domain(e) for e in result.scalars().all()}
+    
     async def get_by_name(self, name: str) -> Optional[Provider]:
         """Get Provider by Name"""
         result = await self.session.execute(
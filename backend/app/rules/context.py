@@ -5,27 +5,60 @@ Defines the context data structure required for rule engine execution.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 
-@dataclass
 class TokenUsage:
     """
-    Token Usage Data Class
-    
+    Token Usage
+
     Records Token consumption for the request.
+
+    The input count can be left to ``input_token_counter``, which is called
+    the first time ``input_tokens`` is read, so requests whose rules never
+    look at token usage skip tokenization.
     """
-    
-    # Input Token Count
-    input_tokens: int = 0
-    # Output Token Count (Usually not yet produced during rule evaluation)
-    output_tokens: int = 0
-    
+
+    def __init__(
+        self,
+        input_tokens: Optional[int] = None,
+        output_tokens: int = 0,
+        input_token_counter: Optional[Callable[[], int]] = None,
+    ) -> None:
+        if input_tokens is None and input_token_counter is None:
+            input_tokens = 0
+        self._input_tokens = input_tokens
+        self._input_token_counter = input_token_counter
+        # Output Token Count (Usually not yet produced during rule evaluation)
+        self.output_tokens = output_tokens
+
+    @property
+    def input_tokens(self) -> int:
+        """Input Token Count (counted on first access when deferred)"""
+        if self._input_tokens is None:
+            self._input_tokens = self._input_token_counter()
+        return self._input_tokens
+
+    @input_tokens.setter
+    def input_tokens(self, value: int) -> None:
+        self._input_tokens = value
+
+    @property
+    def input_tokens_counted(self) -> bool:
+        """Whether the input count is known without calling the counter"""
+        return self._input_tokens is not None
+
     @property
     def total_tokens(self) -> int:
         """Get total Token count"""
         return self.input_tokens + self.output_tokens
 
+    def __repr__(self) -> str:
+        return (
+            f"TokenUsage(input_tokens={self._input_tokens!r}, "
+            f"output_tokens={self.output_tokens!r})"
+        )
+
 
 @dataclass
 class RuleContext:
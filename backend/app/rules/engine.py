@@ -112,6 +112,20 @@ class RuleEngine:
 
         return candidates
 
+    def needs_token_usage(
+        self, provider_mappings: list[ModelMappingProviderResponse]
+    ) -> bool:
+        """
+        Whether the provider-level rules of these mappings read token usage
+
+        Callers count input tokens up front only when this is true.
+        """
+        for pm in provider_mappings:
+            provider_rules = RuleSet.from_dict(pm.provider_rules)
+            if provider_rules is not None and provider_rules.uses_token_usage:
+                return True
+        return False
+
     def evaluate_sync(
         self,
         context: RuleContext,
@@ -35,6 +35,11 @@ class Rule:
             value=data.get("value"),
         )
 
+    @property
+    def uses_token_usage(self) -> bool:
+        """Whether the rule reads token_usage.* (needs the input token count)"""
+        return self.field.split(".", 1)[0].lower() == "token_usage"
+
 
 @dataclass
 class RuleSet:
@@ -81,6 +86,11 @@ class RuleSet:
         """Check if rule set is empty"""
         return len(self.rules) == 0
 
+    @property
+    def uses_token_usage(self) -> bool:
+        """Whether any rule reads token_usage.*"""
+        return any(rule.uses_token_usage for rule in self.rules)
+
 
 @dataclass
 class CandidateProvider:
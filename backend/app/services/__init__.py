@@ -9,7 +9,14 @@ from app.services.api_key_service import ApiKeyService
 from app.services.log_service import LogService
 from app.services.retry_handler import RetryHandler
 from app.services.provider_health import ProviderHealthTracker
-from app.services.strategy import SelectionStrategy, RoundRobinStrategy, CostFirstStrategy, PriorityStrategy
+from app.services.strategy import (
+    SelectionStrategy,
+    RoundRobinStrategy,
+    CostFirstStrategy,
+    PriorityStrategy,
+    LowestLatencyStrategy,
+    LeastOutstandingStrategy,
+)
 
 __all__ = [
     "ProxyService",
@@ -23,4 +30,6 @@ __all__ = [
     "RoundRobinStrategy",
     "CostFirstStrategy",
     "PriorityStrategy",
+    "LowestLatencyStrategy",
+    "LeastOutstandingStrategy",
 ]
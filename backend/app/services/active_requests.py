@@ -2,13 +2,17 @@
 Active Request Tracker
 
 Stores asyncio.Task references for in-progress proxy requests so
-they can be cancelled via the admin API.
+they can be cancelled via the admin API. In single-write logging mode it
+also holds the not-yet-persisted log entries of those requests.
 """
 
 import asyncio
+import itertools
 import logging
 from typing import Optional
 
+from app.domain.log import RequestLogCreate
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +28,10 @@ class ActiveRequestTracker:
 
     def __init__(self) -> None:
         self._tasks: dict[int, asyncio.Task] = {}
+        # Pending (unpersisted) log entries keyed by a negative in-memory ID,
+        # so they can never collide with database log IDs.
+        self._pending: dict[int, RequestLogCreate] = {}
+        self._pending_ids = itertools.count(-1, -1)
         self._lock = asyncio.Lock()
 
     async def register(self, log_id: int, task: asyncio.Task) -> None:
@@ -54,6 +62,41 @@ class ActiveRequestTracker:
         async with self._lock:
             return log_id in self._tasks
 
+    async def add_pending(
+        self, log_data: RequestLogCreate, log_id: Optional[int] = None
+    ) -> int:
+        """Keep an in-progress log entry in memory instead of the database.
+
+        Returns its in-memory log ID (always negative). Pass ``log_id`` to put
+        back an entry previously taken with pop_pending().
+        """
+        async with self._lock:
+            if log_id is None:
+                log_id = next(self._pending_ids)
+            self._pending[log_id] = log_data
+        return log_id
+
+    async def pop_pending(self, log_id: int) -> Optional[RequestLogCreate]:
+        """Take a pending entry for persisting; None if it is already gone
+        (completed, cancelled, or promoted to a database row)."""
+        async with self._lock:
+            return self._pending.pop(log_id, None)
+
+    def has_pending(self, log_id: int) -> bool:
+        return log_id in self._pending
+
+    async def pending_logs(self) -> list[tuple[int, RequestLogCreate]]:
+        """Snapshot of pending entries, oldest first."""
+        async with self._lock:
+            return sorted(self._pending.items(), key=lambda item: -item[0])
+
+    async def rekey(self, old_log_id: int, new_log_id: int) -> None:
+        """Move a task registration to a new log ID (pending entry persisted)."""
+        async with self._lock:
+            task = self._tasks.pop(old_log_id, None)
+            if task is not None:
+                self._tasks[new_log_id] = task
+
 
 # Global singleton
 active_requests = ActiveRequestTracker()
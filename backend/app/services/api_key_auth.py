@@ -0,0 +1,194 @@
+"""In-process API key authentication cache and coalesced last-used tracking."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.domain.api_key import ApiKeyModel
+from app.repositories.api_key_repo import ApiKeyRepository
+from app.services.config_bus import config_bus
+
+logger = logging.getLogger(__name__)
+
+
+def _token_digest(token: str) -> str:
+    # Raw tokens never end up as dict keys (heap dumps, debug output).
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class ApiKeyAuthCache:
+    """Short-TTL cache of token -> API key lookups, keyed by a token hash.
+
+    Unknown tokens are cached as misses (with their own, usually shorter, TTL)
+    so clients retrying with a bad key do not hit the database every time.
+    API key writes go through the config change bus, which calls
+    ``invalidate()`` on every worker; the TTL bounds staleness otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        ttl_seconds: float = 30.0,
+        negative_ttl_seconds: float = 5.0,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        if negative_ttl_seconds < 0:
+            raise ValueError("negative_ttl_seconds must be >= 0")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        # digest -> (expires_at, api key or None for an unknown token)
+        self._entries: dict[str, tuple[float, Optional[ApiKeyModel]]] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "ApiKeyAuthCache":
+        return cls(
+            enabled=settings.API_KEY_AUTH_CACHE_ENABLED,
+            ttl_seconds=settings.API_KEY_AUTH_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.API_KEY_AUTH_CACHE_NEGATIVE_TTL_SECONDS,
+        )
+
+    def get(self, token: str) -> tuple[bool, Optional[ApiKeyModel]]:
+        """Return ``(hit, api_key)``; ``api_key`` is None for a cached miss."""
+        if not self.enabled:
+            return False, None
+        digest = _token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return False, None
+        expires_at, api_key = entry
+        if self._clock() >= expires_at:
+            self._entries.pop(digest, None)
+            return False, None
+        return True, api_key
+
+    def put(self, token: str, api_key: Optional[ApiKeyModel]) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds if api_key is not None else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        self._entries[_token_digest(token)] = (self._clock() + ttl, api_key)
+
+    def _evict(self) -> None:
+        now = self._clock()
+        for digest in [d for d, (exp, _) in self._entries.items() if now >= exp]:
+            del self._entries[digest]
+        # Still full of live entries (e.g. a flood of random tokens): start over.
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def invalidate(self) -> None:
+        """Drop every cached lookup."""
+        self._entries.clear()
+
+
+class LastUsedRecorder:
+    """Coalesce ``last_used_at`` updates and write them in periodic batches.
+
+    Authentication only records the timestamp in memory; a background task
+    writes the latest value per key in one bulk UPDATE every
+    ``flush_interval_seconds``. Before ``start()`` (tests, scripts)
+    ``recording`` is False and callers write through directly.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, datetime] = {}
+        self._repo_factory: Optional[
+            Callable[[], contextlib.AbstractAsyncContextManager[ApiKeyRepository]]
+        ] = None
+        self._flush_interval_seconds = 10.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def recording(self) -> bool:
+        return self._task is not None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def record(self, api_key_id: int, used_at: datetime) -> None:
+        current = self._pending.get(api_key_id)
+        if current is None or used_at > current:
+            self._pending[api_key_id] = used_at
+
+    async def flush(self) -> int:
+        """Write pending timestamps; returns the number of keys flushed."""
+        if not self._pending or self._repo_factory is None:
+            return 0
+        pending, self._pending = self._pending, {}
+        try:
+            async with self._repo_factory() as repo:
+                await repo.bulk_update_last_used(pending)
+        except asyncio.CancelledError:
+            self._requeue(pending)
+            raise
+        except Exception:
+            logger.exception("Failed to flush API key last_used_at")
+            self._requeue(pending)
+            return 0
+        return len(pending)
+
+    def _requeue(self, pending: dict[int, datetime]) -> None:
+        # Keep the values for the next flush unless newer ones arrived.
+        for api_key_id, used_at in pending.items():
+            self.record(api_key_id, used_at)
+
+    async def start(
+        self,
+        repo_factory: Callable[
+            [], contextlib.AbstractAsyncContextManager[ApiKeyRepository]
+        ],
+        *,
+        flush_interval_seconds: float = 10.0,
+    ) -> None:
+        if self._task is not None:
+            logger.warning("API key last-used recorder already started")
+            return
+        self._repo_factory = repo_factory
+        self._flush_interval_seconds = flush_interval_seconds
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "API key last-used recorder started: flush every %ss",
+            flush_interval_seconds,
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still pending."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+        self._repo_factory = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            await self.flush()
+
+
+# Global singletons, injected into ApiKeyService by the API/MCP auth paths.
+api_key_auth_cache = ApiKeyAuthCache.from_settings(get_settings())
+config_bus.subscribe(api_key_auth_cache.invalidate)
+api_key_last_used = LastUsedRecorder()
@@ -19,6 +19,8 @@ from app.domain.api_key import (
     ApiKeyCreateResponse,
 )
 from app.repositories.api_key_repo import ApiKeyRepository
+from app.services.api_key_auth import ApiKeyAuthCache, LastUsedRecorder
+from app.services.config_bus import config_bus
 
 
 class ApiKeyService:
@@ -28,16 +30,30 @@ class ApiKeyService:
     Handles business logic related to API Keys, including creation, authentication, etc.
     """
     
-    def __init__(self, repo: ApiKeyRepository):
+    def __init__(
+        self,
+        repo: ApiKeyRepository,
+        auth_cache: Optional[ApiKeyAuthCache] = None,
+        last_used_recorder: Optional[LastUsedRecorder] = None,
+    ):
         """
         Initialize Service
         
         Args:
             repo: API Key Repository
+            auth_cache: Token lookup cache used by authenticate (optional)
+            last_used_recorder: Batches last_used_at writes when running
+                (optional; otherwise each authentication writes through)
         """
         self.repo = repo
+        self._auth_cache = auth_cache
+        self._last_used_recorder = last_used_recorder
 
     async def _write_last_used(self, api_key_id: int, last_used_at: datetime) -> None:
+        recorder = self._last_used_recorder
+        if recorder is not None and recorder.recording:
+            recorder.record(api_key_id, last_used_at)
+            return
         await self.repo.update_last_used(api_key_id, last_used_at)
     
     async def create(self, data: ApiKeyCreate) -> ApiKeyCreateResponse:
@@ -174,6 +190,7 @@ class ApiKeyService:
                 )
         
         api_key = await self.repo.update(id, data)
+        await config_bus.notify_changed()
         return self._to_response(api_key)  # type: ignore
     
     async def delete(self, id: int) -> None:
@@ -194,6 +211,7 @@ class ApiKeyService:
             )
         
         await self.repo.delete(id)
+        await config_bus.notify_changed()
     
     async def authenticate(self, key_value: str) -> ApiKeyModel:
         """
@@ -218,7 +236,12 @@ class ApiKeyService:
         if key_value.lower().startswith("bearer "):
             key_value = key_value[7:]
         
-        api_key = await self.repo.get_by_key_value(key_value)
+        cache = self._auth_cache
+        hit, api_key = cache.get(key_value) if cache is not None else (False, None)
+        if not hit:
+            api_key = await self.repo.get_by_key_value(key_value)
+            if cache is not None:
+                cache.put(key_value, api_key)
         
         if not api_key:
             raise AuthenticationError(
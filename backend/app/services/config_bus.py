@@ -0,0 +1,179 @@
+"""Cross-worker config change notifications for in-process caches."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Callable, Optional
+
+from app.repositories.config_version_repo import ConfigVersionRepository
+
+logger = logging.getLogger(__name__)
+
+ConfigChangeListener = Callable[[], Any]
+
+# Delay before re-subscribing after a Redis pub/sub failure
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class ConfigChangeBus:
+    """Fan out config-version bumps to every worker's local caches.
+
+    Local listeners (e.g. ``RoutingCache.invalidate``) run immediately on the
+    writing worker. Once started, each write also bumps a shared version:
+
+    - Redis mode: ``INCR`` + ``PUBLISH``; every worker subscribes to the
+      channel and drops its caches as soon as a newer version arrives.
+    - Database mode: a single ``config_version`` row that every worker polls.
+
+    Before ``start()`` (tests, scripts) only the local listeners run, so no
+    shared state is touched.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[ConfigChangeListener] = []
+        self._repo_factory: Optional[
+            Callable[[], contextlib.AbstractAsyncContextManager[ConfigVersionRepository]]
+        ] = None
+        self._redis: Any = None
+        self._channel: Optional[str] = None
+        self._poll_interval_seconds = 2.0
+        self._version = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, listener: ConfigChangeListener) -> None:
+        """Register a callable that drops a local cache."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def _notify_local(self) -> None:
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                logger.exception("Config change listener failed: %r", listener)
+
+    def _observe(self, version: int) -> None:
+        """Drop local caches when ``version`` is newer than the last one seen."""
+        if version <= self._version:
+            return
+        self._version = version
+        logger.debug("Config version changed: version=%s", version)
+        self._notify_local()
+
+    async def notify_changed(self) -> None:
+        """Record a config write: drop local caches and tell the other workers.
+
+        Publishing failures are logged, not raised; the write itself has already
+        been committed and cache TTLs still bound staleness elsewhere.
+        """
+        self._notify_local()
+        if self._repo_factory is None:
+            return
+        try:
+            async with self._repo_factory() as repo:
+                version = await repo.bump()
+        except Exception:
+            logger.exception("Failed to publish config version bump")
+            return
+        # Our own bump has already been applied locally.
+        self._version = max(self._version, version)
+
+    async def start(
+        self,
+        repo_factory: Callable[
+            [], contextlib.AbstractAsyncContextManager[ConfigVersionRepository]
+        ],
+        *,
+        redis_client: Any = None,
+        channel: Optional[str] = None,
+        poll_interval_seconds: float = 2.0,
+    ) -> None:
+        """Start listening for config bumps from other workers.
+
+        Args:
+            repo_factory: yields a ConfigVersionRepository in a short-lived scope
+            redis_client: subscribe to ``channel`` on this client when given;
+                otherwise poll the repository every ``poll_interval_seconds``
+        """
+        if self._task is not None:
+            logger.warning("Config change bus already started")
+            return
+
+        self._repo_factory = repo_factory
+        self._redis = redis_client
+        self._channel = channel
+        self._poll_interval_seconds = poll_interval_seconds
+        try:
+            async with repo_factory() as repo:
+                self._version = await repo.get_version()
+        except Exception:
+            logger.exception("Failed to read initial config version")
+
+        if redis_client is not None:
+            self._task = asyncio.create_task(self._listen_redis())
+            mode = f"redis channel {channel}"
+        else:
+            self._task = asyncio.create_task(self._poll())
+            mode = f"database polling every {poll_interval_seconds}s"
+        logger.info("Config change bus started: %s", mode)
+
+    async def stop(self) -> None:
+        """Stop listening and detach from shared state."""
+        task, self._task = self._task, None
+        self._repo_factory = None
+        self._redis = None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        logger.info("Config change bus stopped")
+
+    async def _check_version(self) -> None:
+        async with self._repo_factory() as repo:
+            self._observe(await repo.get_version())
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval_seconds)
+            try:
+                await self._check_version()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Config version poll failed")
+
+    async def _listen_redis(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # Bumps published while we were not subscribed are not replayed.
+                await self._check_version()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        version = int(message.get("data"))
+                    except (TypeError, ValueError):
+                        continue
+                    self._observe(version)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Config version subscription failed; resubscribing")
+                await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
+
+# Global singleton. Services call notify_changed() after config writes; caches
+# register their invalidation callbacks with subscribe().
+config_bus = ConfigChangeBus()
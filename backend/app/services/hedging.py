@@ -0,0 +1,98 @@
+"""Hedged request policy: when to dispatch a speculative second attempt."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import get_settings
+from app.rules.models import CandidateProvider
+from app.services.provider_health import ProviderHealthKey, provider_health_key
+
+
+class LatencyTracker:
+    """Recent upstream latencies per candidate, for percentile estimates.
+
+    Streams and non-streams are tracked separately: a stream is measured to
+    its first chunk, a non-stream to its complete response. Process-local and
+    bounded to ``max_samples`` per key.
+    """
+
+    def __init__(self, *, max_samples: int = 200, min_samples: int = 20) -> None:
+        if max_samples < 1:
+            raise ValueError("max_samples must be >= 1")
+        if not 1 <= min_samples <= max_samples:
+            raise ValueError("min_samples must be in [1, max_samples]")
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self._samples: dict[tuple[ProviderHealthKey, bool], deque[float]] = {}
+
+    def record(
+        self, candidate: CandidateProvider, is_stream: bool, latency_ms: float
+    ) -> None:
+        key = (provider_health_key(candidate), is_stream)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.max_samples)
+        samples.append(latency_ms)
+
+    def percentile(
+        self, candidate: CandidateProvider, is_stream: bool, q: float
+    ) -> Optional[float]:
+        """The ``q`` quantile (0-1) of recent latencies, or None if too few."""
+        samples = self._samples.get((provider_health_key(candidate), is_stream))
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Hedging parameters for one request.
+
+    ``delay_ms`` fixes the delay; when None it adapts to the ``percentile``
+    of the first candidate's recent latency, falling back to
+    ``default_delay_ms`` until enough samples exist.
+    """
+
+    tracker: LatencyTracker
+    is_stream: bool
+    delay_ms: Optional[int] = None
+    percentile: float = 0.9
+    default_delay_ms: int = 2000
+
+    @classmethod
+    def for_mapping(
+        cls, model_mapping, is_stream: bool, tracker: Optional[LatencyTracker] = None
+    ) -> Optional["HedgePolicy"]:
+        """Policy for a model mapping, or None when it has hedging disabled."""
+        if not getattr(model_mapping, "hedge_enabled", False):
+            return None
+        settings = get_settings()
+        return cls(
+            tracker=tracker or latency_tracker,
+            is_stream=is_stream,
+            delay_ms=model_mapping.hedge_delay_ms,
+            percentile=settings.HEDGE_DELAY_PERCENTILE,
+            default_delay_ms=settings.HEDGE_DEFAULT_DELAY_MS,
+        )
+
+    def delay_seconds(self, candidate: CandidateProvider) -> float:
+        if self.delay_ms is not None:
+            return self.delay_ms / 1000
+        observed = self.tracker.percentile(candidate, self.is_stream, self.percentile)
+        if observed is None:
+            return self.default_delay_ms / 1000
+        return observed / 1000
+
+    def record(self, candidate: CandidateProvider, latency_ms: float) -> None:
+        """Record the latency of a successful attempt."""
+        self.tracker.record(candidate, self.is_stream, latency_ms)
+
+
+latency_tracker = LatencyTracker()
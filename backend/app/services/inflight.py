@@ -0,0 +1,63 @@
+"""In-flight (outstanding) upstream request counters per provider candidate."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Iterable, TypeVar
+
+from app.rules.models import CandidateProvider
+from app.services.provider_health import ProviderHealthKey, provider_health_key
+
+T = TypeVar("T")
+
+
+class InFlightTracker:
+    """Count upstream attempts that have started and not yet finished.
+
+    A non-stream attempt is outstanding until its response is returned, a
+    stream until its generator is exhausted or closed. Process-local; the
+    counters are plain ints because all updates happen on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[ProviderHealthKey, int] = {}
+
+    def acquire(self, candidate: CandidateProvider) -> ProviderHealthKey:
+        key = provider_health_key(candidate)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        return key
+
+    def release(self, key: ProviderHealthKey) -> None:
+        count = self._counts.get(key, 0) - 1
+        if count > 0:
+            self._counts[key] = count
+        else:
+            self._counts.pop(key, None)
+
+    def count(self, candidate: CandidateProvider) -> int:
+        return self._counts.get(provider_health_key(candidate), 0)
+
+    def get_mapping_counts(self, mapping_ids: Iterable[int]) -> dict[int, int]:
+        """Outstanding requests keyed by model-provider mapping ID."""
+        return {
+            mapping_id: self._counts.get(("mapping", mapping_id), 0)
+            for mapping_id in mapping_ids
+        }
+
+    async def track_stream(
+        self, key: ProviderHealthKey, stream: AsyncIterator[T]
+    ) -> AsyncIterator[T]:
+        """Re-yield ``stream`` and release ``key`` once it ends or is closed."""
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            self.release(key)
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+inflight_tracker = InFlightTracker()
@@ -8,6 +8,7 @@ import logging
 from typing import Optional
 
 from app.common.errors import NotFoundError
+from app.common.time import ensure_utc
 from app.domain.log import (
     ApiKeyMonthlyCost,
     RequestLogModel,
@@ -20,6 +21,7 @@ from app.domain.log import (
     ModelProviderStats,
 )
 from app.repositories.log_repo import LogRepository
+from app.services.active_requests import active_requests
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +70,22 @@ class LogService:
     async def cancel(self, log_id: int) -> None:
         """
         Cancel an in-progress request.
+
+        Negative IDs are in-flight requests held in memory (single-write log
+        mode); their row is written here as cancelled.
         """
+        if log_id < 0:
+            log_data = await active_requests.pop_pending(log_id)
+            if log_data is None:
+                raise NotFoundError(
+                    message=f"No in-progress request found with id {log_id}",
+                    code="log_not_found_or_completed",
+                )
+            log_data.is_completed = True
+            log_data.response_status = 499  # Client Closed Request
+            log_data.error_info = "Request cancelled by admin"
+            await self.repo.create(log_data)
+            return
         await self.repo.cancel(log_id)
 
     async def get_by_id(self, id: int) -> RequestLogModel:
@@ -142,6 +159,7 @@ class LogService:
             tuple[list[RequestLogResponse], int]: (Log list, Total count)
         """
         summaries, total = await self.repo.query(query)
+        pending = await self._pending_responses(query)
 
         def to_response(s) -> RequestLogResponse:
             return RequestLogResponse(
@@ -172,8 +190,64 @@ class LogService:
             )
 
         responses = [to_response(s) for s in summaries]
-
-        return responses, total
+        # In-progress entries sort first, so they belong on the first page.
+        if query.page == 1:
+            responses = pending + responses
+
+        return responses, total + len(pending)
+
+    @staticmethod
+    def _pending_matches(query: RequestLogQuery, log: RequestLogCreate) -> bool:
+        """Apply the query filters to an in-memory in-progress entry the way
+        the database applies them to an in-progress row (completion-only
+        columns are NULL, so range filters on them never match)."""
+        if query.is_completed is True or query.has_error is True:
+            return False
+        if any(
+            value is not None
+            for value in (
+                query.provider_id,
+                query.target_model,
+                query.status_min,
+                query.status_max,
+                query.retry_count_min,
+                query.retry_count_max,
+                query.input_tokens_min,
+                query.input_tokens_max,
+                query.total_time_min,
+                query.total_time_max,
+            )
+        ):
+            return False
+        request_time = ensure_utc(log.request_time)
+        if query.start_time and request_time < ensure_utc(query.start_time):
+            return False
+        if query.end_time and request_time > ensure_utc(query.end_time):
+            return False
+        if query.api_key_id and log.api_key_id != query.api_key_id:
+            return False
+        for needle, value in (
+            (query.requested_model, log.requested_model),
+            (query.api_key_name, log.api_key_name),
+            (query.user_id, log.user_id),
+        ):
+            if needle and needle.lower() not in (value or "").lower():
+                return False
+        return True
+
+    async def _pending_responses(
+        self, query: RequestLogQuery
+    ) -> list[RequestLogResponse]:
+        """In-flight requests not yet written to the database (single-write
+        log mode; only those served by this worker are known)."""
+        return [
+            RequestLogResponse(
+                **log.model_dump(include=set(RequestLogResponse.model_fields) - {"id"}),
+                id=log_id,
+            )
+            for log_id, log in await active_requests.pending_logs()
+            if self._pending_matches(query, log)
+        ]
 
     async def cleanup_old_logs(self, retention_days: int) -> int:
         """
@@ -0,0 +1,328 @@
+"""Background request-log writer with a bounded queue and batched inserts."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Literal, Optional
+
+from app.config import get_settings
+from app.domain.log import RequestLogCreate
+from app.repositories.log_repo import LogRepository
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["drop_details", "block", "drop"]
+
+# Heavy request-detail payload fields suppressed when an API Key has detail
+# logging disabled. Main-table metadata plus usage_details/error_info are
+# always retained.
+DETAIL_PAYLOAD_FIELDS = (
+    "request_body",
+    "response_body",
+    "request_headers",
+    "response_headers",
+    "converted_request_body",
+    "upstream_response_body",
+)
+
+
+def strip_detail_payload(log_data: RequestLogCreate) -> None:
+    """Null out the heavy detail payload fields on a log entry in place."""
+    for field in DETAIL_PAYLOAD_FIELDS:
+        setattr(log_data, field, None)
+
+
+@dataclass(frozen=True)
+class _LogWrite:
+    # None inserts a complete entry; otherwise completes the in-progress entry
+    log_id: Optional[int]
+    data: RequestLogCreate
+    # Fills deferred fields of ``data`` (e.g. serialized bodies); run in a
+    # worker thread right before the batch is written
+    prepare: Optional[Callable[[], None]] = None
+
+
+@dataclass(frozen=True)
+class LogWriterStats:
+    """Point-in-time counters of the log writer."""
+
+    running: bool
+    queue_depth: int
+    queue_capacity: int
+    enqueued: int
+    written: int
+    # Entries that could not be written (DB errors)
+    failed: int
+    # Entries rejected by the "drop" overflow policy
+    dropped: int
+    # Entries whose detail payload was stripped because the queue was filling up
+    details_dropped: int
+    flushes: int
+    last_flush_ms: Optional[float]
+    max_flush_ms: Optional[float]
+    avg_flush_ms: Optional[float]
+
+
+class LogWriter:
+    """Write request logs from a background task in multi-row batches.
+
+    Request coroutines only enqueue a ``RequestLogCreate``; the writer groups
+    queued entries and flushes them with ``bulk_create`` / ``bulk_update``
+    once ``batch_size`` entries are waiting or ``flush_interval_seconds`` has
+    passed since the first one arrived.
+
+    When the queue fills up, the overflow policy decides what gives:
+    ``drop_details`` strips the heavy detail payload of new entries once the
+    queue is ``detail_drop_ratio`` full and blocks the caller when it is
+    completely full; ``block`` always blocks; ``drop`` discards new entries.
+
+    Before ``start()`` (tests, scripts) ``running`` is False and callers write
+    through their repository directly.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.5,
+        overflow_policy: OverflowPolicy = "drop_details",
+        detail_drop_ratio: float = 0.8,
+    ) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be >= 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if flush_interval_seconds <= 0:
+            raise ValueError("flush_interval_seconds must be > 0")
+        if not 0 < detail_drop_ratio <= 1:
+            raise ValueError("detail_drop_ratio must be in (0, 1]")
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self._detail_drop_depth = max(1, int(max_queue_size * detail_drop_ratio))
+        self._queue: asyncio.Queue[_LogWrite] = asyncio.Queue(maxsize=max_queue_size)
+        self._repo_factory: Optional[
+            Callable[[], contextlib.AbstractAsyncContextManager[LogRepository]]
+        ] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+        # Entries taken off the queue while _run waits to complete a batch
+        self._collecting: list[_LogWrite] = []
+
+        self._enqueued = 0
+        self._written = 0
+        self._failed = 0
+        self._dropped = 0
+        self._details_dropped = 0
+        self._flushes = 0
+        self._flush_ms_total = 0.0
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "LogWriter":
+        return cls(
+            max_queue_size=settings.LOG_WRITER_MAX_QUEUE_SIZE,
+            batch_size=settings.LOG_WRITER_BATCH_SIZE,
+            flush_interval_seconds=settings.LOG_WRITER_FLUSH_INTERVAL_SECONDS,
+            overflow_policy=settings.LOG_WRITER_OVERFLOW_POLICY,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def stats(self) -> LogWriterStats:
+        return LogWriterStats(
+            running=self.running,
+            queue_depth=self._queue.qsize(),
+            queue_capacity=self.max_queue_size,
+            enqueued=self._enqueued,
+            written=self._written,
+            failed=self._failed,
+            dropped=self._dropped,
+            details_dropped=self._details_dropped,
+            flushes=self._flushes,
+            last_flush_ms=self._last_flush_ms,
+            max_flush_ms=self._max_flush_ms,
+            avg_flush_ms=(
+                self._flush_ms_total / self._flushes if self._flushes else None
+            ),
+        )
+
+    async def create(
+        self,
+        data: RequestLogCreate,
+        *,
+        prepare: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queue a complete log entry for insertion."""
+        await self._put(_LogWrite(None, data, prepare))
+
+    async def update(
+        self,
+        log_id: int,
+        data: RequestLogCreate,
+        *,
+        prepare: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queue completion data for an in-progress log entry."""
+        await self._put(_LogWrite(log_id, data, prepare))
+
+    async def _put(self, item: _LogWrite) -> None:
+        if (
+            self.overflow_policy == "drop_details"
+            and self._queue.qsize() >= self._detail_drop_depth
+        ):
+            strip_detail_payload(item.data)
+            item = _LogWrite(item.log_id, item.data)
+            self._details_dropped += 1
+        if self.overflow_policy == "drop":
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._dropped += 1
+                logger.warning(
+                    "Log writer queue full, dropping log: trace_id=%s",
+                    item.data.trace_id,
+                )
+                return
+        else:
+            await self._queue.put(item)
+        self._enqueued += 1
+
+    async def start(
+        self,
+        repo_factory: Callable[[], contextlib.AbstractAsyncContextManager[LogRepository]],
+    ) -> None:
+        if self._task is not None:
+            logger.warning("Log writer already started")
+            return
+        self._repo_factory = repo_factory
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Log writer started: queue=%s batch=%s flush every %ss policy=%s",
+            self.max_queue_size,
+            self.batch_size,
+            self.flush_interval_seconds,
+            self.overflow_policy,
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and write everything still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+        batch, self._collecting = self._collecting, []
+        await self._flush(batch)
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+        self._repo_factory = None
+
+    def _drain(self, limit: int) -> list[_LogWrite]:
+        batch: list[_LogWrite] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = self._collecting = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            # A batch taken off the queue is written even if stop() cancels
+            # the task meanwhile; stop() writes or waits for it.
+            self._collecting = []
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: list[_LogWrite]) -> None:
+        if not batch or self._repo_factory is None:
+            return
+        preparers = [item.prepare for item in batch if item.prepare is not None]
+        if preparers:
+            await asyncio.to_thread(_run_preparers, preparers)
+        create_items = [item for item in batch if item.log_id is None]
+        update_items = [item for item in batch if item.log_id is not None]
+        # bulk_create and bulk_update commit separately: once creates are
+        # committed only the updates may be retried, or rows get duplicated.
+        unwritten = batch
+        started = time.perf_counter()
+        try:
+            async with self._repo_factory() as repo:
+                if create_items:
+                    await repo.bulk_create([item.data for item in create_items])
+                    self._written += len(create_items)
+                    unwritten = update_items
+                if update_items:
+                    await repo.bulk_update(
+                        [(item.log_id, item.data) for item in update_items]
+                    )
+                    self._written += len(update_items)
+                    unwritten = []
+        except Exception:
+            logger.exception(
+                "Failed to write %s request logs in one batch, retrying one by one",
+                len(unwritten),
+            )
+            await self._flush_one_by_one(unwritten)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._flushes += 1
+        self._flush_ms_total += elapsed_ms
+        self._last_flush_ms = elapsed_ms
+        if self._max_flush_ms is None or elapsed_ms > self._max_flush_ms:
+            self._max_flush_ms = elapsed_ms
+
+    async def _flush_one_by_one(self, batch: list[_LogWrite]) -> None:
+        # Isolate a bad entry so it does not take the whole batch down.
+        for item in batch:
+            try:
+                async with self._repo_factory() as repo:
+                    if item.log_id is None:
+                        await repo.create(item.data)
+                    else:
+                        await repo.update(item.log_id, item.data)
+                self._written += 1
+            except Exception:
+                self._failed += 1
+                logger.exception(
+                    "Failed to write request log: trace_id=%s", item.data.trace_id
+                )
+
+
+def _run_preparers(preparers: list[Callable[[], None]]) -> None:
+    for prepare in preparers:
+        try:
+            prepare()
+        except Exception:
+            logger.exception("Failed to prepare request log")
+
+
+# Global singleton, started by the app lifespan and injected into ProxyService.
+log_writer = LogWriter.from_settings(get_settings())
@@ -31,7 +31,16 @@ from app.rules.context import RuleContext, TokenUsage
 from app.rules.engine import RuleEngine
 from app.services.retry_handler import RetryHandler
 from app.services.provider_health import ProviderHealthTracker
-from app.services.strategy import CostFirstStrategy, PriorityStrategy, RoundRobinStrategy, SelectionStrategy
+from app.services.inflight import InFlightTracker
+from app.services.config_bus import config_bus
+from app.services.strategy import (
+    CostFirstStrategy,
+    LeastOutstandingStrategy,
+    LowestLatencyStrategy,
+    PriorityStrategy,
+    RoundRobinStrategy,
+    SelectionStrategy,
+)
 
 
 class ModelService:
@@ -46,6 +55,8 @@ class ModelService:
         model_repo: ModelRepository,
         provider_repo: ProviderRepository,
         health_tracker: ProviderHealthTracker | None = None,
+        lowest_latency_strategy: SelectionStrategy | None = None,
+        inflight_tracker: InFlightTracker | None = None,
     ):
         """
         Initialize Service
@@ -53,6 +64,11 @@ class ModelService:
         Args:
             model_repo: Model Repository
             provider_repo: Provider Repository
+            health_tracker: Optional provider health tracker
+            lowest_latency_strategy: Optional shared Lowest Latency Strategy,
+                so match previews see the latencies observed by the proxy
+            inflight_tracker: Optional outstanding-request counters, shown on
+                model-provider mappings and used by match previews
         """
         self.model_repo = model_repo
         self.provider_repo = provider_repo
@@ -60,6 +76,9 @@ class ModelService:
         self._round_robin_strategy = RoundRobinStrategy()
         self._cost_first_strategy = CostFirstStrategy()
         self._priority_strategy = PriorityStrategy()
+        self._lowest_latency_strategy = lowest_latency_strategy or LowestLatencyStrategy()
+        self._least_outstanding_strategy = LeastOutstandingStrategy(inflight_tracker)
+        self._inflight_tracker = inflight_tracker
     
     # ============ Model Mapping Operations ============
     
@@ -85,6 +104,7 @@ class ModelService:
             )
         
         mapping = await self.model_repo.create_mapping(data)
+        await config_bus.notify_changed()
         return await self._to_mapping_response(mapping)
     
     async def get_mapping(self, requested_model: str) -> ModelMappingResponse:
@@ -141,11 +161,9 @@ class ModelService:
                 code="no_available_provider",
             )
 
-        providers = {}
-        for pm in provider_mappings:
-            provider = await self.provider_repo.get_by_id(pm.provider_id)
-            if provider:
-                providers[pm.provider_id] = provider
+        providers = await self.provider_repo.get_by_ids(
+            pm.provider_id for pm in provider_mappings
+        )
 
         eligible_provider_mappings = [
             pm
@@ -277,9 +295,17 @@ class ModelService:
             sort_by=sort_by,
         )
         
+        provider_counts = await self.model_repo.get_provider_counts(
+            mapping.requested_model for mapping in mappings
+        )
         responses = []
         for mapping in mappings:
-            responses.append(await self._to_mapping_response(mapping))
+            responses.append(
+                await self._to_mapping_response(
+                    mapping,
+                    provider_counts=provider_counts.get(mapping.requested_model, (0, 0)),
+                )
+            )
         
         return responses, total
     
@@ -307,6 +333,7 @@ class ModelService:
             )
         
         mapping = await self.model_repo.update_mapping(requested_model, data)
+        await config_bus.notify_changed()
         return await self._to_mapping_response(mapping)  # type: ignore
     
     async def delete_mapping(self, requested_model: str) -> None:
@@ -327,6 +354,7 @@ class ModelService:
             )
         
         await self.model_repo.delete_mapping(requested_model)
+        await config_bus.notify_changed()
 
     @staticmethod
     def _normalize_headers(
@@ -352,8 +380,21 @@ class ModelService:
             return self._cost_first_strategy
         if strategy_name == "priority":
             return self._priority_strategy
+        if strategy_name == "lowest_latency":
+            return self._lowest_latency_strategy
+        if strategy_name == "least_outstanding":
+            return self._least_outstanding_strategy
         return self._round_robin_strategy
     
+    def _apply_inflight_counts(
+        self, mappings: list[ModelMappingProviderResponse]
+    ) -> None:
+        if self._inflight_tracker is None or not mappings:
+            return
+        counts = self._inflight_tracker.get_mapping_counts(m.id for m in mappings)
+        for mapping in mappings:
+            mapping.in_flight = counts[mapping.id]
+
     # ============ Model-Provider Mapping Operations ============
     
     async def create_provider_mapping(
@@ -387,7 +428,9 @@ class ModelService:
                 code="provider_not_found",
             )
         
-        return await self.model_repo.add_provider_mapping(data)
+        result = await self.model_repo.add_provider_mapping(data)
+        await config_bus.notify_changed()
+        return result
     
     async def get_provider_mappings(
         self,
@@ -406,11 +449,13 @@ class ModelService:
         Returns:
             list[ModelMappingProviderResponse]: Mapping list
         """
-        return await self.model_repo.get_all_provider_mappings(
+        mappings = await self.model_repo.get_all_provider_mappings(
             requested_model=requested_model,
             provider_id=provider_id,
             is_active=is_active,
         )
+        self._apply_inflight_counts(mappings)
+        return mappings
 
     async def get_provider_pricing_history(
         self,
@@ -544,6 +589,7 @@ class ModelService:
         ModelMappingProviderCreate(**merged)
 
         result = await self.model_repo.update_provider_mapping(id, data)
+        await config_bus.notify_changed()
         return result  # type: ignore
 
     async def bulk_upgrade_provider_model(
@@ -624,6 +670,7 @@ class ModelService:
             current_target_model_name=normalized_current,
             data=update_data,
         )
+        await config_bus.notify_changed()
         if updated_count <= 0:
             raise NotFoundError(
                 message=(
@@ -653,6 +700,7 @@ class ModelService:
             )
         
         await self.model_repo.delete_provider_mapping(id)
+        await config_bus.notify_changed()
 
     async def export_data(self) -> list["ModelExport"]:
         """
@@ -777,11 +825,16 @@ class ModelService:
                 success += 1
             except Exception as e:
                 errors.append(f"Model '{item.requested_model}': {str(e)}")
-        
+
+        # Partially imported models may have been written before an error.
+        await config_bus.notify_changed()
         return {"success": success, "skipped": skipped, "errors": errors}
     
     async def _to_mapping_response(
-        self, mapping: ModelMapping, include_providers: bool = False
+        self,
+        mapping: ModelMapping,
+        include_providers: bool = False,
+        provider_counts: Optional[tuple[int, int]] = None,
     ) -> ModelMappingResponse:
         """
         Convert ModelMapping to Response Model
@@ -789,6 +842,8 @@ class ModelService:
         Args:
             mapping: Model mapping
             include_providers: Whether to include provider list
+            provider_counts: Pre-fetched (provider count, active provider count),
+                used instead of querying when providers are not included
         
         Returns:
             ModelMappingResponse: Response model
@@ -810,12 +865,16 @@ class ModelService:
                     provider.health_sample_count = health.sample_count
                     provider.health_failure_count = health.failure_count
                     provider.health_failure_rate = health.failure_rate
+                    provider.health_circuit_state = health.circuit_state.value
+            self._apply_inflight_counts(providers)
             provider_count = len(providers)
             # Active provider count requires both: mapping is_active AND provider is_active
             active_provider_count = sum(
                 1 for provider in providers 
                 if provider.is_active and provider.provider_is_active is not False
             )
+        elif provider_counts is not None:
+            provider_count, active_provider_count = provider_counts
         else:
             provider_count = await self.model_repo.get_provider_count(
                 mapping.requested_model
@@ -840,6 +899,8 @@ class ModelService:
             cached_input_price=mapping.cached_input_price,
             cached_output_price=mapping.cached_output_price,
             cache_creation_input_price=mapping.cache_creation_input_price,
+            hedge_enabled=mapping.hedge_enabled,
+            hedge_delay_ms=mapping.hedge_delay_ms,
             created_at=mapping.created_at,
             updated_at=mapping.updated_at,
             provider_count=provider_count,
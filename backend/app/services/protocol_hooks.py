@@ -7,6 +7,7 @@ from typing import Any, Callable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.common import json_codec
 from app.repositories.kv_store_repo import KVStoreRepository
 
 logger = logging.getLogger(__name__)
@@ -42,7 +43,7 @@ class ProtocolConversionHooks:
         - Long-lived repo: pass ``kv_repo`` (e.g. a Redis-backed repo or a test
           fake). Reused for every KV op.
         - DB mode: pass ``kv_repo_factory`` + ``session_factory``. Each KV op
-          opens a short-lived session so per-chunk stream caching does not pin a
+          opens a short-lived session so stream caching does not pin a
           pooled DB connection for the whole stream.
 
         Args:
@@ -55,6 +56,11 @@ class ProtocolConversionHooks:
         self._session_factory = session_factory
         # KV caching is active if either a long-lived repo or a DB factory is set.
         self._kv_enabled = kv_repo is not None or kv_repo_factory is not None
+        # Stream state: chat_id -> reasoning_content parts, link key -> chat_id,
+        # and the KV keys not yet written
+        self._stream_reasoning: dict[str, list[str]] = {}
+        self._stream_links: dict[str, str] = {}
+        self._stream_dirty: set[str] = set()
 
     @asynccontextmanager
     async def _kv(self):
@@ -141,6 +147,58 @@ class ProtocolConversionHooks:
             await self._cache_response_tool_call_extra_content_stream(chunk)
         return chunk
 
+    def allows_stream_passthrough(self) -> bool:
+        """Whether same-protocol streams may bypass the stream chunk hooks.
+
+        Subclasses overriding a chunk hook may rewrite chunks, so their
+        streams keep going through the hooks. The built-in KV caching only
+        reads events and runs from ``observe_stream_event`` instead.
+        """
+        cls = type(self)
+        return (
+            cls.before_stream_chunk_conversion
+            is ProtocolConversionHooks.before_stream_chunk_conversion
+            and cls.after_stream_chunk_conversion
+            is ProtocolConversionHooks.after_stream_chunk_conversion
+        )
+
+    def observes_stream_events(
+        self,
+        request_protocol: str,
+        supplier_protocol: str,
+        request_body: Optional[dict[str, Any]] = None,
+    ) -> bool:
+        """Whether a passed-through stream must be framed for ``observe_stream_event``.
+
+        Everything the KV cache keeps is keyed by tool call ID, so a request
+        that declares no tools (or legacy functions) cannot produce anything
+        worth caching and its stream stays on the raw fast path.
+        """
+        if not self._kv_enabled or supplier_protocol != "openai":
+            return False
+        if request_body is None:
+            return True
+        return bool(request_body.get("tools") or request_body.get("functions"))
+
+    async def observe_stream_event(
+        self,
+        event: bytes,
+        request_protocol: str,
+        supplier_protocol: str,
+    ) -> None:
+        """Read one complete SSE event of a passed-through stream."""
+        if supplier_protocol == "openai":
+            await self._cache_response_tool_call_extra_content_stream(event)
+
+    async def after_stream_end(
+        self,
+        request_protocol: str,
+        supplier_protocol: str,
+    ) -> None:
+        """Called once a stream is over (completed, failed or disconnected)."""
+        if self._kv_enabled:
+            await self._flush_stream_cache()
+
     async def before_image_request_conversion(
         self,
         body: dict[str, Any],
@@ -180,78 +238,117 @@ class ProtocolConversionHooks:
     async def _cache_response_tool_call_extra_content_stream(
         self, chunk: bytes
     ) -> bytes:
+        """Collect reasoning_content and tool_call -> chat links of a stream.
+
+        Reasoning text and links are accumulated in memory and written with a
+        single ``set_many`` when a choice finishes, on ``[DONE]`` or from
+        ``after_stream_end``. tool_call extra_content (written once per tool
+        call) is stored as soon as it is seen. Chunks without reasoning or
+        tool calls skip the KV store entirely.
+        """
         if not self._kv_enabled:
             return chunk
+        if (
+            b"reasoning_content" not in chunk
+            and b"tool_calls" not in chunk
+            and not self._stream_dirty
+        ):
+            return chunk
         try:
-            # One short-lived session per chunk: released as soon as this chunk's
-            # KV ops finish, so streaming never pins a pooled connection.
-            async with self._kv() as kv:
-                if kv is None:
-                    return chunk
-                chunk_str = chunk.decode("utf-8", errors="replace")
-                for line in chunk_str.split("\n"):
-                    if not line.startswith("data: ") or line.strip() == "data: [DONE]":
-                        continue
+            finished = False
+            extra_contents: dict[str, str] = {}
+            chunk_str = chunk.decode("utf-8", errors="replace")
+            for line in chunk_str.split("\n"):
+                if not line.startswith("data: "):
+                    continue
+                if line.strip() == "data: [DONE]":
+                    finished = True
+                    continue
 
-                    try:
-                        data = json.loads(line[6:])
-                    except Exception:
-                        continue
+                try:
+                    data = json_codec.loads(line[6:])
+                except Exception:
+                    continue
+
+                chat_id = data.get("id", "")
+
+                for choice in data.get("choices", []):
+                    delta = choice.get("delta", {})
+                    if choice.get("finish_reason"):
+                        finished = True
+
+                    # Accumulate reasoning_content keyed by chat_id
+                    reasoning_content = delta.get("reasoning_content")
+                    if reasoning_content and chat_id:
+                        self._stream_reasoning.setdefault(chat_id, []).append(
+                            reasoning_content
+                        )
+                        self._stream_dirty.add(f"chat_reasoning:{chat_id}")
+
+                    # Process tool_calls. Some OpenAI-compatible providers return
+                    # explicit null when there are no tool calls.
+                    tool_calls = delta.get("tool_calls")
+                    if not isinstance(tool_calls, list):
+                        tool_calls = []
+                    for tool_call in tool_calls:
+                        tool_call_id = tool_call.get("id", "")
+
+                        # Link tool_call_id to chat_id for reasoning_content recovery
+                        if tool_call_id and chat_id:
+                            link_key = f"tool_call_chat_id:{tool_call_id}"
+                            self._stream_links[link_key] = chat_id
+                            self._stream_dirty.add(link_key)
+
+                        # for google: https://ai.google.dev/gemini-api/docs/thought-signatures#openai
+                        extra_content = tool_call.get("extra_content")
+                        if not extra_content:
+                            continue
+
+                        if not tool_call_id:
+                            continue
 
-                    chat_id = data.get("id", "")
-
-                    for choice in data.get("choices", []):
-                        delta = choice.get("delta", {})
-
-                        # Accumulate reasoning_content keyed by chat_id
-                        reasoning_content = delta.get("reasoning_content")
-                        if reasoning_content and chat_id:
-                            cache_key = f"chat_reasoning:{chat_id}"
-                            try:
-                                cached = await kv.get(cache_key)
-                                new_val = cached.value + reasoning_content if cached else reasoning_content
-                                await kv.set(cache_key, new_val, ttl_seconds=TOOL_CALL_EXTRA_CONTENT_TTL)
-                            except Exception as e:
-                                logger.debug(f"Error caching reasoning_content: {e}")
-
-                        # Process tool_calls. Some OpenAI-compatible providers return
-                        # explicit null when there are no tool calls.
-                        tool_calls = delta.get("tool_calls")
-                        if not isinstance(tool_calls, list):
-                            tool_calls = []
-                        for tool_call in tool_calls:
-                            tool_call_id = tool_call.get("id", "")
-
-                            # Link tool_call_id to chat_id for reasoning_content recovery
-                            if tool_call_id and chat_id:
-                                link_key = f"tool_call_chat_id:{tool_call_id}"
-                                try:
-                                    await kv.set(link_key, chat_id, ttl_seconds=TOOL_CALL_EXTRA_CONTENT_TTL)
-                                except Exception as e:
-                                    logger.debug(f"Error linking tool_call to chat_id: {e}")
-
-                            # for google: https://ai.google.dev/gemini-api/docs/thought-signatures#openai
-                            extra_content = tool_call.get("extra_content")
-                            if not extra_content:
-                                continue
-
-                            if not tool_call_id:
-                                continue
-
-                            cache_key = f"tool_call_extra:{tool_call_id}"
+                        extra_contents[tool_call_id] = json.dumps(
+                            extra_content, ensure_ascii=False
+                        )
+
+            if extra_contents:
+                async with self._kv() as kv:
+                    if kv is not None:
+                        for tool_call_id, value in extra_contents.items():
                             await kv.set(
-                                cache_key,
-                                json.dumps(extra_content, ensure_ascii=False),
+                                f"tool_call_extra:{tool_call_id}",
+                                value,
                                 ttl_seconds=TOOL_CALL_EXTRA_CONTENT_TTL,
                             )
                             logger.info(
                                 f"Cached tool_call extra_content: id={tool_call_id}"
                             )
+            if finished:
+                await self._flush_stream_cache()
         except Exception as e:
             logger.debug(f"Error processing stream chunk for extra_content: {e}")
 
         return chunk
 
+    async def _flush_stream_cache(self) -> None:
+        """Write the reasoning text and links changed since the last flush."""
+        if not self._stream_dirty:
+            return
+        items: dict[str, str] = {}
+        for key in self._stream_dirty:
+            if key.startswith("chat_reasoning:"):
+                items[key] = "".join(self._stream_reasoning[key.split(":", 1)[1]])
+            else:
+                items[key] = self._stream_links[key]
+        self._stream_dirty = set()
+        try:
+            async with self._kv() as kv:
+                if kv is None:
+                    return
+                await kv.set_many(items, ttl_seconds=TOOL_CALL_EXTRA_CONTENT_TTL)
+        except Exception as e:
+            logger.debug(f"Error caching stream reasoning_content: {e}")
+
     async def _cache_response_tool_call_extra_content(
         self, supplier_body: dict[str, Any]
     ) -> None:
@@ -1,4 +1,4 @@
-"""Runtime provider health tracking and soft-circuit degradation."""
+"""Runtime provider health tracking, soft-circuit degradation and hard circuit breaking."""
 
 from __future__ import annotations
 
@@ -6,9 +6,9 @@ import asyncio
 import logging
 import time
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Callable, Iterable
+from typing import Any, Callable, Iterable, Optional
 
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
@@ -26,6 +26,14 @@ class HealthOutcome(str, Enum):
     IGNORED = "ignored"
 
 
+class CircuitState(str, Enum):
+    """Hard circuit breaker state of one provider/model candidate."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 @dataclass(frozen=True)
 class ProviderHealthSnapshot:
     """Health statistics for one provider/model candidate."""
@@ -34,6 +42,7 @@ class ProviderHealthSnapshot:
     failure_count: int = 0
     failure_rate: float = 0.0
     degraded: bool = False
+    circuit_state: CircuitState = CircuitState.CLOSED
 
 
 @dataclass
@@ -44,6 +53,18 @@ class _HealthWindow:
     failure_count: int = 0
 
 
+@dataclass
+class _Circuit:
+    """Hard circuit breaker data; absent while closed without failures."""
+
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    last_failure_at: float = 0.0
+    # Start of the half-open probe in flight, if any
+    probe_started_at: float | None = None
+
+
 def provider_health_key(candidate: CandidateProvider) -> ProviderHealthKey:
     """Use mapping identity when available so model failures stay isolated."""
     if candidate.provider_mapping_id is not None:
@@ -71,8 +92,16 @@ class ProviderHealthTracker:
     """Keep a low-volume, in-memory sliding window for provider outcomes.
 
     The tracker intentionally stores one event per logical provider call, not
-    one event per physical retry. It is process-local; the interface can later
-    be backed by Redis if the gateway runs multiple workers or instances.
+    one event per physical retry. It is process-local; with several workers
+    or instances use RedisProviderHealthTracker so they share one window.
+
+    On top of the soft degradation, a hard circuit breaker opens after
+    ``circuit_failure_threshold`` consecutive failures: the candidate is then
+    skipped entirely for ``circuit_open_seconds``. After that it is half-open
+    and a single probe request is let through; success closes the circuit,
+    failure opens it again. A probe that never reports back (e.g. cancelled)
+    is given up on after ``circuit_open_seconds``. Circuit state is always
+    per process.
     """
 
     def __init__(
@@ -83,6 +112,8 @@ class ProviderHealthTracker:
         min_samples: int = 6,
         failure_rate_threshold: float = 0.5,
         cleanup_interval_seconds: float | None = None,
+        circuit_failure_threshold: int = 5,
+        circuit_open_seconds: float = 30,
         clock: Callable[[], float] = time.monotonic,
     ) -> None:
         if window_seconds < 1:
@@ -93,14 +124,22 @@ class ProviderHealthTracker:
             raise ValueError("failure_rate_threshold must be in (0, 1]")
         if cleanup_interval_seconds is not None and cleanup_interval_seconds <= 0:
             raise ValueError("cleanup_interval_seconds must be > 0")
+        if circuit_failure_threshold < 0:
+            raise ValueError("circuit_failure_threshold must be >= 0")
+        if circuit_open_seconds <= 0:
+            raise ValueError("circuit_open_seconds must be > 0")
 
         self.enabled = enabled
         self.window_seconds = window_seconds
         self.min_samples = min_samples
         self.failure_rate_threshold = failure_rate_threshold
+        # 0 disables the hard circuit breaker
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_open_seconds = circuit_open_seconds
         self._clock = clock
         self._windows: dict[ProviderHealthKey, _HealthWindow] = {}
         self._known_states: dict[ProviderHealthKey, bool] = {}
+        self._circuits: dict[ProviderHealthKey, _Circuit] = {}
         self._cleanup_interval_seconds = (
             cleanup_interval_seconds
             if cleanup_interval_seconds is not None
@@ -116,6 +155,8 @@ class ProviderHealthTracker:
             window_seconds=settings.PROVIDER_HEALTH_WINDOW_SECONDS,
             min_samples=settings.PROVIDER_HEALTH_MIN_SAMPLES,
             failure_rate_threshold=settings.PROVIDER_HEALTH_FAILURE_RATE_THRESHOLD,
+            circuit_failure_threshold=settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD,
+            circuit_open_seconds=settings.PROVIDER_CIRCUIT_OPEN_SECONDS,
         )
 
     def _prune(self, key: ProviderHealthKey, now: float) -> bool:
@@ -148,13 +189,20 @@ class ProviderHealthTracker:
         for key in list(self._known_states):
             if key not in live_keys:
                 self._known_states.pop(key, None)
+        for key, circuit in list(self._circuits.items()):
+            if circuit.state is CircuitState.CLOSED and key not in live_keys:
+                self._circuits.pop(key, None)
 
         self._next_cleanup_at = now + self._cleanup_interval_seconds
 
+    def _circuit_state(self, key: ProviderHealthKey) -> CircuitState:
+        circuit = self._circuits.get(key)
+        return circuit.state if circuit is not None else CircuitState.CLOSED
+
     def _snapshot(self, key: ProviderHealthKey) -> ProviderHealthSnapshot:
         window = self._windows.get(key)
         if window is None:
-            return ProviderHealthSnapshot()
+            return ProviderHealthSnapshot(circuit_state=self._circuit_state(key))
 
         sample_count = len(window.events)
         failure_count = window.failure_count
@@ -168,6 +216,7 @@ class ProviderHealthTracker:
             failure_count=failure_count,
             failure_rate=failure_rate,
             degraded=degraded,
+            circuit_state=self._circuit_state(key),
         )
 
     def _state_transition(
@@ -181,19 +230,102 @@ class ProviderHealthTracker:
             return None
         return previous, snapshot.degraded
 
+    def _circuit_transition(
+        self,
+        key: ProviderHealthKey,
+        outcome: HealthOutcome,
+        now: float,
+    ) -> tuple[CircuitState, CircuitState] | None:
+        """Apply a recorded outcome to the hard circuit breaker."""
+        if self.circuit_failure_threshold <= 0:
+            return None
+        circuit = self._circuits.get(key)
+        if outcome is HealthOutcome.SUCCESS:
+            if circuit is None:
+                return None
+            self._circuits.pop(key, None)
+            if circuit.state is CircuitState.CLOSED:
+                return None
+            return circuit.state, CircuitState.CLOSED
+        if outcome is HealthOutcome.IGNORED:
+            # The provider answered, but the result says nothing about its
+            # availability: free the probe slot and leave the state alone.
+            if circuit is not None:
+                circuit.probe_started_at = None
+            return None
+
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        circuit.consecutive_failures += 1
+        circuit.last_failure_at = now
+        circuit.probe_started_at = None
+        if circuit.state is CircuitState.HALF_OPEN or (
+            circuit.state is CircuitState.CLOSED
+            and circuit.consecutive_failures >= self.circuit_failure_threshold
+        ):
+            previous = circuit.state
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = now
+            return previous, CircuitState.OPEN
+        return None
+
+    def allow_request(
+        self,
+        candidate: CandidateProvider,
+        *,
+        claim_probe: bool = True,
+    ) -> bool:
+        """Whether the circuit breaker lets a request through to ``candidate``.
+
+        With ``claim_probe`` a half-open circuit hands its single probe slot
+        to the caller (and an expired open circuit turns half-open); without
+        it the check has no side effects.
+        """
+        if not self.enabled or self.circuit_failure_threshold <= 0:
+            return True
+        key = provider_health_key(candidate)
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return True
+
+        now = self._clock()
+        if circuit.state is CircuitState.OPEN:
+            if now - circuit.opened_at < self.circuit_open_seconds:
+                return False
+            if not claim_probe:
+                return True
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probe_started_at = None
+            self._log_transition(
+                key,
+                self._snapshot(key),
+                (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            )
+
+        probe_started_at = circuit.probe_started_at
+        if probe_started_at is not None and now - probe_started_at < self.circuit_open_seconds:
+            return False
+        if claim_probe:
+            circuit.probe_started_at = now
+        return True
+
     @staticmethod
     def _log_transition(
         key: ProviderHealthKey,
         snapshot: ProviderHealthSnapshot,
-        transition: tuple[bool, bool] | None,
+        transition: tuple[bool, bool] | tuple[CircuitState, CircuitState] | None,
     ) -> None:
         if transition is None:
             return
-        _, degraded = transition
+        _, state = transition
+        if isinstance(state, CircuitState):
+            label = f"circuit_{state.value}"
+        else:
+            label = "degraded" if state else "healthy"
         logger.warning(
             "Provider health state changed: key=%s state=%s samples=%s failures=%s failure_rate=%.3f",
             key,
-            "degraded" if degraded else "healthy",
+            label,
             snapshot.sample_count,
             snapshot.failure_count,
             snapshot.failure_rate,
@@ -248,11 +380,14 @@ class ProviderHealthTracker:
         candidate: CandidateProvider,
         outcome: HealthOutcome,
     ) -> ProviderHealthSnapshot:
-        if not self.enabled or outcome is HealthOutcome.IGNORED:
+        if not self.enabled:
             return ProviderHealthSnapshot()
-
         key = provider_health_key(candidate)
         now = self._clock()
+        if outcome is HealthOutcome.IGNORED:
+            self._circuit_transition(key, outcome, now)
+            return ProviderHealthSnapshot()
+
         async with self._lock:
             self._cleanup_expired(now)
             self._prune(key, now)
@@ -264,9 +399,11 @@ class ProviderHealthTracker:
             window.events.append((now, failed))
             if failed:
                 window.failure_count += 1
+            circuit_transition = self._circuit_transition(key, outcome, now)
             snapshot = self._snapshot(key)
             transition = self._state_transition(key, snapshot)
 
+        self._log_transition(key, snapshot, circuit_transition)
         self._log_transition(key, snapshot, transition)
         return snapshot
 
@@ -282,4 +419,266 @@ class ProviderHealthTracker:
         async with self._lock:
             self._windows.clear()
             self._known_states.clear()
+            self._circuits.clear()
             self._next_cleanup_at = self._clock() + self._cleanup_interval_seconds
+
+
+# Shared by both scripts: sums the "<bucket>:s" / "<bucket>:f" fields of one
+# hash that fall inside the window ending at the current bucket.
+_HEALTH_SUM_LUA = """
+local function window_sums(key, first_bucket)
+  local fields = redis.call('HGETALL', key)
+  local samples, failures = 0, 0
+  for i = 1, #fields, 2 do
+    local bucket, kind = string.match(fields[i], '^(%d+):(%a)$')
+    if bucket and tonumber(bucket) >= first_bucket then
+      if kind == 's' then
+        samples = samples + tonumber(fields[i + 1])
+      else
+        failures = failures + tonumber(fields[i + 1])
+      end
+    end
+  end
+  return samples, failures
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local bucket_ms = tonumber(ARGV[1])
+local bucket = math.floor(now / bucket_ms)
+local first_bucket = bucket - tonumber(ARGV[2]) + 1
+"""
+
+# KEYS[1]: health hash
+# ARGV: bucket size (ms), buckets per window, failed (0/1), TTL (ms)
+# Returns {samples, failures} of the window after recording
+_HEALTH_RECORD_SCRIPT = _HEALTH_SUM_LUA + """
+local count = redis.call('HINCRBY', KEYS[1], bucket .. ':s', 1)
+if ARGV[3] == '1' then
+  redis.call('HINCRBY', KEYS[1], bucket .. ':f', 1)
+end
+if count == 1 then
+  -- First sample of a new bucket: drop buckets that left the window
+  for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    local b = tonumber(string.match(field, '^(%d+):'))
+    if b and b < first_bucket then
+      redis.call('HDEL', KEYS[1], field)
+    end
+  end
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+local samples, failures = window_sums(KEYS[1], first_bucket)
+return {samples, failures}
+"""
+
+# KEYS: health hashes
+# ARGV: bucket size (ms), buckets per window
+# Returns {samples_1, failures_1, samples_2, failures_2, ...}
+_HEALTH_READ_SCRIPT = _HEALTH_SUM_LUA + """
+local result = {}
+for _, key in ipairs(KEYS) do
+  local samples, failures = window_sums(key, first_bucket)
+  table.insert(result, samples)
+  table.insert(result, failures)
+end
+return result
+"""
+
+
+class RedisProviderHealthTracker(ProviderHealthTracker):
+    """Provider health shared by every worker and node through Redis.
+
+    Each provider key is a Redis hash of per-bucket sample/failure counters
+    (``window_seconds / 60`` seconds per bucket, at least 1s) that are
+    incremented atomically and summed over the window by a Lua script, timed
+    by the Redis server clock. Snapshots are cached locally for
+    ``cache_ttl_ms`` so routing does not pay a Redis round trip per request;
+    a worker's own records refresh its cache immediately.
+
+    Redis errors fail open: the provider is reported healthy and a warning is
+    logged, so a Redis outage does not take routing down with it.
+    """
+
+    _WINDOW_BUCKETS = 60
+
+    def __init__(
+        self,
+        *,
+        client_factory: Optional[Callable[[], Any]] = None,
+        key_prefix: str = "lgw:health:",
+        cache_ttl_ms: int = 250,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if cache_ttl_ms < 0:
+            raise ValueError("cache_ttl_ms must be >= 0")
+        if client_factory is None:
+            from app.db.redis import get_redis
+
+            client_factory = get_redis
+        self._client_factory = client_factory
+        self._key_prefix = key_prefix
+        self._cache_ttl = cache_ttl_ms / 1000
+        self._cache: dict[ProviderHealthKey, tuple[float, ProviderHealthSnapshot]] = {}
+        self._client: Any = None
+        self._scripts: dict[str, Any] = {}
+        bucket_seconds = max(1, self.window_seconds // self._WINDOW_BUCKETS)
+        self._bucket_ms = bucket_seconds * 1000
+        self._window_buckets = -(-self.window_seconds // bucket_seconds)
+        self._ttl_ms = (self.window_seconds + bucket_seconds) * 1000
+
+    @classmethod
+    def from_settings(cls, settings) -> "RedisProviderHealthTracker":
+        return cls(
+            enabled=settings.PROVIDER_HEALTH_ENABLED,
+            window_seconds=settings.PROVIDER_HEALTH_WINDOW_SECONDS,
+            min_samples=settings.PROVIDER_HEALTH_MIN_SAMPLES,
+            failure_rate_threshold=settings.PROVIDER_HEALTH_FAILURE_RATE_THRESHOLD,
+            circuit_failure_threshold=settings.PROVIDER_CIRCUIT_FAILURE_THRESHOLD,
+            circuit_open_seconds=settings.PROVIDER_CIRCUIT_OPEN_SECONDS,
+            cache_ttl_ms=settings.PROVIDER_HEALTH_CACHE_MS,
+        )
+
+    def _script(self, source: str) -> Any:
+        # The client is created in the app lifespan, after the tracker
+        client = self._client_factory()
+        if client is not self._client:
+            self._client = client
+            self._scripts = {}
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = client.register_script(source)
+        return script
+
+    def _redis_key(self, key: ProviderHealthKey) -> str:
+        return self._key_prefix + ":".join(str(part) for part in key)
+
+    def _build_snapshot(
+        self, key: ProviderHealthKey, samples: int, failures: int
+    ) -> ProviderHealthSnapshot:
+        if samples <= 0:
+            return ProviderHealthSnapshot(circuit_state=self._circuit_state(key))
+        failure_rate = failures / samples
+        return ProviderHealthSnapshot(
+            sample_count=samples,
+            failure_count=failures,
+            failure_rate=failure_rate,
+            degraded=(
+                samples >= self.min_samples
+                and failure_rate >= self.failure_rate_threshold
+            ),
+            circuit_state=self._circuit_state(key),
+        )
+
+    def _snapshot(self, key: ProviderHealthKey) -> ProviderHealthSnapshot:
+        """Last snapshot read from Redis, with the current circuit state."""
+        cached = self._cache.get(key)
+        if cached is None:
+            return ProviderHealthSnapshot(circuit_state=self._circuit_state(key))
+        return replace(cached[1], circuit_state=self._circuit_state(key))
+
+    def _cleanup_expired(self, now: float) -> None:
+        """Periodically drop expired cache entries of removed/idle keys."""
+        if now < self._next_cleanup_at:
+            return
+        self._cache = {
+            key: entry for key, entry in self._cache.items() if entry[0] > now
+        }
+        for key in list(self._known_states):
+            if key not in self._cache:
+                self._known_states.pop(key, None)
+        # Failure streaks outlive the snapshot cache; keep them for a window
+        cutoff = now - self.window_seconds
+        for key, circuit in list(self._circuits.items()):
+            if circuit.state is CircuitState.CLOSED and circuit.last_failure_at < cutoff:
+                self._circuits.pop(key, None)
+        self._next_cleanup_at = now + self._cleanup_interval_seconds
+
+    def _store(
+        self, key: ProviderHealthKey, snapshot: ProviderHealthSnapshot, now: float
+    ) -> tuple[bool, bool] | None:
+        self._cache[key] = (now + self._cache_ttl, snapshot)
+        return self._state_transition(key, snapshot)
+
+    async def _get_snapshots_for_keys(
+        self,
+        keys: list[ProviderHealthKey],
+    ) -> dict[ProviderHealthKey, ProviderHealthSnapshot]:
+        if not self.enabled:
+            return {key: ProviderHealthSnapshot() for key in keys}
+
+        now = self._clock()
+        self._cleanup_expired(now)
+        snapshots: dict[ProviderHealthKey, ProviderHealthSnapshot] = {}
+        stale: list[ProviderHealthKey] = []
+        for key in keys:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > now:
+                snapshots[key] = self._snapshot(key)
+            else:
+                stale.append(key)
+        if not stale:
+            return snapshots
+
+        try:
+            counts = await self._script(_HEALTH_READ_SCRIPT)(
+                keys=[self._redis_key(key) for key in stale],
+                args=[self._bucket_ms, self._window_buckets],
+            )
+        except Exception as exc:
+            logger.warning("Provider health store unavailable, treating as healthy: %s", exc)
+            for key in stale:
+                snapshots[key] = ProviderHealthSnapshot(circuit_state=self._circuit_state(key))
+            return snapshots
+
+        for index, key in enumerate(stale):
+            snapshot = self._build_snapshot(
+                key,
+                int(counts[2 * index]), int(counts[2 * index + 1])
+            )
+            snapshots[key] = snapshot
+            self._log_transition(key, snapshot, self._store(key, snapshot, now))
+        return snapshots
+
+    async def record(
+        self,
+        candidate: CandidateProvider,
+        outcome: HealthOutcome,
+    ) -> ProviderHealthSnapshot:
+        if not self.enabled:
+            return ProviderHealthSnapshot()
+        key = provider_health_key(candidate)
+        now = self._clock()
+        # The circuit breaker is local, so it keeps working if Redis is down
+        circuit_transition = self._circuit_transition(key, outcome, now)
+        if outcome is HealthOutcome.IGNORED:
+            return ProviderHealthSnapshot()
+
+        failed = outcome is HealthOutcome.FAILURE
+        try:
+            samples, failures = await self._script(_HEALTH_RECORD_SCRIPT)(
+                keys=[self._redis_key(key)],
+                args=[self._bucket_ms, self._window_buckets, 1 if failed else 0, self._ttl_ms],
+            )
+        except Exception as exc:
+            logger.warning("Provider health store unavailable, skipping record: %s", exc)
+            snapshot = self._snapshot(key)
+            self._log_transition(key, snapshot, circuit_transition)
+            return snapshot
+
+        snapshot = self._build_snapshot(key, int(samples), int(failures))
+        self._log_transition(key, snapshot, circuit_transition)
+        self._log_transition(key, snapshot, self._store(key, snapshot, now))
+        return snapshot
+
+    async def reset(self) -> None:
+        """Clear local state; the shared counters expire on their own."""
+        self._cache.clear()
+        self._known_states.clear()
+        self._circuits.clear()
+
+
+def create_provider_health_tracker(settings) -> ProviderHealthTracker:
+    """Provider health tracker for the configured PROVIDER_HEALTH_BACKEND."""
+    if settings.PROVIDER_HEALTH_BACKEND == "redis":
+        return RedisProviderHealthTracker.from_settings(settings)
+    return ProviderHealthTracker.from_settings(settings)
@@ -20,6 +20,7 @@ from app.domain.provider import (
 )
 from app.providers import get_provider_client
 from app.repositories.provider_repo import ProviderRepository
+from app.services.config_bus import config_bus
 
 
 class ProviderService:
@@ -60,6 +61,7 @@ class ProviderService:
             )
         
         provider = await self.repo.create(data)
+        await config_bus.notify_changed()
         return self._to_response(provider)
     
     async def get_by_id(self, id: int) -> ProviderResponse:
@@ -167,6 +169,7 @@ class ProviderService:
                 )
         
         provider = await self.repo.update(id, data)
+        await config_bus.notify_changed()
         return self._to_response(provider)  # type: ignore
     
     async def delete(self, id: int) -> None:
@@ -196,6 +199,7 @@ class ProviderService:
             )
         
         await self.repo.delete(id)
+        await config_bus.notify_changed()
 
     async def export_data(self) -> list[ProviderCreate]:
         """
@@ -249,7 +253,9 @@ class ProviderService:
             
             await self.repo.create(item)
             success += 1
-            
+
+        if success:
+            await config_bus.notify_changed()
         return {"success": success, "skipped": skipped}
 
     async def list_upstream_models(
@@ -15,6 +15,7 @@ import anyio
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.common import json_codec
 from app.common.costs import calculate_cost_from_billing, resolve_billing
 from app.common.errors import NotFoundError, ServiceError
 from app.common.protocol_conversion import (
@@ -23,12 +24,18 @@ from app.common.protocol_conversion import (
     convert_stream_for_user,
     normalize_protocol,
 )
-from app.common.provider_protocols import resolve_implementation_protocol
+from app.common.provider_protocols import (
+    OPENAI_RESPONSES_PROTOCOL,
+    resolve_implementation_protocol,
+)
 from app.common.proxy import build_proxy_config
 from app.common.sanitizer import sanitize_headers
-from app.common.stream_usage import StreamUsageAccumulator
+from app.common.sse import SSEFramer
+from app.common.stream_capture import StreamCapture
+from app.common.stream_usage import StreamUsageTap
 from app.common.time import utc_now
 from app.common.upstream_url import build_upstream_url
+from app.common.token_count_executor import token_count_executor
 from app.common.token_counter import get_token_counter
 from app.common.usage_extractor import extract_usage_details
 from app.common.utils import generate_trace_id
@@ -43,9 +50,16 @@ from app.rules import CandidateProvider, RuleContext, RuleEngine, TokenUsage
 from app.services.retry_handler import AttemptRecord, RetryHandler
 from app.services.provider_health import ProviderHealthTracker
 from app.services.active_requests import active_requests
+from app.services.log_writer import LogWriter, strip_detail_payload
+from app.services.hedging import HedgePolicy
+from app.services.inflight import InFlightTracker
+from app.services.routing_cache import RoutingCache
+from app.services.token_rate_limit import TokenRateLimiter, TokenReservation
 from app.services.protocol_hooks import OPENAI_IMAGE_PATHS, ProtocolConversionHooks
 from app.services.strategy import (
     CostFirstStrategy,
+    LeastOutstandingStrategy,
+    LowestLatencyStrategy,
     PriorityStrategy,
     RoundRobinStrategy,
     SelectionStrategy,
@@ -55,6 +69,9 @@ logger = logging.getLogger(__name__)
 
 MAX_LOG_TEXT_LENGTH = 10000
 MAX_USER_ID_LENGTH = 255
+
+# Strong references to fire-and-forget log writes scheduled from callbacks
+_background_log_tasks: set[asyncio.Task] = set()
 CandidateKey = tuple[str, int] | tuple[str, int, str]
 
 
@@ -98,25 +115,6 @@ def _extract_user_id(headers: dict[str, str]) -> str | None:
     return None
 
 
-# Heavy request-detail payload fields suppressed when an API Key has detail
-# logging disabled. Main-table metadata plus usage_details/error_info are
-# always retained.
-_DETAIL_PAYLOAD_FIELDS = (
-    "request_body",
-    "response_body",
-    "request_headers",
-    "response_headers",
-    "converted_request_body",
-    "upstream_response_body",
-)
-
-
-def _strip_detail_payload(log_data: RequestLogCreate) -> None:
-    """Null out the heavy detail payload fields on a log entry in place."""
-    for field in _DETAIL_PAYLOAD_FIELDS:
-        setattr(log_data, field, None)
-
-
 class ProxyService:
     """
     Proxy Core Service
@@ -148,8 +146,20 @@ class ProxyService:
         round_robin_strategy: Optional[SelectionStrategy] = None,
         cost_first_strategy: Optional[SelectionStrategy] = None,
         priority_strategy: Optional[SelectionStrategy] = None,
+        lowest_latency_strategy: Optional[SelectionStrategy] = None,
+        least_outstanding_strategy: Optional[SelectionStrategy] = None,
         protocol_hooks: Optional[ProtocolConversionHooks] = None,
         health_tracker: Optional[ProviderHealthTracker] = None,
+        inflight_tracker: Optional[InFlightTracker] = None,
+        routing_cache: Optional[RoutingCache] = None,
+        token_rate_limiter: Optional[TokenRateLimiter] = None,
+        log_writer: Optional[LogWriter] = None,
+        log_write_mode: str = "initial_row",
+        stream_log_persist_after_seconds: float = 0,
+        stream_capture_max_bytes: int = 1024 * 1024,
+        stream_capture_spill_to_disk: bool = False,
+        stream_capture_spill_max_bytes: int = 16 * 1024 * 1024,
+        stream_passthrough: bool = True,
     ):
         """
         Initialize Service
@@ -177,6 +187,34 @@ class ProxyService:
             round_robin_strategy: Optional Round Robin Strategy instance
             cost_first_strategy: Optional Cost First Strategy instance
             priority_strategy: Optional Priority Strategy instance
+            lowest_latency_strategy: Optional Lowest Latency Strategy instance
+            least_outstanding_strategy: Optional Least Outstanding Strategy
+                instance
+            inflight_tracker: Optional counters of outstanding upstream
+                requests, fed by every forwarded attempt
+            routing_cache: Optional routing snapshot cache; when omitted every
+                request loads its routing config from the repositories
+            token_rate_limiter: Optional tokens-per-minute budgets; requests
+                reserve their input tokens before being forwarded
+            log_writer: Optional background log writer; while it is running,
+                log inserts and completions are queued to it instead of being
+                written inline
+            log_write_mode: "initial_row" inserts a log row when a request
+                arrives and updates it on completion; "single_write" keeps
+                in-flight requests in ``active_requests`` and inserts the row
+                once on completion
+            stream_log_persist_after_seconds: single_write only; streams still
+                running after this many seconds get their row inserted early
+                (0 disables)
+            stream_capture_max_bytes: byte budget for each captured stream
+                body (client and upstream); the middle of longer streams is
+                replaced by a truncation marker (0 keeps everything)
+            stream_capture_spill_to_disk: spool a larger head of each stream
+                body to a temp file instead of keeping it in memory
+            stream_capture_spill_max_bytes: hard byte cap per captured stream
+                body when spilling to disk
+            stream_passthrough: send same-protocol upstream stream bytes to the
+                client as they arrive when the protocol hooks allow it
         """
         self._session_factory = session_factory
         # Legacy/test instances (used when session_factory is None). Exposed under
@@ -196,8 +234,31 @@ class ProxyService:
         self._round_robin_strategy = round_robin_strategy or RoundRobinStrategy()
         self._cost_first_strategy = cost_first_strategy or CostFirstStrategy()
         self._priority_strategy = priority_strategy or PriorityStrategy()
+        self._lowest_latency_strategy = lowest_latency_strategy or LowestLatencyStrategy()
+        self._least_outstanding_strategy = (
+            least_outstanding_strategy or LeastOutstandingStrategy(inflight_tracker)
+        )
+        self._inflight_tracker = inflight_tracker
         self._protocol_hooks = protocol_hooks or ProtocolConversionHooks()
         self._health_tracker = health_tracker
+        self._routing_cache = routing_cache
+        self._token_rate_limiter = token_rate_limiter
+        self._log_writer = log_writer
+        self._log_write_mode = log_write_mode
+        self._stream_log_persist_after_seconds = stream_log_persist_after_seconds
+        self._stream_capture_max_bytes = stream_capture_max_bytes
+        self._stream_capture_spill_to_disk = stream_capture_spill_to_disk
+        self._stream_capture_spill_max_bytes = stream_capture_spill_max_bytes
+        self._stream_passthrough = stream_passthrough
+
+    def _new_stream_capture(self, record_details: bool) -> StreamCapture:
+        # Nothing is captured when the body would be stripped anyway.
+        return StreamCapture(
+            self._stream_capture_max_bytes,
+            enabled=record_details,
+            spill_to_disk=self._stream_capture_spill_to_disk,
+            spill_max_bytes=self._stream_capture_spill_max_bytes,
+        )
 
     @asynccontextmanager
     async def _repos(self):
@@ -215,7 +276,11 @@ class ProxyService:
             )
 
     async def _write_log(
-        self, log_data: RequestLogCreate, record_details: bool = True
+        self,
+        log_data: RequestLogCreate,
+        record_details: bool = True,
+        *,
+        prepare: Optional[Callable[[], None]] = None,
     ) -> None:
         # When detail logging is disabled for the API Key, drop the heavy payload
         # fields (request/response bodies and headers). Main-table metadata
@@ -223,7 +288,13 @@ class ProxyService:
         # error_info are always retained. Idempotent: callers may also strip
         # earlier (e.g. before debug logging) so the payload never leaks.
         if not record_details:
-            _strip_detail_payload(log_data)
+            strip_detail_payload(log_data)
+            prepare = None
+        if self._log_writer is not None and self._log_writer.running:
+            await self._log_writer.create(log_data, prepare=prepare)
+            return
+        if prepare is not None:
+            prepare()
         async with self._repos() as (_model_repo, _provider_repo, log_repo):
             await log_repo.create(log_data)
 
@@ -257,18 +328,100 @@ class ProxyService:
             request_method=method,
             is_completed=False,
         )
+        if self._log_write_mode == "single_write":
+            log_id = await active_requests.add_pending(log_data)
+            self._finalize_pending_on_exit(log_id)
+            return log_id
         async with self._repos() as (_model_repo, _provider_repo, log_repo):
             log_id = await log_repo.create_initial(log_data)
         return log_id
 
+    def _finalize_pending_on_exit(self, log_id: int) -> None:
+        """Make sure a pending entry is persisted even if the request task
+        ends without reaching its completion path (e.g. client disconnect)."""
+        task = asyncio.current_task()
+        if task is None:
+            return
+
+        def on_done(_task: asyncio.Task) -> None:
+            if not active_requests.has_pending(log_id):
+                return
+            abandoned = asyncio.get_running_loop().create_task(
+                self._write_abandoned_log(log_id)
+            )
+            _background_log_tasks.add(abandoned)
+            abandoned.add_done_callback(_background_log_tasks.discard)
+
+        task.add_done_callback(on_done)
+
+    async def _write_abandoned_log(self, log_id: int) -> None:
+        log_data = await active_requests.pop_pending(log_id)
+        await active_requests.deregister(log_id)
+        if log_data is None:
+            return
+        log_data.is_completed = True
+        log_data.response_status = 499
+        log_data.error_info = "Request ended before completion"
+        try:
+            await self._write_log(log_data)
+        except Exception:
+            logger.exception(
+                "Failed to write abandoned request log: trace_id=%s",
+                log_data.trace_id,
+            )
+
+    async def _persist_pending_log(self, log_id: int) -> int:
+        """Insert the in-progress row for a pending entry (single_write mode).
+
+        Returns the database log ID, or ``log_id`` unchanged when the entry is
+        no longer pending or the insert fails.
+        """
+        log_data = await active_requests.pop_pending(log_id)
+        if log_data is None:
+            return log_id
+        try:
+            async with self._repos() as (_model_repo, _provider_repo, log_repo):
+                new_log_id = await log_repo.create_initial(log_data)
+        except Exception:
+            logger.exception("Failed to persist in-progress log: log_id=%s", log_id)
+            await active_requests.add_pending(log_data, log_id=log_id)
+            return log_id
+        await active_requests.rekey(log_id, new_log_id)
+        return new_log_id
+
     async def _update_log(
-        self, log_id: int, log_data: RequestLogCreate, record_details: bool = True
+        self,
+        log_id: int,
+        log_data: RequestLogCreate,
+        record_details: bool = True,
+        *,
+        prepare: Optional[Callable[[], None]] = None,
     ) -> None:
-        """Update an existing log entry with completion data."""
+        """Update an existing log entry with completion data.
+
+        ``prepare`` fills deferred fields of ``log_data``; the log writer runs
+        it off the request path, otherwise it runs before the write.
+        """
         if not record_details:
-            _strip_detail_payload(log_data)
+            strip_detail_payload(log_data)
+            prepare = None
         log_data.is_completed = True
+        if self._log_write_mode == "single_write" and log_id < 0:
+            # Pending in memory (single_write mode): insert the row once. A
+            # missing entry means an admin cancel already persisted it.
+            if await active_requests.pop_pending(log_id) is None:
+                return
+            try:
+                await self._write_log(log_data, prepare=prepare)
+            except Exception:
+                logger.exception("Failed to write log: trace_id=%s", log_data.trace_id)
+            return
         try:
+            if self._log_writer is not None and self._log_writer.running:
+                await self._log_writer.update(log_id, log_data, prepare=prepare)
+                return
+            if prepare is not None:
+                prepare()
             async with self._repos() as (_model_repo, _provider_repo, log_repo):
                 await log_repo.update(log_id, log_data)
         except Exception:
@@ -321,7 +474,8 @@ class ProxyService:
         Get strategy instance based on strategy name
 
         Args:
-            strategy_name: Strategy name ("round_robin", "cost_first", or "priority")
+            strategy_name: Strategy name ("round_robin", "cost_first", "priority",
+                "lowest_latency" or "least_outstanding")
 
         Returns:
             SelectionStrategy: Strategy instance
@@ -330,6 +484,10 @@ class ProxyService:
             return self._cost_first_strategy
         if strategy_name == "priority":
             return self._priority_strategy
+        if strategy_name == "lowest_latency":
+            return self._lowest_latency_strategy
+        if strategy_name == "least_outstanding":
+            return self._least_outstanding_strategy
         else:
             # Default to round_robin for unknown strategies
             return self._round_robin_strategy
@@ -365,8 +523,8 @@ class ProxyService:
                 decoded = body.decode("utf-8")
                 # Try to parse as JSON first
                 try:
-                    data = json.loads(decoded)
-                except json.JSONDecodeError:
+                    data = json_codec.loads(decoded)
+                except json_codec.JSONDecodeError:
                     return _truncate_log_text(decoded)
             except UnicodeDecodeError:
                 return f"[binary data: {len(body)} bytes]"
@@ -375,13 +533,41 @@ class ProxyService:
         if isinstance(data, (dict, list)):
             try:
                 truncated_data = _smart_truncate(data)
-                return json.dumps(truncated_data, ensure_ascii=False)
+                return json_codec.dumps(truncated_data)
             except Exception:
                 # Fallback
                 return _truncate_log_text(str(data))
 
         return _truncate_log_text(str(data))
 
+    def _set_log_response_bodies(
+        self, log_data: RequestLogCreate, **bodies: Any
+    ) -> Optional[Callable[[], None]]:
+        """Set serialized response bodies on a log entry.
+
+        Raw passthrough bodies (bytes) are not serialized here: the returned
+        callable does it later, once per distinct body, so the upstream bytes
+        handed to the client unchanged are not re-parsed on the request path.
+        Returns None when nothing was deferred.
+        """
+        raw_bodies: dict[str, bytes | bytearray] = {}
+        for field, body in bodies.items():
+            if isinstance(body, (bytes, bytearray)):
+                raw_bodies[field] = body
+            else:
+                setattr(log_data, field, self._serialize_response_body(body))
+        if not raw_bodies:
+            return None
+
+        def serialize() -> None:
+            serialized: dict[int, Optional[str]] = {}
+            for field, body in raw_bodies.items():
+                if id(body) not in serialized:
+                    serialized[id(body)] = self._serialize_response_body(body)
+                setattr(log_data, field, serialized[id(body)])
+
+        return serialize
+
     @staticmethod
     def _sanitize_request_body_for_log(body: dict[str, Any]) -> dict[str, Any]:
         if not isinstance(body, dict) or "_files" not in body:
@@ -517,6 +703,31 @@ class ProxyService:
             "supplier_protocol": supplier_protocol,
         }
 
+    async def _load_routing_config(
+        self, requested_model: str
+    ) -> Optional[
+        tuple[ModelMapping, list[ModelMappingProviderResponse], dict[int, Provider]]
+    ]:
+        """Load the model mapping, its active provider mappings and providers.
+
+        Returns None when the model is not configured.
+        """
+        async with self._repos() as (model_repo, provider_repo, _log_repo):
+            model_mapping = await model_repo.get_mapping(requested_model)
+            if not model_mapping:
+                return None
+
+            provider_mappings = await model_repo.get_provider_mappings(
+                requested_model=requested_model,
+                is_active=True,
+            )
+
+            providers = await provider_repo.get_by_ids(
+                pm.provider_id for pm in provider_mappings
+            )
+
+        return model_mapping, provider_mappings, providers
+
     async def _resolve_candidates(
         self,
         requested_model: str,
@@ -526,48 +737,55 @@ class ProxyService:
     ) -> tuple[
         ModelMapping,
         list[CandidateProvider],
-        int,
+        Optional[int],
         str,
         dict[CandidateKey, ModelMappingProviderResponse],
     ]:
         """
         Resolve model and provider candidate list
 
+        Input tokens are counted here only when provider rules or the
+        selection strategy use them; otherwise input_tokens is None and
+        callers estimate it later, if upstream usage does not report it.
+
         Returns:
             tuple: (model_mapping, candidates, input_tokens, protocol, provider_mapping_by_id)
         """
         request_protocol = (request_protocol or "openai").lower()
-        async with self._repos() as (model_repo, provider_repo, _log_repo):
-            model_mapping = await model_repo.get_mapping(requested_model)
-            if not model_mapping:
-                raise NotFoundError(
-                    message=f"Model '{requested_model}' is not configured",
-                    code="model_not_found",
-                )
-
-            if not model_mapping.is_active:
-                raise ServiceError(
-                    message=f"Model '{requested_model}' is disabled",
-                    code="model_disabled",
+        if self._routing_cache is not None:
+            snapshot = await self._routing_cache.get(
+                requested_model, self._load_routing_config
+            )
+            route = (
+                (
+                    snapshot.model_mapping,
+                    list(snapshot.provider_mappings),
+                    dict(snapshot.providers),
                 )
+                if snapshot is not None
+                else None
+            )
+        else:
+            route = await self._load_routing_config(requested_model)
 
-            provider_mappings = await model_repo.get_provider_mappings(
-                requested_model=requested_model,
-                is_active=True,
+        if route is None:
+            raise NotFoundError(
+                message=f"Model '{requested_model}' is not configured",
+                code="model_not_found",
             )
+        model_mapping, provider_mappings, providers = route
 
-            if not provider_mappings:
-                raise ServiceError(
-                    message=f"No providers configured for model '{requested_model}'",
-                    code="no_available_provider",
-                )
+        if not model_mapping.is_active:
+            raise ServiceError(
+                message=f"Model '{requested_model}' is disabled",
+                code="model_disabled",
+            )
 
-            provider_ids = [pm.provider_id for pm in provider_mappings]
-            providers: dict[int, Provider] = {}
-            for pid in provider_ids:
-                provider = await provider_repo.get_by_id(pid)
-                if provider:
-                    providers[pid] = provider
+        if not provider_mappings:
+            raise ServiceError(
+                message=f"No providers configured for model '{requested_model}'",
+                code="no_available_provider",
+            )
 
         eligible_provider_mappings = [
             pm
@@ -591,13 +809,29 @@ class ProxyService:
         }
 
         token_counter = get_token_counter(request_protocol)
-        input_tokens = token_counter.count_request(body, requested_model)
+        input_tokens: Optional[int] = None
+        if (
+            self._get_strategy(model_mapping.strategy).needs_input_tokens
+            or self.rule_engine.needs_token_usage(eligible_provider_mappings)
+            or (
+                self._token_rate_limiter is not None
+                and self._token_rate_limiter.enabled
+            )
+        ):
+            input_tokens = await token_count_executor.count_request(
+                token_counter, body, requested_model
+            )
 
         context = RuleContext(
             current_model=requested_model,
             headers=headers,
             request_body=body,
-            token_usage=TokenUsage(input_tokens=input_tokens),
+            token_usage=TokenUsage(
+                input_tokens=input_tokens,
+                input_token_counter=lambda: token_counter.count_request(
+                    body, requested_model
+                ),
+            ),
         )
 
         candidates = await self.rule_engine.evaluate(
@@ -621,6 +855,22 @@ class ProxyService:
             provider_mapping_by_id,
         )
 
+    async def _reserve_tokens(
+        self, api_key_id: Optional[int], requested_model: str, input_tokens: Optional[int]
+    ) -> Optional[TokenReservation]:
+        """Take the input tokens from the TPM budgets (RateLimitError if exhausted)"""
+        if self._token_rate_limiter is None or input_tokens is None:
+            return None
+        return await self._token_rate_limiter.reserve(
+            api_key_id, requested_model, input_tokens
+        )
+
+    async def _settle_tokens(
+        self, reservation: Optional[TokenReservation], actual_tokens: int
+    ) -> None:
+        if reservation is not None and self._token_rate_limiter is not None:
+            await self._token_rate_limiter.settle(reservation, actual_tokens)
+
     async def process_request(
         self,
         api_key_id: Optional[int],
@@ -698,6 +948,9 @@ class ProxyService:
                 headers=headers,
                 body=body,
             )
+            token_reservation = await self._reserve_tokens(
+                api_key_id, requested_model, input_tokens
+            )
         except Exception as exc:
             await self._finalize_initial_log_error(
                 log_id=log_id,
@@ -721,6 +974,15 @@ class ProxyService:
             raise
         token_counter = get_token_counter(protocol)
 
+        async def estimate_input_tokens() -> int:
+            """Count input tokens locally, once, when nothing reported them"""
+            nonlocal input_tokens
+            if input_tokens is None:
+                input_tokens = await token_count_executor.count_request(
+                    token_counter, body, requested_model
+                )
+            return input_tokens
+
         # Extract image count for per-image billing
         image_count: Optional[int] = None
         if path in OPENAI_IMAGE_PATHS:
@@ -745,7 +1007,12 @@ class ProxyService:
 
         # Select strategy based on model configuration
         strategy = self._get_strategy(model_mapping.strategy)
-        retry_handler = RetryHandler(strategy, self._health_tracker)
+        retry_handler = RetryHandler(
+            strategy,
+            self._health_tracker,
+            HedgePolicy.for_mapping(model_mapping, is_stream=False),
+            inflight_tracker=self._inflight_tracker,
+        )
 
         # Track protocol conversion data for logging
         conversion_data: dict[str, Any] = {
@@ -754,8 +1021,14 @@ class ProxyService:
             "converted_request_body": None,
             "upstream_response_body": None,
         }
+        # Per-candidate conversion data: hedged attempts run concurrently
+        attempt_conversion_data: dict[Any, dict[str, Any]] = {}
 
         async def log_failed_attempt(attempt: AttemptRecord) -> None:
+            await estimate_input_tokens()
+            attempt_data = attempt_conversion_data.get(
+                self._candidate_key(attempt.provider), conversion_data
+            )
             provider_mapping = provider_mapping_by_id.get(
                 self._candidate_key(attempt.provider)
             )
@@ -832,14 +1105,14 @@ class ProxyService:
                 request_path=path,
                 request_url=request_url,
                 request_method=method,
-                upstream_url=conversion_data.get("upstream_url"),
+                upstream_url=attempt_data.get("upstream_url"),
                 # Protocol conversion fields
                 request_protocol=request_protocol,
                 supplier_protocol=resolve_implementation_protocol(
                     attempt.provider.protocol
                 ),
                 converted_request_body=_smart_truncate(
-                    conversion_data.get("converted_request_body")
+                    attempt_data.get("converted_request_body")
                 ),
                 upstream_response_body=self._serialize_response_body(
                     attempt.response.body
@@ -912,11 +1185,13 @@ class ProxyService:
                     if hooked_image_supplier_body is not None:
                         supplier_body = hooked_image_supplier_body
                 # Track conversion data for logging
-                conversion_data["supplier_protocol"] = supplier_protocol
-                conversion_data["converted_request_body"] = supplier_body
-                conversion_data["upstream_url"] = build_upstream_url(
-                    candidate.base_url, supplier_path
-                )
+                attempt_conversion_data[self._candidate_key(candidate)] = {
+                    "supplier_protocol": supplier_protocol,
+                    "converted_request_body": supplier_body,
+                    "upstream_url": build_upstream_url(
+                        candidate.base_url, supplier_path
+                    ),
+                }
                 same_protocol = normalize_protocol(
                     request_protocol
                 ) == normalize_protocol(supplier_protocol)
@@ -960,6 +1235,12 @@ class ProxyService:
             image_count=image_count,
             on_failure_attempt=log_failed_attempt,
         )
+        if result.final_provider is not None:
+            conversion_data.update(
+                attempt_conversion_data.get(
+                    self._candidate_key(result.final_provider), {}
+                )
+            )
 
         if result.response.body is not None and result.final_provider is not None:
             try:
@@ -1043,9 +1324,9 @@ class ProxyService:
             upstream_body = conversion_data.get("upstream_response_body")
             details = None
             try:
-                details = extract_usage_details(upstream_body) or extract_usage_details(
-                    result.response.body
-                )
+                details = extract_usage_details(upstream_body)
+                if details is None and result.response.body is not upstream_body:
+                    details = extract_usage_details(result.response.body)
             except Exception:
                 details = None
 
@@ -1056,13 +1337,13 @@ class ProxyService:
                 if details.output_tokens:
                     output_tokens = details.output_tokens
                 else:
-                    output_tokens = token_counter.count_output_body(
-                        result.response.body, requested_model
+                    output_tokens = await token_count_executor.count_output_body(
+                        token_counter, result.response.body, requested_model
                     )
                     usage_details["output_tokens"] = output_tokens
                     usage_details["source"] = "mixed"
                 if not usage_details.get("input_tokens"):
-                    usage_details["input_tokens"] = input_tokens
+                    usage_details["input_tokens"] = await estimate_input_tokens()
                     usage_details["source"] = "mixed"
                 if not usage_details.get("total_tokens") and usage_details.get(
                     "input_tokens"
@@ -1071,8 +1352,9 @@ class ProxyService:
                         usage_details.get("output_tokens") or 0
                     )
             else:
-                output_tokens = token_counter.count_output_body(
-                    result.response.body, requested_model
+                await estimate_input_tokens()
+                output_tokens = await token_count_executor.count_output_body(
+                    token_counter, result.response.body, requested_model
                 )
                 usage_details = {
                     "input_tokens": input_tokens,
@@ -1082,6 +1364,11 @@ class ProxyService:
                 }
 
         # 10. Record log
+        await estimate_input_tokens()
+        await self._settle_tokens(
+            token_reservation,
+            (input_tokens or 0) + (output_tokens or 0) if result.success else 0,
+        )
         provider_mapping = (
             provider_mapping_by_id.get(self._candidate_key(result.final_provider))
             if result.final_provider is not None
@@ -1179,7 +1466,6 @@ class ProxyService:
             response_headers=sanitize_headers(result.response.headers),
             request_body=sanitized_body,
             response_status=result.response.status_code,
-            response_body=self._serialize_response_body(result.response.body),
             usage_details=usage_details,
             error_info=result.response.error,
             trace_id=trace_id,
@@ -1194,15 +1480,17 @@ class ProxyService:
             converted_request_body=_smart_truncate(
                 conversion_data.get("converted_request_body")
             ),
-            upstream_response_body=self._serialize_response_body(
-                conversion_data.get("upstream_response_body")
-            ),
+        )
+        prepare_log_bodies = self._set_log_response_bodies(
+            log_data,
+            response_body=result.response.body,
+            upstream_response_body=conversion_data.get("upstream_response_body"),
         )
 
         # Strip detail payload before debug logging so a key with detail
         # logging disabled never leaks bodies/headers into application logs.
         if not record_details:
-            _strip_detail_payload(log_data)
+            strip_detail_payload(log_data)
 
         # DEBUG: Log request details
         try:
@@ -1213,7 +1501,12 @@ class ProxyService:
 
         # The initial row represents the overall request and must always reach
         # a terminal state. Failed-attempt rows remain useful retry diagnostics.
-        await self._update_log(log_id, log_data, record_details=record_details)
+        await self._update_log(
+            log_id,
+            log_data,
+            record_details=record_details,
+            prepare=prepare_log_bodies,
+        )
         await active_requests.deregister(log_id)
 
         return result.response, {
@@ -1296,6 +1589,9 @@ class ProxyService:
                 headers=headers,
                 body=body,
             )
+            token_reservation = await self._reserve_tokens(
+                api_key_id, requested_model, input_tokens
+            )
         except Exception as exc:
             await self._finalize_initial_log_error(
                 log_id=log_id,
@@ -1317,6 +1613,16 @@ class ProxyService:
             )
             await active_requests.deregister(log_id)
             raise
+        token_counter = get_token_counter(protocol)
+
+        async def estimate_input_tokens() -> int:
+            """Count input tokens locally, once, when nothing reported them"""
+            nonlocal input_tokens
+            if input_tokens is None:
+                input_tokens = await token_count_executor.count_request(
+                    token_counter, body, requested_model
+                )
+            return input_tokens
 
         # Extract image count for per-image billing
         image_count: Optional[int] = None
@@ -1342,15 +1648,23 @@ class ProxyService:
 
         # Select strategy based on model configuration
         strategy = self._get_strategy(model_mapping.strategy)
-        retry_handler = RetryHandler(strategy, self._health_tracker)
+        retry_handler = RetryHandler(
+            strategy,
+            self._health_tracker,
+            HedgePolicy.for_mapping(model_mapping, is_stream=True),
+            inflight_tracker=self._inflight_tracker,
+        )
 
-        # Track protocol conversion data for logging
+        # Track protocol conversion data for logging. Each attempt gets its own
+        # dict (hedged attempts run concurrently); once the stream starts this
+        # is rebound to the dict of the attempt that is streamed.
         stream_conversion_data: dict[str, Any] = {
             "request_protocol": request_protocol,
             "supplier_protocol": None,
             "converted_request_body": None,
-            "upstream_chunks": [],
+            "upstream_capture": None,
         }
+        stream_attempt_data: dict[Any, dict[str, Any]] = {}
 
         # 8. Execute streaming request
         async def forward_stream_fn(candidate: CandidateProvider):
@@ -1358,6 +1672,13 @@ class ProxyService:
                 yield b"", ProviderResponse(status_code=400, error=msg)
 
             supplier_protocol: Optional[str] = None
+            attempt_data: dict[str, Any] = {
+                "request_protocol": request_protocol,
+                "supplier_protocol": None,
+                "converted_request_body": None,
+                "upstream_capture": None,
+            }
+            stream_attempt_data[self._candidate_key(candidate)] = attempt_data
             try:
                 is_image_path = path in OPENAI_IMAGE_PATHS
                 supplier_protocol = resolve_implementation_protocol(candidate.protocol)
@@ -1410,9 +1731,9 @@ class ProxyService:
                     if hooked_image_supplier_body is not None:
                         supplier_body = hooked_image_supplier_body
                 # Track conversion data for logging
-                stream_conversion_data["supplier_protocol"] = supplier_protocol
-                stream_conversion_data["converted_request_body"] = supplier_body
-                stream_conversion_data["upstream_url"] = build_upstream_url(
+                attempt_data["supplier_protocol"] = supplier_protocol
+                attempt_data["converted_request_body"] = supplier_body
+                attempt_data["upstream_url"] = build_upstream_url(
                     candidate.base_url, supplier_path
                 )
             except Exception as e:
@@ -1457,40 +1778,8 @@ class ProxyService:
                         yield chunk, resp
                     return
 
-                async def upstream_bytes() -> AsyncGenerator[bytes, None]:
-                    # Reset upstream chunks for the current attempt
-                    stream_conversion_data["upstream_chunks"] = []
-
-                    # Buffer for complete SSE events (events end with \n\n)
-                    event_buffer = b""
-
-                    async def process_chunk(chunk: bytes) -> AsyncGenerator[bytes, None]:
-                        nonlocal event_buffer
-                        stream_conversion_data["upstream_chunks"].append(chunk)
-                        event_buffer += chunk
-
-                        # Process complete SSE events (each event ends with \n\n)
-                        while b"\n\n" in event_buffer:
-                            # Find the position of the event delimiter
-                            delimiter_pos = event_buffer.index(b"\n\n")
-                            # Extract the complete event including the delimiter
-                            complete_event = event_buffer[: delimiter_pos + 2]
-                            event_buffer = event_buffer[delimiter_pos + 2 :]
-
-                            # Call hook with complete SSE event
-                            hooked_event = (
-                                await self._protocol_hooks.before_stream_chunk_conversion(
-                                    complete_event,
-                                    request_protocol,
-                                    supplier_protocol,
-                                )
-                            )
-                            if hooked_event is None:
-                                hooked_event = complete_event
-                            yield hooked_event
-
-                    async for event in process_chunk(first_chunk):
-                        yield event
+                async def upstream_chunks() -> AsyncGenerator[bytes, None]:
+                    yield first_chunk
                     async for chunk, resp in upstream_gen:
                         if not resp.is_success:
                             # first_resp is the same object surfaced as initial_response;
@@ -1504,27 +1793,96 @@ class ProxyService:
                                 message=first_resp.error,
                                 code="upstream_stream_failed",
                             )
-                        async for event in process_chunk(chunk):
-                            yield event
+                        yield chunk
+
+                def reset_upstream_capture() -> Optional[StreamCapture]:
+                    # Reset the upstream capture for the current attempt
+                    previous_capture = attempt_data["upstream_capture"]
+                    if previous_capture is not None:
+                        previous_capture.close()
+                    upstream_capture = (
+                        None if passthrough else self._new_stream_capture(record_details)
+                    )
+                    attempt_data["upstream_capture"] = upstream_capture
+                    return upstream_capture
+
+                async def upstream_bytes() -> AsyncGenerator[bytes, None]:
+                    upstream_capture = reset_upstream_capture()
+
+                    # Frames complete SSE events (each ends with a blank line)
+                    framer = SSEFramer()
+                    async for chunk in upstream_chunks():
+                        await upstream_capture.awrite(chunk)
+                        for complete_event in framer.feed(chunk):
+                            # Call hook with complete SSE event
+                            hooked_event = (
+                                await self._protocol_hooks.before_stream_chunk_conversion(
+                                    complete_event,
+                                    request_protocol,
+                                    supplier_protocol,
+                                )
+                            )
+                            if hooked_event is None:
+                                hooked_event = complete_event
+                            yield hooked_event
 
                     # Flush any remaining data in buffer (incomplete event)
-                    if event_buffer:
+                    remaining = framer.flush()
+                    if remaining:
                         hooked_remaining = (
                             await self._protocol_hooks.before_stream_chunk_conversion(
-                                event_buffer,
+                                remaining,
                                 request_protocol,
                                 supplier_protocol,
                             )
                         )
                         if hooked_remaining is None:
-                            hooked_remaining = event_buffer
+                            hooked_remaining = remaining
                         yield hooked_remaining
 
+                async def passthrough_bytes() -> AsyncGenerator[bytes, None]:
+                    # Upstream bytes are the client bytes: the client capture
+                    # doubles as the upstream body, usage comes from the
+                    # wrapped_generator tap.
+                    reset_upstream_capture()
+                    if not self._protocol_hooks.observes_stream_events(
+                        request_protocol, supplier_protocol, body
+                    ):
+                        async for chunk in upstream_chunks():
+                            yield chunk
+                        return
+
+                    framer = SSEFramer()
+                    async for chunk in upstream_chunks():
+                        for complete_event in framer.feed(chunk):
+                            await self._protocol_hooks.observe_stream_event(
+                                complete_event,
+                                request_protocol,
+                                supplier_protocol,
+                            )
+                        yield chunk
+                    remaining = framer.flush()
+                    if remaining:
+                        await self._protocol_hooks.observe_stream_event(
+                            remaining,
+                            request_protocol,
+                            supplier_protocol,
+                        )
+
+                same_protocol = normalize_protocol(
+                    request_protocol
+                ) == normalize_protocol(supplier_protocol)
+                passthrough = (
+                    same_protocol
+                    and self._stream_passthrough
+                    and self._protocol_hooks.allows_stream_passthrough()
+                )
+
                 try:
-                    same_protocol = normalize_protocol(
-                        request_protocol
-                    ) == normalize_protocol(supplier_protocol)
-                    if same_protocol:
+                    if passthrough:
+                        async for chunk in passthrough_bytes():
+                            yield chunk, first_resp
+                    elif same_protocol:
                         async for chunk in upstream_bytes():
                             hooked_chunk = (
                                 await self._protocol_hooks.after_stream_chunk_conversion(
@@ -1542,7 +1900,12 @@ class ProxyService:
                             supplier_protocol=supplier_protocol,
                             upstream=upstream_bytes(),
                             model=candidate.target_model,
-                            input_tokens=input_tokens,
+                            # Responses streams report input usage at the end
+                            # even when the supplier stream does not
+                            input_tokens=await estimate_input_tokens()
+                            if normalize_protocol(request_protocol)
+                            == OPENAI_RESPONSES_PROTOCOL
+                            else input_tokens,
                         ):
                             hooked_out_chunk = (
                                 await self._protocol_hooks.after_stream_chunk_conversion(
@@ -1594,6 +1957,10 @@ class ProxyService:
             return wrapped()
 
         async def log_failed_attempt(attempt: AttemptRecord) -> None:
+            await estimate_input_tokens()
+            attempt_data = stream_attempt_data.get(
+                self._candidate_key(attempt.provider), stream_conversion_data
+            )
             provider_mapping = provider_mapping_by_id.get(
                 self._candidate_key(attempt.provider)
             )
@@ -1670,14 +2037,14 @@ class ProxyService:
                 request_path=path,
                 request_url=request_url,
                 request_method=method,
-                upstream_url=stream_conversion_data.get("upstream_url"),
+                upstream_url=attempt_data.get("upstream_url"),
                 # Protocol conversion fields
                 request_protocol=request_protocol,
                 supplier_protocol=resolve_implementation_protocol(
                     attempt.provider.protocol
                 ),
                 converted_request_body=_smart_truncate(
-                    stream_conversion_data.get("converted_request_body")
+                    attempt_data.get("converted_request_body")
                 ),
                 upstream_response_body=self._serialize_response_body(
                     attempt.response.body
@@ -1726,6 +2093,7 @@ class ProxyService:
                 record_details=record_details,
             )
             await active_requests.deregister(log_id)
+            await self._settle_tokens(token_reservation, 0)
             raise error
         except Exception as e:
             error = ServiceError(
@@ -1750,33 +2118,56 @@ class ProxyService:
                 record_details=record_details,
             )
             await active_requests.deregister(log_id)
+            await self._settle_tokens(token_reservation, 0)
             raise error from e
 
+        # Log the streamed attempt's conversion data and drop the captures of
+        # hedged attempts that lost the race
+        if final_provider is not None:
+            final_key = self._candidate_key(final_provider)
+            for key, data in stream_attempt_data.items():
+                if key == final_key:
+                    stream_conversion_data = data
+                elif data["upstream_capture"] is not None:
+                    data["upstream_capture"].close()
+                    data["upstream_capture"] = None
+
+        # single_write mode: long streams get their row inserted early so they
+        # are visible to every worker and survive a crash mid-stream.
+        persist_deadline: Optional[float] = (
+            start_monotonic + self._stream_log_persist_after_seconds
+            if self._log_write_mode == "single_write"
+            and self._stream_log_persist_after_seconds > 0
+            else None
+        )
+
         # Wrap generator to handle logging
         async def wrapped_generator():
-            nonlocal input_tokens
-            usage_acc = StreamUsageAccumulator(
+            nonlocal input_tokens, log_id, persist_deadline
+            # Parses usage-bearing events only; text is parsed lazily for the
+            # local token count fallback
+            usage_acc = StreamUsageTap(
                 protocol=protocol,
                 model=requested_model,
             )
-            raw_stream_chunks: list[bytes] = []
+            raw_stream_capture = self._new_stream_capture(record_details)
             stream_error: Optional[str] = None
 
-            def record_stream_chunk(chunk: Any) -> None:
-                if not chunk:
-                    return
-                if isinstance(chunk, (bytes, bytearray)):
-                    raw_stream_chunks.append(bytes(chunk))
-                    return
-                raw_stream_chunks.append(str(chunk).encode("utf-8"))
-
             try:
                 usage_acc.feed(first_chunk)
-                record_stream_chunk(first_chunk)
+                await raw_stream_capture.awrite(first_chunk)
                 yield first_chunk
                 async for chunk, _, _, _ in stream_gen:
                     usage_acc.feed(chunk)
-                    record_stream_chunk(chunk)
+                    await raw_stream_capture.awrite(chunk)
+                    if (
+                        persist_deadline is not None
+                        and log_id < 0
+                        and time.monotonic() >= persist_deadline
+                    ):
+                        with anyio.CancelScope(shield=True):
+                            log_id = await self._persist_pending_log(log_id)
+                        persist_deadline = None
                     yield chunk
             except asyncio.CancelledError:
                 stream_error = "client_disconnected"
@@ -1786,10 +2177,27 @@ class ProxyService:
                 stream_error = str(e)
                 return
             finally:
-                usage_result = usage_acc.finalize()
+                try:
+                    with anyio.CancelScope(shield=True):
+                        await self._protocol_hooks.after_stream_end(
+                            request_protocol,
+                            stream_conversion_data.get("supplier_protocol"),
+                        )
+                except Exception:
+                    logger.exception("after_stream_end hook failed: trace_id=%s", trace_id)
+                with anyio.CancelScope(shield=True):
+                    usage_result = await usage_acc.finalize_async()
+                    if usage_result.input_tokens:
+                        input_tokens = usage_result.input_tokens
+                    else:
+                        await estimate_input_tokens()
+                    await self._settle_tokens(
+                        token_reservation,
+                        (input_tokens or 0) + (usage_result.output_tokens or 0)
+                        if initial_response.status_code < 400
+                        else 0,
+                    )
                 usage_details = usage_result.usage_details
-                if usage_result.input_tokens:
-                    input_tokens = usage_result.input_tokens
                 if usage_details is None:
                     usage_details = {
                         "input_tokens": input_tokens,
@@ -1882,11 +2290,21 @@ class ProxyService:
                     cached_input_tokens=stream_cached_input_tokens,
                     cache_creation_input_tokens=stream_cache_creation_input_tokens,
                 )
-                raw_stream_text = (
-                    b"".join(raw_stream_chunks).decode("utf-8", errors="replace")
-                    if raw_stream_chunks
-                    else ""
-                )
+                upstream_capture = stream_conversion_data["upstream_capture"]
+                # Spilled captures are read in a worker thread, which a client
+                # disconnect would cancel
+                with anyio.CancelScope(shield=True):
+                    try:
+                        raw_stream_text = await raw_stream_capture.atext()
+                        upstream_stream_text = (
+                            await upstream_capture.atext()
+                            if upstream_capture is not None
+                            else ""
+                        )
+                    finally:
+                        raw_stream_capture.close()
+                        if upstream_capture is not None:
+                            upstream_capture.close()
                 reconstructed_body = json.dumps(
                     {
                         "type": "stream_reconstruction",
@@ -1946,18 +2364,14 @@ class ProxyService:
                     ),
                     # For stream, upstream_response_body is the raw stream captured from upstream
                     upstream_response_body=(
-                        b"".join(stream_conversion_data["upstream_chunks"]).decode(
-                            "utf-8", errors="replace"
-                        )
-                        if stream_conversion_data.get("upstream_chunks")
-                        else (raw_stream_text if raw_stream_text else None)
+                        upstream_stream_text or raw_stream_text or None
                     ),
                 )
 
                 # Strip detail payload before debug logging so a key with detail
                 # logging disabled never leaks bodies/headers into application logs.
                 if not record_details:
-                    _strip_detail_payload(log_data)
+                    strip_detail_payload(log_data)
 
                 # DEBUG: Log request details
                 try:
@@ -1970,7 +2384,7 @@ class ProxyService:
                 try:
                     with anyio.CancelScope(shield=True):
                         await self._update_log(log_id, log_data, record_details=record_details)
-                    await active_requests.deregister(log_id)
+                        await active_requests.deregister(log_id)
                 except Exception:
                     # Log writing failure does not affect main flow
                     pass
@@ -6,6 +6,7 @@ Implements logic for request retry and provider failover.
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Callable, Optional, Awaitable
@@ -14,6 +15,8 @@ from app.config import get_settings
 from app.common.time import ensure_utc, utc_now
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
+from app.services.hedging import HedgePolicy
+from app.services.inflight import InFlightTracker
 from app.services.provider_health import (
     ProviderHealthTracker,
     provider_health_key,
@@ -56,6 +59,22 @@ class RetryResult:
     attempts: list[AttemptRecord]
 
 
+@dataclass
+class _HedgeAttempt:
+    """One racing attempt of a hedged request."""
+
+    provider: CandidateProvider
+    request_time: datetime
+    started: float
+    # None while running or when cancelled because another attempt won
+    response: Optional[ProviderResponse] = None
+    # Stream generator positioned after the first chunk (streams only)
+    payload: Any = None
+    # Exception raised by the attempt instead of returning a response
+    error: Optional[Exception] = None
+    latency_ms: float = 0.0
+
+
 class RetryHandler:
     """
     Retry and Failover Handler
@@ -64,18 +83,32 @@ class RetryHandler:
     - Status code >= 500: Retry on the same provider, max 3 times, 1000ms interval
     - Status code < 500: Switch directly to the next provider
     - All providers failed: Return the last failed response
+
+    With a hedge policy, the first attempt is hedged: if the first provider
+    has not answered (streams: first chunk) within the hedge delay, the next
+    provider is dispatched in parallel. The first successful response wins
+    and the other attempt is cancelled. If both fail, failover continues
+    with the remaining providers.
+
+    With an in-flight tracker, every upstream attempt is counted from the
+    moment it is forwarded until its response returns or its stream ends.
     """
     
     def __init__(
         self,
         strategy: SelectionStrategy,
         health_tracker: ProviderHealthTracker | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        inflight_tracker: InFlightTracker | None = None,
     ):
         """
         Initialize Handler
         
         Args:
             strategy: Provider Selection Strategy
+            health_tracker: Optional provider health tracker
+            hedge_policy: Optional hedged request policy (None disables hedging)
+            inflight_tracker: Optional outstanding-request counters
         """
         settings = get_settings()
         self.strategy = strategy
@@ -84,6 +117,8 @@ class RetryHandler:
         # Retry interval (ms)
         self.retry_delay_ms = settings.RETRY_DELAY_MS
         self.health_tracker = health_tracker
+        self.hedge_policy = hedge_policy
+        self.inflight_tracker = inflight_tracker
 
     @staticmethod
     def _candidate_key(
@@ -113,6 +148,7 @@ class RetryHandler:
                 requested_model,
                 input_tokens=input_tokens,
                 image_count=image_count,
+                claim_probe=False,
             )
         ]
 
@@ -123,6 +159,7 @@ class RetryHandler:
         *,
         input_tokens: Optional[int] = None,
         image_count: Optional[int] = None,
+        claim_probe: bool = True,
     ) -> AsyncIterator[CandidateProvider]:
         """Yield candidates lazily in health-aware strategy order.
 
@@ -130,6 +167,9 @@ class RetryHandler:
         actually asks for a candidate from that group. This is important for
         stateful weighted strategies: a successful primary request must not
         advance counters for fallback providers that were never attempted.
+        Candidates whose hard circuit is open are skipped; with
+        ``claim_probe`` a half-open candidate is yielded to at most one
+        request at a time.
         """
         if not candidates:
             return
@@ -182,6 +222,19 @@ class RetryHandler:
                 input_tokens=input_tokens,
                 image_count=image_count,
             ):
+                if (
+                    self.health_tracker is not None
+                    and self.health_tracker.enabled
+                    and not self.health_tracker.allow_request(
+                        candidate, claim_probe=claim_probe
+                    )
+                ):
+                    logger.info(
+                        "Skipping provider with open circuit: provider_id=%s, provider_name=%s",
+                        candidate.provider_id,
+                        candidate.provider_name,
+                    )
+                    continue
                 yield candidate
 
     async def _iter_strategy_candidates(
@@ -219,18 +272,202 @@ class RetryHandler:
         provider: CandidateProvider,
         response: ProviderResponse,
     ) -> None:
-        if self.health_tracker is None:
-            return
         try:
-            await self.health_tracker.record_response(provider, response)
+            self.strategy.record_response(provider, response)
+            if self.health_tracker is not None:
+                await self.health_tracker.record_response(provider, response)
         except Exception:
             # Health tracking must never make the proxy request fail.
             logger.exception(
-                "Failed to update provider health: provider_id=%s target_model=%s",
+                "Failed to update provider health/latency stats: provider_id=%s target_model=%s",
                 provider.provider_id,
                 provider.target_model,
             )
     
+    def _track_forward(
+        self, forward_fn: Callable[[CandidateProvider], Any]
+    ) -> Callable[[CandidateProvider], Awaitable[ProviderResponse]]:
+        """Wrap ``forward_fn`` so each call counts as an in-flight request."""
+        tracker = self.inflight_tracker
+        assert tracker is not None
+
+        async def tracked(candidate: CandidateProvider) -> ProviderResponse:
+            key = tracker.acquire(candidate)
+            try:
+                return await forward_fn(candidate)
+            finally:
+                tracker.release(key)
+
+        return tracked
+
+    @staticmethod
+    async def _close_stream(generator: Any) -> None:
+        aclose = getattr(generator, "aclose", None)
+        if aclose is None:
+            return
+        try:
+            await aclose()
+        except Exception:
+            logger.debug("Failed to close upstream stream", exc_info=True)
+
+    async def _race_hedged(
+        self,
+        primary: CandidateProvider,
+        ordered: AsyncIterator[CandidateProvider],
+        start: Callable[[CandidateProvider], Awaitable[tuple[ProviderResponse, Any]]],
+        discard: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> list[_HedgeAttempt]:
+        """Run ``primary`` and race the next candidate if it misses the hedge delay.
+
+        Returns finished attempts in completion order followed by attempts
+        cancelled because another one succeeded first. A single attempt means
+        no hedge was dispatched. Exceptions raised by an attempt are kept on
+        ``_HedgeAttempt.error`` (with a 502 response) so they do not abort the
+        other attempt. If the race itself is cancelled (client disconnect),
+        every attempt is cancelled and any payload already produced is
+        discarded before the cancellation propagates.
+
+        A cancelled loser that ran for at least the hedge delay (the primary)
+        records its elapsed time as a latency sample: it is a lower bound of
+        its real latency, and dropping it would leave only the fast attempts
+        in the adaptive hedge delay. A hedge cancelled sooner says nothing
+        about its tail and is not recorded.
+        """
+        assert self.hedge_policy is not None
+        attempts: dict[asyncio.Future, _HedgeAttempt] = {}
+        finished: list[_HedgeAttempt] = []
+        returned = False
+
+        def dispatch(candidate: CandidateProvider) -> None:
+            attempt = _HedgeAttempt(
+                provider=candidate,
+                request_time=utc_now(),
+                started=time.monotonic(),
+            )
+            attempts[asyncio.ensure_future(start(candidate))] = attempt
+
+        dispatch(primary)
+        pending: set[asyncio.Future] = set(attempts)
+        try:
+            delay = self.hedge_policy.delay_seconds(primary)
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                secondary = await anext(ordered, None)
+                if secondary is not None:
+                    logger.info(
+                        "Hedging request: provider_id=%s has not answered in %.0fms, "
+                        "dispatching provider_id=%s",
+                        primary.provider_id,
+                        delay * 1000,
+                        secondary.provider_id,
+                    )
+                    dispatch(secondary)
+                    pending = set(attempts)
+
+            while True:
+                for task in done:
+                    attempt = attempts[task]
+                    attempt.latency_ms = (time.monotonic() - attempt.started) * 1000
+                    try:
+                        attempt.response, attempt.payload = task.result()
+                    except Exception as exc:
+                        attempt.error = exc
+                        attempt.response = ProviderResponse(status_code=502, error=str(exc))
+                    finished.append(attempt)
+                if not pending or any(a.response.is_success for a in finished):
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            returned = True
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            now = time.monotonic()
+            for task in pending:
+                attempts[task].latency_ms = (now - attempts[task].started) * 1000
+            # Payloads that will not reach the caller: attempts that finished
+            # despite the cancel, and everything if the race was interrupted
+            leftovers = list(pending) if returned else list(attempts)
+            for task in leftovers:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                payload = task.result()[1]
+                if discard is not None and payload is not None:
+                    await discard(payload)
+
+        # Attempts that succeeded in the same tick as the winner lose as well
+        winner_found = False
+        for attempt in finished:
+            if not attempt.response.is_success:
+                continue
+            if winner_found:
+                if discard is not None and attempt.payload is not None:
+                    await discard(attempt.payload)
+                attempt.response = attempt.payload = None
+            winner_found = True
+        cancelled = [attempts[task] for task in pending]
+        for attempt in cancelled:
+            if attempt.latency_ms >= delay * 1000:
+                self.hedge_policy.record(attempt.provider, attempt.latency_ms)
+        return finished + cancelled
+
+    async def _record_hedge_losers(
+        self,
+        race: list[_HedgeAttempt],
+        attempt_index: int,
+        on_failure_attempt: Callable[[AttemptRecord], Awaitable[None]] | None,
+    ) -> tuple[Optional[_HedgeAttempt], list[AttemptRecord]]:
+        """Record every raced attempt but the winner as a failed attempt.
+
+        Returns the winning attempt (None if every attempt failed) and the
+        attempt records of the others, in race order.
+        """
+        winner = next(
+            (a for a in race if a.response is not None and a.response.is_success),
+            None,
+        )
+        records: list[AttemptRecord] = []
+        for attempt in race:
+            if attempt is winner:
+                continue
+            if attempt.response is None:
+                response = ProviderResponse(
+                    status_code=499,
+                    error="Hedged request cancelled: provider %s answered first"
+                    % (winner.provider.provider_name if winner else "-"),
+                )
+            else:
+                response = attempt.response
+                await self._record_health(attempt.provider, response)
+            record = AttemptRecord(
+                provider=attempt.provider,
+                response=response,
+                request_time=attempt.request_time,
+                attempt_index=attempt_index + len(records),
+            )
+            records.append(record)
+            logger.warning(
+                "Hedged provider attempt lost: provider_id=%s, provider_name=%s, "
+                "status_code=%s, error=%s",
+                attempt.provider.provider_id,
+                attempt.provider.provider_name,
+                response.status_code,
+                response.error,
+            )
+            if on_failure_attempt is not None:
+                try:
+                    await on_failure_attempt(record)
+                except Exception:
+                    logger.exception(
+                        "on_failure_attempt callback failed (hedge): provider_id=%s attempt_index=%s",
+                        attempt.provider.provider_id,
+                        record.attempt_index,
+                    )
+        return winner, records
+
     async def execute_with_retry(
         self,
         candidates: list[CandidateProvider],
@@ -270,13 +507,20 @@ class RetryHandler:
         last_provider: Optional[CandidateProvider] = None
         attempts: list[AttemptRecord] = []
         attempt_index = 0
-        
-        async for current_provider in self._iter_ordered_candidates(
+        hedge_pending = self.hedge_policy is not None
+        if self.inflight_tracker is not None:
+            forward_fn = self._track_forward(forward_fn)
+
+        async def forward_once(candidate: CandidateProvider) -> tuple[ProviderResponse, Any]:
+            return await forward_fn(candidate), None
+
+        ordered = self._iter_ordered_candidates(
             candidates,
             requested_model,
             input_tokens=input_tokens,
             image_count=image_count,
-        ):
+        )
+        async for current_provider in ordered:
             last_provider = current_provider
             provider_response: Optional[ProviderResponse] = None
             
@@ -286,7 +530,35 @@ class RetryHandler:
             while same_provider_retries < self.max_retries:
                 # Execute request
                 attempt_time = utc_now()
-                response = await forward_fn(current_provider)
+                if hedge_pending:
+                    hedge_pending = False
+                    race = await self._race_hedged(current_provider, ordered, forward_once)
+                    if len(race) > 1:
+                        winner, records = await self._record_hedge_losers(
+                            race, attempt_index, on_failure_attempt
+                        )
+                        attempts.extend(records)
+                        attempt_index += len(records)
+                        total_retry_count += len(records)
+                        if winner is None:
+                            # Both raced providers failed: fail over to the rest
+                            last_provider = records[-1].provider
+                            last_response = records[-1].response
+                            break
+                        current_provider = winner.provider
+                        attempt_time = winner.request_time
+                        response = winner.response
+                        latency_ms = winner.latency_ms
+                    else:
+                        if race[0].error is not None:
+                            raise race[0].error
+                        response = race[0].response
+                        latency_ms = race[0].latency_ms
+                else:
+                    started = time.monotonic()
+                    response = await forward_fn(current_provider)
+                    latency_ms = (time.monotonic() - started) * 1000
+                last_provider = current_provider
                 last_response = response
                 provider_response = response
                 attempt_record = AttemptRecord(
@@ -301,6 +573,8 @@ class RetryHandler:
                 # Success response
                 if response.is_success:
                     await self._record_health(current_provider, response)
+                    if self.hedge_policy is not None:
+                        self.hedge_policy.record(current_provider, latency_ms)
                     return RetryResult(
                         response=response,
                         retry_count=total_retry_count,
@@ -409,29 +683,85 @@ class RetryHandler:
         last_response: Optional[ProviderResponse] = None
         last_provider: Optional[CandidateProvider] = None
         attempt_index = 0
-
-        async for current_provider in self._iter_ordered_candidates(
+        hedge_pending = self.hedge_policy is not None
+
+        async def open_stream(candidate: CandidateProvider) -> Any:
+            tracker = self.inflight_tracker
+            key = tracker.acquire(candidate) if tracker is not None else None
+            try:
+                result = forward_stream_fn(candidate)
+                # Handle both sync and async forward_stream_fn
+                if asyncio.iscoroutine(result):
+                    result = await result
+            except BaseException:
+                if key is not None:
+                    tracker.release(key)
+                raise
+            if key is None:
+                return result
+            # Outstanding until the stream is exhausted or closed
+            return tracker.track_stream(key, result)
+
+        async def first_chunk(candidate: CandidateProvider) -> tuple[ProviderResponse, Any]:
+            generator = await open_stream(candidate)
+            try:
+                chunk, response = await anext(generator)
+            except asyncio.CancelledError:
+                await generator.aclose()
+                raise
+            return response, (chunk, generator)
+
+        async def discard_stream(payload: Any) -> None:
+            await self._close_stream(payload[1])
+
+        ordered = self._iter_ordered_candidates(
             candidates,
             requested_model,
             input_tokens=input_tokens,
             image_count=image_count,
-        ):
+        )
+        async for current_provider in ordered:
             last_provider = current_provider
             same_provider_retries = 0
             provider_response: Optional[ProviderResponse] = None
             
             while same_provider_retries < self.max_retries:
                 try:
-                    # Get generator
                     attempt_time = utc_now()
-                    result = forward_stream_fn(current_provider)
-                    # Handle both sync and async forward_stream_fn
-                    if asyncio.iscoroutine(result):
-                        generator = await result
+                    if hedge_pending:
+                        hedge_pending = False
+                        race = await self._race_hedged(
+                            current_provider, ordered, first_chunk, discard_stream
+                        )
+                        if len(race) > 1:
+                            winner, records = await self._record_hedge_losers(
+                                race, attempt_index, on_failure_attempt
+                            )
+                            for attempt in race:
+                                if attempt is not winner and attempt.payload is not None:
+                                    await discard_stream(attempt.payload)
+                            attempt_index += len(records)
+                            total_retry_count += len(records)
+                            if winner is None:
+                                # Both raced providers failed: fail over to the rest
+                                last_provider = records[-1].provider
+                                last_response = records[-1].response
+                                break
+                            current_provider = last_provider = winner.provider
+                            attempt_time = winner.request_time
+                            race = [winner]
+                        if race[0].error is not None:
+                            raise race[0].error
+                        response = race[0].response
+                        chunk, generator = race[0].payload
+                        latency_ms = race[0].latency_ms
                     else:
-                        generator = result
-                    # Get first chunk
-                    chunk, response = await anext(generator)
+                        started = time.monotonic()
+                        # Get generator
+                        generator = await open_stream(current_provider)
+                        # Get first chunk
+                        chunk, response = await anext(generator)
+                        latency_ms = (time.monotonic() - started) * 1000
                     last_response = response
                     provider_response = response
                     last_chunk = chunk
@@ -444,13 +774,19 @@ class RetryHandler:
                     attempt_index += 1
 
                     if response.is_success:
-                        # Success, yield subsequent data
-                        yield chunk, response, current_provider, total_retry_count
-                        final_response = response
-                        async for chunk, stream_response in generator:
-                            final_response = stream_response
-                            last_response = stream_response
-                            yield chunk, stream_response, current_provider, total_retry_count
+                        if self.hedge_policy is not None:
+                            self.hedge_policy.record(current_provider, latency_ms)
+                        # Success, yield subsequent data. Close the upstream
+                        # generator as soon as the consumer stops reading.
+                        try:
+                            yield chunk, response, current_provider, total_retry_count
+                            final_response = response
+                            async for chunk, stream_response in generator:
+                                final_response = stream_response
+                                last_response = stream_response
+                                yield chunk, stream_response, current_provider, total_retry_count
+                        finally:
+                            await self._close_stream(generator)
                         await self._record_health(current_provider, final_response)
                         return
 
@@ -463,6 +799,7 @@ class RetryHandler:
                                 current_provider.provider_id,
                                 attempt_record.attempt_index,
                             )
+                    await self._close_stream(generator)
 
                     # Log failure
                     logger.warning(
@@ -0,0 +1,175 @@
+"""In-process routing snapshot cache for proxy candidate resolution."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Awaitable, Callable, Mapping, Optional
+
+from app.config import get_settings
+from app.domain.model import ModelMapping, ModelMappingProviderResponse
+from app.domain.provider import Provider
+from app.services.config_bus import config_bus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RoutingSnapshot:
+    """Routing configuration for one requested model.
+
+    Snapshots are shared by every request that hits the cache, so callers must
+    treat the contained domain objects as read-only.
+    """
+
+    version: int
+    loaded_at: float
+    model_mapping: ModelMapping
+    # Active model-provider mappings in repository order (priority, id)
+    provider_mappings: tuple[ModelMappingProviderResponse, ...]
+    # Providers referenced by provider_mappings, API keys already decrypted
+    providers: Mapping[int, Provider]
+
+
+RoutingLoader = Callable[
+    [str],
+    Awaitable[
+        Optional[
+            tuple[
+                ModelMapping,
+                list[ModelMappingProviderResponse],
+                dict[int, Provider],
+            ]
+        ]
+    ],
+]
+
+
+class RoutingCache:
+    """Versioned, TTL-bounded cache of routing snapshots keyed by requested model.
+
+    Config writes call ``invalidate()``, which bumps the version and drops every
+    snapshot. Loads that started before an invalidation are returned to their
+    caller but never stored, so a racing write cannot be overwritten by stale
+    data. The TTL bounds staleness for writes that bypass this process.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._version = 0
+        self._snapshots: dict[str, RoutingSnapshot] = {}
+        self._loading: dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "RoutingCache":
+        return cls(
+            enabled=settings.ROUTING_CACHE_ENABLED,
+            ttl_seconds=settings.ROUTING_CACHE_TTL_SECONDS,
+        )
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> int:
+        """Drop every snapshot and return the new version."""
+        self._version += 1
+        self._snapshots.clear()
+        self._loading.clear()
+        logger.debug("Routing cache invalidated: version=%s", self._version)
+        return self._version
+
+    def _fresh(self, requested_model: str) -> Optional[RoutingSnapshot]:
+        snapshot = self._snapshots.get(requested_model)
+        if snapshot is None:
+            return None
+        if (
+            snapshot.version != self._version
+            or self._clock() - snapshot.loaded_at >= self.ttl_seconds
+        ):
+            self._snapshots.pop(requested_model, None)
+            return None
+        return snapshot
+
+    async def get(
+        self,
+        requested_model: str,
+        loader: RoutingLoader,
+    ) -> Optional[RoutingSnapshot]:
+        """Return the snapshot for ``requested_model``, loading it on a miss.
+
+        Concurrent misses for the same model share a single load. Unknown
+        models are not cached so arbitrary client-supplied names cannot grow
+        the cache.
+        """
+        if not self.enabled:
+            loaded = await loader(requested_model)
+            return self._build(self._version, loaded)
+
+        snapshot = self._fresh(requested_model)
+        if snapshot is not None:
+            return snapshot
+
+        pending = self._loading.get(requested_model)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only the loading request was cancelled; load for ourselves.
+                if not pending.cancelled():
+                    raise
+
+        version = self._version
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._loading[requested_model] = future
+        try:
+            snapshot = self._build(version, await loader(requested_model))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark retrieved so an unobserved failure is
+            # not reported as "exception was never retrieved".
+            future.exception()
+            raise
+        finally:
+            if self._loading.get(requested_model) is future:
+                self._loading.pop(requested_model, None)
+
+        if snapshot is not None and version == self._version:
+            self._snapshots[requested_model] = snapshot
+        future.set_result(snapshot)
+        return snapshot
+
+    def _build(self, version: int, loaded) -> Optional[RoutingSnapshot]:
+        if loaded is None:
+            return None
+        model_mapping, provider_mappings, providers = loaded
+        return RoutingSnapshot(
+            version=version,
+            loaded_at=self._clock(),
+            model_mapping=model_mapping,
+            provider_mappings=tuple(provider_mappings),
+            providers=MappingProxyType(dict(providers)),
+        )
+
+
+# Global singleton. Config writes through ModelService/ProviderService (on any
+# worker) invalidate it via the config change bus; the proxy reads through it.
+routing_cache = RoutingCache.from_settings(get_settings())
+config_bus.subscribe(routing_cache.invalidate)
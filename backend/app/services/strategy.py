@@ -5,13 +5,18 @@ Provides implementation for provider selection strategies.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional
 import asyncio
 import logging
+import random
 from decimal import Decimal
 
+from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
 from app.common.costs import resolve_billing, estimate_input_cost_from_billing
+from app.common.usage_extractor import extract_output_tokens
+from app.services.inflight import InFlightTracker, inflight_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +33,10 @@ class SelectionStrategy(ABC):
     
     Defines the interface for selecting a provider from a list of candidates.
     """
+
+    # Whether select/get_next use input_tokens. Input tokens are counted
+    # before selection only for strategies that do.
+    needs_input_tokens: bool = False
     
     @abstractmethod
     async def select(
@@ -75,6 +84,14 @@ class SelectionStrategy(ABC):
         """
         pass
 
+    def record_response(self, candidate: CandidateProvider, response: ProviderResponse) -> None:
+        """
+        Observe an upstream response of a candidate selected by this strategy
+
+        Called wherever provider health is recorded. Stateless strategies
+        ignore it.
+        """
+
 
 class RoundRobinStrategy(SelectionStrategy):
     """
@@ -399,6 +416,8 @@ class CostFirstStrategy(SelectionStrategy):
     If multiple providers have the same lowest cost, uses Round Robin to distribute load.
     """
 
+    needs_input_tokens = True
+
     def __init__(self):
         """Initialize Strategy"""
         self._round_robin = RoundRobinStrategy()
@@ -620,3 +639,270 @@ class CostFirstStrategy(SelectionStrategy):
         )
 
         return next_candidate
+
+
+@dataclass
+class _LatencyStats:
+    """EWMA latency/throughput of one candidate (None until first sample)."""
+
+    first_byte_ms: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+    samples: int = 0
+
+
+class LowestLatencyStrategy(SelectionStrategy):
+    """
+    Lowest Latency Strategy
+
+    Prefers the candidate with the lowest observed latency. Keeps an EWMA of
+    time to first byte for every successful response and of output-token
+    throughput for non-stream responses that report usage.
+
+    Selection uses power of two choices: two random candidates are compared
+    and the faster one wins, which keeps the fastest candidate from taking all
+    traffic at once. With probability ``exploration_rate`` a random candidate
+    is picked instead, so candidates without samples (and slow ones that may
+    have recovered) keep being measured. Failover goes to the next fastest.
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.3,
+        exploration_rate: float = 0.05,
+        reference_output_tokens: int = 256,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize Strategy
+
+        Args:
+            alpha: EWMA weight of the newest sample (0-1]
+            exploration_rate: Probability of picking a random candidate
+            reference_output_tokens: Completion length used to turn throughput
+                into time when scoring candidates
+            rng: Random source (for testing)
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if not 0 <= exploration_rate <= 1:
+            raise ValueError("exploration_rate must be in [0, 1]")
+        self.alpha = alpha
+        self.exploration_rate = exploration_rate
+        self.reference_output_tokens = reference_output_tokens
+        self._rng = rng or random.Random()
+        self._stats: dict[tuple, _LatencyStats] = {}
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + self.alpha * (sample - current)
+
+    def record_response(self, candidate: CandidateProvider, response: ProviderResponse) -> None:
+        if not response.is_success or response.first_byte_delay_ms is None:
+            return
+        stats = self._stats.setdefault(_candidate_key(candidate), _LatencyStats())
+        stats.first_byte_ms = self._ewma(stats.first_byte_ms, response.first_byte_delay_ms)
+        stats.samples += 1
+
+        # Streams are recorded at their first chunk, before total_time_ms and
+        # usage are known; only complete bodies yield a throughput sample.
+        if response.total_time_ms and response.body is not None:
+            output_tokens = extract_output_tokens(response.body)
+            if output_tokens:
+                stats.tokens_per_second = self._ewma(
+                    stats.tokens_per_second,
+                    output_tokens * 1000 / response.total_time_ms,
+                )
+
+    def snapshot(self, candidate: CandidateProvider) -> _LatencyStats:
+        return self._stats.get(_candidate_key(candidate), _LatencyStats())
+
+    def _score(self, stats: _LatencyStats, with_throughput: bool) -> float:
+        score = stats.first_byte_ms if stats.first_byte_ms is not None else float("inf")
+        if with_throughput and stats.tokens_per_second:
+            score += self.reference_output_tokens * 1000 / stats.tokens_per_second
+        return score
+
+    def _faster(self, a: CandidateProvider, b: CandidateProvider) -> CandidateProvider:
+        stats_a, stats_b = self.snapshot(a), self.snapshot(b)
+        # Only add throughput when both sides have it, so they stay comparable
+        with_throughput = bool(stats_a.tokens_per_second and stats_b.tokens_per_second)
+        return a if self._score(stats_a, with_throughput) <= self._score(stats_b, with_throughput) else b
+
+    def _ranked(self, candidates: list[CandidateProvider]) -> list[CandidateProvider]:
+        """Candidates from fastest to slowest; unmeasured ones last."""
+        return sorted(
+            candidates,
+            key=lambda c: (
+                self._score(self.snapshot(c), with_throughput=False),
+                c.priority,
+                c.provider_id,
+                c.target_model,
+                c.provider_mapping_id or 0,
+            ),
+        )
+
+    async def select(
+        self,
+        candidates: list[CandidateProvider],
+        requested_model: str,
+        input_tokens: Optional[int] = None,
+        image_count: Optional[int] = None,
+    ) -> Optional[CandidateProvider]:
+        """
+        Select provider with power of two choices on observed latency
+
+        Args:
+            candidates: List of candidate providers
+            requested_model: Requested model name
+            input_tokens: Number of input tokens (unused in lowest latency)
+            image_count: Number of images (unused in lowest latency)
+
+        Returns:
+            Optional[CandidateProvider]: Selected provider
+        """
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        if self._rng.random() < self.exploration_rate:
+            return self._rng.choice(candidates)
+        a, b = self._rng.sample(candidates, 2)
+        return self._faster(a, b)
+
+    async def get_next(
+        self,
+        candidates: list[CandidateProvider],
+        requested_model: str,
+        current: CandidateProvider,
+        input_tokens: Optional[int] = None,
+        image_count: Optional[int] = None,
+    ) -> Optional[CandidateProvider]:
+        """
+        Get next fastest provider (used for failover)
+
+        Args:
+            candidates: List of candidate providers
+            requested_model: Requested model name
+            current: Current provider
+            input_tokens: Number of input tokens (unused in lowest latency)
+            image_count: Number of images (unused in lowest latency)
+
+        Returns:
+            Optional[CandidateProvider]: Next provider in latency order
+        """
+        if not candidates or len(candidates) <= 1:
+            return None
+
+        ranked = self._ranked(candidates)
+        current_index = next(
+            (i for i, c in enumerate(ranked) if _candidate_key(c) == _candidate_key(current)),
+            -1,
+        )
+        if current_index == -1:
+            return None
+        # Wrap around: after a slow exploration pick, the faster ones follow
+        return ranked[(current_index + 1) % len(ranked)]
+
+    def reset(self) -> None:
+        """Forget all latency samples (for testing)"""
+        self._stats.clear()
+
+
+class LeastOutstandingStrategy(SelectionStrategy):
+    """
+    Least Outstanding Requests Strategy
+
+    Selects the candidate with the fewest in-flight requests relative to its
+    weight (outstanding / weight), so providers busy with long-running
+    streams get less new work. Ties (e.g. when idle) are broken with weighted
+    round robin. Failover goes to the next least loaded candidate.
+    """
+
+    def __init__(self, tracker: Optional[InFlightTracker] = None):
+        """
+        Initialize Strategy
+
+        Args:
+            tracker: In-flight counters fed by the retry handler
+        """
+        self.tracker = tracker or inflight_tracker
+        self._round_robin = RoundRobinStrategy()
+
+    def _load(self, candidate: CandidateProvider) -> float:
+        return self.tracker.count(candidate) / (candidate.weight if candidate.weight > 0 else 1)
+
+    def _ranked(self, candidates: list[CandidateProvider]) -> list[CandidateProvider]:
+        return sorted(
+            candidates,
+            key=lambda c: (
+                self._load(c),
+                c.priority,
+                c.provider_id,
+                c.target_model,
+                c.provider_mapping_id or 0,
+            ),
+        )
+
+    async def select(
+        self,
+        candidates: list[CandidateProvider],
+        requested_model: str,
+        input_tokens: Optional[int] = None,
+        image_count: Optional[int] = None,
+    ) -> Optional[CandidateProvider]:
+        """
+        Select provider with the lowest weighted in-flight count
+
+        Args:
+            candidates: List of candidate providers
+            requested_model: Requested model name
+            input_tokens: Number of input tokens (unused in least outstanding)
+            image_count: Number of images (unused in least outstanding)
+
+        Returns:
+            Optional[CandidateProvider]: Selected provider
+        """
+        if not candidates:
+            return None
+
+        loads = [(candidate, self._load(candidate)) for candidate in candidates]
+        min_load = min(load for _, load in loads)
+        least_loaded = [candidate for candidate, load in loads if load == min_load]
+        if len(least_loaded) == 1:
+            return least_loaded[0]
+        return await self._round_robin.select(least_loaded, requested_model)
+
+    async def get_next(
+        self,
+        candidates: list[CandidateProvider],
+        requested_model: str,
+        current: CandidateProvider,
+        input_tokens: Optional[int] = None,
+        image_count: Optional[int] = None,
+    ) -> Optional[CandidateProvider]:
+        """
+        Get next least loaded provider (used for failover)
+
+        Args:
+            candidates: List of candidate providers
+            requested_model: Requested model name
+            current: Current provider
+            input_tokens: Number of input tokens (unused in least outstanding)
+            image_count: Number of images (unused in least outstanding)
+
+        Returns:
+            Optional[CandidateProvider]: Next provider in load order
+        """
+        if not candidates or len(candidates) <= 1:
+            return None
+
+        ranked = self._ranked(candidates)
+        current_index = next(
+            (i for i, c in enumerate(ranked) if _candidate_key(c) == _candidate_key(current)),
+            -1,
+        )
+        if current_index == -1:
+            return None
+        return ranked[(current_index + 1) % len(ranked)]
@@ -0,0 +1,126 @@
+"""Tokens-per-minute budgets for proxy requests, per API key and per model."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.common.errors import RateLimitError
+from app.common.rate_limiter import RateLimiter, create_rate_limiter
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TPM_WINDOW_SECONDS = 60
+
+
+@dataclass
+class TokenReservation:
+    """Tokens taken from each budget before the request is forwarded.
+
+    ``entries`` holds (budget key, tokens per minute, tokens charged).
+    """
+
+    entries: list[tuple[str, int, int]] = field(default_factory=list)
+    settled: bool = False
+
+
+class TokenRateLimiter:
+    """Per-API-key and per-model tokens-per-minute limits.
+
+    Input tokens are reserved up front so a request that would exceed a budget
+    is rejected before it reaches a provider. Once the response is known the
+    reservation is settled against the actual input + output tokens, which
+    charges the output and refunds whatever was not used (e.g. failures).
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[RateLimiter] = None,
+        *,
+        per_key_tpm: int = 0,
+        per_model_tpm: int = 0,
+    ) -> None:
+        self.per_key_tpm = max(0, per_key_tpm)
+        self.per_model_tpm = max(0, per_model_tpm)
+        self._limiter = limiter
+
+    @classmethod
+    def from_settings(cls, settings) -> "TokenRateLimiter":
+        if not settings.RATE_LIMIT_ENABLED:
+            return cls()
+        return cls(
+            create_rate_limiter(settings),
+            per_key_tpm=settings.RATE_LIMIT_TPM_PER_KEY,
+            per_model_tpm=settings.RATE_LIMIT_TPM_PER_MODEL,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._limiter is not None and (
+            self.per_key_tpm > 0 or self.per_model_tpm > 0
+        )
+
+    async def reserve(
+        self, api_key_id: Optional[int], model: str, tokens: int
+    ) -> Optional[TokenReservation]:
+        """Take ``tokens`` from every applicable budget or raise RateLimitError.
+
+        Returns None when no budget applies.
+        """
+        if not self.enabled:
+            return None
+
+        budgets = []
+        if self.per_key_tpm and api_key_id is not None:
+            budgets.append((f"tpm:key:{api_key_id}", self.per_key_tpm, "api_key"))
+        if self.per_model_tpm and model:
+            budgets.append((f"tpm:model:{model}", self.per_model_tpm, "model"))
+
+        reservation = TokenReservation()
+        for key, tpm, scope in budgets:
+            # A prompt larger than the whole budget still gets through once
+            # the budget is full rather than never
+            cost = min(max(0, tokens), tpm)
+            allowed, _, retry_after = await self._limiter.acquire(
+                key, tpm, TPM_WINDOW_SECONDS, cost
+            )
+            if not allowed:
+                await self.settle(reservation, 0)
+                logger.warning(
+                    "Token rate limit exceeded: %s=%s, limit=%s tokens/min",
+                    scope,
+                    api_key_id if scope == "api_key" else model,
+                    tpm,
+                )
+                raise RateLimitError(
+                    message=(
+                        f"Token rate limit exceeded for this {scope.replace('_', ' ')}. "
+                        f"Please try again in {retry_after}s."
+                    ),
+                    code="token_rate_limit_exceeded",
+                    details={
+                        "scope": scope,
+                        "limit_tokens_per_minute": tpm,
+                        "retry_after": retry_after,
+                    },
+                    retry_after=retry_after,
+                )
+            reservation.entries.append((key, tpm, cost))
+        return reservation
+
+    async def settle(
+        self, reservation: Optional[TokenReservation], actual_tokens: int
+    ) -> None:
+        """Charge or refund the difference between reserved and actual tokens."""
+        if reservation is None or reservation.settled:
+            return
+        reservation.settled = True
+        for key, tpm, charged in reservation.entries:
+            delta = max(0, actual_tokens) - charged
+            if delta:
+                await self._limiter.adjust(key, tpm, TPM_WINDOW_SECONDS, delta)
+
+
+token_rate_limiter = TokenRateLimiter.from_settings(get_settings())
@@ -0,0 +1,91 @@
+"""
+Media token estimation on large base64 payloads.
+
+Estimates tokens of base64 image, audio and document blocks the size of
+vision-request screenshots and compares against decoding the whole payload,
+which is what reading dimensions/byte lengths used to cost.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_image_tokens [--rounds 50] [--mb 1 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import time
+from typing import Any, Callable
+
+from app.common.token_counter import (
+    _estimate_audio_tokens,
+    _estimate_image_tokens,
+    _extract_image_size_from_bytes,
+)
+
+
+def _png(size: int) -> bytes:
+    header = (
+        b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        + (2560).to_bytes(4, "big")
+        + (1600).to_bytes(4, "big")
+        + b"\x08\x02\x00\x00\x00"
+    )
+    return header + b"\x5a" * (size - len(header))
+
+
+def _jpeg(size: int) -> bytes:
+    # EXIF-sized APP1 segment before the SOF segment
+    app1 = b"\xff\xe1" + (60002).to_bytes(2, "big") + b"\x00" * 60000
+    sof = b"\xff\xc0\x00\x11\x08" + (3024).to_bytes(2, "big") + (4032).to_bytes(2, "big")
+    head = b"\xff\xd8" + app1 + sof
+    return head + b"\x5a" * (size - len(head) - 2) + b"\xff\xd9"
+
+
+def _best(fn: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes_mb: list[float], rounds: int) -> None:
+    print(f"{'payload':<12}{'MB':>6}{'full decode ms':>16}{'estimate ms':>13}{'speedup':>9}")
+    for mb in sizes_mb:
+        size = int(mb * 1024 * 1024)
+        for name, raw in (("png", _png(size)), ("jpeg", _jpeg(size)), ("audio", None)):
+            data = base64.b64encode(raw if raw is not None else b"\x00" * size).decode()
+            if raw is not None:
+                item = {"type": "image_url", "image_url": {"url": f"data:image/{name};base64,{data}"}}
+
+                def estimate() -> None:
+                    _estimate_image_tokens(item, protocol="openai")
+
+                def full_decode() -> None:
+                    _extract_image_size_from_bytes(base64.b64decode(data))
+
+            else:
+                item = {"type": "input_audio", "input_audio": {"data": data}}
+
+                def estimate() -> None:
+                    _estimate_audio_tokens(item)
+
+                def full_decode() -> None:
+                    len(base64.b64decode(data))
+
+            t_full = _best(full_decode, rounds) * 1e3
+            t_estimate = _best(estimate, rounds) * 1e3
+            print(
+                f"{name:<12}{mb:>6g}{t_full:>16.3f}{t_estimate:>13.3f}"
+                f"{t_full / t_estimate:>8.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mb", nargs="*", type=float, default=[1, 4, 8])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.mb, args.rounds)
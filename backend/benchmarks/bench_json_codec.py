@@ -0,0 +1,83 @@
+"""
+JSON codec backends on SSE payloads.
+
+Decodes every data payload of the SSE fixtures in benchmarks/fixtures (or the
+files given on the command line, e.g. streams captured from request logs) and
+re-encodes the decoded values, once per installed backend of
+app.common.json_codec.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_json_codec [--rounds 200] [FILE.sse ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from app.common import json_codec
+from app.common.sse import SSEFramer, event_data
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _payloads(path: Path) -> list[str]:
+    framer = SSEFramer()
+    payloads = []
+    for event in framer.feed(path.read_bytes() + b"\n\n"):
+        data = event_data(event)
+        if data and data.strip() != "[DONE]":
+            payloads.append(data)
+    return payloads
+
+
+def _best(fn: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(paths: list[Path], rounds: int) -> None:
+    backends = [
+        name
+        for name in json_codec.BACKENDS
+        if name == "stdlib" or importlib.util.find_spec(name) is not None
+    ]
+    print(f"{'fixture':<24}{'events':>7}{'backend':>10}{'loads us/evt':>14}{'dumps us/evt':>14}")
+    for path in paths:
+        payloads = _payloads(path)
+        if not payloads:
+            continue
+        values = [json_codec.loads(p) for p in payloads]
+        for name in backends:
+            json_codec.set_backend(name)
+
+            def decode() -> None:
+                for payload in payloads:
+                    json_codec.loads(payload)
+
+            def encode() -> None:
+                for value in values:
+                    json_codec.dumps_bytes(value)
+
+            t_loads = _best(decode, rounds) / len(payloads) * 1e6
+            t_dumps = _best(encode, rounds) / len(values) * 1e6
+            print(
+                f"{path.stem:<24}{len(payloads):>7}{name:>10}"
+                f"{t_loads:>14.2f}{t_dumps:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    main(args.files or sorted(FIXTURES_DIR.glob("*.sse")), args.rounds)
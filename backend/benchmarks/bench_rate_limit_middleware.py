@@ -0,0 +1,128 @@
+"""
+SSE throughput through the rate limit middleware.
+
+Streams an SSE response of many small chunks straight through the ASGI stack
+(no server or socket) and compares the bare app against the rate limit
+middleware disabled and enabled. A ``BaseHTTPMiddleware`` passthrough is
+included as the reference for what the middleware used to cost per chunk.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_rate_limit_middleware [--chunks 5000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import AsyncGenerator
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.rate_limit import RateLimitMiddleware
+
+
+def _sse_app(chunks: int) -> ASGIApp:
+    payload = b'data: {"choices":[{"delta":{"content":"token "}}]}\n\n'
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        for _ in range(chunks):
+            yield payload
+        yield b"data: [DONE]\n\n"
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await StreamingResponse(body(), media_type="text/event-stream")(
+            scope, receive, send
+        )
+
+    return app
+
+
+def _rate_limited(app: ASGIApp, enabled: bool) -> ASGIApp:
+    middleware = RateLimitMiddleware(app)
+    middleware.enabled = enabled
+    # Keep every round under the limit
+    middleware._proxy_max = 10**9
+    return middleware
+
+
+def _base_http_passthrough(app: ASGIApp) -> ASGIApp:
+    async def dispatch(request, call_next):
+        return await call_next(request)
+
+    return BaseHTTPMiddleware(app, dispatch=dispatch)
+
+
+async def _stream_once(app: ASGIApp) -> int:
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chat/completions",
+        "raw_path": b"/v1/chat/completions",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"authorization", b"Bearer sk-bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    received = False
+    received_chunks = 0
+
+    async def receive() -> Message:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        # Client stays connected until the response is complete
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal received_chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            received_chunks += 1
+
+    await app(scope, receive, send)
+    return received_chunks
+
+
+async def _best(app: ASGIApp, rounds: int) -> tuple[float, int]:
+    best = float("inf")
+    received = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        received = await _stream_once(app)
+        best = min(best, time.perf_counter() - start)
+    return best, received
+
+
+async def main(chunks: int, rounds: int) -> None:
+    stacks = {
+        "no middleware": _sse_app(chunks),
+        "rate limit (disabled)": _rate_limited(_sse_app(chunks), enabled=False),
+        "rate limit (enabled)": _rate_limited(_sse_app(chunks), enabled=True),
+        "BaseHTTPMiddleware": _base_http_passthrough(_sse_app(chunks)),
+    }
+    baseline = None
+    print(f"{'stack':<24}{'ms':>10}{'chunks/s':>12}{'us/chunk':>10}{'overhead':>10}")
+    for name, app in stacks.items():
+        elapsed, received = await _best(app, rounds)
+        baseline = baseline or elapsed
+        print(
+            f"{name:<24}{elapsed * 1e3:>10.2f}{received / elapsed:>12.0f}"
+            f"{elapsed / received * 1e6:>10.2f}{(elapsed / baseline - 1) * 100:>9.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunks, args.rounds))
@@ -0,0 +1,151 @@
+"""
+Per-event cost of bridged stream conversions.
+
+Compares each protocol pair that is bridged through OpenAI Chat, run as one
+direct conversion (chunks handed over as JSON values) against the chained path
+(source -> OpenAI Chat SSE bytes -> target), which re-encodes, re-frames and
+re-parses every intermediate event.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_stream_converters [--events 2000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, AsyncGenerator, Callable
+
+from app.common.protocol import convert_stream
+
+
+def _anthropic_events(n: int) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = [
+        {"type": "message_start", "message": {"id": "msg_1", "usage": {}}},
+        {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        },
+    ]
+    events += [
+        {
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": f"token {i} "},
+        }
+        for i in range(n)
+    ]
+    events += [
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn"},
+            "usage": {"input_tokens": 10, "output_tokens": n},
+        },
+        {"type": "message_stop"},
+    ]
+    return events
+
+
+def _responses_events(n: int) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = [
+        {"type": "response.created", "response": {"id": "resp_1"}}
+    ]
+    events += [
+        {"type": "response.output_text.delta", "delta": f"token {i} "}
+        for i in range(n)
+    ]
+    events.append({"type": "response.completed", "response": {"id": "resp_1"}})
+    return events
+
+
+def _gemini_events(n: int) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = [
+        {"candidates": [{"content": {"parts": [{"text": f"token {i} "}]}}]}
+        for i in range(n)
+    ]
+    events.append(
+        {
+            "candidates": [{"content": {"parts": []}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": n},
+        }
+    )
+    return events
+
+
+PAIRS: list[tuple[str, str, Callable[[int], list[dict[str, Any]]]]] = [
+    ("anthropic", "openai_responses", _anthropic_events),
+    ("anthropic", "gemini", _anthropic_events),
+    ("openai_responses", "anthropic", _responses_events),
+    ("openai_responses", "gemini", _responses_events),
+    ("gemini", "anthropic", _gemini_events),
+    ("gemini", "openai_responses", _gemini_events),
+]
+
+
+async def _replay(chunks: list[bytes]) -> AsyncGenerator[bytes, None]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _convert(
+    source: str, target: str, upstream: AsyncGenerator[bytes, None]
+) -> AsyncGenerator[bytes, None]:
+    return convert_stream(
+        source_protocol=source,
+        target_protocol=target,
+        upstream=upstream,
+        model="bench-model",
+        options={"input_tokens": 10},
+    )
+
+
+async def _drain(stream: AsyncGenerator[bytes, None]) -> None:
+    async for _ in stream:
+        pass
+
+
+async def _time(run: Callable[[], AsyncGenerator[bytes, None]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await _drain(run())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main(n_events: int, rounds: int) -> None:
+    print(f"{'pair':<36}{'direct us/evt':>15}{'chained us/evt':>16}{'speedup':>9}")
+    for source, target, build in PAIRS:
+        chunks = [
+            f"data: {json.dumps(e, ensure_ascii=False)}\n\n".encode("utf-8")
+            for e in build(n_events)
+        ]
+
+        def direct() -> AsyncGenerator[bytes, None]:
+            return _convert(source, target, _replay(chunks))
+
+        def chained() -> AsyncGenerator[bytes, None]:
+            openai = _convert(source, "openai", _replay(chunks))
+            return _convert("openai", target, openai)
+
+        t_direct = await _time(direct, rounds)
+        t_chained = await _time(chained, rounds)
+        print(
+            f"{source + ' -> ' + target:<36}"
+            f"{t_direct / len(chunks) * 1e6:>15.2f}"
+            f"{t_chained / len(chunks) * 1e6:>16.2f}"
+            f"{t_chained / t_direct:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.rounds))
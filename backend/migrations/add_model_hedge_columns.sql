@@ -0,0 +1,4 @@
+-- Add hedged request settings to model_mappings.
+-- hedge_delay_ms NULL means the delay adapts to the first candidate's latency.
+ALTER TABLE model_mappings ADD COLUMN hedge_enabled BOOLEAN DEFAULT FALSE;
+ALTER TABLE model_mappings ADD COLUMN hedge_delay_ms INTEGER;
@@ -0,0 +1,9 @@
+-- Migration: Create config_version table
+-- Description: Single-row counter used to invalidate in-process config caches
+-- across workers when Redis pub/sub is not configured
+
+CREATE TABLE IF NOT EXISTS config_version (
+    id INTEGER PRIMARY KEY NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
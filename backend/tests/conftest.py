@@ -8,13 +8,36 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
+from app.common import json_codec
+from app.common.http_client import upstream_client_pool
+from app.common.token_count_cache import token_count_cache
 from app.db.models import Base
 
+# Some proxy tests assert logged bodies byte for byte in the stdlib layout
+# ('{"key": "value"}', e.g. test_serialize_response_body_json_bytes), which
+# orjson/msgspec write compactly. Pin the stdlib so results do not depend on
+# which optional codecs are installed; test_json_codec.py covers each backend.
+json_codec.set_backend("stdlib")
+
 
 # Use in-memory database for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def reset_upstream_client_pool():
+    """Drop pooled upstream clients so each test (and its mocks) starts fresh"""
+    yield
+    await upstream_client_pool.aclose()
+
+
+@pytest.fixture(autouse=True)
+def reset_token_count_cache():
+    """Tests stub tokenizers, so counts cached by one must not leak into the next"""
+    yield
+    token_count_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def async_engine():
     """Create async database engine for testing"""
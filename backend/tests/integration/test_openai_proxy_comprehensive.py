@@ -19,6 +19,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.api.deps import get_current_api_key, get_proxy_service
+from app.common.errors import RateLimitError
 from app.common.time import utc_now
 from app.domain.api_key import ApiKeyModel
 from app.main import app
@@ -124,6 +125,37 @@ class TestOpenAIChatCompletions:
 
         app.dependency_overrides = {}
 
+    @pytest.mark.asyncio
+    async def test_token_rate_limit_sets_retry_after_header(self):
+        """A TPM 429 tells clients when to retry through Retry-After."""
+
+        class LimitedProxyService(MockProxyService):
+            async def process_request(self, **kwargs):
+                raise RateLimitError(
+                    code="token_rate_limit_exceeded",
+                    details={"retry_after": 7},
+                    retry_after=7,
+                )
+
+        app.dependency_overrides[get_proxy_service] = LimitedProxyService
+        app.dependency_overrides[get_current_api_key] = _make_api_key
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/v1/chat/completions",
+                json={
+                    "model": "gpt-4o-mini",
+                    "messages": [{"role": "user", "content": "Hello!"}],
+                },
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        assert response.json()["error"]["code"] == "token_rate_limit_exceeded"
+
+        app.dependency_overrides = {}
+
     @pytest.mark.asyncio
     async def test_chat_completion_with_system_message(self):
         """Test chat completion with system message."""
@@ -0,0 +1,98 @@
+import sys
+
+import httpx
+import pytest
+
+from app.common.http_client import UpstreamClientPool
+from app.config import get_settings
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_per_origin_proxy_and_timeout():
+    pool = UpstreamClientPool(http2=False)
+
+    async with pool.client("https://api.example.com/v1", None, 30) as first:
+        pass
+    async with pool.client("https://API.example.com/other", None, 30) as same:
+        pass
+    async with pool.client("https://api.example.com", "http://proxy:8080", 30) as proxied:
+        pass
+    async with pool.client("https://api.example.com", None, 60) as slower:
+        pass
+    async with pool.client("https://other.example.com", None, 30) as other:
+        pass
+
+    assert first is same
+    assert len({id(first), id(proxied), id(slower), id(other)}) == 4
+    assert not first.is_closed
+
+    await pool.aclose()
+    assert first.is_closed
+    assert proxied.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_applies_connection_limits():
+    pool = UpstreamClientPool(
+        max_connections=7, max_keepalive_connections=3, keepalive_expiry_seconds=5, http2=False
+    )
+
+    async with pool.client("https://api.example.com", None, 30) as client:
+        connection_pool = client._transport._pool
+        assert connection_pool._max_connections == 7
+        assert connection_pool._max_keepalive_connections == 3
+        assert connection_pool._keepalive_expiry == 5
+
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_unbounded_by_default_and_fails_fast_when_capped():
+    unbounded = UpstreamClientPool(http2=False)
+    capped = UpstreamClientPool(max_connections=10, pool_timeout_seconds=2, http2=False)
+
+    async with unbounded.client("https://api.example.com", None, 1800) as client:
+        assert client._transport._pool._max_connections == sys.maxsize
+    async with capped.client("https://api.example.com", None, 1800) as client:
+        assert client.timeout.read == 1800
+        assert client.timeout.pool == 2
+
+    await unbounded.aclose()
+    await capped.aclose()
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_uses_throwaway_clients():
+    pool = UpstreamClientPool(enabled=False)
+
+    async with pool.client("https://api.example.com", None, 30) as first:
+        pass
+    async with pool.client("https://api.example.com", None, 30) as second:
+        pass
+
+    assert first is not second
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_does_not_keep_upstream_cookies():
+    seen_cookies: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=tenant-a; Path=/"})
+
+    pool = UpstreamClientPool(http2=False)
+    async with pool.client("https://api.example.com", None, 30) as client:
+        client._transport = httpx.MockTransport(handler)
+        await client.get("https://api.example.com/v1/models")
+        await client.get("https://api.example.com/v1/models")
+
+    assert seen_cookies == [None, None]
+    assert len(client.cookies.jar) == 0
+    await pool.aclose()
+
+
+def test_http2_is_opt_in():
+    assert UpstreamClientPool().http2 is False
+    assert get_settings().UPSTREAM_HTTP2_ENABLED is False
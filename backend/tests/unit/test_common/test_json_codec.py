@@ -0,0 +1,84 @@
+import json
+import math
+
+import pytest
+
+from app.common import json_codec
+
+
+@pytest.fixture(params=json_codec.BACKENDS)
+def backend(request):
+    name = request.param
+    if name != "stdlib":
+        pytest.importorskip(name)
+    previous = json_codec.backend_name()
+    assert json_codec.set_backend(name) == name
+    yield name
+    json_codec.set_backend(previous)
+
+
+def out_bytes(text, backend):
+    sep = ": " if backend == "stdlib" else ":"
+    return ('{"text"' + sep + '"' + text + '"}').encode("utf-8")
+
+
+def test_dumps_keeps_non_ascii_unescaped(backend):
+    out = json_codec.dumps({"text": "你好 🙂"})
+    assert "你好 🙂" in out
+    assert json.loads(out) == {"text": "你好 🙂"}
+    assert json_codec.dumps_bytes({"text": "é"}) == out_bytes("é", backend)
+
+
+def test_loads_accepts_text_and_bytes(backend):
+    payload = '{"a": [1, 2.5, null, true], "b": "ü"}'
+    expected = {"a": [1, 2.5, None, True], "b": "ü"}
+    assert json_codec.loads(payload) == expected
+    assert json_codec.loads(payload.encode("utf-8")) == expected
+    assert json_codec.loads(bytearray(payload.encode("utf-8"))) == expected
+
+
+def test_loads_raises_json_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads("{not json")
+    with pytest.raises(ValueError):
+        json_codec.loads(b"")
+
+
+def test_loads_accepts_what_the_stdlib_accepts(backend):
+    assert json_codec.loads('{"s": "\\ud800"}') == {"s": "\ud800"}
+    nan, inf = json_codec.loads(b"[NaN, Infinity]")
+    assert math.isnan(nan) and inf == math.inf
+
+
+def test_dumps_stringifies_non_str_keys(backend):
+    assert json.loads(json_codec.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_dumps_falls_back_for_values_the_backend_rejects(backend):
+    big = 2**70
+    assert json.loads(json_codec.dumps({"n": big})) == {"n": big}
+
+
+def test_unsupported_values_still_raise_type_error(backend):
+    with pytest.raises(TypeError):
+        json_codec.dumps({"x": object()})
+
+
+def test_missing_backend_falls_back_to_stdlib(monkeypatch):
+    def missing():
+        raise ImportError("not installed")
+
+    monkeypatch.setattr(json_codec, "_build_orjson", missing)
+    monkeypatch.setattr(json_codec, "_build_msgspec", missing)
+    previous = json_codec.backend_name()
+    try:
+        assert json_codec.set_backend("auto") == "stdlib"
+        assert json_codec.set_backend("orjson") == "stdlib"
+    finally:
+        monkeypatch.undo()
+        json_codec.set_backend(previous)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        json_codec.set_backend("simplejson")
@@ -608,3 +608,144 @@ class TestEndToEndConversion:
             openai_response["choices"][0]["message"]["content"]
             == "Hello! How can I help you?"
         )
+
+
+def _normalize_sse(raw: bytes) -> list:
+    """Parse SSE output into (event, payload) pairs without volatile ids/timestamps."""
+    volatile = {"id", "created", "created_at", "item_id"}
+
+    def scrub(value):
+        if isinstance(value, dict):
+            return {k: scrub(v) for k, v in value.items() if k not in volatile}
+        if isinstance(value, list):
+            return [scrub(v) for v in value]
+        return value
+
+    events = []
+    for block in raw.decode().split("\n\n"):
+        if not block.strip():
+            continue
+        name = None
+        data = None
+        for line in block.split("\n"):
+            if line.startswith("event:"):
+                name = line[6:].strip()
+            elif line.startswith("data:"):
+                data = line[5:].strip()
+        payload = data if data == "[DONE]" else scrub(json.loads(data))
+        events.append((name, payload))
+    return events
+
+
+class TestDirectChainedStreams:
+    """Pairs bridged through OpenAI Chat must match two separate conversions."""
+
+    def setup_method(self):
+        reset_registry()
+
+    ANTHROPIC_EVENTS = [
+        {
+            "type": "message_start",
+            "message": {"id": "msg_1", "usage": {"input_tokens": 10}},
+        },
+        {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 0,
+            "delta": {"type": "text_delta", "text": "你好"},
+        },
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "content_block_start",
+            "index": 1,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": "get"},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": '{"q": 1}'},
+        },
+        {"type": "content_block_stop", "index": 1},
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": "tool_use"},
+            "usage": {"output_tokens": 5},
+        },
+        {"type": "message_stop"},
+    ]
+
+    RESPONSES_EVENTS = [
+        {"type": "response.created", "response": {"id": "resp_1"}},
+        {"type": "response.output_text.delta", "delta": "Hello"},
+        {
+            "type": "response.output_item.added",
+            "item_id": "fc_1",
+            "item": {"type": "function_call", "call_id": "call_1", "name": "get"},
+        },
+        {
+            "type": "response.function_call_arguments.delta",
+            "item_id": "fc_1",
+            "delta": '{"q": 1}',
+        },
+        {"type": "response.completed", "response": {"id": "resp_1"}},
+    ]
+
+    GEMINI_EVENTS = [
+        {"candidates": [{"content": {"parts": [{"text": "Hi"}]}}]},
+        {
+            "candidates": [
+                {
+                    "content": {
+                        "parts": [{"functionCall": {"name": "get", "args": {"q": 1}}}]
+                    },
+                    "finishReason": "STOP",
+                }
+            ],
+            "usageMetadata": {"promptTokenCount": 3, "candidatesTokenCount": 2},
+        },
+    ]
+
+    @staticmethod
+    async def _collect(source, target, chunks):
+        async def upstream():
+            for chunk in chunks:
+                yield chunk
+
+        out = []
+        async for chunk in convert_stream(
+            source_protocol=source,
+            target_protocol=target,
+            upstream=upstream(),
+            model="m",
+            options={"input_tokens": 7},
+        ):
+            out.append(chunk)
+        return b"".join(out)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "source,target,events",
+        [
+            ("anthropic", "openai_responses", ANTHROPIC_EVENTS),
+            ("anthropic", "gemini", ANTHROPIC_EVENTS),
+            ("openai_responses", "anthropic", RESPONSES_EVENTS),
+            ("openai_responses", "gemini", RESPONSES_EVENTS),
+            ("gemini", "anthropic", GEMINI_EVENTS),
+            ("gemini", "openai_responses", GEMINI_EVENTS),
+        ],
+    )
+    async def test_direct_matches_two_hop(self, source, target, events):
+        chunks = [
+            f"data: {json.dumps(e, ensure_ascii=False)}\n\n".encode() for e in events
+        ]
+
+        direct = await self._collect(source, target, chunks)
+        openai = await self._collect(source, "openai", chunks)
+        chained = await self._collect("openai", target, [openai])
+
+        assert _normalize_sse(direct) == _normalize_sse(chained)
+        assert len(_normalize_sse(direct)) > 1
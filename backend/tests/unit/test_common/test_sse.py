@@ -0,0 +1,74 @@
+import pytest
+
+from app.common.sse import SSEFramer, event_data
+from app.common.stream_usage import SSEDecoder
+
+STREAM = b"event: a\ndata: 1\n\n: ping\n\ndata: 2\ndata: 3\n\n"
+
+
+def _feed_all(framer: SSEFramer, chunks: list[bytes]) -> list[bytes]:
+    events: list[bytes] = []
+    for chunk in chunks:
+        events.extend(framer.feed(chunk))
+    return events
+
+
+@pytest.mark.parametrize(
+    "stream",
+    [
+        STREAM,
+        STREAM.replace(b"\n", b"\r\n"),
+        STREAM.replace(b"\n", b"\r"),
+    ],
+    ids=["lf", "crlf", "cr"],
+)
+def test_framer_splits_events_for_every_line_ending(stream):
+    whole = SSEFramer().feed(stream)
+    byte_by_byte = _feed_all(SSEFramer(), [stream[i : i + 1] for i in range(len(stream))])
+
+    assert b"".join(whole) == stream
+    assert [event_data(event) for event in whole] == ["1", None, "2\n3"]
+    assert [event_data(event) for event in byte_by_byte] == ["1", None, "2\n3"]
+
+
+def test_framer_handles_crlf_split_across_chunks():
+    framer = SSEFramer()
+
+    assert framer.feed(b"data: 1\r\n\r") == [b"data: 1\r\n\r"]
+    assert framer.feed(b"\ndata: 2\r") == []
+    # The LF completing the CRLF was already accounted for and is not repeated
+    assert [event_data(event) for event in framer.feed(b"\n\r\n")] == ["2"]
+
+
+def test_framer_flush_returns_unterminated_event_and_drops_stray_blank_lines():
+    framer = SSEFramer()
+
+    assert framer.feed(b"\n\ndata: 1\n\ndata: par") == [b"data: 1\n\n"]
+    assert framer.feed(b"tial\n") == []
+    assert framer.flush() == b"data: partial\n"
+    assert framer.flush() == b""
+
+
+def test_framer_handles_large_event_in_many_chunks():
+    payload = b"x" * 200_000
+    stream = b"data: " + payload + b"\n\n"
+    framer = SSEFramer()
+
+    events = _feed_all(framer, [stream[i : i + 1000] for i in range(0, len(stream), 1000)])
+
+    assert events == [stream]
+    assert len(framer._buf) == 0
+
+
+def test_framer_feed_lines():
+    framer = SSEFramer()
+
+    assert framer.feed_lines(b"data: 1\r\ndata: 2\r") == [b"data: 1", b"data: 2"]
+    assert framer.feed_lines(b"\n\r\ndata") == [b""]
+    assert framer.flush() == b"data"
+
+
+def test_sse_decoder_supports_cr_line_endings():
+    decoder = SSEDecoder()
+
+    assert decoder.feed(b'data: {"a":1}\r\r') == ['{"a":1}']
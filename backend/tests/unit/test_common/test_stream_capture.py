@@ -0,0 +1,79 @@
+import pytest
+
+from app.common import stream_capture
+from app.common.stream_capture import StreamCapture
+
+
+def test_capture_keeps_everything_within_budget():
+    capture = StreamCapture(16)
+    capture.write(b"data: 1\n\n")
+    capture.write("data: 2")
+
+    assert capture.text() == "data: 1\n\ndata: 2"
+    assert capture.truncated is False
+
+
+def test_capture_keeps_head_and_tail_with_marker():
+    capture = StreamCapture(8)
+    for index in range(1000):
+        capture.write(f"{index:04d}".encode())
+
+    assert capture.truncated is True
+    assert capture.total_bytes == 4000
+    assert capture.text() == "0000\n...[truncated 3992 bytes]...\n0999"
+    assert len(capture._tail) <= 4
+
+
+def test_capture_splits_a_single_large_chunk():
+    capture = StreamCapture(4)
+    capture.write(b"abcdefghij")
+
+    assert capture.getvalue() == b"ab\n...[truncated 6 bytes]...\nij"
+
+
+def test_disabled_capture_ignores_writes():
+    capture = StreamCapture(8, enabled=False)
+    capture.write(b"secret")
+
+    assert capture.text() == ""
+    assert capture.total_bytes == 0
+
+
+def test_unlimited_capture_keeps_everything():
+    capture = StreamCapture(0)
+    capture.write(b"x" * 10_000)
+
+    assert capture.getvalue() == b"x" * 10_000
+    assert capture.truncated is False
+
+
+@pytest.mark.asyncio
+async def test_spilled_capture_keeps_the_stream_up_to_the_spill_cap(monkeypatch):
+    monkeypatch.setattr(stream_capture, "_SPILL_FLUSH_BYTES", 16)
+    capture = StreamCapture(8, spill_to_disk=True, spill_max_bytes=1000)
+    for index in range(100):
+        await capture.awrite(f"{index:04d}".encode())
+
+    assert capture._spool._rolled is True
+    assert len(capture._head) < 16
+    assert await capture.atext() == "".join(f"{i:04d}" for i in range(100))
+    assert capture.truncated is False
+    capture.close()
+
+
+@pytest.mark.asyncio
+async def test_spilled_capture_truncates_past_the_spill_cap():
+    capture = StreamCapture(8, spill_to_disk=True, spill_max_bytes=16)
+    for index in range(1000):
+        await capture.awrite(f"{index:04d}".encode())
+
+    assert capture.truncated is True
+    assert capture.getvalue() == (
+        b"000000010002" + b"\n...[truncated 3984 bytes]...\n" + b"0999"
+    )
+    capture.close()
+
+
+def test_negative_budget_is_rejected():
+    with pytest.raises(ValueError):
+        StreamCapture(-1)
@@ -2,7 +2,7 @@
 Streaming Usage Parsing Unit Tests
 """
 
-from app.common.stream_usage import StreamUsageAccumulator
+from app.common.stream_usage import StreamUsageAccumulator, StreamUsageTap
 from app.common.token_counter import get_token_counter
 
 
@@ -137,3 +137,45 @@ def test_gemini_stream_includes_function_calls():
     result = acc.finalize()
     assert "get_weather" in result.output_text
     assert "Paris" in result.output_text
+
+
+def test_usage_tap_counts_deferred_text_without_upstream_usage():
+    tap = StreamUsageTap(protocol="openai", model="gpt-4")
+    # Event split across chunks
+    tap.feed(b"data: {\"choices\":[{\"delta\":{\"content\":\"Hel\"")
+    tap.feed(b"}}]}\n\ndata: {\"choices\":[{\"delta\":{\"content\":\"lo\"}}]}\n\n")
+    tap.feed(b"data: [DONE]\n\n")
+
+    result = tap.finalize()
+    assert result.output_text == "Hello"
+    expected = get_token_counter("openai").count_tokens("Hello", "gpt-4")
+    assert result.output_tokens == expected
+
+
+def test_usage_tap_skips_text_once_upstream_reports_usage():
+    tap = StreamUsageTap(protocol="anthropic", model="claude-3")
+    chunks = [
+        b"event: message_start\ndata: {\"type\":\"message_start\",\"message\":{\"usage\":{\"input_tokens\":5,\"output_tokens\":1}}}\n\n",
+        b"event: content_block_delta\ndata: {\"type\":\"content_block_delta\",\"index\":0,\"delta\":{\"type\":\"text_delta\",\"text\":\"Hi\"}}\n\n",
+        b"event: message_delta\ndata: {\"type\":\"message_delta\",\"usage\":{\"output_tokens\":9}}\n\n",
+    ]
+    for c in chunks:
+        tap.feed(c)
+
+    result = tap.finalize()
+    assert result.input_tokens == 5
+    assert result.output_tokens == 9
+    # The text delta was never parsed
+    assert result.output_text == ""
+
+
+def test_usage_tap_parses_eagerly_past_deferred_budget():
+    tap = StreamUsageTap(protocol="openai", model="gpt-4", max_deferred_bytes=60)
+    for index in range(5):
+        tap.feed(
+            f'data: {{"choices":[{{"delta":{{"content":"c{index}"}}}}]}}\n\n'.encode()
+        )
+
+    assert tap._eager is True
+    assert tap._deferred == []
+    assert tap.finalize().output_text == "c0c1c2c3c4"
@@ -0,0 +1,144 @@
+import pytest
+
+from app.common import token_counter as token_counter_module
+from app.common.token_count_cache import TokenCountCache
+from app.common.token_counter import AnthropicTokenCounter, OpenAITokenCounter
+
+
+class _WordEncoding:
+    """Stand-in for a tiktoken encoding: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_ordinary(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        return [self.encode_ordinary(text) for text in texts]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = TokenCountCache(max_bytes=1024 * 1024, min_chars=32)
+    monkeypatch.setattr(token_counter_module, "token_count_cache", cache)
+    return cache
+
+
+def _with_encoding(counter_cls):
+    encoding = _WordEncoding()
+    counter = counter_cls()
+    counter._get_encoding = lambda model: encoding
+    return counter, encoding
+
+
+def _words(prefix, n):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": _words("sys", 50)}]
+    for turn in range(turns):
+        messages.append({"role": "user", "content": _words(f"q{turn}_", 20)})
+        messages.append({"role": "assistant", "content": _words(f"a{turn}_", 20)})
+    return {
+        "messages": messages,
+        "tools": [{"name": "ls", "description": _words("tool", 30)}],
+    }
+
+
+@pytest.mark.parametrize("counter_cls", [OpenAITokenCounter, AnthropicTokenCounter])
+def test_repeated_request_is_served_from_cache(cache, counter_cls):
+    counter, encoding = _with_encoding(counter_cls)
+    body = _conversation(3)
+
+    first = counter.count_request(body, "m")
+    encoded = len(encoding.encoded)
+    second = counter.count_request(body, "m")
+
+    assert second == first
+    assert len(encoding.encoded) == encoded
+    assert cache.stats().hits > 0
+
+
+@pytest.mark.parametrize("counter_cls", [OpenAITokenCounter, AnthropicTokenCounter])
+def test_only_new_messages_are_tokenized(cache, counter_cls):
+    counter, encoding = _with_encoding(counter_cls)
+    counter.count_request(_conversation(2), "m")
+    encoding.encoded.clear()
+
+    body = _conversation(3)
+    total = counter.count_request(body, "m")
+
+    assert encoding.encoded == ["user", _words("q2_", 20), "assistant", _words("a2_", 20)]
+    uncached, _ = _with_encoding(counter_cls)
+    cache.clear()
+    assert total == uncached.count_request(body, "m")
+
+
+@pytest.mark.parametrize("counter_cls", [OpenAITokenCounter, AnthropicTokenCounter])
+def test_batched_count_fills_cache(cache, counter_cls):
+    counter, encoding = _with_encoding(counter_cls)
+    body = _conversation(2)
+
+    expected = counter.count_request_batched(body, "m", num_threads=4)
+    encoding.encoded.clear()
+
+    assert counter.count_request(body, "m") == expected
+    assert encoding.encoded == []
+
+
+def test_counts_are_keyed_by_encoding(cache):
+    counter, _ = _with_encoding(OpenAITokenCounter)
+    body = _conversation(1)
+    counter.count_request(body, "text-davinci-003")
+    misses = cache.stats().misses
+
+    counter.count_request(body, "gpt-4")
+
+    assert cache.stats().misses > misses
+
+
+def test_short_fragments_are_not_cached(cache):
+    key = cache.key("OpenAITokenCounter", "cl100k_base", "message", {"role": "user"})
+    assert key is None
+
+
+def test_disabled_cache_returns_no_keys():
+    cache = TokenCountCache(enabled=False)
+    assert cache.key("c", "e", "message", "x" * 1000) is None
+    assert cache.stats().enabled is False
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    cache = TokenCountCache(max_bytes=1024, min_chars=1)
+    keys = [cache.key("c", "e", "message", f"fragment {i}") for i in range(20)]
+    for i, key in enumerate(keys):
+        cache.put(key, i)
+        # Keep the first entry recently used
+        cache.get(keys[0])
+
+    stats = cache.stats()
+    assert stats.evictions > 0
+    assert stats.size_bytes <= 1024
+    assert cache.get(keys[0]) == 0
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[-1]) == 19
+
+
+def test_stats_report_hit_rate():
+    cache = TokenCountCache(min_chars=1)
+    assert cache.stats().hit_rate is None
+    key = cache.key("c", "e", "tools", "[]")
+    cache.get(key)
+    cache.put(key, 7)
+    assert cache.get(key) == 7
+
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
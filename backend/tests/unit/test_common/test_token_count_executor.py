@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from app.common.stream_usage import StreamUsageAccumulator
+from app.common.token_count_cache import token_count_cache
+from app.common.token_count_executor import TokenCountExecutor, payload_chars
+from app.common.token_counter import AnthropicTokenCounter, OpenAITokenCounter
+
+
+class _WordEncoding:
+    """Stand-in for a tiktoken encoding: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def encode(self, text, disallowed_special=()):
+        self.threads.add(threading.get_ident())
+        return text.split()
+
+    def encode_ordinary(self, text):
+        self.threads.add(threading.get_ident())
+        return text.split()
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        self.batches.append((list(texts), num_threads))
+        return [self.encode_ordinary(text) for text in texts]
+
+
+def _with_encoding(counter_cls):
+    encoding = _WordEncoding()
+    counter = counter_cls()
+    counter._get_encoding = lambda model: encoding
+    return counter, encoding
+
+
+REQUEST = {
+    "messages": [
+        {"role": "system", "content": "you are a helpful agent"},
+        {"role": "user", "content": [{"type": "text", "text": "list the files"}]},
+        {
+            "role": "assistant",
+            "tool_calls": [{"id": "c1", "function": {"name": "ls", "arguments": "{}"}}],
+        },
+        {"role": "tool", "tool_call_id": "c1", "content": "a.py b.py"},
+    ],
+    "system": "anthropic system prompt",
+    "tools": [{"name": "ls", "description": "list files", "input_schema": {}}],
+    "tool_choice": "auto",
+}
+
+
+@pytest.mark.parametrize("counter_cls", [OpenAITokenCounter, AnthropicTokenCounter])
+def test_batched_request_count_matches_unbatched(counter_cls):
+    counter, encoding = _with_encoding(counter_cls)
+    expected = counter.count_request(REQUEST, "m")
+
+    assert counter.count_request_batched(REQUEST, "m", num_threads=4) == expected
+    assert len(encoding.batches) == 1
+    texts, num_threads = encoding.batches[0]
+    assert num_threads == 4
+    assert "list the files" in texts
+
+
+def test_batched_output_body_count_matches_unbatched():
+    counter, encoding = _with_encoding(OpenAITokenCounter)
+    body = {"choices": [{"message": {"content": "four words of output"}}]}
+
+    assert counter.count_output_body_batched(body, "m") == 4
+    assert counter.count_output_body(body, "m") == 4
+    # A single thread encodes inline without spinning up tiktoken's pool
+    assert encoding.batches == []
+
+
+def test_count_texts_without_tiktoken_uses_estimate():
+    counter = OpenAITokenCounter()
+    counter._get_encoding = lambda model: None
+    assert counter.count_texts(["abcdefgh", "abcd"], num_threads=4) == 3
+
+
+def test_payload_chars_stops_at_limit():
+    body = {"messages": [{"content": "x" * 10}] * 100}
+    assert payload_chars(body, 10_000) == 1000
+    assert payload_chars(body, 25) < 1000
+
+
+@pytest.mark.asyncio
+async def test_small_payload_is_counted_inline():
+    counter, encoding = _with_encoding(OpenAITokenCounter)
+    executor = TokenCountExecutor(max_workers=2, offload_min_chars=1000)
+    try:
+        body = {"messages": [{"role": "user", "content": "hi there"}]}
+        assert await executor.count_request(counter, body, "m") == counter.count_request(body, "m")
+        assert encoding.threads == {threading.get_ident()}
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_large_payload_is_counted_on_the_pool():
+    counter, encoding = _with_encoding(OpenAITokenCounter)
+    executor = TokenCountExecutor(max_workers=2, offload_min_chars=100, batch_threads=3)
+    try:
+        body = {"messages": [{"role": "user", "content": "word " * 100}]}
+        expected = counter.count_request(body, "m")
+        # Count again instead of reusing the memoized result
+        token_count_cache.clear()
+        encoding.threads.clear()
+
+        assert await executor.count_request(counter, body, "m") == expected
+        assert threading.get_ident() not in encoding.threads
+        assert encoding.batches[-1][1] == 3
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_disabled_executor_counts_inline():
+    counter, encoding = _with_encoding(OpenAITokenCounter)
+    executor = TokenCountExecutor(max_workers=0, offload_min_chars=1)
+    body = {"messages": [{"role": "user", "content": "word " * 100}]}
+
+    await executor.count_request(counter, body, "m")
+    assert encoding.threads == {threading.get_ident()}
+
+
+@pytest.mark.asyncio
+async def test_stream_finalize_async_matches_finalize():
+    chunks = [
+        b'data: {"choices":[{"delta":{"content":"hello streaming "}}]}\n\n',
+        b'data: {"choices":[{"delta":{"content":"world"}}]}\n\n',
+        b"data: [DONE]\n\n",
+    ]
+
+    def build():
+        acc = StreamUsageAccumulator(protocol="openai", model="m")
+        acc._token_counter, _ = _with_encoding(OpenAITokenCounter)
+        for chunk in chunks:
+            acc.feed(chunk)
+        return acc
+
+    result = await build().finalize_async()
+    assert result.output_tokens == build().finalize().output_tokens == 3
@@ -1,4 +1,6 @@
 
+import base64
+
 import pytest
 from app.common.token_counter import AnthropicTokenCounter, OpenAITokenCounter
 
@@ -175,3 +177,86 @@ def test_anthropic_count_messages_with_document_and_tool_result():
         ]
     )
     assert enriched > base
+
+
+def _png(width, height, body_size=0):
+    return (
+        b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        + width.to_bytes(4, "big")
+        + height.to_bytes(4, "big")
+        + b"\x08\x02\x00\x00\x00"
+        + b"\x00" * body_size
+    )
+
+
+def _jpeg(width, height, app_segments=0):
+    # 60 KB APP1 (EXIF-like) segments before the SOF segment
+    app = (b"\xff\xe1" + (60002).to_bytes(2, "big") + b"\x00" * 60000) * app_segments
+    sof = b"\xff\xc0\x00\x11\x08" + height.to_bytes(2, "big") + width.to_bytes(2, "big") + b"\x03"
+    return b"\xff\xd8" + app + sof + b"\x00" * 64 + b"\xff\xd9"
+
+
+@pytest.mark.parametrize(
+    ("image", "expected"),
+    [
+        (_png(1920, 1080, body_size=50000), (1920, 1080)),
+        (_jpeg(640, 480), (640, 480)),
+        # SOF after 120 KB of metadata, past the first probe window
+        (_jpeg(4032, 3024, app_segments=2), (4032, 3024)),
+        (b"GIF89a" + (300).to_bytes(2, "little") + (200).to_bytes(2, "little") + b"\x00" * 32, (300, 200)),
+        (
+            b"RIFF\x00\x00\x00\x00WEBPVP8X\x0a\x00\x00\x00\x00\x00\x00\x00"
+            + (1023).to_bytes(3, "little")
+            + (767).to_bytes(3, "little"),
+            (1024, 768),
+        ),
+        (
+            b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f"
+            + ((799) | (599 << 14)).to_bytes(4, "little"),
+            (800, 600),
+        ),
+    ],
+)
+def test_image_size_is_read_from_header(image, expected):
+    from app.common.token_counter import _extract_image_size_from_data
+
+    encoded = base64.b64encode(image).decode()
+    assert _extract_image_size_from_data(encoded) == expected
+    assert _extract_image_size_from_data(f"data:image/x;base64,{encoded}") == expected
+
+
+def test_image_size_probe_decodes_only_the_header(monkeypatch):
+    from app.common import token_counter
+
+    decoded = []
+    original = token_counter.base64.b64decode
+
+    def recording_b64decode(data, *args, **kwargs):
+        decoded.append(len(data))
+        return original(data, *args, **kwargs)
+
+    monkeypatch.setattr(token_counter.base64, "b64decode", recording_b64decode)
+    encoded = base64.b64encode(_png(800, 600, body_size=3_000_000)).decode()
+
+    assert token_counter._extract_image_size_from_data(encoded) == (800, 600)
+    assert max(decoded) < 100
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"", b"a", b"ab", b"abc", b"abcd", bytes(range(256)) * 40],
+)
+def test_base64_decoded_length_matches_decoding(payload):
+    from app.common.token_counter import _base64_decoded_length
+
+    encoded = base64.b64encode(payload).decode()
+    assert _base64_decoded_length(encoded) == len(payload)
+    assert _base64_decoded_length("data:audio/wav;base64," + encoded) == len(payload)
+    mime = base64.encodebytes(payload).decode()
+    assert _base64_decoded_length(mime) == len(payload)
+
+
+def test_base64_decoded_length_rejects_truncated_payload():
+    from app.common.token_counter import _base64_decoded_length
+
+    assert _base64_decoded_length("YWJj" + "YQ") is None
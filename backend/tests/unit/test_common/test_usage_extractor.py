@@ -176,3 +176,31 @@ def test_extract_usage_details_gemini_multimodal_input():
 def test_extract_output_tokens_fallback_total_minus_input():
     body = {"usage": {"total_tokens": 20, "prompt_tokens": 12}}
     assert extract_output_tokens(body) == 8
+
+
+def test_extract_usage_details_raw_bytes_scans_single_usage_object():
+    body = (
+        b'{"object":"list","data":[{"embedding":[0.1,0.2]}],'
+        b'"note":"a \\"usage\\": {} lookalike",'
+        b'"usage":{"prompt_tokens":8,"total_tokens":8}}'
+    )
+    details = extract_usage_details(body)
+    assert details is not None
+    assert details.input_tokens == 8
+    assert details.total_tokens == 8
+
+    gemini = b'{"candidates":[],"usageMetadata":{"promptTokenCount":3,"candidatesTokenCount":4}}'
+    details = extract_usage_details(gemini)
+    assert (details.input_tokens, details.output_tokens) == (3, 4)
+
+    assert extract_usage_details(b'{"data":[{"b64_json":"AAAA"}]}') is None
+
+
+def test_extract_usage_details_raw_bytes_with_several_usage_keys_parses_body():
+    body = (
+        b'{"message":{"usage":{"output_tokens":1}},'
+        b'"usage":{"prompt_tokens":5,"completion_tokens":6}}'
+    )
+    details = extract_usage_details(body)
+    # Same precedence as a parsed body: top-level usage wins
+    assert (details.input_tokens, details.output_tokens) == (5, 6)
@@ -10,8 +10,9 @@ import time
 
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
+from app.common.rate_limiter import RedisRateLimiter
 from app.middleware.rate_limit import (
     RateLimitMiddleware,
     InMemoryRateLimiter,
@@ -19,6 +20,14 @@ from app.middleware.rate_limit import (
 )
 
 
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
 class TestParseRateLimit:
     """Tests for parse_rate_limit function."""
 
@@ -177,8 +186,104 @@ class TestInMemoryRateLimiter:
         limiter.cleanup_expired(max_age_seconds=0)
 
         # Both keys should have been cleaned
-        assert "key1" not in limiter._requests or len(limiter._requests["key1"]) == 0
-        assert "key2" not in limiter._requests or len(limiter._requests["key2"]) == 0
+        assert "key1" not in limiter._tat
+        assert "key2" not in limiter._tat
+
+
+class TestGCRA:
+    """Tests for GCRA costs and adjustments."""
+
+    def test_cost_consumes_multiple_units(self):
+        limiter = InMemoryRateLimiter(clock=FakeClock())
+
+        is_allowed, remaining, _ = limiter.is_allowed("k", 100, 60, cost=70)
+        assert (is_allowed, remaining) == (True, 30)
+
+        is_allowed, _, retry_after = limiter.is_allowed("k", 100, 60, cost=40)
+        assert is_allowed is False
+        # 10 units refill at 100 units/minute in 6 seconds
+        assert retry_after == 6
+
+    def test_budget_refills_gradually(self):
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        limiter.is_allowed("k", 60, 60, cost=60)
+
+        clock.now += 10
+        is_allowed, remaining, _ = limiter.is_allowed("k", 60, 60, cost=10)
+        assert (is_allowed, remaining) == (True, 0)
+
+    @pytest.mark.asyncio
+    async def test_adjust_charges_and_refunds(self):
+        limiter = InMemoryRateLimiter(clock=FakeClock())
+        await limiter.acquire("k", 100, 60, cost=50)
+
+        await limiter.adjust("k", 100, 60, 30)
+        assert (await limiter.acquire("k", 100, 60, cost=21))[0] is False
+
+        await limiter.adjust("k", 100, 60, -80)
+        assert await limiter.acquire("k", 100, 60, cost=100) == (True, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_refund_does_not_bank_budget(self):
+        limiter = InMemoryRateLimiter(clock=FakeClock())
+        await limiter.adjust("k", 10, 60, -100)
+
+        assert (await limiter.acquire("k", 10, 60, cost=11))[0] is False
+
+
+class TestRedisRateLimiter:
+    """Tests for the Redis limiter's script calls and error handling."""
+
+    class FakeRedis:
+        def __init__(self, result=None, error=None):
+            self.result = result
+            self.error = error
+            self.calls = []
+            self.registered = 0
+
+        def register_script(self, script):
+            self.registered += 1
+
+            async def run(keys, args):
+                self.calls.append((keys, args))
+                if self.error is not None:
+                    raise self.error
+                return self.result
+
+            return run
+
+    @pytest.mark.asyncio
+    async def test_acquire_runs_script_with_interval_and_cost(self):
+        client = self.FakeRedis(result=[1, 7, 0])
+        limiter = RedisRateLimiter(lambda: client, key_prefix="p:")
+
+        assert await limiter.acquire("ip:1", 10, 60, cost=3) == (True, 7, 0)
+        assert await limiter.acquire("ip:1", 10, 60) == (True, 7, 0)
+        assert client.calls[0] == (["p:ip:1"], [6000.0, 60000, 3, 0])
+        assert client.registered == 1
+
+    @pytest.mark.asyncio
+    async def test_denied_request_rounds_retry_after_up(self):
+        limiter = RedisRateLimiter(lambda: self.FakeRedis(result=[0, 0, 1500]))
+
+        assert await limiter.acquire("k", 10, 60) == (False, 0, 2)
+
+    @pytest.mark.asyncio
+    async def test_adjust_forces_update(self):
+        client = self.FakeRedis(result=[1, 0, 0])
+        limiter = RedisRateLimiter(lambda: client, key_prefix="p:")
+
+        await limiter.adjust("k", 100, 60, -25)
+        assert client.calls == [(["p:k"], [600.0, 60000, -25, 1])]
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fail_open(self):
+        client = self.FakeRedis(error=ConnectionError("down"))
+        limiter = RedisRateLimiter(lambda: client)
+
+        assert await limiter.acquire("k", 10, 60) == (True, 10, 0)
+        await limiter.adjust("k", 10, 60, 5)
 
 
 class TestRateLimitMiddleware:
@@ -414,3 +519,29 @@ class TestRateLimitMiddleware:
                 response = client.get("/static/app.js")
                 # 404 is fine, we just want to ensure no 429
                 assert response.status_code in [200, 404, 405]
+
+    def test_middleware_passes_streaming_responses_through(self, app, mock_settings):
+        """Streamed chunks and the request body reach their destination unchanged."""
+        chunks = [f"data: {i}\n\n".encode() for i in range(50)]
+
+        @app.post("/v1/stream")
+        async def stream_endpoint(request: Request):
+            body = await request.body()
+
+            async def events():
+                yield body
+                for chunk in chunks:
+                    yield chunk
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        with patch("app.middleware.rate_limit.get_settings", return_value=mock_settings):
+            app.add_middleware(RateLimitMiddleware)
+            client = TestClient(app)
+
+            response = client.post("/v1/stream", content=b"payload")
+
+            assert response.status_code == 200
+            assert response.content == b"payload" + b"".join(chunks)
+            assert response.headers["X-RateLimit-Limit"] == "200"
+            assert response.headers["content-type"].startswith("text/event-stream")
@@ -0,0 +1,26 @@
+"""
+Test Config Version Repository
+"""
+
+import pytest
+
+from app.repositories.sqlalchemy.config_version_repo import (
+    SQLAlchemyConfigVersionRepository,
+)
+
+
+@pytest.mark.asyncio
+async def test_version_starts_at_zero(db_session):
+    repo = SQLAlchemyConfigVersionRepository(db_session)
+
+    assert await repo.get_version() == 0
+
+
+@pytest.mark.asyncio
+async def test_bump_creates_row_then_increments(db_session):
+    repo = SQLAlchemyConfigVersionRepository(db_session)
+
+    assert await repo.bump() == 1
+    assert await repo.bump() == 2
+    assert await repo.bump() == 3
+    assert await repo.get_version() == 3
@@ -169,3 +169,21 @@ async def test_get_expired_key_returns_none_and_deletes(db_session):
     result = await repo.get("auto_delete_key")
     
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_set_many_inserts_and_updates(db_session):
+    """Test setting several keys at once"""
+    repo = SQLAlchemyKVStoreRepository(db_session)
+    await repo.set("existing_key", "old_value")
+
+    await repo.set_many(
+        {"existing_key": "new_value", "new_key": "value"}, ttl_seconds=3600
+    )
+
+    existing = await repo.get("existing_key")
+    created = await repo.get("new_key")
+    assert existing.value == "new_value"
+    assert existing.expires_at is not None
+    assert created.value == "value"
+    assert created.expires_at is not None
@@ -0,0 +1,75 @@
+"""
+Test multi-row log writes used by the background log writer.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.log import RequestLogCreate
+from app.repositories.sqlalchemy.log_repo import SQLAlchemyLogRepository
+
+
+def _make_log_data(**overrides) -> RequestLogCreate:
+    defaults = dict(
+        request_time=datetime.now(timezone.utc),
+        api_key_id=1,
+        api_key_name="test-key",
+        requested_model="gpt-4",
+        target_model="gpt-4",
+        provider_id=1,
+        provider_name="OpenAI",
+        input_tokens=10,
+        output_tokens=20,
+        total_cost=0.0123,
+        response_status=200,
+        trace_id="trace-1",
+        request_body={"model": "gpt-4"},
+        response_body='{"ok":true}',
+        usage_details={"prompt_tokens": 10},
+    )
+    defaults.update(overrides)
+    return RequestLogCreate(**defaults)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_writes_summary_and_detail_rows_in_order(db_session):
+    repo = SQLAlchemyLogRepository(db_session)
+
+    log_ids = await repo.bulk_create(
+        [_make_log_data(trace_id=f"trace-{index}") for index in range(3)]
+    )
+
+    assert len(log_ids) == 3
+    for index, log_id in enumerate(log_ids):
+        log = await repo.get_by_id(log_id)
+        assert log.trace_id == f"trace-{index}"
+        assert log.total_cost == pytest.approx(0.0123)
+        assert log.request_body == {"model": "gpt-4"}
+        assert log.usage_details == {"prompt_tokens": 10}
+    assert await repo.bulk_create([]) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_completes_only_in_progress_logs(db_session):
+    repo = SQLAlchemyLogRepository(db_session)
+    in_progress = await repo.create_initial(_make_log_data(trace_id="running"))
+    cancelled = await repo.create_initial(_make_log_data(trace_id="cancelled"))
+    await repo.cancel(cancelled)
+
+    completed = await repo.bulk_update(
+        [
+            (in_progress, _make_log_data(trace_id="running", response_status=201)),
+            (cancelled, _make_log_data(trace_id="cancelled", response_status=200)),
+        ]
+    )
+
+    assert completed == 1
+    log = await repo.get_by_id(in_progress)
+    assert log.is_completed is True
+    assert log.response_status == 201
+    assert log.response_body == '{"ok":true}'
+    cancelled_log = await repo.get_by_id(cancelled)
+    assert cancelled_log.response_status == 499
+    assert cancelled_log.response_body is None
+    assert await repo.bulk_update([]) == 0
@@ -0,0 +1,57 @@
+import pytest
+
+from app.domain.model import ModelMappingCreate, ModelMappingProviderCreate
+from app.domain.provider import ProviderCreate, ProviderUpdate
+from app.repositories.sqlalchemy.model_repo import SQLAlchemyModelRepository
+from app.repositories.sqlalchemy.provider_repo import SQLAlchemyProviderRepository
+
+
+@pytest.mark.asyncio
+async def test_get_provider_counts_matches_single_model_counts(db_session):
+    model_repo = SQLAlchemyModelRepository(db_session)
+    provider_repo = SQLAlchemyProviderRepository(db_session)
+
+    providers = [
+        await provider_repo.create(
+            ProviderCreate(
+                name=f"provider-count-{index}",
+                base_url="https://example.com",
+                protocol="openai",
+                api_type="chat",
+            )
+        )
+        for index in range(3)
+    ]
+    await provider_repo.update(providers[2].id, ProviderUpdate(is_active=False))
+
+    for requested_model in ["alpha", "bravo", "charlie"]:
+        await model_repo.create_mapping(ModelMappingCreate(requested_model=requested_model))
+
+    for provider in providers:
+        await model_repo.add_provider_mapping(
+            ModelMappingProviderCreate(
+                requested_model="alpha",
+                provider_id=provider.id,
+                target_model_name="gpt-4o",
+                input_price=1.0,
+                output_price=2.0,
+            )
+        )
+    await model_repo.add_provider_mapping(
+        ModelMappingProviderCreate(
+            requested_model="bravo",
+            provider_id=providers[0].id,
+            target_model_name="gpt-4o",
+            input_price=1.0,
+            output_price=2.0,
+            is_active=False,
+        )
+    )
+
+    counts = await model_repo.get_provider_counts(["alpha", "bravo", "charlie"])
+
+    assert counts == {"alpha": (3, 2), "bravo": (1, 0), "charlie": (0, 0)}
+    for requested_model, (total, active) in counts.items():
+        assert total == await model_repo.get_provider_count(requested_model)
+        assert active == await model_repo.get_active_provider_count(requested_model)
+    assert await model_repo.get_provider_counts([]) == {}
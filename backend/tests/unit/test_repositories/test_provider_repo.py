@@ -43,3 +43,27 @@ async def test_delete_provider_keeps_request_log_snapshot_fields(db_session):
     assert fetched_log is not None
     assert fetched_log.provider_id == provider.id
     assert fetched_log.provider_name == provider.name
+
+
+@pytest.mark.asyncio
+async def test_get_by_ids_returns_existing_providers_keyed_by_id(db_session):
+    provider_repo = SQLAlchemyProviderRepository(db_session)
+    created = [
+        await provider_repo.create(
+            ProviderCreate(
+                name=f"provider-bulk-{index}",
+                base_url="https://example.com",
+                protocol="openai",
+                api_type="chat",
+            )
+        )
+        for index in range(3)
+    ]
+
+    providers = await provider_repo.get_by_ids(
+        [created[2].id, created[0].id, created[2].id, 9999]
+    )
+
+    assert set(providers) == {created[0].id, created[2].id}
+    assert providers[created[2].id].name == "provider-bulk-2"
+    assert await provider_repo.get_by_ids([]) == {}
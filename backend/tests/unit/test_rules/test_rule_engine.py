@@ -64,6 +64,40 @@ class TestRuleContext:
         assert context.get_value("token_usage.input_tokens") == 100
         assert context.get_value("token_usage.output_tokens") == 50
         assert context.get_value("token_usage.total_tokens") == 150
+
+    def test_token_usage_is_counted_on_first_access(self):
+        """Test deferred input token counting"""
+        calls = []
+
+        def count():
+            calls.append(1)
+            return 42
+
+        usage = TokenUsage(input_token_counter=count)
+        context = RuleContext(current_model="gpt-4", token_usage=usage)
+        assert context.get_value("model") == "gpt-4"
+        assert not usage.input_tokens_counted
+        assert calls == []
+
+        assert context.get_value("token_usage.input_tokens") == 42
+        assert context.get_value("token_usage.total_tokens") == 42
+        assert usage.input_tokens_counted
+        assert calls == [1]
+
+    def test_rule_set_reports_token_usage_rules(self):
+        """Test detecting rules that need token counts"""
+        assert not RuleSet.from_dict(
+            {"rules": [{"field": "headers.x-priority", "operator": "eq", "value": "high"}]}
+        ).uses_token_usage
+        assert RuleSet.from_dict(
+            {
+                "rules": [
+                    {"field": "model", "operator": "eq", "value": "gpt-4"},
+                    {"field": "token_usage.input_tokens", "operator": "gt", "value": 1000},
+                ],
+                "logic": "OR",
+            }
+        ).uses_token_usage
     
     def test_get_value_not_found(self):
         """Test getting non-existent field"""
@@ -2,14 +2,19 @@
 ApiKeyService.authenticate unit tests
 """
 
-from datetime import timezone
+from contextlib import asynccontextmanager
+from datetime import timedelta, timezone
+from unittest.mock import AsyncMock
 
 import pytest
 
+from app.common.errors import AuthenticationError
 from app.common.time import utc_now
-from app.domain.api_key import ApiKeyCreate
+from app.domain.api_key import ApiKeyCreate, ApiKeyUpdate
 from app.repositories.sqlalchemy.api_key_repo import SQLAlchemyApiKeyRepository
+from app.services.api_key_auth import ApiKeyAuthCache, LastUsedRecorder
 from app.services.api_key_service import ApiKeyService
+from app.services.config_bus import config_bus
 
 
 @pytest.mark.asyncio
@@ -29,3 +34,76 @@ async def test_authenticate_updates_last_used_at(db_session):
     assert updated.last_used_at is not None
     assert updated.last_used_at.tzinfo == timezone.utc
     assert before <= updated.last_used_at <= after
+
+
+@pytest.mark.asyncio
+async def test_authenticate_reads_through_cache_and_caches_misses(db_session):
+    repo = SQLAlchemyApiKeyRepository(db_session)
+    created = await repo.create(ApiKeyCreate(key_name="cached-key"), key_value="sk-cached")
+    counting_repo = AsyncMock(wraps=repo)
+    service = ApiKeyService(counting_repo, auth_cache=ApiKeyAuthCache())
+
+    for _ in range(3):
+        api_key = await service.authenticate("Bearer sk-cached")
+        assert api_key.id == created.id
+    for _ in range(2):
+        with pytest.raises(AuthenticationError):
+            await service.authenticate("sk-unknown")
+
+    assert counting_repo.get_by_key_value.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_api_key_update_invalidates_auth_cache(db_session, monkeypatch):
+    repo = SQLAlchemyApiKeyRepository(db_session)
+    created = await repo.create(ApiKeyCreate(key_name="disable-me"), key_value="sk-disable")
+    cache = ApiKeyAuthCache()
+    monkeypatch.setattr(config_bus, "_listeners", [cache.invalidate])
+    service = ApiKeyService(repo, auth_cache=cache)
+
+    await service.authenticate("sk-disable")
+    await service.update(created.id, ApiKeyUpdate(is_active=False))
+
+    with pytest.raises(AuthenticationError):
+        await service.authenticate("sk-disable")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_defers_last_used_to_recorder(db_session):
+    repo = SQLAlchemyApiKeyRepository(db_session)
+    created = await repo.create(ApiKeyCreate(key_name="deferred"), key_value="sk-deferred")
+    recorder = LastUsedRecorder()
+
+    @asynccontextmanager
+    async def repo_factory():
+        yield repo
+
+    await recorder.start(repo_factory, flush_interval_seconds=3600)
+    try:
+        service = ApiKeyService(repo, last_used_recorder=recorder)
+        await service.authenticate("sk-deferred")
+        await service.authenticate("sk-deferred")
+
+        assert recorder.pending_count == 1
+        assert (await repo.get_by_id(created.id)).last_used_at is None
+    finally:
+        await recorder.stop()
+
+    assert recorder.pending_count == 0
+    db_session.expire_all()
+    assert (await repo.get_by_id(created.id)).last_used_at is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_last_used_never_moves_backwards(db_session):
+    repo = SQLAlchemyApiKeyRepository(db_session)
+    first = await repo.create(ApiKeyCreate(key_name="bulk-1"), key_value="sk-bulk-1")
+    second = await repo.create(ApiKeyCreate(key_name="bulk-2"), key_value="sk-bulk-2")
+    now = utc_now().replace(microsecond=0)
+
+    await repo.bulk_update_last_used({first.id: now, second.id: now})
+    await repo.bulk_update_last_used({first.id: now - timedelta(seconds=5)})
+    db_session.expire_all()
+
+    assert (await repo.get_by_id(first.id)).last_used_at == now
+    assert (await repo.get_by_id(second.id)).last_used_at == now
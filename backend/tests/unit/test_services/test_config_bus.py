@@ -0,0 +1,96 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.repositories.config_version_repo import ConfigVersionRepository
+from app.services.config_bus import ConfigChangeBus
+
+
+class InMemoryConfigVersionRepo(ConfigVersionRepository):
+    def __init__(self) -> None:
+        self.version = 0
+
+    async def get_version(self) -> int:
+        return self.version
+
+    async def bump(self) -> int:
+        self.version += 1
+        return self.version
+
+
+def repo_factory(repo: ConfigVersionRepository):
+    @asynccontextmanager
+    async def factory():
+        yield repo
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_notify_runs_local_listeners_without_shared_state() -> None:
+    bus = ConfigChangeBus()
+    calls: list[str] = []
+    bus.subscribe(lambda: calls.append("routing"))
+
+    await bus.notify_changed()
+
+    assert calls == ["routing"]
+    assert bus.running is False
+
+
+@pytest.mark.asyncio
+async def test_listener_failure_does_not_block_other_listeners() -> None:
+    bus = ConfigChangeBus()
+    calls: list[str] = []
+
+    def broken() -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(lambda: calls.append("ok"))
+
+    await bus.notify_changed()
+
+    assert calls == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_polling_picks_up_bumps_from_other_workers() -> None:
+    shared = InMemoryConfigVersionRepo()
+    writer = ConfigChangeBus()
+    reader = ConfigChangeBus()
+    reader_calls: list[int] = []
+    reader.subscribe(lambda: reader_calls.append(1))
+
+    await writer.start(repo_factory(shared), poll_interval_seconds=0.01)
+    await reader.start(repo_factory(shared), poll_interval_seconds=0.01)
+    try:
+        await writer.notify_changed()
+        assert shared.version == 1
+
+        for _ in range(100):
+            if reader_calls:
+                break
+            await asyncio.sleep(0.01)
+        assert reader_calls == [1]
+    finally:
+        await writer.stop()
+        await reader.stop()
+
+
+@pytest.mark.asyncio
+async def test_own_bump_is_not_applied_twice() -> None:
+    shared = InMemoryConfigVersionRepo()
+    bus = ConfigChangeBus()
+    calls: list[int] = []
+    bus.subscribe(lambda: calls.append(1))
+
+    await bus.start(repo_factory(shared), poll_interval_seconds=0.01)
+    try:
+        await bus.notify_changed()
+        await asyncio.sleep(0.05)
+    finally:
+        await bus.stop()
+
+    assert calls == [1]
@@ -0,0 +1,274 @@
+import asyncio
+
+import pytest
+
+from app.providers.base import ProviderResponse
+from app.rules.models import CandidateProvider
+from app.services.hedging import HedgePolicy, LatencyTracker
+from app.services.retry_handler import RetryHandler
+from app.services.strategy import PriorityStrategy
+
+
+def make_candidates() -> list[CandidateProvider]:
+    return [
+        CandidateProvider(
+            provider_id=i,
+            provider_name=f"p{i}",
+            base_url=f"https://api{i}.com",
+            protocol="openai",
+            api_key=f"key{i}",
+            target_model=f"model{i}",
+            priority=i,
+        )
+        for i in (1, 2, 3)
+    ]
+
+
+def make_handler(delay_ms: int | None = 20, tracker: LatencyTracker | None = None) -> RetryHandler:
+    handler = RetryHandler(
+        PriorityStrategy(),
+        hedge_policy=HedgePolicy(
+            tracker=tracker or LatencyTracker(min_samples=1),
+            is_stream=False,
+            delay_ms=delay_ms,
+        ),
+    )
+    handler.retry_delay_ms = 1
+    return handler
+
+
+def forward_with_delays(delays: dict[int, float], statuses: dict[int, int] | None = None):
+    calls: list[int] = []
+    cancelled: list[int] = []
+
+    async def forward_fn(candidate):
+        calls.append(candidate.provider_id)
+        try:
+            await asyncio.sleep(delays.get(candidate.provider_id, 0))
+        except asyncio.CancelledError:
+            cancelled.append(candidate.provider_id)
+            raise
+        status = (statuses or {}).get(candidate.provider_id, 200)
+        return ProviderResponse(status_code=status, body={"id": candidate.provider_id})
+
+    return forward_fn, calls, cancelled
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    forward_fn, calls, _ = forward_with_delays({1: 0})
+
+    result = await make_handler(delay_ms=200).execute_with_retry(
+        make_candidates(), "m", forward_fn
+    )
+
+    assert result.success and result.final_provider.provider_id == 1
+    assert calls == [1]
+    assert result.retry_count == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    forward_fn, calls, cancelled = forward_with_delays({1: 5, 2: 0})
+    failed = []
+
+    async def on_failure(attempt):
+        failed.append(attempt)
+
+    result = await make_handler().execute_with_retry(
+        make_candidates(), "m", forward_fn, on_failure_attempt=on_failure
+    )
+
+    assert result.success and result.final_provider.provider_id == 2
+    assert calls == [1, 2]
+    assert cancelled == [1]
+    assert result.retry_count == 1
+    assert [a.provider.provider_id for a in result.attempts] == [1, 2]
+    assert [(a.provider.provider_id, a.response.status_code) for a in failed] == [(1, 499)]
+
+
+@pytest.mark.asyncio
+async def test_primary_still_wins_when_it_answers_first():
+    forward_fn, calls, cancelled = forward_with_delays({1: 0.05, 2: 5})
+
+    result = await make_handler().execute_with_retry(
+        make_candidates(), "m", forward_fn
+    )
+
+    assert result.final_provider.provider_id == 1
+    assert calls == [1, 2]
+    assert cancelled == [2]
+
+
+@pytest.mark.asyncio
+async def test_failed_race_fails_over_to_remaining_candidates():
+    forward_fn, calls, _ = forward_with_delays(
+        {1: 0.05, 2: 0.06}, statuses={1: 500, 2: 429}
+    )
+
+    result = await make_handler().execute_with_retry(
+        make_candidates(), "m", forward_fn
+    )
+
+    assert result.success and result.final_provider.provider_id == 3
+    assert calls == [1, 2, 3]
+    assert result.retry_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_hedge_yields_winner_and_closes_loser():
+    closed = []
+
+    def forward_stream_fn(candidate):
+        async def gen():
+            try:
+                if candidate.provider_id == 1:
+                    await asyncio.sleep(5)
+                resp = ProviderResponse(status_code=200)
+                yield f"p{candidate.provider_id}-a".encode(), resp
+                yield f"p{candidate.provider_id}-b".encode(), resp
+            finally:
+                closed.append(candidate.provider_id)
+
+        return gen()
+
+    handler = make_handler()
+    chunks = [
+        (chunk, provider.provider_id, retry_count)
+        async for chunk, _, provider, retry_count in handler.execute_with_retry_stream(
+            make_candidates(), "m", forward_stream_fn
+        )
+    ]
+
+    assert chunks == [(b"p2-a", 2, 1), (b"p2-b", 2, 1)]
+    assert sorted(closed) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_hedge_closes_failed_attempt_and_abandoned_winner():
+    closed = []
+
+    def forward_stream_fn(candidate):
+        async def gen():
+            try:
+                if candidate.provider_id == 1:
+                    await asyncio.sleep(0.05)
+                    yield b"", ProviderResponse(status_code=500, error="upstream failed")
+                    return
+                await asyncio.sleep(0.08)
+                resp = ProviderResponse(status_code=200)
+                yield b"p2-a", resp
+                yield b"p2-b", resp
+            finally:
+                closed.append(candidate.provider_id)
+
+        return gen()
+
+    stream = make_handler().execute_with_retry_stream(
+        make_candidates(), "m", forward_stream_fn
+    )
+    chunk, _, provider, _ = await anext(stream)
+    await stream.aclose()
+
+    assert (chunk, provider.provider_id) == (b"p2-a", 2)
+    assert sorted(closed) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_cancels_attempts_during_hedge_delay():
+    forward_fn, calls, cancelled = forward_with_delays({1: 5})
+
+    task = asyncio.create_task(
+        make_handler(delay_ms=5000).execute_with_retry(make_candidates(), "m", forward_fn)
+    )
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert calls == [1]
+    assert cancelled == [1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_stream_request_closes_attempts_during_hedge_delay():
+    closed = []
+
+    def forward_stream_fn(candidate):
+        async def gen():
+            try:
+                await asyncio.sleep(5)
+                yield b"late", ProviderResponse(status_code=200)
+            finally:
+                closed.append(candidate.provider_id)
+
+        return gen()
+
+    async def consume():
+        async for _ in make_handler(delay_ms=5000).execute_with_retry_stream(
+            make_candidates(), "m", forward_stream_fn
+        ):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert closed == [1]
+
+
+def test_adaptive_delay_uses_latency_percentile():
+    tracker = LatencyTracker(min_samples=10)
+    candidate = make_candidates()[0]
+    policy = HedgePolicy(tracker=tracker, is_stream=True, percentile=0.9, default_delay_ms=1500)
+
+    assert policy.delay_seconds(candidate) == 1.5
+    for latency in range(100, 1100, 100):
+        policy.record(candidate, latency)
+
+    assert policy.delay_seconds(candidate) == 1.0
+    assert tracker.percentile(candidate, False, 0.9) is None
+
+
+@pytest.mark.asyncio
+async def test_adaptive_delay_is_stable_under_sustained_hedging():
+    tracker = LatencyTracker(min_samples=10, max_samples=10)
+    primary, secondary = make_candidates()[:2]
+    handler = make_handler(delay_ms=None, tracker=tracker)
+    for latency in [5] * 8 + [100] * 2:
+        handler.hedge_policy.record(primary, latency)
+    for _ in range(10):
+        handler.hedge_policy.record(secondary, 50)
+    assert handler.hedge_policy.delay_seconds(primary) == 0.1
+
+    # One request in five is slow enough to be hedged; its cancelled
+    # attempt still counts as (at least) the time it ran
+    for i in range(20):
+        forward_fn, _, _ = forward_with_delays({1: 5 if i % 5 == 4 else 0.005, 2: 0.05})
+        result = await handler.execute_with_retry(make_candidates(), "m", forward_fn)
+        assert result.success
+
+    assert handler.hedge_policy.delay_seconds(primary) >= 0.1
+
+    # A hedge cancelled shortly after it started is not a latency sample
+    handler = make_handler(delay_ms=50, tracker=tracker)
+    for _ in range(10):
+        forward_fn, _, cancelled = forward_with_delays({1: 0.07, 2: 0.05})
+        result = await handler.execute_with_retry(make_candidates(), "m", forward_fn)
+        assert result.final_provider.provider_id == 1 and cancelled == [2]
+
+    assert tracker.percentile(secondary, False, 0.5) >= 50
+
+
+def test_policy_is_only_built_for_hedged_mappings():
+    class Mapping:
+        hedge_enabled = False
+        hedge_delay_ms = None
+
+    assert HedgePolicy.for_mapping(Mapping(), is_stream=False) is None
+    Mapping.hedge_enabled = True
+    Mapping.hedge_delay_ms = 300
+    policy = HedgePolicy.for_mapping(Mapping(), is_stream=False)
+    assert policy.delay_seconds(make_candidates()[0]) == 0.3
@@ -0,0 +1,184 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.common.time import utc_now
+from app.domain.log import RequestLogCreate
+from app.services.log_writer import LogWriter
+
+
+def _log(trace_id: str = "trace") -> RequestLogCreate:
+    return RequestLogCreate(
+        request_time=utc_now(),
+        requested_model="gpt-4",
+        trace_id=trace_id,
+        request_body={"model": "gpt-4"},
+        response_body="ok",
+        error_info="boom",
+    )
+
+
+def _repo_factory(repo):
+    @asynccontextmanager
+    async def factory():
+        yield repo
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_creates_and_updates_and_drains_on_stop():
+    repo = AsyncMock()
+    writer = LogWriter(batch_size=10, flush_interval_seconds=30)
+    await writer.start(_repo_factory(repo))
+
+    for index in range(3):
+        await writer.create(_log(f"create-{index}"))
+    await writer.update(42, _log("update"))
+    await writer.stop()
+
+    repo.bulk_create.assert_awaited_once()
+    assert [log.trace_id for log in repo.bulk_create.await_args.args[0]] == [
+        "create-0",
+        "create-1",
+        "create-2",
+    ]
+    [(log_id, data)] = repo.bulk_update.await_args.args[0]
+    assert (log_id, data.trace_id) == (42, "update")
+    stats = writer.stats()
+    assert (stats.queue_depth, stats.enqueued, stats.written) == (0, 4, 4)
+    assert stats.flushes == 1
+    assert stats.last_flush_ms is not None
+    assert writer.running is False
+
+
+@pytest.mark.asyncio
+async def test_stop_writes_the_batch_being_collected():
+    repo = AsyncMock()
+    writer = LogWriter(batch_size=10, flush_interval_seconds=5)
+    await writer.start(_repo_factory(repo))
+
+    for index in range(3):
+        await writer.create(_log(f"create-{index}"))
+    # Let the writer take the entries off the queue and wait for more
+    await asyncio.sleep(0.05)
+    await writer.stop()
+
+    repo.bulk_create.assert_awaited_once()
+    assert len(repo.bulk_create.await_args.args[0]) == 3
+    assert writer.stats().written == 3
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_full_batches_without_waiting_for_interval():
+    repo = AsyncMock()
+    writer = LogWriter(batch_size=2, flush_interval_seconds=30)
+    await writer.start(_repo_factory(repo))
+
+    await writer.create(_log("a"))
+    await writer.create(_log("b"))
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    repo.bulk_create.assert_awaited_once()
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_details_policy_strips_payload_then_blocks():
+    writer = LogWriter(max_queue_size=4, detail_drop_ratio=0.5)
+
+    first, second, third = _log("first"), _log("second"), _log("third")
+    await writer.create(first)
+    await writer.create(second)
+    await writer.create(third)
+    await writer.create(_log("fourth"))
+
+    assert first.request_body == {"model": "gpt-4"}
+    assert third.request_body is None
+    assert third.error_info == "boom"
+    assert writer.stats().details_dropped == 2
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(writer.create(_log("blocked")), timeout=0.05)
+    assert writer.stats().queue_depth == 4
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_logs_when_full():
+    writer = LogWriter(max_queue_size=1, overflow_policy="drop")
+
+    await writer.create(_log("kept"))
+    await writer.create(_log("dropped"))
+
+    stats = writer.stats()
+    assert (stats.queue_depth, stats.enqueued, stats.dropped) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_one_by_one():
+    repo = AsyncMock()
+    repo.bulk_create.side_effect = RuntimeError("batch failed")
+    repo.create.side_effect = [None, RuntimeError("bad row")]
+    writer = LogWriter(batch_size=10, flush_interval_seconds=30)
+    await writer.start(_repo_factory(repo))
+
+    await writer.create(_log("good"))
+    await writer.create(_log("bad"))
+    await writer.stop()
+
+    assert repo.create.await_count == 2
+    stats = writer.stats()
+    assert (stats.written, stats.failed) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_update_does_not_recreate_committed_rows():
+    repo = AsyncMock()
+    repo.bulk_update.side_effect = RuntimeError("update failed")
+    writer = LogWriter(batch_size=10, flush_interval_seconds=30)
+    await writer.start(_repo_factory(repo))
+
+    await writer.create(_log("create-0"))
+    await writer.create(_log("create-1"))
+    await writer.update(42, _log("update"))
+    await writer.stop()
+
+    created = [log.trace_id for log in repo.bulk_create.await_args.args[0]]
+    assert created == ["create-0", "create-1"]
+    repo.create.assert_not_awaited()
+    repo.update.assert_awaited_once()
+    assert repo.update.await_args.args[0] == 42
+    stats = writer.stats()
+    assert (stats.written, stats.failed) == (3, 0)
+
+
+@pytest.mark.asyncio
+async def test_prepare_runs_before_write_and_is_skipped_when_details_dropped():
+    repo = AsyncMock()
+    writer = LogWriter(max_queue_size=4, batch_size=10, detail_drop_ratio=0.5)
+    await writer.start(_repo_factory(repo))
+
+    prepared = _log("prepared")
+    prepared.response_body = None
+    stripped = _log("stripped")
+
+    def fill_body():
+        prepared.response_body = "serialized later"
+
+    def broken():
+        raise ValueError("bad body")
+
+    await writer.create(prepared, prepare=fill_body)
+    await writer.create(_log("broken"), prepare=broken)
+    await writer.create(stripped, prepare=lambda: setattr(stripped, "response_body", "x"))
+    await writer.stop()
+
+    written = {log.trace_id: log for log in repo.bulk_create.await_args.args[0]}
+    assert written["prepared"].response_body == "serialized later"
+    # A failing prepare does not lose the entry
+    assert written["broken"].response_body == "ok"
+    assert written["stripped"].response_body is None
+
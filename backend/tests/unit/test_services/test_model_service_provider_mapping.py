@@ -13,6 +13,7 @@ from app.domain.provider import ProviderCreate
 from app.rules.models import CandidateProvider
 from app.repositories.sqlalchemy.model_repo import SQLAlchemyModelRepository
 from app.repositories.sqlalchemy.provider_repo import SQLAlchemyProviderRepository
+from app.services.inflight import InFlightTracker
 from app.services.model_service import ModelService
 from app.services.provider_health import HealthOutcome, ProviderHealthTracker
 
@@ -143,6 +144,51 @@ async def test_get_mapping_includes_runtime_provider_health(db_session):
     assert mapping.providers[0].health_failure_rate == 0.5
 
 
+@pytest.mark.asyncio
+async def test_provider_mappings_include_inflight_counts(db_session):
+    model_repo = SQLAlchemyModelRepository(db_session)
+    provider_repo = SQLAlchemyProviderRepository(db_session)
+    inflight_tracker = InFlightTracker()
+    service = ModelService(model_repo, provider_repo, inflight_tracker=inflight_tracker)
+
+    await model_repo.create_mapping(ModelMappingCreate(requested_model="busy-model"))
+    provider = await provider_repo.create(
+        ProviderCreate(
+            name="busy-provider",
+            base_url="https://example.com",
+            protocol="openai",
+            api_type="chat",
+        )
+    )
+    created = await service.create_provider_mapping(
+        ModelMappingProviderCreate(
+            requested_model="busy-model",
+            provider_id=provider.id,
+            target_model_name="upstream-busy-model",
+            input_price=0.0,
+            output_price=0.0,
+        )
+    )
+    candidate = CandidateProvider(
+        provider_mapping_id=created.id,
+        provider_id=provider.id,
+        provider_name=provider.name,
+        base_url=provider.base_url,
+        protocol=provider.protocol,
+        api_key=provider.api_key,
+        target_model=created.target_model_name,
+    )
+    inflight_tracker.acquire(candidate)
+    inflight_tracker.acquire(candidate)
+
+    mapping = await service.get_mapping("busy-model")
+    listed = await service.get_provider_mappings(requested_model="busy-model")
+
+    assert mapping.providers is not None
+    assert mapping.providers[0].in_flight == 2
+    assert listed[0].in_flight == 2
+
+
 @pytest.mark.asyncio
 async def test_bulk_upgrade_provider_model_updates_all_matched_mappings(db_session):
     model_repo = SQLAlchemyModelRepository(db_session)
@@ -1,5 +1,5 @@
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -8,7 +8,10 @@ from app.domain.model import ModelMapping
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
 from app.domain.kv_store import KeyValueModel
-from app.services.protocol_hooks import ProtocolConversionHooks
+from app.services.protocol_hooks import (
+    TOOL_CALL_EXTRA_CONTENT_TTL,
+    ProtocolConversionHooks,
+)
 from app.services.proxy_service import ProxyService
 
 
@@ -1320,3 +1323,93 @@ async def test_cache_non_stream_response_handles_kv_error():
 
     mock_kv_repo.set.assert_called_once()
     assert result == supplier_body
+
+
+def _reasoning_chunk(chat_id: str, reasoning: str, finish_reason=None) -> bytes:
+    data = {
+        "id": chat_id,
+        "choices": [
+            {"delta": {"reasoning_content": reasoning}, "finish_reason": finish_reason}
+        ],
+    }
+    return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_stream_reasoning_is_written_once_when_choice_finishes():
+    mock_kv_repo = AsyncMock()
+    hooks = ProtocolConversionHooks(kv_repo=mock_kv_repo)
+    tool_call_chunk = (
+        "data: "
+        + json.dumps(
+            {
+                "id": "chat-1",
+                "choices": [
+                    {"delta": {"tool_calls": [{"id": "call-1", "index": 0}]}}
+                ],
+            }
+        )
+        + "\n\n"
+    ).encode("utf-8")
+
+    for part in ["Let ", "me ", "think"]:
+        await hooks.before_stream_chunk_conversion(
+            _reasoning_chunk("chat-1", part), "openai", "openai"
+        )
+    await hooks.before_stream_chunk_conversion(tool_call_chunk, "openai", "openai")
+    mock_kv_repo.set_many.assert_not_called()
+    mock_kv_repo.get.assert_not_called()
+
+    await hooks.before_stream_chunk_conversion(
+        b'data: {"id":"chat-1","choices":[{"delta":{},"finish_reason":"tool_calls"}]}\n\n',
+        "openai",
+        "openai",
+    )
+
+    mock_kv_repo.set_many.assert_awaited_once()
+    items = mock_kv_repo.set_many.await_args.args[0]
+    assert items == {
+        "chat_reasoning:chat-1": "Let me think",
+        "tool_call_chat_id:call-1": "chat-1",
+    }
+    mock_kv_repo.set.assert_not_called()
+
+    # Nothing left to write at the end of the stream
+    await hooks.after_stream_end("openai", "openai")
+    mock_kv_repo.set_many.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_without_reasoning_skip_kv_session():
+    session_factory = MagicMock()
+    hooks = ProtocolConversionHooks(
+        kv_repo_factory=lambda session: AsyncMock(),
+        session_factory=session_factory,
+    )
+
+    await hooks.before_stream_chunk_conversion(
+        b'data: {"id":"chat-1","choices":[{"delta":{"content":"hi"}}]}\n\n',
+        "openai",
+        "openai",
+    )
+    await hooks.after_stream_end("openai", "openai")
+
+    session_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_after_stream_end_flushes_unfinished_stream_reasoning():
+    mock_kv_repo = AsyncMock()
+    hooks = ProtocolConversionHooks(kv_repo=mock_kv_repo)
+
+    await hooks.after_stream_chunk_conversion(
+        _reasoning_chunk("chat-2", "partial"), "openai", "anthropic"
+    )
+    mock_kv_repo.set_many.assert_not_called()
+
+    await hooks.after_stream_end("openai", "anthropic")
+
+    mock_kv_repo.set_many.assert_awaited_once_with(
+        {"chat_reasoning:chat-2": "partial"},
+        ttl_seconds=TOOL_CALL_EXTRA_CONTENT_TTL,
+    )
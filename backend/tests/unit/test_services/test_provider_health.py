@@ -3,8 +3,10 @@ import pytest
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
 from app.services.provider_health import (
+    CircuitState,
     HealthOutcome,
     ProviderHealthTracker,
+    RedisProviderHealthTracker,
     classify_provider_response,
     provider_health_key,
 )
@@ -274,3 +276,258 @@ def test_response_classification_is_conservative() -> None:
         classify_provider_response(ProviderResponse(status_code=404))
         is HealthOutcome.IGNORED
     )
+
+
+class FakeHealthRedis:
+    """Evaluates the health scripts in Python against a shared server clock."""
+
+    def __init__(self) -> None:
+        self.now_ms = 0
+        self.hashes: dict[str, dict[int, list[int]]] = {}
+        self.calls: list[tuple[str, list[str]]] = []
+        self.error: Exception | None = None
+
+    def register_script(self, source):
+        kind = "record" if "HINCRBY" in source else "read"
+
+        async def run(keys, args):
+            self.calls.append((kind, keys))
+            if self.error is not None:
+                raise self.error
+            bucket_ms, window_buckets = int(args[0]), int(args[1])
+            bucket = self.now_ms // bucket_ms
+            first = bucket - window_buckets + 1
+
+            def sums(key):
+                buckets = self.hashes.get(key, {})
+                live = [v for b, v in buckets.items() if b >= first]
+                return [sum(v[0] for v in live), sum(v[1] for v in live)]
+
+            if kind == "record":
+                counters = self.hashes.setdefault(keys[0], {}).setdefault(bucket, [0, 0])
+                counters[0] += 1
+                counters[1] += int(args[2])
+                return sums(keys[0])
+            return [value for key in keys for value in sums(key)]
+
+        return run
+
+
+def make_redis_tracker(client, clock, **kwargs) -> RedisProviderHealthTracker:
+    return RedisProviderHealthTracker(
+        client_factory=lambda: client,
+        window_seconds=600,
+        min_samples=2,
+        failure_rate_threshold=0.5,
+        clock=clock,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_shares_window_across_workers() -> None:
+    client = FakeHealthRedis()
+    clock = MutableClock()
+    worker_a = make_redis_tracker(client, clock, cache_ttl_ms=250)
+    worker_b = make_redis_tracker(client, clock, cache_ttl_ms=250)
+    candidate = make_candidate(1)
+    key = provider_health_key(candidate)
+
+    assert (await worker_b.get_snapshots([candidate]))[key].sample_count == 0
+
+    await worker_a.record(candidate, HealthOutcome.FAILURE)
+    snapshot = await worker_a.record(candidate, HealthOutcome.FAILURE)
+    assert snapshot.degraded is True
+    assert client.calls[-1] == ("record", ["lgw:health:mapping:1"])
+
+    # worker_b serves its cached read until the cache expires
+    assert (await worker_b.get_snapshots([candidate]))[key].degraded is False
+    clock.now = 0.3
+    snapshot = (await worker_b.get_snapshots([candidate]))[key]
+    assert snapshot.degraded is True
+    assert snapshot.sample_count == 2
+    assert snapshot.failure_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_reads_stale_keys_in_one_call() -> None:
+    client = FakeHealthRedis()
+    clock = MutableClock()
+    tracker = make_redis_tracker(client, clock)
+    first, second = make_candidate(1), make_candidate(2)
+
+    await tracker.record(first, HealthOutcome.SUCCESS)
+    snapshots = await tracker.get_mapping_snapshots([1, 2])
+
+    assert snapshots[1].sample_count == 1
+    assert snapshots[2].sample_count == 0
+    # first was cached by its own record; only second needed Redis
+    assert client.calls[-1] == ("read", ["lgw:health:mapping:2"])
+    await tracker.get_snapshots([first, second])
+    assert len(client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_window_expires_by_bucket() -> None:
+    client = FakeHealthRedis()
+    clock = MutableClock()
+    tracker = make_redis_tracker(client, clock, cache_ttl_ms=0)
+    candidate = make_candidate(1)
+
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+    client.now_ms = 300_000
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+    client.now_ms = 600_000
+    snapshot = (await tracker.get_snapshots([candidate]))[provider_health_key(candidate)]
+
+    assert snapshot.sample_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_fails_open() -> None:
+    client = FakeHealthRedis()
+    client.error = ConnectionError("down")
+    tracker = make_redis_tracker(client, MutableClock())
+    candidate = make_candidate(1)
+
+    assert (await tracker.record(candidate, HealthOutcome.FAILURE)).degraded is False
+    snapshot = (await tracker.get_snapshots([candidate]))[provider_health_key(candidate)]
+    assert snapshot.degraded is False
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures() -> None:
+    clock = MutableClock()
+    tracker = ProviderHealthTracker(
+        min_samples=100, circuit_failure_threshold=3, circuit_open_seconds=30, clock=clock
+    )
+    candidate = make_candidate(1)
+
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+    await tracker.record(candidate, HealthOutcome.SUCCESS)
+    for _ in range(2):
+        await tracker.record(candidate, HealthOutcome.FAILURE)
+    assert tracker.allow_request(candidate) is True
+
+    snapshot = await tracker.record(candidate, HealthOutcome.FAILURE)
+
+    assert snapshot.circuit_state is CircuitState.OPEN
+    assert snapshot.degraded is False
+    assert tracker.allow_request(candidate) is False
+
+
+@pytest.mark.asyncio
+async def test_retry_handler_skips_open_circuit() -> None:
+    tracker = ProviderHealthTracker(circuit_failure_threshold=1)
+    broken, fallback = make_candidate(1), make_candidate(2)
+    await tracker.record(broken, HealthOutcome.FAILURE)
+    handler = RetryHandler(PriorityStrategy(), tracker)
+    called: list[int] = []
+
+    async def forward_fn(candidate):
+        called.append(candidate.provider_mapping_id)
+        return ProviderResponse(status_code=200, body={"ok": True})
+
+    result = await handler.execute_with_retry([broken, fallback], "requested-model", forward_fn)
+
+    assert result.success is True
+    assert called == [2]
+    assert await handler.get_ordered_candidates([broken, fallback], "requested-model") == [
+        fallback
+    ]
+
+
+@pytest.mark.asyncio
+async def test_half_open_circuit_admits_single_probe() -> None:
+    clock = MutableClock()
+    tracker = ProviderHealthTracker(
+        circuit_failure_threshold=1, circuit_open_seconds=30, clock=clock
+    )
+    candidate = make_candidate(1)
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+
+    clock.now = 30
+    # Previewing the order must not consume the probe slot
+    assert tracker.allow_request(candidate, claim_probe=False) is True
+    assert tracker.allow_request(candidate, claim_probe=False) is True
+    assert (await tracker.get_snapshots([candidate]))[
+        provider_health_key(candidate)
+    ].circuit_state is CircuitState.OPEN
+
+    assert tracker.allow_request(candidate) is True
+    assert tracker.allow_request(candidate) is False
+
+    # An ignored outcome (e.g. client cancel) frees the slot for another probe
+    await tracker.record(candidate, HealthOutcome.IGNORED)
+    assert tracker.allow_request(candidate) is True
+
+    # A probe that never reports back stops blocking after the cooldown
+    clock.now = 60
+    assert tracker.allow_request(candidate) is True
+
+
+@pytest.mark.asyncio
+async def test_probe_outcome_closes_or_reopens_circuit() -> None:
+    clock = MutableClock()
+    tracker = ProviderHealthTracker(
+        circuit_failure_threshold=2, circuit_open_seconds=30, clock=clock
+    )
+    candidate = make_candidate(1)
+    for _ in range(2):
+        await tracker.record(candidate, HealthOutcome.FAILURE)
+
+    clock.now = 30
+    assert tracker.allow_request(candidate) is True
+    snapshot = await tracker.record(candidate, HealthOutcome.FAILURE)
+    assert snapshot.circuit_state is CircuitState.OPEN
+    assert tracker.allow_request(candidate) is False
+
+    clock.now = 60
+    assert tracker.allow_request(candidate) is True
+    snapshot = await tracker.record(candidate, HealthOutcome.SUCCESS)
+    assert snapshot.circuit_state is CircuitState.CLOSED
+    assert tracker.allow_request(candidate) is True
+    # A closed circuit starts counting consecutive failures from zero again
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+    assert tracker.allow_request(candidate) is True
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_circuit_survives_store_outage() -> None:
+    client = FakeHealthRedis()
+    client.error = ConnectionError("down")
+    tracker = make_redis_tracker(client, MutableClock(), circuit_failure_threshold=2)
+    candidate = make_candidate(1)
+
+    for _ in range(2):
+        await tracker.record(candidate, HealthOutcome.FAILURE)
+
+    snapshot = (await tracker.get_snapshots([candidate]))[provider_health_key(candidate)]
+    assert snapshot.circuit_state is CircuitState.OPEN
+    assert tracker.allow_request(candidate) is False
+
+
+@pytest.mark.asyncio
+async def test_redis_tracker_keeps_failure_streak_past_cache_cleanup() -> None:
+    client = FakeHealthRedis()
+    clock = MutableClock()
+    tracker = make_redis_tracker(
+        client, clock, cache_ttl_ms=250, circuit_failure_threshold=5
+    )
+    candidate = make_candidate(1)
+
+    # Slow timeouts: failures far apart, each routed after a snapshot read
+    for index in range(5):
+        clock.now = index * 25
+        await tracker.get_snapshots([candidate])
+        await tracker.record(candidate, HealthOutcome.FAILURE)
+
+    assert tracker.allow_request(candidate) is False
+
+    # A streak with no failure for a whole window is forgotten
+    clock.now = 1000
+    await tracker.record(candidate, HealthOutcome.SUCCESS)
+    await tracker.record(candidate, HealthOutcome.FAILURE)
+    clock.now = 1700
+    await tracker.get_snapshots([candidate])
+    assert provider_health_key(candidate) not in tracker._circuits
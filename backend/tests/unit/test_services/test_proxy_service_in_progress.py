@@ -1,15 +1,18 @@
 """Failure-path coverage for initial request logs."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.common.errors import ServiceError
+from app.common.errors import NotFoundError, ServiceError
 from app.common.time import utc_now
+from app.domain.log import RequestLogCreate, RequestLogQuery
 from app.domain.model import ModelMapping
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
 from app.services.active_requests import active_requests
+from app.services.log_service import LogService
 from app.services.proxy_service import ProxyService
 
 
@@ -130,3 +133,136 @@ async def test_all_provider_failures_still_complete_initial_log():
     assert log_data.response_status == 503
     assert log_data.error_info == "upstream unavailable"
     assert await active_requests.is_active(43) is False
+
+
+def _single_write_service() -> ProxyService:
+    service = ProxyService(
+        model_repo=AsyncMock(),
+        provider_repo=AsyncMock(),
+        log_repo=AsyncMock(),
+        log_write_mode="single_write",
+    )
+    service._resolve_candidates = AsyncMock(  # type: ignore[method-assign]
+        side_effect=ServiceError("No providers", code="no_available_provider")
+    )
+    return service
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_single_write_mode_inserts_log_once(stream):
+    service = _single_write_service()
+    method = (
+        service.process_request_stream if stream else service.process_request
+    )
+
+    with pytest.raises(ServiceError):
+        await method(
+            api_key_id=1,
+            api_key_name="key",
+            request_protocol="openai",
+            path="/v1/chat/completions",
+            request_url="/v1/chat/completions",
+            method="POST",
+            headers={},
+            body={"model": "test-model", "messages": []},
+        )
+
+    service.log_repo.create_initial.assert_not_awaited()
+    service.log_repo.update.assert_not_awaited()
+    service.log_repo.create.assert_awaited_once()
+    (log_data,) = service.log_repo.create.await_args.args
+    assert log_data.is_completed is True
+    assert log_data.response_status == 503
+    assert await active_requests.pending_logs() == []
+
+
+@pytest.mark.asyncio
+async def test_single_write_mode_writes_abandoned_request_on_task_exit():
+    service = _single_write_service()
+    started = asyncio.Event()
+
+    async def hang(**_kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    service._resolve_candidates = hang  # type: ignore[method-assign]
+    task = asyncio.create_task(
+        service.process_request(
+            api_key_id=1,
+            api_key_name="key",
+            request_protocol="openai",
+            path="/v1/chat/completions",
+            request_url="/v1/chat/completions",
+            method="POST",
+            headers={},
+            body={"model": "test-model", "messages": []},
+        )
+    )
+    await started.wait()
+    [(log_id, _)] = await active_requests.pending_logs()
+    assert log_id < 0
+    assert await active_requests.is_active(log_id) is True
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    service.log_repo.create.assert_awaited_once()
+    (log_data,) = service.log_repo.create.await_args.args
+    assert log_data.response_status == 499
+    assert await active_requests.pending_logs() == []
+    assert await active_requests.is_active(log_id) is False
+
+
+@pytest.mark.asyncio
+async def test_persisting_pending_log_switches_to_update():
+    service = _single_write_service()
+    service.log_repo.create_initial.return_value = 77
+    log_data = RequestLogCreate(
+        request_time=utc_now(), requested_model="test-model", is_completed=False
+    )
+    pending_id = await active_requests.add_pending(log_data)
+    await active_requests.register(pending_id, asyncio.current_task())
+
+    log_id = await service._persist_pending_log(pending_id)
+
+    assert log_id == 77
+    assert await active_requests.is_active(77) is True
+    assert await active_requests.is_active(pending_id) is False
+    await service._update_log(log_id, log_data)
+    service.log_repo.update.assert_awaited_once()
+    service.log_repo.create.assert_not_awaited()
+    await active_requests.deregister(77)
+
+
+@pytest.mark.asyncio
+async def test_log_service_lists_and_cancels_pending_requests():
+    repo = AsyncMock()
+    repo.query.return_value = ([], 0)
+    log_service = LogService(repo)
+    pending_id = await active_requests.add_pending(
+        RequestLogCreate(
+            request_time=utc_now(),
+            api_key_id=5,
+            requested_model="test-model",
+            is_completed=False,
+        )
+    )
+
+    items, total = await log_service.query(RequestLogQuery())
+    assert total == 1
+    assert items[0].id == pending_id
+    assert items[0].is_completed is False
+    assert await log_service.query(RequestLogQuery(api_key_id=6)) == ([], 0)
+    assert await log_service.query(RequestLogQuery(is_completed=True)) == ([], 0)
+
+    await log_service.cancel(pending_id)
+
+    (log_data,) = repo.create.await_args.args
+    assert log_data.response_status == 499
+    assert log_data.is_completed is True
+    with pytest.raises(NotFoundError):
+        await log_service.cancel(pending_id)
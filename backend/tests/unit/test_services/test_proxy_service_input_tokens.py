@@ -0,0 +1,185 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.common.rate_limiter import InMemoryRateLimiter
+from app.common.time import utc_now
+from app.domain.model import ModelMapping, ModelMappingProviderResponse
+from app.domain.provider import Provider
+from app.providers.base import ProviderResponse
+from app.rules.models import CandidateProvider
+from app.services.proxy_service import ProxyService
+from app.services.token_rate_limit import TokenRateLimiter
+
+
+class FakeCounter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count_request(self, body, model):
+        self.calls += 1
+        return 7
+
+    def count_output_body(self, body, model):
+        return 3
+
+
+def make_service(strategy: str = "round_robin", provider_rules=None) -> ProxyService:
+    now = utc_now()
+    mapping = ModelMapping(
+        requested_model="test-model",
+        strategy=strategy,
+        matching_rules=None,
+        capabilities=None,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    provider_mapping = ModelMappingProviderResponse(
+        id=1,
+        requested_model="test-model",
+        provider_id=1,
+        provider_name="p1",
+        target_model_name="gpt-4o-mini",
+        provider_rules=provider_rules,
+        priority=0,
+        weight=1,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    provider = Provider(
+        id=1,
+        name="p1",
+        base_url="https://example.com",
+        protocol="openai",
+        api_type="chat",
+        api_key="sk-test",
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    model_repo = AsyncMock()
+    model_repo.get_mapping.return_value = mapping
+    model_repo.get_provider_mappings.return_value = [provider_mapping]
+    provider_repo = AsyncMock()
+    provider_repo.get_by_ids.return_value = {1: provider}
+    return ProxyService(
+        model_repo=model_repo, provider_repo=provider_repo, log_repo=AsyncMock()
+    )
+
+
+@pytest.fixture
+def counter(monkeypatch) -> FakeCounter:
+    counter = FakeCounter()
+    monkeypatch.setattr(
+        "app.services.proxy_service.get_token_counter", lambda protocol: counter
+    )
+    return counter
+
+
+async def resolve(service: ProxyService):
+    return await service._resolve_candidates(
+        requested_model="test-model",
+        request_protocol="openai",
+        headers={},
+        body={"model": "test-model", "messages": [{"role": "user", "content": "hi"}]},
+    )
+
+
+@pytest.mark.asyncio
+async def test_input_tokens_are_not_counted_when_nothing_reads_them(counter):
+    _, candidates, input_tokens, _, _ = await resolve(make_service())
+
+    assert [c.provider_id for c in candidates] == [1]
+    assert input_tokens is None
+    assert counter.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_token_usage_rules_count_input_tokens_before_matching(counter):
+    service = make_service(
+        provider_rules={
+            "rules": [
+                {"field": "token_usage.input_tokens", "operator": "lt", "value": 10}
+            ]
+        }
+    )
+
+    _, candidates, input_tokens, _, _ = await resolve(service)
+
+    assert [c.provider_id for c in candidates] == [1]
+    assert input_tokens == 7
+    assert counter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cost_first_strategy_counts_input_tokens_before_selection(counter):
+    _, _, input_tokens, _, _ = await resolve(make_service(strategy="cost_first"))
+
+    assert input_tokens == 7
+    assert counter.calls == 1
+
+
+@pytest.mark.parametrize(
+    ("upstream_body", "expected_input_tokens", "expected_calls"),
+    [
+        (b'{"id":"r","usage":{"prompt_tokens":11,"completion_tokens":2}}', 11, 0),
+        (b'{"id":"r","choices":[]}', 7, 1),
+    ],
+)
+@pytest.mark.asyncio
+async def test_deferred_input_tokens_are_estimated_only_without_upstream_usage(
+    counter, upstream_body, expected_input_tokens, expected_calls
+):
+    service = make_service()
+    candidate = CandidateProvider(
+        provider_id=1,
+        provider_name="p1",
+        base_url="https://example.com",
+        protocol="openai",
+        api_key="sk-test",
+        target_model="gpt-4o-mini",
+    )
+    mapping = service.model_repo.get_mapping.return_value
+    service._resolve_candidates = AsyncMock(  # type: ignore[method-assign]
+        return_value=(mapping, [candidate], None, "openai", {})
+    )
+    fake_client = AsyncMock()
+    fake_client.forward = AsyncMock(
+        return_value=ProviderResponse(
+            status_code=200,
+            headers={"content-type": "application/json"},
+            body=upstream_body,
+        )
+    )
+
+    with patch("app.services.proxy_service.get_provider_client", return_value=fake_client):
+        response, _ = await service.process_request(
+            api_key_id=1,
+            api_key_name="k",
+            request_protocol="openai",
+            path="/v1/chat/completions",
+            request_url="/v1/chat/completions",
+            method="POST",
+            headers={},
+            body={"model": "test-model", "messages": []},
+        )
+
+    assert response.status_code == 200
+    log_data = service.log_repo.update.await_args.args[1]
+    assert log_data.input_tokens == expected_input_tokens
+    assert counter.calls == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_token_rate_limit_counts_input_tokens_before_selection(counter):
+    service = make_service()
+    service._token_rate_limiter = TokenRateLimiter(
+        InMemoryRateLimiter(), per_key_tpm=1000
+    )
+
+    _, _, input_tokens, _, _ = await resolve(service)
+
+    assert input_tokens == 7
+    assert counter.calls == 1
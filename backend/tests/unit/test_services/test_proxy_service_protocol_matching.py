@@ -30,6 +30,9 @@ class FakeProviderRepo:
     async def get_by_id(self, provider_id: int):
         return self._providers.get(provider_id)
 
+    async def get_by_ids(self, provider_ids):
+        return {pid: self._providers[pid] for pid in provider_ids if pid in self._providers}
+
 
 @pytest.mark.asyncio
 async def test_resolve_candidates_does_not_filter_by_request_protocol_anymore():
@@ -4,11 +4,8 @@ import pytest
 
 from app.common.time import utc_now
 from app.domain.log import RequestLogCreate
-from app.services.proxy_service import (
-    _DETAIL_PAYLOAD_FIELDS,
-    ProxyService,
-    _strip_detail_payload,
-)
+from app.services.log_writer import DETAIL_PAYLOAD_FIELDS, strip_detail_payload
+from app.services.proxy_service import ProxyService
 
 
 def _make_log_data() -> RequestLogCreate:
@@ -80,16 +77,16 @@ async def test_write_log_strips_payload_when_disabled():
 def test_strip_detail_payload_nulls_only_payload_fields():
     log_data = _make_log_data()
 
-    _strip_detail_payload(log_data)
+    strip_detail_payload(log_data)
 
     # Exactly the documented payload fields are dropped.
-    for field in _DETAIL_PAYLOAD_FIELDS:
+    for field in DETAIL_PAYLOAD_FIELDS:
         assert getattr(log_data, field) is None, field
 
     # usage_details and error_info are never part of the stripped set, so the
     # debug-log and DB paths keep them even when detail logging is disabled.
-    assert "usage_details" not in _DETAIL_PAYLOAD_FIELDS
-    assert "error_info" not in _DETAIL_PAYLOAD_FIELDS
+    assert "usage_details" not in DETAIL_PAYLOAD_FIELDS
+    assert "error_info" not in DETAIL_PAYLOAD_FIELDS
     assert log_data.usage_details == {"input_tokens": 10, "output_tokens": 5}
     assert log_data.error_info == "boom"
 
@@ -77,6 +77,80 @@ async def test_process_request_same_protocol_response_body_passthrough_bytes():
 
     log_data = service.log_repo.update.await_args.args[1]
     assert log_data.output_tokens == 12
+    assert log_data.response_body == '{"id": "raw", "usage": {"completion_tokens": 12}}'
+    assert log_data.upstream_response_body == log_data.response_body
+
+
+@pytest.mark.asyncio
+async def test_raw_response_log_bodies_are_serialized_by_log_writer():
+    now = utc_now()
+    model_mapping = ModelMapping(
+        requested_model="test-model",
+        strategy="round_robin",
+        matching_rules=None,
+        capabilities=None,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    candidate = CandidateProvider(
+        provider_id=1,
+        provider_name="p-openai",
+        base_url="https://example.com",
+        protocol="openai",
+        api_key="sk-test",
+        target_model="text-embedding-3-small",
+        priority=0,
+        weight=1,
+    )
+    writer = AsyncMock()
+    writer.running = True
+    service = ProxyService(
+        model_repo=AsyncMock(),
+        provider_repo=AsyncMock(),
+        log_repo=AsyncMock(),
+        log_writer=writer,
+    )
+    service._resolve_candidates = AsyncMock(return_value=(model_mapping, [candidate], 0, "openai", {}))  # type: ignore[method-assign]
+    raw = b'{"data":[{"embedding":[0.5]}],"usage":{"prompt_tokens":4,"total_tokens":4}}'
+
+    fake_client = AsyncMock()
+    fake_client.forward = AsyncMock(
+        return_value=ProviderResponse(status_code=200, headers={}, body=raw)
+    )
+
+    with patch("app.services.proxy_service.get_provider_client", return_value=fake_client):
+        with patch(
+            "app.services.proxy_service.convert_request_for_supplier",
+            return_value=("/v1/embeddings", {"model": "text-embedding-3-small"}),
+        ):
+            with patch.object(
+                ProxyService,
+                "_serialize_response_body",
+                wraps=ProxyService._serialize_response_body,
+            ) as serialize:
+                response, _ = await service.process_request(
+                    api_key_id=1,
+                    api_key_name="k",
+                    request_protocol="openai",
+                    path="/v1/embeddings",
+                    request_url="/v1/embeddings",
+                    method="POST",
+                    headers={},
+                    body={"model": "test-model", "input": "hi"},
+                )
+                assert response.body is raw
+                log_id, log_data = writer.update.await_args.args
+                prepare = writer.update.await_args.kwargs["prepare"]
+                assert log_data.input_tokens == 4
+                assert log_data.response_body is None
+                assert serialize.call_count == 0
+
+                prepare()
+
+    assert serialize.call_count == 1
+    assert log_data.response_body == log_data.upstream_response_body
+    assert '"prompt_tokens": 4' in log_data.response_body
 
 
 @pytest.mark.asyncio
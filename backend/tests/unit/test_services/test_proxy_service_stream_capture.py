@@ -0,0 +1,152 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import anyio
+import pytest
+
+from app.common.time import utc_now
+from app.domain.model import ModelMapping
+from app.providers.base import ProviderResponse
+from app.rules.models import CandidateProvider
+from app.services.active_requests import active_requests
+from app.services.protocol_hooks import ProtocolConversionHooks
+from app.services.proxy_service import ProxyService
+
+
+def _service(**kwargs) -> ProxyService:
+    now = utc_now()
+    model_mapping = ModelMapping(
+        requested_model="test-model",
+        strategy="round_robin",
+        matching_rules=None,
+        capabilities=None,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    candidate = CandidateProvider(
+        provider_id=1,
+        provider_name="p-openai",
+        base_url="https://example.com",
+        protocol="openai",
+        api_key="sk-test",
+        target_model="gpt-4o",
+        priority=0,
+        weight=1,
+    )
+    service = ProxyService(
+        model_repo=AsyncMock(),
+        provider_repo=AsyncMock(),
+        log_repo=AsyncMock(),
+        protocol_hooks=ProtocolConversionHooks(),
+        **kwargs,
+    )
+    service._resolve_candidates = AsyncMock(
+        return_value=(model_mapping, [candidate], 0, "openai", {})
+    )  # type: ignore[method-assign]
+    return service
+
+
+async def _run_stream(
+    service: ProxyService,
+    *,
+    record_details: bool = True,
+    chunk_interval: float = 0,
+    disconnect_after: float | None = None,
+) -> list[bytes]:
+    def forward_stream(**kwargs):
+        async def gen():
+            for index in range(50):
+                if chunk_interval:
+                    await asyncio.sleep(chunk_interval)
+                yield (
+                    f'data: {{"choices":[{{"delta":{{"content":"c{index:02d}"}}}}]}}\n\n'.encode(),
+                    ProviderResponse(status_code=200, headers={}),
+                )
+
+        return gen()
+
+    fake_client = AsyncMock()
+    fake_client.forward_stream = forward_stream
+
+    with patch(
+        "app.services.proxy_service.convert_request_for_supplier",
+        return_value=("/v1/chat/completions", {"converted": True}),
+    ):
+        with patch(
+            "app.services.proxy_service.get_provider_client",
+            return_value=fake_client,
+        ):
+            _, stream_gen, _ = await service.process_request_stream(
+                api_key_id=1,
+                api_key_name="k",
+                request_protocol="openai",
+                path="/v1/chat/completions",
+                request_url="/v1/chat/completions",
+                method="POST",
+                headers={},
+                body={"model": "test-model", "stream": True, "messages": []},
+                record_details=record_details,
+            )
+            chunks: list[bytes] = []
+
+            async def consume() -> None:
+                async for chunk in stream_gen:
+                    chunks.append(chunk)
+
+            # Starlette cancels the response task group on client disconnect
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(consume)
+                if disconnect_after is not None:
+                    await asyncio.sleep(disconnect_after)
+                    tg.cancel_scope.cancel()
+            return chunks
+
+
+@pytest.mark.asyncio
+async def test_stream_log_bodies_are_bounded_by_capture_budget():
+    service = _service(stream_capture_max_bytes=200)
+
+    chunks = await _run_stream(service)
+
+    assert len(chunks) == 50
+    log_data = service.log_repo.update.await_args.args[1]
+    for body in (log_data.response_body, log_data.upstream_response_body):
+        assert body.startswith('data: {"choices":[{"delta":{"content":"c00"}}]}')
+        assert body.endswith('data: {"choices":[{"delta":{"content":"c49"}}]}\n\n')
+        assert "...[truncated " in body
+        assert '"c25"' not in body
+    # Usage is still computed from the whole stream
+    assert log_data.output_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_capture_is_skipped_without_record_details():
+    service = _service(stream_capture_max_bytes=0)
+
+    with patch("app.services.proxy_service.StreamCapture") as capture_cls:
+        capture_cls.return_value.atext = AsyncMock(return_value="")
+        await _run_stream(service, record_details=False)
+
+    assert all(
+        call.kwargs["enabled"] is False for call in capture_cls.call_args_list
+    )
+    log_data = service.log_repo.update.await_args.args[1]
+    assert log_data.response_body is None
+    assert log_data.upstream_response_body is None
+
+
+@pytest.mark.asyncio
+async def test_spilled_stream_is_logged_when_the_client_disconnects():
+    service = _service(stream_capture_max_bytes=200, stream_capture_spill_to_disk=True)
+
+    with patch.object(
+        active_requests, "deregister", wraps=active_requests.deregister
+    ) as deregister:
+        chunks = await _run_stream(service, chunk_interval=0.01, disconnect_after=0.1)
+
+    assert 0 < len(chunks) < 50
+    log_data = service.log_repo.update.await_args.args[1]
+    assert log_data.error_info == "client_disconnected"
+    assert log_data.response_body.startswith('data: {"choices":[{"delta":{"content":"c00"}}]}')
+    deregister.assert_awaited_once()
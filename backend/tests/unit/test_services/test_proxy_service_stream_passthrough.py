@@ -0,0 +1,158 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.common.time import utc_now
+from app.domain.model import ModelMapping
+from app.providers.base import ProviderResponse
+from app.rules.models import CandidateProvider
+from app.services.protocol_hooks import ProtocolConversionHooks
+from app.services.proxy_service import ProxyService
+
+# Event boundaries deliberately fall inside chunks
+UPSTREAM_CHUNKS = [
+    b'data: {"choices":[{"delta":{"content":"Hel',
+    b'lo"}}]}\n\ndata: {"choices":[{"delta":{"content":" world"}}]}\n',
+    b'\ndata: {"choices":[],"usage":{"prompt_tokens":3,"completion_tokens":7}}\n\n',
+    b"data: [DONE]\n\n",
+]
+
+
+def _service(hooks: ProtocolConversionHooks, **kwargs) -> ProxyService:
+    now = utc_now()
+    model_mapping = ModelMapping(
+        requested_model="test-model",
+        strategy="round_robin",
+        matching_rules=None,
+        capabilities=None,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    candidate = CandidateProvider(
+        provider_id=1,
+        provider_name="p-openai",
+        base_url="https://example.com",
+        protocol="openai",
+        api_key="sk-test",
+        target_model="gpt-4o",
+        priority=0,
+        weight=1,
+    )
+    service = ProxyService(
+        model_repo=AsyncMock(),
+        provider_repo=AsyncMock(),
+        log_repo=AsyncMock(),
+        protocol_hooks=hooks,
+        **kwargs,
+    )
+    service._resolve_candidates = AsyncMock(
+        return_value=(model_mapping, [candidate], 0, "openai", {})
+    )  # type: ignore[method-assign]
+    return service
+
+
+async def _run_stream(service: ProxyService, **body) -> list[bytes]:
+    def forward_stream(**kwargs):
+        async def gen():
+            for chunk in UPSTREAM_CHUNKS:
+                yield chunk, ProviderResponse(status_code=200, headers={})
+
+        return gen()
+
+    fake_client = AsyncMock()
+    fake_client.forward_stream = forward_stream
+
+    with patch(
+        "app.services.proxy_service.convert_request_for_supplier",
+        return_value=("/v1/chat/completions", {"converted": True}),
+    ):
+        with patch(
+            "app.services.proxy_service.get_provider_client",
+            return_value=fake_client,
+        ):
+            _, stream_gen, _ = await service.process_request_stream(
+                api_key_id=1,
+                api_key_name="k",
+                request_protocol="openai",
+                path="/v1/chat/completions",
+                request_url="/v1/chat/completions",
+                method="POST",
+                headers={},
+                body={"model": "test-model", "stream": True, "messages": [], **body},
+            )
+            return [chunk async for chunk in stream_gen]
+
+
+@pytest.mark.asyncio
+async def test_same_protocol_stream_passes_upstream_chunks_through():
+    service = _service(ProtocolConversionHooks())
+
+    chunks = await _run_stream(service)
+
+    assert chunks == UPSTREAM_CHUNKS
+    log_data = service.log_repo.update.await_args.args[1]
+    assert log_data.input_tokens == 3
+    assert log_data.output_tokens == 7
+    assert log_data.upstream_response_body == log_data.response_body
+    assert log_data.response_body == b"".join(UPSTREAM_CHUNKS).decode()
+
+
+@pytest.mark.asyncio
+async def test_passthrough_disabled_reframes_events():
+    service = _service(ProtocolConversionHooks(), stream_passthrough=False)
+
+    chunks = await _run_stream(service)
+
+    assert b"".join(chunks) == b"".join(UPSTREAM_CHUNKS)
+    assert all(chunk.endswith(b"\n\n") for chunk in chunks)
+    assert len(chunks) == 4
+
+
+@pytest.mark.asyncio
+async def test_overridden_chunk_hook_disables_passthrough():
+    class UpperHooks(ProtocolConversionHooks):
+        async def after_stream_chunk_conversion(
+            self, chunk, request_protocol, supplier_protocol
+        ):
+            return chunk.replace(b"world", b"WORLD")
+
+    hooks = UpperHooks()
+    assert hooks.allows_stream_passthrough() is False
+    service = _service(hooks)
+
+    chunks = await _run_stream(service)
+
+    assert b'" WORLD"' in b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_passthrough_feeds_complete_events_to_kv_observer():
+    hooks = ProtocolConversionHooks(kv_repo=AsyncMock())
+    assert hooks.allows_stream_passthrough() is True
+    assert hooks.observes_stream_events("openai", "openai") is True
+    service = _service(hooks)
+
+    with patch.object(
+        hooks, "observe_stream_event", new=AsyncMock()
+    ) as observe:
+        chunks = await _run_stream(service, tools=[{"type": "function"}])
+
+    assert chunks == UPSTREAM_CHUNKS
+    events = [call.args[0] for call in observe.await_args_list]
+    assert b"".join(events) == b"".join(UPSTREAM_CHUNKS)
+    assert all(event.endswith(b"\n\n") for event in events)
+
+
+@pytest.mark.asyncio
+async def test_passthrough_without_tools_skips_kv_observer():
+    hooks = ProtocolConversionHooks(kv_repo=AsyncMock())
+    service = _service(hooks)
+
+    with patch.object(
+        hooks, "observe_stream_event", new=AsyncMock()
+    ) as observe:
+        chunks = await _run_stream(service)
+
+    assert chunks == UPSTREAM_CHUNKS
+    observe.assert_not_awaited()
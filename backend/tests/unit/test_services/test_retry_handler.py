@@ -2,10 +2,13 @@
 Retry Handler Unit Tests
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock
+from app.services.inflight import InFlightTracker
 from app.services.retry_handler import RetryHandler
-from app.services.strategy import PriorityStrategy, RoundRobinStrategy
+from app.services.strategy import LowestLatencyStrategy, PriorityStrategy, RoundRobinStrategy
 from app.providers.base import ProviderResponse
 from app.rules.models import CandidateProvider
 
@@ -307,6 +310,82 @@ async def test_unattempted_stream_fallback_does_not_advance_weight_counter():
     assert fallback_provider_ids == [2, 3]
 
 
+@pytest.mark.asyncio
+async def test_strategy_observes_upstream_responses():
+    strategy = LowestLatencyStrategy(exploration_rate=0.0)
+    handler = RetryHandler(strategy)
+    handler.retry_delay_ms = 1
+    candidates = _priority_fallback_candidates()
+
+    async def forward_fn(candidate):
+        if candidate.provider_id == 1:
+            return ProviderResponse(status_code=503, first_byte_delay_ms=5)
+        return ProviderResponse(status_code=200, first_byte_delay_ms=40)
+
+    result = await handler.execute_with_retry(candidates, "test-model", forward_fn)
+
+    assert result.success is True
+    assert strategy.snapshot(candidates[0]).samples == 0
+    assert strategy.snapshot(result.final_provider).first_byte_ms == 40
+
+
+@pytest.mark.asyncio
+async def test_inflight_counts_non_stream_attempts():
+    tracker = InFlightTracker()
+    handler = RetryHandler(PriorityStrategy(), inflight_tracker=tracker)
+    handler.retry_delay_ms = 1
+    candidates = _priority_fallback_candidates()
+    seen: list[int] = []
+
+    async def forward_fn(candidate):
+        seen.append(tracker.count(candidate))
+        if candidate.provider_id == 1:
+            return ProviderResponse(status_code=400)
+        return ProviderResponse(status_code=200)
+
+    result = await handler.execute_with_retry(candidates, "test-model", forward_fn)
+
+    assert result.success is True
+    assert seen == [1, 1]
+    assert tracker.get_mapping_counts([]) == {}
+    assert all(tracker.count(c) == 0 for c in candidates)
+
+
+@pytest.mark.asyncio
+async def test_inflight_counts_stream_until_closed():
+    tracker = InFlightTracker()
+    handler = RetryHandler(PriorityStrategy(), inflight_tracker=tracker)
+    handler.retry_delay_ms = 1
+    candidates = _priority_fallback_candidates()
+    closed: list[int] = []
+
+    def forward_stream_fn(candidate):
+        async def gen():
+            try:
+                if candidate.provider_id == 1:
+                    yield b"", ProviderResponse(status_code=400, error="bad")
+                    return
+                for part in (b"a", b"b", b"c"):
+                    yield part, ProviderResponse(status_code=200)
+            finally:
+                closed.append(candidate.provider_id)
+
+        return gen()
+
+    stream = handler.execute_with_retry_stream(candidates, "test-model", forward_stream_fn)
+    chunk, _, provider, _ = await anext(stream)
+
+    assert chunk == b"a"
+    # The failed primary was closed and released; the winner is still open
+    assert closed == [1]
+    assert tracker.count(candidates[0]) == 0
+    assert tracker.count(provider) == 1
+
+    await stream.aclose()
+    assert tracker.count(provider) == 0
+    assert closed == [1, provider.provider_id]
+
+
 def _paused_candidates(paused_until):
     """Three candidates A, C active and B paused (paused_until)."""
     return [
@@ -0,0 +1,210 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.common.time import utc_now
+from app.domain.model import ModelMapping, ModelMappingProviderResponse
+from app.domain.provider import Provider
+from app.services.proxy_service import ProxyService
+from app.services.routing_cache import RoutingCache
+
+
+class MutableClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_route(requested_model: str = "test-model"):
+    now = utc_now()
+    mapping = ModelMapping(
+        requested_model=requested_model,
+        strategy="round_robin",
+        matching_rules=None,
+        capabilities=None,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    provider_mapping = ModelMappingProviderResponse(
+        id=1,
+        requested_model=requested_model,
+        provider_id=1,
+        provider_name="p1",
+        target_model_name="gpt-4o-mini",
+        provider_rules=None,
+        priority=0,
+        weight=1,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    provider = Provider(
+        id=1,
+        name="p1",
+        base_url="https://example.com",
+        protocol="openai",
+        api_type="chat",
+        api_key="sk-test",
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    return mapping, [provider_mapping], {1: provider}
+
+
+class CountingLoader:
+    def __init__(self, route=None) -> None:
+        self.route = route if route is not None else make_route()
+        self.calls = 0
+
+    async def __call__(self, requested_model: str):
+        self.calls += 1
+        if requested_model != self.route[0].requested_model:
+            return None
+        return self.route
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_reused_until_ttl_expires() -> None:
+    clock = MutableClock()
+    cache = RoutingCache(ttl_seconds=30, clock=clock)
+    loader = CountingLoader()
+
+    first = await cache.get("test-model", loader)
+    second = await cache.get("test-model", loader)
+    assert first is second
+    assert loader.calls == 1
+
+    clock.now = 30
+    third = await cache.get("test-model", loader)
+    assert third is not first
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version_and_drops_snapshots() -> None:
+    cache = RoutingCache()
+    loader = CountingLoader()
+
+    first = await cache.get("test-model", loader)
+    version = cache.invalidate()
+    second = await cache.get("test-model", loader)
+
+    assert version == first.version + 1
+    assert second.version == version
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_models_are_not_cached() -> None:
+    cache = RoutingCache()
+    loader = CountingLoader()
+
+    assert await cache.get("missing", loader) is None
+    assert await cache.get("missing", loader) is None
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_stored() -> None:
+    cache = RoutingCache()
+    release = asyncio.Event()
+    route = make_route()
+    calls = 0
+
+    async def slow_loader(requested_model: str):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return route
+
+    task = asyncio.create_task(cache.get("test-model", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate()
+    release.set()
+    stale = await task
+
+    assert stale is not None
+    fresh = await cache.get("test-model", slow_loader)
+    assert fresh.version == cache.version
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load() -> None:
+    cache = RoutingCache()
+    release = asyncio.Event()
+    calls = 0
+
+    async def slow_loader(requested_model: str):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return make_route()
+
+    tasks = [
+        asyncio.create_task(cache.get("test-model", slow_loader)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_loads() -> None:
+    cache = RoutingCache(enabled=False)
+    loader = CountingLoader()
+
+    await cache.get("test-model", loader)
+    await cache.get("test-model", loader)
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_candidates_hits_repositories_once_with_cache(monkeypatch) -> None:
+    mapping, provider_mappings, providers = make_route()
+    model_repo = AsyncMock()
+    model_repo.get_mapping.return_value = mapping
+    model_repo.get_provider_mappings.return_value = provider_mappings
+    provider_repo = AsyncMock()
+    provider_repo.get_by_ids.side_effect = lambda pids: {
+        pid: providers[pid] for pid in pids if pid in providers
+    }
+
+    class FakeCounter:
+        def count_request(self, body, model):
+            return 7
+
+    monkeypatch.setattr(
+        "app.services.proxy_service.get_token_counter", lambda protocol: FakeCounter()
+    )
+
+    service = ProxyService(
+        model_repo=model_repo,
+        provider_repo=provider_repo,
+        log_repo=AsyncMock(),
+        routing_cache=RoutingCache(),
+    )
+    body = {"model": "test-model", "messages": [{"role": "user", "content": "hi"}]}
+
+    for _ in range(3):
+        _, candidates, input_tokens, _, _ = await service._resolve_candidates(
+            requested_model="test-model",
+            request_protocol="openai",
+            headers={},
+            body=body,
+        )
+        assert [c.provider_id for c in candidates] == [1]
+        # Neither rules nor round_robin read input tokens
+        assert input_tokens is None
+
+    assert model_repo.get_mapping.await_count == 1
+    assert model_repo.get_provider_mappings.await_count == 1
+    assert provider_repo.get_by_ids.await_count == 1
@@ -4,7 +4,16 @@ Round Robin Strategy Unit Tests
 
 import pytest
 import asyncio
-from app.services.strategy import RoundRobinStrategy, CostFirstStrategy, PriorityStrategy
+import random
+from app.providers.base import ProviderResponse
+from app.services.strategy import (
+    RoundRobinStrategy,
+    CostFirstStrategy,
+    PriorityStrategy,
+    LowestLatencyStrategy,
+    LeastOutstandingStrategy,
+)
+from app.services.inflight import InFlightTracker
 from app.rules.models import CandidateProvider
 
 
@@ -795,3 +804,177 @@ class TestCostFirstModelBillingFallback:
         # image_count=10: Cheap = $0.01*10 = $0.10, Expensive = $0.05*10 = $0.50
         selected = await self.strategy.select(candidates, "dall-e-3", input_tokens=1, image_count=10)
         assert selected.provider_id == 1
+
+
+class TestLowestLatencyStrategy:
+    """Lowest Latency Strategy Tests"""
+
+    def setup_method(self):
+        """Setup before test"""
+        self.strategy = LowestLatencyStrategy(exploration_rate=0.0, rng=random.Random(7))
+        self.candidates = [
+            CandidateProvider(
+                provider_id=i,
+                provider_name=f"Provider{i}",
+                base_url=f"https://api{i}.com",
+                protocol="openai",
+                api_key=f"key{i}",
+                target_model=f"model{i}",
+                priority=1,
+                provider_mapping_id=i,
+            )
+            for i in (1, 2, 3)
+        ]
+
+    def _observe(self, candidate, first_byte_ms, total_ms=None, output_tokens=None):
+        body = None
+        if output_tokens is not None:
+            body = {"usage": {"prompt_tokens": 10, "completion_tokens": output_tokens}}
+        self.strategy.record_response(
+            candidate,
+            ProviderResponse(
+                status_code=200,
+                body=body,
+                first_byte_delay_ms=first_byte_ms,
+                total_time_ms=total_ms,
+            ),
+        )
+
+    def test_ewma_tracks_first_byte_and_throughput(self):
+        """Samples are folded into an EWMA; failures are ignored"""
+        c = self.candidates[0]
+        self._observe(c, 100, total_ms=1000, output_tokens=50)
+        self._observe(c, 200, total_ms=1000, output_tokens=100)
+        self.strategy.record_response(
+            c, ProviderResponse(status_code=500, first_byte_delay_ms=9000)
+        )
+
+        stats = self.strategy.snapshot(c)
+        assert stats.samples == 2
+        assert stats.first_byte_ms == pytest.approx(130)
+        assert stats.tokens_per_second == pytest.approx(65)
+
+    def test_stream_first_chunk_only_updates_first_byte(self):
+        """Stream responses are recorded before total time and usage exist"""
+        c = self.candidates[0]
+        self._observe(c, 300)
+
+        stats = self.strategy.snapshot(c)
+        assert stats.first_byte_ms == 300
+        assert stats.tokens_per_second is None
+
+    @pytest.mark.asyncio
+    async def test_select_prefers_faster_of_two(self):
+        """Power of two choices never picks the slowest candidate"""
+        for candidate, latency in zip(self.candidates, (50, 200, 800)):
+            self._observe(candidate, latency)
+
+        picks = [await self.strategy.select(self.candidates, "m") for _ in range(200)]
+        counts = {c.provider_id: sum(p.provider_id == c.provider_id for p in picks) for c in self.candidates}
+
+        assert counts[3] == 0
+        assert counts[1] > counts[2] > 0
+
+    @pytest.mark.asyncio
+    async def test_throughput_breaks_first_byte_ties(self):
+        """With equal TTFB the higher-throughput candidate wins"""
+        fast, slow = self.candidates[:2]
+        self._observe(fast, 100, total_ms=1000, output_tokens=200)
+        self._observe(slow, 100, total_ms=1000, output_tokens=20)
+
+        for _ in range(20):
+            assert (await self.strategy.select([fast, slow], "m")).provider_id == fast.provider_id
+
+    @pytest.mark.asyncio
+    async def test_exploration_reaches_cold_candidates(self):
+        """Exploration keeps sampling candidates that have no latency yet"""
+        strategy = LowestLatencyStrategy(exploration_rate=0.5, rng=random.Random(1))
+        warm, cold = self.candidates[:2]
+        strategy.record_response(warm, ProviderResponse(status_code=200, first_byte_delay_ms=10))
+
+        picks = {(await strategy.select([warm, cold], "m")).provider_id for _ in range(50)}
+
+        assert picks == {warm.provider_id, cold.provider_id}
+
+    @pytest.mark.asyncio
+    async def test_get_next_follows_latency_order(self):
+        """Failover walks candidates from fastest to slowest, wrapping around"""
+        for candidate, latency in zip(self.candidates, (300, 100, 200)):
+            self._observe(candidate, latency)
+
+        c1, c2, c3 = self.candidates
+        assert (await self.strategy.get_next(self.candidates, "m", c2)).provider_id == 3
+        assert (await self.strategy.get_next(self.candidates, "m", c3)).provider_id == 1
+        assert (await self.strategy.get_next(self.candidates, "m", c1)).provider_id == 2
+        assert await self.strategy.get_next([c1], "m", c1) is None
+
+
+class TestLeastOutstandingStrategy:
+    """Least Outstanding Strategy Tests"""
+
+    def setup_method(self):
+        """Setup before test"""
+        self.tracker = InFlightTracker()
+        self.strategy = LeastOutstandingStrategy(self.tracker)
+        self.candidates = [
+            CandidateProvider(
+                provider_id=i,
+                provider_name=f"Provider{i}",
+                base_url=f"https://api{i}.com",
+                protocol="openai",
+                api_key=f"key{i}",
+                target_model=f"model{i}",
+                priority=1,
+                weight=weight,
+                provider_mapping_id=i,
+            )
+            for i, weight in ((1, 1), (2, 1), (3, 2))
+        ]
+
+    def _busy(self, candidate, count):
+        for _ in range(count):
+            self.tracker.acquire(candidate)
+
+    @pytest.mark.asyncio
+    async def test_select_least_loaded_per_weight(self):
+        """Outstanding requests are divided by the mapping weight"""
+        c1, c2, c3 = self.candidates
+        self._busy(c1, 40)
+        self._busy(c2, 3)
+        self._busy(c3, 4)  # 4 / 2 = 2 < 3
+
+        selected = await self.strategy.select(self.candidates, "m")
+        assert selected.provider_id == 3
+
+    @pytest.mark.asyncio
+    async def test_ties_use_weighted_round_robin(self):
+        """Idle candidates are shared by weight"""
+        picks = [
+            (await self.strategy.select(self.candidates, "m")).provider_id
+            for _ in range(8)
+        ]
+        assert picks.count(1) == 2
+        assert picks.count(2) == 2
+        assert picks.count(3) == 4
+
+    @pytest.mark.asyncio
+    async def test_release_restores_candidate(self):
+        """A finished request makes the candidate eligible again"""
+        c1, c2, _ = self.candidates
+        key = self.tracker.acquire(c1)
+        assert (await self.strategy.select([c1, c2], "m")).provider_id == 2
+
+        self.tracker.release(key)
+        self.tracker.acquire(c2)
+        assert (await self.strategy.select([c1, c2], "m")).provider_id == 1
+
+    @pytest.mark.asyncio
+    async def test_get_next_follows_load_order(self):
+        """Failover walks candidates from least to most loaded"""
+        c1, c2, c3 = self.candidates
+        self._busy(c1, 5)
+        self._busy(c2, 1)
+
+        assert (await self.strategy.get_next(self.candidates, "m", c3)).provider_id == 2
+        assert (await self.strategy.get_next(self.candidates, "m", c2)).provider_id == 1
+        assert (await self.strategy.get_next(self.candidates, "m", c1)).provider_id == 3
@@ -0,0 +1,92 @@
+import pytest
+
+from app.common.errors import RateLimitError
+from app.common.rate_limiter import InMemoryRateLimiter
+from app.services.token_rate_limit import TokenRateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_limiter(per_key_tpm: int = 0, per_model_tpm: int = 0):
+    backend = InMemoryRateLimiter(clock=FakeClock())
+    return (
+        TokenRateLimiter(
+            backend, per_key_tpm=per_key_tpm, per_model_tpm=per_model_tpm
+        ),
+        backend,
+    )
+
+
+def remaining(backend: InMemoryRateLimiter, key: str, tpm: int) -> int:
+    allowed, left, _ = backend.is_allowed(key, tpm, 60, cost=0)
+    assert allowed
+    return left
+
+
+@pytest.mark.asyncio
+async def test_disabled_limiter_reserves_nothing():
+    limiter, _ = make_limiter()
+
+    assert limiter.enabled is False
+    assert await limiter.reserve(1, "gpt-4o", 10_000) is None
+
+
+@pytest.mark.asyncio
+async def test_reserve_takes_input_tokens_from_each_budget():
+    limiter, backend = make_limiter(per_key_tpm=1000, per_model_tpm=5000)
+
+    reservation = await limiter.reserve(1, "gpt-4o", 300)
+
+    assert [key for key, _, _ in reservation.entries] == [
+        "tpm:key:1",
+        "tpm:model:gpt-4o",
+    ]
+    assert remaining(backend, "tpm:key:1", 1000) == 700
+    assert remaining(backend, "tpm:model:gpt-4o", 5000) == 4700
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_raises_and_refunds_earlier_budgets():
+    limiter, backend = make_limiter(per_key_tpm=10_000, per_model_tpm=500)
+    await limiter.reserve(1, "gpt-4o", 400)
+
+    with pytest.raises(RateLimitError) as exc_info:
+        await limiter.reserve(2, "gpt-4o", 200)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.details["scope"] == "model"
+    assert exc_info.value.details["retry_after"] >= 1
+    assert exc_info.value.headers["Retry-After"] == str(
+        exc_info.value.details["retry_after"]
+    )
+    assert remaining(backend, "tpm:key:2", 10_000) == 10_000
+
+
+@pytest.mark.asyncio
+async def test_settle_charges_output_and_refunds_failures():
+    limiter, backend = make_limiter(per_key_tpm=1000)
+
+    reservation = await limiter.reserve(1, "gpt-4o", 100)
+    await limiter.settle(reservation, 350)
+    assert remaining(backend, "tpm:key:1", 1000) == 650
+
+    failed = await limiter.reserve(1, "gpt-4o", 200)
+    await limiter.settle(failed, 0)
+    await limiter.settle(failed, 500)
+    assert remaining(backend, "tpm:key:1", 1000) == 650
+
+
+@pytest.mark.asyncio
+async def test_oversized_prompt_is_capped_at_the_budget():
+    limiter, backend = make_limiter(per_key_tpm=1000)
+
+    reservation = await limiter.reserve(1, "gpt-4o", 5000)
+
+    assert reservation.entries == [("tpm:key:1", 1000, 1000)]
+    assert remaining(backend, "tpm:key:1", 1000) == 0
@@ -254,6 +254,10 @@ function ModelDetailContent() {
         return t('list.strategy.costFirst');
       case 'priority':
         return t('list.strategy.priority');
+      case 'lowest_latency':
+        return t('list.strategy.lowestLatency');
+      case 'least_outstanding':
+        return t('list.strategy.leastOutstanding');
       case 'round_robin':
       default:
         return t('list.strategy.roundRobin');
@@ -449,6 +453,7 @@ function ModelDetailContent() {
                   {supportsBilling && <TableHead>{t('detail.billing')}</TableHead>}
                   <TableHead>{t('detail.priority')}</TableHead>
                   <TableHead>{t('detail.weight')}</TableHead>
+                  <TableHead>{t('detail.inFlight')}</TableHead>
                   <TableHead>{t('detail.status')}</TableHead>
                   <TableHead className="text-right">{t('detail.actions')}</TableHead>
                 </TableRow>
@@ -546,6 +551,18 @@ function ModelDetailContent() {
                               </Tooltip>
                             </TooltipProvider>
                           ) : null}
+                          {mapping.health_circuit_state === 'open' ||
+                          mapping.health_circuit_state === 'half_open' ? (
+                            <Badge
+                              variant="destructive"
+                              className="whitespace-nowrap font-medium"
+                              title={t('detail.circuitTooltip')}
+                            >
+                              {mapping.health_circuit_state === 'open'
+                                ? t('detail.circuitOpen')
+                                : t('detail.circuitHalfOpen')}
+                            </Badge>
+                          ) : null}
                         </div>
                       </TableCell>
                       <TableCell>
@@ -571,6 +588,7 @@ function ModelDetailContent() {
                       )}
                       <TableCell>{mapping.priority}</TableCell>
                       <TableCell>{mapping.weight}</TableCell>
+                      <TableCell className="tabular-nums">{mapping.in_flight ?? 0}</TableCell>
                       <TableCell>
                         {isProviderDisabledWhileMappingActive ? (
                           <TooltipProvider>
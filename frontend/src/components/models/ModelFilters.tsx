@@ -129,6 +129,8 @@ export function ModelFilters({ filters, onFilterChange }: ModelFiltersProps) {
                 <SelectItem value="round_robin">{t('filters.roundRobin')}</SelectItem>
                 <SelectItem value="cost_first">{t('filters.costFirst')}</SelectItem>
                 <SelectItem value="priority">{t('filters.priority')}</SelectItem>
+                <SelectItem value="lowest_latency">{t('filters.lowestLatency')}</SelectItem>
+                <SelectItem value="least_outstanding">{t('filters.leastOutstanding')}</SelectItem>
               </SelectContent>
             </Select>
           </div>
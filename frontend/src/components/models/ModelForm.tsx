@@ -383,7 +383,7 @@ export function ModelForm({
               name="strategy"
               control={control}
               render={({ field }) => (
-                <div className="grid grid-cols-1 md:grid-cols-3 gap-3">
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
                   {/* Round Robin Strategy */}
                   <Card
                     className={`cursor-pointer transition-all duration-200 hover:shadow-md ${
@@ -508,6 +508,84 @@ export function ModelForm({
                       </div>
                     </div>
                   </Card>
+
+                  {/* Lowest Latency Strategy */}
+                  <Card
+                    className={`cursor-pointer transition-all duration-200 hover:shadow-md ${
+                      field.value === 'lowest_latency'
+                        ? 'border-primary border-2 bg-primary/5'
+                        : 'border-border hover:border-primary/50'
+                    }`}
+                    onClick={() => field.onChange('lowest_latency')}
+                  >
+                    <div className="p-4 space-y-2">
+                      <div className="flex items-center gap-3">
+                        <div className={`w-5 h-5 rounded-full border-2 flex items-center justify-center ${
+                          field.value === 'lowest_latency'
+                            ? 'border-primary bg-primary'
+                            : 'border-muted-foreground'
+                        }`}>
+                          {field.value === 'lowest_latency' && (
+                            <div className="w-2 h-2 rounded-full bg-white"></div>
+                          )}
+                        </div>
+                        <div className="flex items-center gap-2">
+                          <span className="text-2xl">⚡</span>
+                          <span className="font-semibold text-base">
+                            {t('form.lowestLatencyTitle')}
+                          </span>
+                        </div>
+                      </div>
+                      <p className="text-sm text-muted-foreground pl-8">
+                        {t('form.lowestLatencyDescription')}
+                      </p>
+                      <div className="pl-8 pt-1">
+                        <div className="inline-flex items-center gap-1 px-2 py-0.5 rounded-md bg-purple-100 dark:bg-purple-900/30 text-purple-700 dark:text-purple-300 text-xs">
+                          <span>⏱️</span>
+                          <span>{t('form.lowestLatencyTag')}</span>
+                        </div>
+                      </div>
+                    </div>
+                  </Card>
+
+                  {/* Least Outstanding Strategy */}
+                  <Card
+                    className={`cursor-pointer transition-all duration-200 hover:shadow-md ${
+                      field.value === 'least_outstanding'
+                        ? 'border-primary border-2 bg-primary/5'
+                        : 'border-border hover:border-primary/50'
+                    }`}
+                    onClick={() => field.onChange('least_outstanding')}
+                  >
+                    <div className="p-4 space-y-2">
+                      <div className="flex items-center gap-3">
+                        <div className={`w-5 h-5 rounded-full border-2 flex items-center justify-center ${
+                          field.value === 'least_outstanding'
+                            ? 'border-primary bg-primary'
+                            : 'border-muted-foreground'
+                        }`}>
+                          {field.value === 'least_outstanding' && (
+                            <div className="w-2 h-2 rounded-full bg-white"></div>
+                          )}
+                        </div>
+                        <div className="flex items-center gap-2">
+                          <span className="text-2xl">📶</span>
+                          <span className="font-semibold text-base">
+                            {t('form.leastOutstandingTitle')}
+                          </span>
+                        </div>
+                      </div>
+                      <p className="text-sm text-muted-foreground pl-8">
+                        {t('form.leastOutstandingDescription')}
+                      </p>
+                      <div className="pl-8 pt-1">
+                        <div className="inline-flex items-center gap-1 px-2 py-0.5 rounded-md bg-cyan-100 dark:bg-cyan-900/30 text-cyan-700 dark:text-cyan-300 text-xs">
+                          <span>🚦</span>
+                          <span>{t('form.leastOutstandingTag')}</span>
+                        </div>
+                      </div>
+                    </div>
+                  </Card>
                 </div>
               )}
             />
@@ -67,6 +67,10 @@ export function ModelList({
         return t('list.strategy.costFirst');
       case 'priority':
         return t('list.strategy.priority');
+      case 'lowest_latency':
+        return t('list.strategy.lowestLatency');
+      case 'least_outstanding':
+        return t('list.strategy.leastOutstanding');
       case 'round_robin':
       default:
         return t('list.strategy.roundRobin');
@@ -7,7 +7,12 @@ import { RuleSet } from './common';
 import { ProtocolType } from './provider';
 
 /** Selection Strategy Type */
-export type SelectionStrategy = 'round_robin' | 'cost_first' | 'priority';
+export type SelectionStrategy =
+  | 'round_robin'
+  | 'cost_first'
+  | 'priority'
+  | 'lowest_latency'
+  | 'least_outstanding';
 export type ModelType = 'chat' | 'speech' | 'transcription' | 'embedding' | 'images';
 export type ModelListSortBy = 'requested_model_asc' | 'requested_model_desc';
 
@@ -56,6 +61,8 @@ export interface ModelMappingProvider {
   health_sample_count?: number;
   health_failure_count?: number;
   health_failure_rate?: number;
+  health_circuit_state?: 'closed' | 'open' | 'half_open'; // Runtime hard-circuit state
+  in_flight?: number;                  // Outstanding upstream requests (runtime)
   resolved_billing_mode?: 'token_flat' | 'token_tiered' | 'per_request' | 'per_image' | 'inherit_model_default' | null;
   resolved_input_price?: number | null;
   resolved_output_price?: number | null;